@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+보고서 라이브러리 무결성 점검
+다운로드 폴더(예전 실행에서 받은 PDF 폴더 포함)의 파일을 여러 프로세스에서 mmap으로 읽어
+PDF 머리말(%PDF-)과 끝 표시(%%EOF)를 확인하고, 매니페스트가 있으면 크기와 SHA-256을 비교합니다.
+문제가 있는 보고서는 download --links로 바로 다시 받을 수 있는 링크 TXT로 저장합니다.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+from dart_pack import PACK_SCHEME, read_file, resolve_file
+from dart_storage import DownloadManifest, MANIFEST_FILENAME
+
+
+PDF_HEADER = b'%PDF-'
+PDF_TRAILER = b'%%EOF'
+# 머리말 앞과 끝 표시 뒤에 다른 바이트가 조금 붙어도 정상 PDF로 봄
+HEADER_WINDOW = 1024
+TRAILER_WINDOW = 1024
+HTML_MARKERS = (b'<html', b'<!doctype', b'<head', b'<script', b'<?xml')
+
+# 파일명에서 접수번호 추정 (기본 파일명 report_{rcpNo}_{dcmNo}.pdf 등)
+_RCP_PATTERN = re.compile(r'(?<!\d)(\d{14})(?!\d)')
+
+
+def inspect_pdf(data) -> List[str]:
+    """
+    PDF 형식 점검 (bytes, mmap, memoryview 모두 가능 - 앞뒤 일부만 읽음)
+
+    Returns:
+        문제 목록 - empty, html (PDF 이름으로 저장된 오류 페이지), not_pdf, truncated
+    """
+    if not len(data):
+        return ['empty']
+    head = bytes(data[:HEADER_WINDOW])
+    if PDF_HEADER not in head:
+        return ['html' if any(marker in head.lstrip().lower() for marker in HTML_MARKERS) else 'not_pdf']
+    if PDF_TRAILER not in bytes(data[-TRAILER_WINDOW:]):
+        return ['truncated']
+    return []
+
+
+def audit_file(task: Dict) -> Dict:
+    """
+    파일 하나 점검 (프로세스 풀에서 실행되는 작업 단위)
+
+    Args:
+        task: path(파일 경로 또는 pack:// 위치), size, sha256(매니페스트 기대값, 없으면 None), hash(해시 계산 여부)
+
+    Returns:
+        task에 actual_size, actual_sha256, problems를 더한 결과
+    """
+    result = dict(task)
+    try:
+        if task['path'].startswith(PACK_SCHEME):
+            data = read_file(task['path'])
+            size = len(data)
+            problems = inspect_pdf(data)
+            digest = hashlib.sha256(data).hexdigest() if task.get('hash') else None
+        else:
+            with open(task['path'], 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    problems, digest = ['empty'], None
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                        problems = inspect_pdf(m)
+                        digest = hashlib.sha256(m).hexdigest() if task.get('hash') else None
+    except Exception as e:
+        result.update(problems=['unreadable'], error=str(e))
+        return result
+
+    if task.get('size') is not None and size != task['size']:
+        problems.append('size_mismatch')
+    if digest and task.get('sha256') and digest != task['sha256']:
+        problems.append('hash_mismatch')
+    result.update(actual_size=size, actual_sha256=digest, problems=problems)
+    return result
+
+
+def library_files(save_dir: str, hash_files: bool = True) -> List[Dict]:
+    """
+    점검할 PDF 목록 - 폴더의 모든 PDF(하위 폴더 포함)와 매니페스트에만 있는 보고서(팩 또는 없어진 파일)
+
+    Returns:
+        audit_file 작업 목록 (매니페스트 정보가 있으면 rcp_no, 기대 크기/해시, 보고서 정보 포함)
+    """
+    manifest = DownloadManifest(save_dir) if os.path.exists(os.path.join(save_dir, MANIFEST_FILENAME)) else None
+    by_filename = {entry['filename']: entry for entry in (manifest.entries.values() if manifest else [])
+                   if entry.get('filename')}
+
+    tasks = []
+    seen = set()
+    for root, dirs, files in os.walk(save_dir):
+        # 팩, 추출 결과 등 내부 폴더 제외
+        dirs[:] = [name for name in dirs if not name.startswith('.')]
+        for name in files:
+            if not name.lower().endswith('.pdf'):
+                continue
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, save_dir)
+            seen.add(rel)
+            tasks.append(_task(path, rel, by_filename.get(rel), hash_files))
+
+    for filename, entry in by_filename.items():
+        if filename in seen or entry.get('evicted'):
+            continue
+        path = resolve_file(save_dir, filename)
+        task = _task(path or os.path.join(save_dir, filename), filename, entry, hash_files)
+        if not path:
+            task['missing'] = True
+        tasks.append(task)
+    return tasks
+
+
+def _task(path: str, name: str, entry: Optional[Dict], hash_files: bool) -> Dict:
+    entry = entry or {}
+    rcp_match = _RCP_PATTERN.search(os.path.basename(name))
+    return {
+        'path': path,
+        'name': name,
+        'size': entry.get('size'),
+        'sha256': entry.get('sha256'),
+        'hash': hash_files,
+        'rcp_no': entry.get('rcp_no') or (rcp_match.group(1) if rcp_match else ''),
+        'dcm_no': entry.get('dcm_no', ''),
+        'corp_name': entry.get('corp_name', ''),
+        'report_name': entry.get('report_name', ''),
+        'report_url': entry.get('report_url', ''),
+    }
+
+
+def audit_library(save_dir: str, workers: Optional[int] = None, hash_files: bool = True) -> Dict:
+    """
+    다운로드 폴더 점검
+
+    Args:
+        save_dir: 다운로드 폴더
+        workers: 점검 프로세스 수 (None이면 CPU 코어 수)
+        hash_files: False이면 SHA-256 비교 없이 형식과 크기만 점검 (파일마다 앞뒤 일부만 읽음)
+
+    Returns:
+        files, ok, bytes, seconds, files_per_sec, problems(문제 파일 결과 목록)
+    """
+    if not os.path.isdir(save_dir):
+        print(f"❌ 폴더가 없습니다: {save_dir}")
+        return {'files': 0, 'ok': 0, 'bytes': 0, 'seconds': 0.0, 'files_per_sec': 0.0, 'problems': []}
+
+    workers = workers or os.cpu_count() or 1
+    tasks = library_files(save_dir, hash_files)
+    missing = [dict(task, problems=['missing']) for task in tasks if task.get('missing')]
+    tasks = [task for task in tasks if not task.get('missing')]
+
+    print(f"🩺 라이브러리 점검: 파일 {len(tasks):,}개 (프로세스 {workers}개{', 해시 비교' if hash_files else ''})")
+    started = time.perf_counter()
+    problems = list(missing)
+    total_bytes = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # 파일 수가 많으므로 묶어서 전달하여 프로세스 간 통신 횟수를 줄임
+        chunksize = max(1, min(256, len(tasks) // (workers * 8)))
+        for done, result in enumerate(executor.map(audit_file, tasks, chunksize=chunksize), 1):
+            total_bytes += result.get('actual_size') or 0
+            if result['problems']:
+                problems.append(result)
+            if done % 10000 == 0:
+                print(f"  ... {done:,}/{len(tasks):,}개 점검")
+
+    seconds = time.perf_counter() - started
+    rate = len(tasks) / seconds if seconds > 0 else 0.0
+    print(f"  ✅ 정상 {len(tasks) - len(problems) + len(missing):,}개, ⚠️ 문제 {len(problems):,}개 "
+          f"({total_bytes:,} bytes, {seconds:.1f}초, {rate:,.0f} 파일/초)")
+    for result in problems[:20]:
+        print(f"    - {result['name']}: {', '.join(result['problems'])}")
+    if len(problems) > 20:
+        print(f"    ... 외 {len(problems) - 20:,}개")
+
+    return {
+        'files': len(tasks) + len(missing),
+        'ok': len(tasks) - (len(problems) - len(missing)),
+        'bytes': total_bytes,
+        'seconds': seconds,
+        'files_per_sec': rate,
+        'problems': problems,
+    }
+
+
+def redownload_reports(problems: List[Dict], base_url: str = "https://dart.fss.or.kr") -> List[Dict]:
+    """
+    다시 받을 보고서 목록 (save_links_to_txt 입력 형식) - 접수번호를 알 수 없는 파일은 제외
+
+    접수일은 접수번호 앞 8자리에서 얻음
+    """
+    reports = {}
+    for result in problems:
+        rcp_no = result.get('rcp_no')
+        if not rcp_no or rcp_no in reports:
+            continue
+        reports[rcp_no] = {
+            'company': result.get('corp_name', ''),
+            'report_name': result.get('report_name') or result['name'],
+            'submit_date': f"{rcp_no[:4]}.{rcp_no[4:6]}.{rcp_no[6:8]}",
+            'report_url': result.get('report_url') or f"{base_url}/dsaf001/main.do?rcpNo={rcp_no}",
+            'note': f"{result['name']}: {', '.join(result['problems'])}",
+        }
+    return list(reports.values())
+
+
+def save_redownload_list(problems: List[Dict], filename: str) -> int:
+    """
+    문제 보고서 링크 TXT 저장 (download --links / download_all_reports_from_txt 입력)
+
+    Returns:
+        저장한 링크 수
+    """
+    from dart_scraper import DartScraper
+
+    reports = redownload_reports(problems)
+    unresolved = sum(1 for result in problems if not result.get('rcp_no'))
+    if unresolved:
+        print(f"  ℹ️ 접수번호를 알 수 없는 파일 {unresolved:,}개는 링크 목록에서 제외 (검색 후 다시 받아야 함)")
+    if reports:
+        DartScraper.save_links_to_txt(reports, filename)
+    return len(reports)
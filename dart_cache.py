@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+검색·뷰어 응답 재검증 캐시
+응답 본문과 검증자(ETag, Last-Modified)를 보관했다가 다음 요청에 If-None-Match/If-Modified-Since를 붙여 보냅니다.
+304 응답이면 보관한 본문과 파싱 결과를 그대로 쓰고, 검증자가 없거나 서버가 무시해 200이 오면
+본문 SHA-256을 비교해 내용이 같을 때 다시 파싱하지 않습니다.
+
+본문은 페이지 종류(URL 경로)별로 DART 페이지 표본에서 학습한 사전으로 압축해 보관합니다.
+zstandard가 설치되어 있으면 zstd 사전, 없으면 zlib 미리 설정 사전(zdict, 최대 32KB)을 사용합니다.
+(pip install 'ddownload[zstd]')
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from typing import List, Dict, Optional, Any, Tuple
+from urllib.parse import urlencode, urlparse
+
+import requests
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+DEFAULT_RESPONSE_CACHE_FILE = ".dart_responses.sqlite"
+
+# 본문 압축 방식
+RAW = 'raw'
+ZLIB = 'zlib'
+ZSTD = 'zstd'
+
+# deflate 창 크기 - zlib 사전은 이보다 길어도 앞부분을 쓰지 못함
+ZLIB_MAX_DICT_SIZE = 32 * 1024
+ZSTD_DICT_SIZE = 64 * 1024
+# 사전 후보 조각 길이 (긴 줄은 태그 경계에서 나눔)
+_MIN_PIECE = 8
+_MAX_PIECE = 256
+_TAG_END = re.compile(rb'(?<=>)')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    sha256 TEXT NOT NULL,
+    encoding TEXT,
+    body BLOB NOT NULL,
+    parsed TEXT NOT NULL DEFAULT '{}',
+    fetched_at REAL NOT NULL,
+    validated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_validated ON responses (validated_at);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    dict_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    samples INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+# 압축 저장 이전 캐시 파일에 추가할 열 (기존 행은 codec이 NULL - 압축하지 않은 본문)
+_COMPRESSION_COLUMNS = (('kind', 'TEXT'), ('codec', 'TEXT'), ('dict_id', 'INTEGER'), ('size', 'INTEGER'))
+
+
+def page_kind(url: str) -> str:
+    """사전을 나눠 쓰는 페이지 종류 - URL 경로 (검색 결과, 보고서 뷰어 등)"""
+    return urlparse(url).path or '/'
+
+
+def _pieces(body: bytes):
+    """사전 후보 조각 - 줄 단위, 긴 줄은 태그 경계에서 _MAX_PIECE 이하로 나눔"""
+    for line in body.splitlines(keepends=True):
+        if len(line) <= _MAX_PIECE:
+            if len(line.strip()) >= _MIN_PIECE:
+                yield line
+            continue
+        chunk = b''
+        for part in _TAG_END.split(line):
+            if chunk and len(chunk) + len(part) > _MAX_PIECE:
+                yield chunk
+                chunk = b''
+            chunk += part
+        if len(chunk.strip()) >= _MIN_PIECE:
+            yield chunk
+
+
+def build_zdict(samples: List[bytes], size: int = ZLIB_MAX_DICT_SIZE) -> bytes:
+    """
+    zlib 미리 설정 사전 만들기
+
+    여러 표본에 반복해서 나오는 조각(스크립트, 표 마크업, 머리말)을 (나온 표본 수 × 길이) 순으로 골라 size까지 채움
+    deflate는 가까운 일치를 더 짧게 부호화하므로 가장 값진 조각을 사전 끝에 둠
+    """
+    counts: Dict[bytes, int] = {}
+    for sample in samples:
+        for piece in set(_pieces(sample)):
+            counts[piece] = counts.get(piece, 0) + 1
+
+    min_count = 2 if len(samples) > 1 else 1
+    ranked = sorted((piece for piece, count in counts.items() if count >= min_count),
+                    key=lambda piece: counts[piece] * len(piece), reverse=True)
+    chosen = []
+    total = 0
+    for piece in ranked:
+        if total + len(piece) > size:
+            continue
+        chosen.append(piece)
+        total += len(piece)
+    return b''.join(reversed(chosen))
+
+
+def train_dictionary(samples: List[bytes], codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """
+    페이지 표본으로 압축 사전 학습
+
+    Args:
+        samples: 같은 종류 페이지의 본문 목록
+        codec: ZSTD 또는 ZLIB (None이면 zstandard가 있을 때 ZSTD)
+
+    Returns:
+        (codec, 사전 데이터)
+    """
+    codec = codec or (ZSTD if zstandard is not None else ZLIB)
+    if codec == ZSTD:
+        try:
+            return ZSTD, zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+        except zstandard.ZstdError:
+            # 표본이 너무 적거나 작으면 zstd 학습이 실패하므로 zlib 사전으로 대신함
+            pass
+    return ZLIB, build_zdict(samples)
+
+
+def compress_body(body: bytes, codec: str, dictionary: Optional[bytes] = None, level: int = 9) -> bytes:
+    if codec == ZSTD:
+        zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdCompressor(level=level, dict_data=zdict).compress(body)
+    if codec == ZLIB:
+        compressor = zlib.compressobj(level, zdict=dictionary) if dictionary else zlib.compressobj(level)
+        return compressor.compress(body) + compressor.flush()
+    return body
+
+
+def decompress_body(data: bytes, codec: Optional[str], dictionary: Optional[bytes] = None) -> bytes:
+    if codec == ZSTD:
+        zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdDecompressor(dict_data=zdict).decompress(data)
+    if codec == ZLIB:
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+    return data
+
+
+# 조건부 요청 결과 구분
+NEW = 'new'                  # 캐시에 없던 요청
+CHANGED = 'changed'          # 캐시가 있었지만 내용이 바뀜
+NOT_MODIFIED = 'not_modified'  # 304 - 본문 전송 없음
+UNCHANGED = 'unchanged'      # 200이지만 본문 해시가 같아 파싱 생략
+
+
+class ResponseCache:
+    """요청별 응답 본문(사전 압축), 검증자, 파싱 결과 보관 (SQLite)"""
+
+    def __init__(self, cache_file: Optional[str] = DEFAULT_RESPONSE_CACHE_FILE, max_age_days: float = 30,
+                 train_after: int = 32, train_samples: int = 200):
+        """
+        Args:
+            cache_file: 캐시 파일 (None이면 메모리에만 보관)
+            max_age_days: 이 기간 동안 다시 확인하지 않은 응답은 열 때 삭제
+            train_after: 같은 종류 페이지가 이만큼 쌓이면 압축 사전을 학습하고 쌓인 본문도 다시 압축
+                         (그 전에는 사전 없이 압축)
+            train_samples: 사전 학습에 쓸 최근 본문 수
+        """
+        self.cache_file = cache_file
+        self.train_after = train_after
+        self.train_samples = train_samples
+        self.codec = ZSTD if zstandard is not None else ZLIB
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(cache_file or ':memory:', check_same_thread=False)
+        if cache_file:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(responses)")}
+        for name, column_type in _COMPRESSION_COLUMNS:
+            if name not in columns:
+                self.conn.execute(f"ALTER TABLE responses ADD COLUMN {name} {column_type}")
+        self.conn.execute("DELETE FROM responses WHERE validated_at < ?", (time.time() - max_age_days * 86400,))
+        self.conn.commit()
+
+        # 사전은 종류별 최신 것으로 압축하고, 예전 사전으로 압축한 본문을 풀 수 있도록 모두 보관
+        self._dictionaries: Dict[int, Tuple[str, bytes]] = {}
+        self._kind_dict: Dict[str, int] = {}
+        for dict_id, kind, codec, data in self.conn.execute(
+                "SELECT dict_id, kind, codec, data FROM dictionaries ORDER BY dict_id"):
+            self._dictionaries[dict_id] = (codec, bytes(data))
+            self._kind_dict[kind] = dict_id
+
+        self.counts = {NEW: 0, CHANGED: 0, NOT_MODIFIED: 0, UNCHANGED: 0}
+        self.conditional_requests = 0
+        self.bytes_received = 0
+        self.bytes_saved = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    @staticmethod
+    def key(method: str, url: str, data=None) -> str:
+        """요청 키 - 메서드, URL, 폼 데이터 (같은 이름의 값이 여러 개여도 순서대로)"""
+        form = urlencode(data, doseq=True) if data else ''
+        return hashlib.sha256(f"{method.upper()} {url}\n{form}".encode('utf-8')).hexdigest()
+
+    # --- 본문 압축 ---
+
+    def _compress(self, kind: str, body: bytes) -> Tuple[bytes, str, Optional[int]]:
+        dict_id = self._kind_dict.get(kind)
+        if dict_id is None:
+            return compress_body(body, self.codec), self.codec, None
+        codec, dictionary = self._dictionaries[dict_id]
+        if codec == ZSTD and zstandard is None:
+            return compress_body(body, ZLIB), ZLIB, None
+        return compress_body(body, codec, dictionary), codec, dict_id
+
+    def _decompress(self, data: bytes, codec: Optional[str], dict_id: Optional[int]) -> bytes:
+        dictionary = self._dictionaries[dict_id][1] if dict_id is not None else None
+        return decompress_body(data, codec, dictionary)
+
+    def _maybe_train(self, kind: str) -> None:
+        """사전이 없는 종류의 페이지가 train_after개 쌓이면 학습 (잠금을 잡은 상태에서 호출)"""
+        if kind in self._kind_dict or self.train_after <= 0:
+            return
+        count = self.conn.execute("SELECT COUNT(*) FROM responses WHERE kind = ?", (kind,)).fetchone()[0]
+        if count >= self.train_after:
+            self._train(kind)
+
+    def _train(self, kind: str) -> Optional[int]:
+        rows = self.conn.execute(
+            "SELECT body, codec, dict_id FROM responses WHERE kind = ? ORDER BY fetched_at DESC LIMIT ?",
+            (kind, self.train_samples)).fetchall()
+        samples = []
+        for body, codec, dict_id in rows:
+            try:
+                samples.append(self._decompress(bytes(body), codec, dict_id))
+            except Exception:
+                continue
+        if len(samples) < 2:
+            return None
+
+        codec, dictionary = train_dictionary(samples, self.codec)
+        if not dictionary:
+            return None
+        dict_id = self.conn.execute(
+            "INSERT INTO dictionaries (kind, codec, data, samples, created_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, codec, dictionary, len(samples), time.time())).lastrowid
+        self._dictionaries[dict_id] = (codec, dictionary)
+        self._kind_dict[kind] = dict_id
+        recompressed = self._recompress(kind)
+        self.conn.commit()
+        print(f"  🗜️ 응답 캐시 압축 사전 학습: {kind} (표본 {len(samples)}개, {codec} {len(dictionary):,} bytes, "
+              f"본문 {recompressed}개 다시 압축)")
+        return dict_id
+
+    def _recompress(self, kind: str) -> int:
+        """종류의 모든 본문을 최신 사전으로 다시 압축"""
+        dict_id = self._kind_dict[kind]
+        rows = self.conn.execute(
+            "SELECT key, body, codec, dict_id FROM responses WHERE kind = ? AND "
+            "(dict_id IS NULL OR dict_id != ?)", (kind, dict_id)).fetchall()
+        for key, body, codec, old_dict_id in rows:
+            try:
+                raw = self._decompress(bytes(body), codec, old_dict_id)
+            except Exception:
+                continue
+            data, new_codec, new_dict_id = self._compress(kind, raw)
+            self.conn.execute("UPDATE responses SET body = ?, codec = ?, dict_id = ?, size = ? WHERE key = ?",
+                              (data, new_codec, new_dict_id, len(raw), key))
+        return len(rows)
+
+    def train(self, kind: Optional[str] = None) -> List[int]:
+        """
+        압축 사전 다시 학습 (페이지 구조가 바뀌어 압축률이 떨어졌을 때)
+
+        Args:
+            kind: 페이지 종류 (None이면 캐시에 있는 모든 종류)
+
+        Returns:
+            새 사전 번호 목록
+        """
+        with self._lock:
+            kinds = [kind] if kind else [row[0] for row in self.conn.execute(
+                "SELECT DISTINCT kind FROM responses WHERE kind IS NOT NULL")]
+            return [dict_id for dict_id in (self._train(name) for name in kinds) if dict_id is not None]
+
+    # --- 조회와 저장 ---
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, sha256, encoding, body, parsed, codec, dict_id "
+                "FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            etag, last_modified, digest, encoding, body, parsed, codec, dict_id = row
+            try:
+                body = self._decompress(bytes(body), codec, dict_id)
+            except Exception as e:
+                # zstd로 압축한 캐시를 zstandard 없이 여는 경우 등 - 캐시가 없는 것으로 처리
+                print(f"  ⚠️ 캐시 본문 읽기 실패 ({codec}): {e}")
+                return None
+        return {'etag': etag, 'last_modified': last_modified, 'sha256': digest, 'encoding': encoding,
+                'body': body, 'parsed': json.loads(parsed)}
+
+    def conditional_headers(self, entry: Dict, method: str) -> Dict[str, str]:
+        """
+        재검증 헤더
+
+        If-None-Match는 GET/HEAD에만 붙임 - 다른 메서드에서 ETag가 일치하면 서버가 412로 거부해야 하므로
+        (검색 POST에는 If-Modified-Since만 보내고, 서버가 무시하면 본문 해시 비교로 처리)
+        """
+        headers = {}
+        if entry.get('etag') and method.upper() in ('GET', 'HEAD'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        if headers:
+            with self._lock:
+                self.conditional_requests += 1
+        return headers
+
+    def store(self, key: str, url: str, response: requests.Response, digest: str,
+              parsed: Dict[str, Any], outcome: str) -> None:
+        """새 본문 저장 (내용이 바뀌면 이전 파싱 결과는 버림)"""
+        body = response.content
+        with self._lock:
+            self.counts[outcome] += 1
+            self.bytes_received += len(body)
+            self._put(key, url, body, digest, response.encoding, response.headers.get('ETag'),
+                      response.headers.get('Last-Modified'), parsed)
+
+    def _put(self, key: str, url: str, body: bytes, digest: str, encoding: Optional[str],
+             etag: Optional[str], last_modified: Optional[str], parsed: Dict[str, Any]) -> None:
+        """본문 압축 저장 (잠금을 잡은 상태에서 호출)"""
+        kind = page_kind(url)
+        self._maybe_train(kind)
+        data, codec, dict_id = self._compress(kind, body)
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, url, etag, last_modified, sha256, encoding, body, parsed, fetched_at, validated_at, "
+            "kind, codec, dict_id, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, url, etag, last_modified, digest, encoding, data, _dump_parsed(parsed), now, now,
+             kind, codec, dict_id, len(body)))
+        self.conn.commit()
+
+    def revalidated(self, key: str, entry: Dict, response: requests.Response, outcome: str) -> None:
+        """
+        내용이 그대로임을 확인 (304 또는 같은 해시의 200) - 검증 시각과 새 검증자만 갱신
+
+        304는 보관한 본문만큼 전송을 절약한 것으로 집계
+        """
+        with self._lock:
+            self.counts[outcome] += 1
+            if outcome == NOT_MODIFIED:
+                self.bytes_saved += len(entry['body'])
+            else:
+                self.bytes_received += len(response.content)
+            self.conn.execute(
+                "UPDATE responses SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), "
+                "validated_at = ? WHERE key = ?",
+                (response.headers.get('ETag'), response.headers.get('Last-Modified'), time.time(), key))
+            self.conn.commit()
+
+    def add_parsed(self, key: str, parsed: Dict[str, Any]) -> None:
+        """같은 본문에 대한 다른 파서의 결과 추가"""
+        with self._lock:
+            self.conn.execute("UPDATE responses SET parsed = ? WHERE key = ?", (_dump_parsed(parsed), key))
+            self.conn.commit()
+
+    def stats(self) -> Dict:
+        """
+        재검증 통계
+
+        Returns:
+            requests, revalidations(캐시가 있던 요청), conditional_requests(검증자를 보낸 요청),
+            not_modified, unchanged, changed, new, revalidation_rate(캐시가 있던 요청 중 내용이 그대로인 비율),
+            parse_skipped, bytes_received, bytes_saved
+        """
+        with self._lock:
+            counts = dict(self.counts)
+            revalidations = counts[NOT_MODIFIED] + counts[UNCHANGED] + counts[CHANGED]
+            reused = counts[NOT_MODIFIED] + counts[UNCHANGED]
+            return {
+                'requests': revalidations + counts[NEW],
+                'revalidations': revalidations,
+                'conditional_requests': self.conditional_requests,
+                'not_modified': counts[NOT_MODIFIED],
+                'unchanged': counts[UNCHANGED],
+                'changed': counts[CHANGED],
+                'new': counts[NEW],
+                'revalidation_rate': round(reused / revalidations, 3) if revalidations else 0.0,
+                'parse_skipped': reused,
+                'bytes_received': self.bytes_received,
+                'bytes_saved': self.bytes_saved,
+            }
+
+    def print_stats(self) -> None:
+        """재검증 통계 출력 (캐시를 다시 확인한 요청이 있을 때만)"""
+        stats = self.stats()
+        if not stats['revalidations']:
+            return
+        print(f"♻️ 응답 재검증: {stats['requests']}회 중 {stats['revalidations']}회 재확인 → "
+              f"304 {stats['not_modified']}회, 내용 같음 {stats['unchanged']}회, 변경 {stats['changed']}회 "
+              f"(재사용 {stats['revalidation_rate']:.0%}, 파싱 생략 {stats['parse_skipped']}회, "
+              f"전송 절약 {stats['bytes_saved']:,} bytes)")
+
+    def storage_stats(self) -> Dict:
+        """
+        저장 용량
+
+        Returns:
+            responses, raw_bytes(압축 전), stored_bytes, ratio, kinds(종류별 같은 항목과 사용 중인 사전)
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT kind, COUNT(*), SUM(COALESCE(size, LENGTH(body))), SUM(LENGTH(body)) "
+                "FROM responses GROUP BY kind").fetchall()
+            kinds = {}
+            for kind, count, raw, stored in rows:
+                dict_id = self._kind_dict.get(kind)
+                kinds[kind or '(압축 이전)'] = {
+                    'responses': count,
+                    'raw_bytes': raw or 0,
+                    'stored_bytes': stored or 0,
+                    'ratio': round(raw / stored, 2) if stored else 0.0,
+                    'dictionary': f"{self._dictionaries[dict_id][0]} #{dict_id}" if dict_id else None,
+                }
+        raw_total = sum(item['raw_bytes'] for item in kinds.values())
+        stored_total = sum(item['stored_bytes'] for item in kinds.values())
+        return {
+            'responses': sum(item['responses'] for item in kinds.values()),
+            'raw_bytes': raw_total,
+            'stored_bytes': stored_total,
+            'ratio': round(raw_total / stored_total, 2) if stored_total else 0.0,
+            'kinds': kinds,
+        }
+
+    def bodies(self) -> List[Tuple[str, bytes]]:
+        """보관한 모든 본문 (페이지 종류, 압축을 푼 본문) - 압축 벤치마크 표본"""
+        with self._lock:
+            rows = self.conn.execute("SELECT url, body, codec, dict_id FROM responses").fetchall()
+            pages = []
+            for url, body, codec, dict_id in rows:
+                try:
+                    pages.append((page_kind(url), self._decompress(bytes(body), codec, dict_id)))
+                except Exception:
+                    continue
+        return pages
+
+
+def load_corpus(corpus_dir: str) -> List[Tuple[str, bytes]]:
+    """
+    벤치마크용 HTML 표본 폴더 읽기
+
+    하위 폴더 이름이 페이지 종류 (예: corpus/search/*.html, corpus/viewer/*.html), 바로 아래 파일은 '/'
+    """
+    pages = []
+    for root, dirs, files in os.walk(corpus_dir):
+        dirs.sort()
+        rel = os.path.relpath(root, corpus_dir)
+        kind = '/' if rel == '.' else '/' + rel.replace(os.sep, '/')
+        for name in sorted(files):
+            if name.lower().endswith(('.html', '.htm')):
+                with open(os.path.join(root, name), 'rb') as f:
+                    pages.append((kind, f.read()))
+    return pages
+
+
+def _median_ms(timings: List[float]) -> float:
+    timings = sorted(timings)
+    return timings[len(timings) // 2] * 1000 if timings else 0.0
+
+
+def benchmark_compression(pages: List[Tuple[str, bytes]], network_ms: float = 500.0, repeat: int = 5) -> Dict:
+    """
+    응답 캐시 압축 벤치마크
+
+    종류별로 표본을 번갈아 학습용/측정용으로 나눠, 측정용 본문에 대한 압축 방식별 압축률과 속도를 재고,
+    실제 캐시 파일에 저장한 뒤 캐시 적중(조회 + 압축 해제) 지연을 네트워크 요청 시간과 비교
+
+    Args:
+        pages: (페이지 종류, 본문) 목록
+        network_ms: 비교할 네트워크 요청 시간 (ms, 보통 요청 한도의 요청 간격)
+        repeat: 압축 해제와 조회 반복 횟수
+
+    Returns:
+        pages, raw_bytes, variants(방식별 stored_bytes, ratio, dict_bytes, compress_ms, decompress_ms),
+        hit_ms, hit_p95_ms, network_ms, speedup, cache(실제 캐시 파일의 압축률)
+    """
+    by_kind: Dict[str, List[bytes]] = {}
+    for kind, body in pages:
+        by_kind.setdefault(kind, []).append(body)
+    train: Dict[str, List[bytes]] = {}
+    test: List[Tuple[str, bytes]] = []
+    for kind, bodies in by_kind.items():
+        train[kind] = bodies[0::2]
+        test.extend((kind, body) for body in (bodies[1::2] or bodies))
+    raw_total = sum(len(body) for _, body in test)
+
+    variants = {}
+    codecs = [(RAW, False), (ZLIB, False), (ZLIB, True)]
+    if zstandard is not None:
+        codecs += [(ZSTD, False), (ZSTD, True)]
+    for codec, use_dictionary in codecs:
+        dictionaries: Dict[str, Optional[bytes]] = {kind: None for kind in train}
+        if use_dictionary:
+            for kind, samples in train.items():
+                trained_codec, dictionary = train_dictionary(samples, codec)
+                dictionaries[kind] = dictionary if trained_codec == codec else None
+
+        started = time.perf_counter()
+        compressed = [(kind, compress_body(body, codec, dictionaries[kind])) for kind, body in test]
+        compress_seconds = time.perf_counter() - started
+
+        timings = []
+        for _ in range(repeat):
+            for kind, data in compressed:
+                started = time.perf_counter()
+                decompress_body(data, codec, dictionaries[kind])
+                timings.append(time.perf_counter() - started)
+
+        stored = sum(len(data) for _, data in compressed)
+        variants[codec + ('+dict' if use_dictionary else '')] = {
+            'stored_bytes': stored,
+            'ratio': round(raw_total / stored, 2) if stored else 0.0,
+            'dict_bytes': sum(len(d) for d in dictionaries.values() if d),
+            'compress_ms': round(compress_seconds * 1000 / max(1, len(test)), 3),
+            'decompress_ms': round(_median_ms(timings), 3),
+        }
+
+    # 실제 저장 경로: 학습용 본문으로 사전을 만든 캐시 파일에 측정용 본문을 넣고 조회
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(os.path.join(tmp_dir, 'bench.sqlite'), train_after=0)
+        try:
+            with cache._lock:
+                for index, (kind, body) in enumerate((kind, body) for kind, bodies in train.items() for body in bodies):
+                    cache._put(f"train-{index}", f"https://dart.fss.or.kr{kind}?sample={index}", body,
+                               hashlib.sha256(body).hexdigest(), 'utf-8', None, None, {})
+                for kind in train:
+                    cache._train(kind)
+                cache.conn.execute("DELETE FROM responses")
+                for index, (kind, body) in enumerate(test):
+                    cache._put(f"test-{index}", f"https://dart.fss.or.kr{kind}?page={index}", body,
+                               hashlib.sha256(body).hexdigest(), 'utf-8', None, None, {'search': []})
+            timings = []
+            for _ in range(repeat):
+                for index in range(len(test)):
+                    started = time.perf_counter()
+                    cache.lookup(f"test-{index}")
+                    timings.append(time.perf_counter() - started)
+            storage = cache.storage_stats()
+        finally:
+            cache.close()
+
+    timings.sort()
+    hit_ms = _median_ms(timings)
+    return {
+        'pages': len(pages),
+        'kinds': len(by_kind),
+        'test_pages': len(test),
+        'raw_bytes': raw_total,
+        'variants': variants,
+        'hit_ms': round(hit_ms, 3),
+        'hit_p95_ms': round(timings[int(len(timings) * 0.95)] * 1000, 3) if timings else 0.0,
+        'network_ms': network_ms,
+        'speedup': round(network_ms / hit_ms) if hit_ms else 0,
+        'cache': {key: storage[key] for key in ('raw_bytes', 'stored_bytes', 'ratio')},
+    }
+
+
+def _dump_parsed(parsed: Dict[str, Any]) -> str:
+    """파싱 결과 직렬화 - JSON으로 바꿀 수 없는 결과는 보관하지 않음 (다음에 본문에서 다시 파싱)"""
+    kept = {}
+    for name, value in parsed.items():
+        try:
+            kept[name] = json.loads(json.dumps(value, ensure_ascii=False))
+        except (TypeError, ValueError):
+            continue
+    return json.dumps(kept, ensure_ascii=False)
@@ -0,0 +1,680 @@
+#!/usr/bin/env python3
+"""
+DART 공시정보 명령행 도구 (비대화식)
+cron이나 다른 프로그램에서 호출할 수 있도록 하위 명령과 종료 코드, JSON 출력을 제공합니다.
+무거운 모듈(requests, BeautifulSoup)은 명령을 실행할 때만 불러오므로 --help와 status는 바로 응답합니다.
+
+    python main.py search 삼성전자 --years 3 --json
+    python main.py plan 삼성전자 --download-dir 삼성전자_reports
+    python main.py download 삼성전자 --sections 재무제표 주석
+    python main.py download --links 삼성전자_report_links.txt
+    python main.py download 삼성전자 --deadline 08:00 --tiers index_companies.txt
+    python main.py sync --tracked tracked_companies.txt
+    python main.py crawl --queue /shared/dart_queue.sqlite --companies companies.txt --global-rps 2
+    python main.py export --download-dir 삼성전자_reports --format csv
+    python main.py status --download-dir 삼성전자_reports
+    python main.py open 20240312000736 --download-dir 삼성전자_reports --quota-gb 20
+    python main.py pack import --download-dir 삼성전자_reports
+    python main.py audit --download-dir archive/samsung_data/samsung_reports_pdf
+    python main.py bench-cache --corpus fixtures/dart_pages
+    python main.py bench-parse --workers 0 1 2 4
+    python main.py bench-write --work-dir /mnt/archive
+    python main.py bench-extract --workers 1 2 4
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import List, Dict, Optional
+
+
+# 벤치마크 기본 표본 (fixtures/make_dart_pages.py로 생성)
+_FIXTURE_PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'dart_pages')
+# 추출 벤치마크 기본 보고서 폴더 (fixtures/make_report_library.py로 생성)
+_FIXTURE_LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'report_library')
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_FAILED = 1        # 일부 또는 전체 작업 실패, 결과 없음
+EXIT_USAGE = 2         # 잘못된 인자 (argparse 기본값과 동일)
+EXIT_UNAVAILABLE = 3   # DART 사이트 접속 실패
+
+# status가 무거운 모듈을 불러오지 않도록 dart_storage.MANIFEST_FILENAME, dart_pack.PACK_SCHEME과 같은 값을 둠
+_MANIFEST_FILENAME = ".dart_manifest.jsonl"
+_PACK_SCHEME = "pack://"
+
+
+def _emit(args, data, text_lines: Optional[List[str]] = None) -> None:
+    """결과 출력 - --json이면 JSON 한 덩어리, 아니면 사람이 읽는 형식"""
+    if args.json:
+        json.dump(data, sys.stdout, ensure_ascii=False, indent=2, default=str)
+        sys.stdout.write('\n')
+    else:
+        for line in text_lines if text_lines is not None else [json.dumps(data, ensure_ascii=False, default=str)]:
+            print(line)
+
+
+@contextlib.contextmanager
+def _progress_to_stderr(args):
+    """--json일 때 진행 메시지를 stderr로 돌려 stdout에는 결과만 남김"""
+    if args.json:
+        with contextlib.redirect_stdout(sys.stderr):
+            yield
+    else:
+        yield
+
+
+@contextlib.contextmanager
+def _scraper(args):
+    """세션을 준비한 DartScraper (접속 실패 시 None) - 명령이 끝나면 파싱 풀·세션·캐시 정리"""
+    from dart_scraper import DartScraper
+
+    storage = None
+    if getattr(args, 's3_bucket', None):
+        from dart_s3 import S3Storage
+        storage = S3Storage(args.s3_endpoint, args.s3_bucket, prefix=args.s3_prefix or "")
+    elif getattr(args, 'pack', False):
+        from dart_pack import PackStorage
+        storage = PackStorage()
+
+    quota_gb = getattr(args, 'quota_gb', None)
+    scraper = DartScraper(requests_per_second=args.rps,
+                          mirror_quota=int(quota_gb * 1024 ** 3) if quota_gb else None,
+                          storage=storage)
+    try:
+        if not scraper.get_search_page():
+            print("❌ DART 사이트 접속 실패", file=sys.stderr)
+            yield None
+        else:
+            yield scraper
+    finally:
+        scraper.close()
+
+
+def _search(scraper, args) -> List[Dict]:
+    if args.all_types:
+        reports = scraper.search_company_all(args.company, years=args.years, max_pages=args.max_pages)
+        scraper.response_cache.print_stats()
+        return reports
+
+    from datetime import datetime, timedelta
+    from dart_scraper import REGULAR_PUBLIC_TYPES
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=args.years * 365)
+    reports = []
+    for page in range(1, args.max_pages + 1):
+        page_results = scraper.search_page(args.company, start_date.strftime('%Y%m%d'),
+                                           end_date.strftime('%Y%m%d'), page=page,
+                                           public_types=REGULAR_PUBLIC_TYPES)
+        if not page_results:
+            break
+        reports.extend(page_results)
+    scraper.response_cache.print_stats()
+    return reports
+
+
+def _default_dir(args) -> str:
+    if args.download_dir:
+        return args.download_dir
+    if getattr(args, 'links', None):
+        return args.links.replace('.txt', '_pdf')
+    if getattr(args, 'company', None):
+        safe_company_name = "".join(c for c in args.company if c.isalnum() or c in "._- ")
+        return f"{safe_company_name}_reports"
+    return "downloads"
+
+
+# --- 하위 명령 ---
+
+def cmd_search(args) -> int:
+    with _progress_to_stderr(args), _scraper(args) as scraper:
+        if scraper is None:
+            return EXIT_UNAVAILABLE
+        reports = _search(scraper, args)
+
+    _emit(args, reports, [
+        f"{r.get('submit_date', '')}\t{r.get('corp_name') or r.get('company', '')}\t{r.get('report_name', '')}\t{r.get('report_url', '')}"
+        for r in reports
+    ])
+    return EXIT_OK if reports else EXIT_FAILED
+
+
+def cmd_plan(args) -> int:
+    return _download(args, dry_run=True)
+
+
+def cmd_download(args) -> int:
+    return _download(args, dry_run=False)
+
+
+def _scheduler(args, scraper, download_dir: str):
+    """--deadline/--budget-minutes/--tiers/--type-priority가 있으면 DownloadScheduler, 없으면 None"""
+    if not any(getattr(args, name, None) for name in ('deadline', 'budget_minutes', 'tiers', 'type_priority')):
+        return None
+
+    from datetime import datetime, timedelta
+    from dart_scheduler import DownloadScheduler, PriorityRules, DEFAULT_TYPE_ORDER, load_company_tiers, parse_deadline
+
+    deadline = None
+    if args.deadline:
+        deadline = parse_deadline(args.deadline)
+    elif args.budget_minutes:
+        deadline = datetime.now() + timedelta(minutes=args.budget_minutes)
+    rules = PriorityRules(tiers=load_company_tiers(args.tiers) if args.tiers else None,
+                          type_order=args.type_priority or DEFAULT_TYPE_ORDER,
+                          recent_days=args.recent_days)
+    return DownloadScheduler(scraper, download_dir, deadline=deadline, rules=rules)
+
+
+def _download(args, dry_run: bool) -> int:
+    if not args.company and not args.links:
+        print("❌ 회사명 또는 --links가 필요합니다", file=sys.stderr)
+        return EXIT_USAGE
+    if getattr(args, 'tiers', None) and not os.path.exists(args.tiers):
+        print(f"❌ 파일이 없습니다: {args.tiers}", file=sys.stderr)
+        return EXIT_USAGE
+
+    download_dir = _default_dir(args)
+    with _progress_to_stderr(args), _scraper(args) as scraper:
+        if scraper is None:
+            return EXIT_UNAVAILABLE
+        try:
+            scheduler = None if dry_run else _scheduler(args, scraper, download_dir)
+        except ValueError as e:
+            print(f"❌ 마감 시각 형식 오류: {e}", file=sys.stderr)
+            return EXIT_USAGE
+        if scheduler is not None and args.links:
+            print("ℹ️ 링크 파일에는 보고서명이 없어 스케줄 옵션은 회사 검색 다운로드에만 적용됩니다")
+
+        if args.links:
+            result = scraper.download_all_reports_from_txt(args.links, download_dir, dry_run=dry_run)
+        else:
+            reports = _search(scraper, args)
+            if not reports:
+                print("❌ 검색된 보고서가 없습니다.")
+                return EXIT_FAILED
+            result = scraper.download_reports_batch(
+                reports, download_dir, keep_all_versions=args.keep_all_versions, dry_run=dry_run,
+                sections=None if dry_run else args.sections,
+                extract_dir=None if dry_run else args.extract_dir,
+                scheduler=scheduler
+            )
+
+    if result is None:
+        return EXIT_FAILED
+    if dry_run:
+        _emit(args, result, [f"{key}: {value}" for key, value in result.items()])
+        return EXIT_OK
+    lines = [f"성공 {result['success']}건, 실패 {result['failed']}건 ({result['download_dir']})"]
+    schedule = result.get('schedule')
+    if schedule:
+        for name in ('priority', 'backfill'):
+            bucket = schedule[name]
+            lines.append(f"{name}: 완료 {bucket['done']}/{bucket['planned']}, 실패 {bucket['failed']}, 미룸 {bucket['deferred']}")
+        lines.append(f"checkpointed: {schedule['checkpointed']}")
+    _emit(args, result, lines)
+    return EXIT_OK if result['failed'] == 0 else EXIT_FAILED
+
+
+def cmd_sync(args) -> int:
+    from dart_watcher import DisclosureWatcher, load_tracked_companies
+
+    if not os.path.exists(args.tracked):
+        print(f"❌ 파일이 없습니다: {args.tracked}", file=sys.stderr)
+        return EXIT_USAGE
+
+    download_dir = args.download_dir or "watch_reports"
+    with _progress_to_stderr(args), _scraper(args) as scraper:
+        if scraper is None:
+            return EXIT_UNAVAILABLE
+        watcher = DisclosureWatcher(scraper, load_tracked_companies(args.tracked),
+                                    download_dir=download_dir, days=args.days)
+        result = watcher.sync()
+
+    _emit(args, result, [f"신규 {len(result['new_reports'])}건: 성공 {result['success']}건, 실패 {result['failed']}건"])
+    return EXIT_OK if result['failed'] == 0 else EXIT_FAILED
+
+
+def cmd_crawl(args) -> int:
+    from dart_coord import WorkQueue, CoordinatedWorker
+    from dart_watcher import load_tracked_companies
+
+    download_dir = args.download_dir or "downloads"
+    with _progress_to_stderr(args):
+        work_queue = WorkQueue(args.queue, node_id=args.node_id, lease_seconds=args.lease)
+        if args.global_rps is not None:
+            work_queue.set_global_rate(args.global_rps)
+
+        with _scraper(args) as scraper:
+            if scraper is None:
+                return EXIT_UNAVAILABLE
+            worker = CoordinatedWorker(scraper, work_queue, download_dir, years=args.years)
+            if args.companies:
+                added = worker.add_companies(load_tracked_companies(args.companies))
+                print(f"📋 회사 작업 {added}건 등록")
+            stats = worker.run(idle_exit=not args.follow)
+
+    _emit(args, stats, [f"{key}: {value}" for key, value in stats['items'].items()])
+    return EXIT_OK if not any(key.endswith(':failed') for key in stats['items']) else EXIT_FAILED
+
+
+def _manifest_entries(download_dir: str) -> List[Dict]:
+    """매니페스트의 최종 기록 (같은 보고서는 마지막 기록이 유효)"""
+    path = os.path.join(download_dir, _MANIFEST_FILENAME)
+    entries: Dict = {}
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            key = (entry.get('rcp_no', ''), entry.get('dcm_no', ''))
+            entries[key] = dict(entries.get(key, {}), **entry)
+    return list(entries.values())
+
+
+def cmd_export(args) -> int:
+    download_dir = args.download_dir or "downloads"
+    entries = _manifest_entries(download_dir)
+    if not entries:
+        print(f"❌ 다운로드 기록이 없습니다: {download_dir}", file=sys.stderr)
+        return EXIT_FAILED
+
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'json':
+            json.dump(entries, output, ensure_ascii=False, indent=2)
+            output.write('\n')
+        elif args.format == 'csv':
+            import csv
+            fields = ['rcp_no', 'dcm_no', 'corp_name', 'report_name', 'filename', 'location', 'size', 'sha256', 'report_url', 'updated_at']
+            writer = csv.DictWriter(output, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(entries)
+        else:
+            # save_links_to_txt와 같은 형식 - download --links로 다시 받을 수 있음
+            for entry in entries:
+                if entry.get('report_url'):
+                    output.write(f"{entry['report_url']}\n")
+    finally:
+        if args.output:
+            output.close()
+            print(f"💾 {len(entries)}건 내보내기 완료: {args.output}", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_status(args) -> int:
+    download_dir = args.download_dir or "downloads"
+    entries = _manifest_entries(download_dir)
+    present = [entry for entry in entries if not entry.get('evicted') and (
+        str(entry.get('location', '')).startswith(_PACK_SCHEME)
+        or os.path.isfile(os.path.join(download_dir, entry.get('filename', ''))))]
+    result = {
+        'download_dir': os.path.abspath(download_dir),
+        'recorded': len(entries),
+        'present': len(present),
+        'evicted': sum(1 for entry in entries if entry.get('evicted')),
+        'bytes': sum(entry.get('size') or 0 for entry in present),
+    }
+    _emit(args, result, [f"{key}: {value}" for key, value in result.items()])
+    return EXIT_OK
+
+
+def cmd_open(args) -> int:
+    from dart_mirror import ReportMirror
+
+    download_dir = args.download_dir or "downloads"
+    with _progress_to_stderr(args), _scraper(args) as scraper:
+        if scraper is None:
+            return EXIT_UNAVAILABLE
+        # 다시 받은 뒤의 한도 정리는 scraper(mirror_quota)가 방금 받은 보고서를 빼고 처리
+        file_path = ReportMirror(scraper, download_dir, scraper.mirror_quota or 0).open(args.rcp_no, args.dcm_no)
+
+    result = {'rcp_no': args.rcp_no, 'path': os.path.abspath(file_path) if file_path else None}
+    _emit(args, result, [result['path'] or f"❌ 보고서를 받지 못했습니다: {args.rcp_no}"])
+    return EXIT_OK if file_path else EXIT_FAILED
+
+
+def cmd_audit(args) -> int:
+    from dart_audit import audit_library, save_redownload_list
+
+    download_dir = args.download_dir or "downloads"
+    with _progress_to_stderr(args):
+        result = audit_library(download_dir, workers=args.workers, hash_files=not args.quick)
+        links_file = args.links_output or f"{os.path.basename(os.path.normpath(download_dir))}_redownload_links.txt"
+        result['redownload_links'] = save_redownload_list(result['problems'], links_file) if result['problems'] else 0
+        if result['redownload_links']:
+            result['links_file'] = os.path.abspath(links_file)
+            print(f"💡 다시 받기: python main.py download --links {links_file} --download-dir {download_dir}")
+
+    summary = {key: value for key, value in result.items() if key != 'problems'}
+    _emit(args, dict(summary, problems=[{key: item.get(key) for key in ('name', 'rcp_no', 'problems', 'actual_size', 'size')}
+                                        for item in result['problems']]),
+          [f"{key}: {value}" for key, value in summary.items()])
+    return EXIT_FAILED if result['problems'] else EXIT_OK
+
+
+def cmd_rename(args) -> int:
+    from dart_storage import migrate_filenames
+
+    download_dir = args.download_dir or "downloads"
+    if not os.path.isdir(download_dir):
+        print(f"❌ 폴더가 없습니다: {download_dir}", file=sys.stderr)
+        return EXIT_FAILED
+    with _progress_to_stderr(args):
+        renames = migrate_filenames(download_dir, dry_run=args.dry_run)
+    _emit(args, {'renamed': 0 if args.dry_run else len(renames), 'planned': len(renames),
+                 'files': [{'old': old, 'new': new} for old, new in renames]},
+          [f"{old}\t{new}" for old, new in renames])
+    return EXIT_OK
+
+
+def cmd_pack(args) -> int:
+    from dart_pack import open_pack, has_pack, pack_library
+
+    download_dir = args.download_dir or "downloads"
+    if args.action != 'import' and not has_pack(download_dir):
+        print(f"❌ 팩이 없습니다: {download_dir}", file=sys.stderr)
+        return EXIT_FAILED
+
+    with _progress_to_stderr(args):
+        if args.action == 'import':
+            result = pack_library(download_dir, remove_files=not args.keep_files)
+        elif args.action == 'compact':
+            result = open_pack(download_dir).compact(min_garbage=args.min_garbage)
+        elif args.action == 'extract':
+            pack = open_pack(download_dir)
+            entry = pack.get(args.name) if args.name else None
+            if not entry and args.rcp_no:
+                entry = pack.find(args.rcp_no)
+            if not entry:
+                print(f"❌ 팩에 없는 파일: {args.name or args.rcp_no}", file=sys.stderr)
+                return EXIT_FAILED
+            output = args.output or os.path.basename(entry['name'])
+            pack.extract(entry['name'], output)
+            result = {'name': entry['name'], 'output': os.path.abspath(output), 'size': entry['length']}
+        else:
+            result = open_pack(download_dir).stats()
+    _emit(args, result, [f"{key}: {value}" for key, value in result.items()])
+    return EXIT_OK
+
+
+def cmd_bench_startup(args) -> int:
+    """--help 응답 시간 측정 (무거운 모듈을 실수로 미리 불러오면 기준을 넘어 실패)"""
+    import subprocess
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    timings = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, script, '--help'], stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    median = timings[len(timings) // 2]
+    result = {'runs': args.runs, 'median_ms': round(median, 1), 'max_ms': round(timings[-1], 1),
+              'limit_ms': args.limit_ms}
+    _emit(args, result, [f"--help 시작 시간: 중앙값 {median:.1f}ms, 최대 {timings[-1]:.1f}ms (기준 {args.limit_ms}ms)"])
+    return EXIT_OK if median <= args.limit_ms else EXIT_FAILED
+
+
+def cmd_bench_cache(args) -> int:
+    """응답 캐시 압축률과 적중 지연 측정 (적중이 요청 간격보다 --min-speedup배 이상 빠르지 않으면 실패)"""
+    from dart_cache import ResponseCache, DEFAULT_RESPONSE_CACHE_FILE, benchmark_compression, load_corpus
+
+    if args.corpus:
+        if not os.path.isdir(args.corpus):
+            print(f"❌ 폴더가 없습니다: {args.corpus}", file=sys.stderr)
+            return EXIT_USAGE
+        pages = load_corpus(args.corpus)
+    else:
+        cache_file = args.cache or DEFAULT_RESPONSE_CACHE_FILE
+        if not os.path.exists(cache_file):
+            print(f"❌ 캐시 파일이 없습니다: {cache_file} (--corpus로 HTML 표본 폴더 지정)", file=sys.stderr)
+            return EXIT_USAGE
+        cache = ResponseCache(cache_file)
+        try:
+            pages = cache.bodies()
+        finally:
+            cache.close()
+    if len(pages) < 2:
+        print("❌ 표본 페이지가 2개 이상 필요합니다", file=sys.stderr)
+        return EXIT_USAGE
+
+    network_ms = args.network_ms or (1000.0 / args.rps if args.rps > 0 else 100.0)
+    with _progress_to_stderr(args):
+        result = benchmark_compression(pages, network_ms=network_ms, repeat=args.repeat)
+
+    lines = [f"표본 {result['pages']}개 ({result['kinds']}종류), 측정 {result['test_pages']}개 {result['raw_bytes']:,} bytes"]
+    for name, item in result['variants'].items():
+        lines.append(f"  {name:10s} 압축률 {item['ratio']:6.2f}x  저장 {item['stored_bytes']:>12,} bytes  "
+                     f"압축 {item['compress_ms']:.3f}ms  해제 {item['decompress_ms']:.3f}ms/페이지")
+    lines.append(f"캐시 적중 {result['hit_ms']:.3f}ms (p95 {result['hit_p95_ms']:.3f}ms), "
+                 f"요청 {network_ms:.0f}ms 대비 {result['speedup']:,}배 빠름, 캐시 파일 압축률 {result['cache']['ratio']}x")
+    _emit(args, result, lines)
+    return EXIT_OK if result['speedup'] >= args.min_speedup else EXIT_FAILED
+
+
+def cmd_bench_parse(args) -> int:
+    """검색·뷰어 HTML 파싱 처리량을 프로세스 수별로 측정 (--parse-workers 값을 정할 때 사용)"""
+    from dart_cache import load_corpus
+    from dart_scraper import benchmark_parsing
+
+    if not os.path.isdir(args.corpus):
+        print(f"❌ 폴더가 없습니다: {args.corpus}", file=sys.stderr)
+        return EXIT_USAGE
+    pages = load_corpus(args.corpus)
+
+    with _progress_to_stderr(args):
+        result = benchmark_parsing(pages, workers=args.workers, repeat=args.repeat)
+    if not result['pages']:
+        print("❌ search/, viewer/ 하위 폴더에 HTML 표본이 필요합니다", file=sys.stderr)
+        return EXIT_USAGE
+
+    lines = [f"표본 {result['pages']}페이지, CPU {result['cpu_count']}개"]
+    for run in result['runs']:
+        lines.append(f"  프로세스 {run['workers']:2d}개: {run['pages_per_sec']:8.1f} 페이지/초  "
+                     f"({run['seconds']:.3f}초, {run['speedup']:.2f}배)")
+    _emit(args, result, lines)
+    return EXIT_OK
+
+
+def cmd_bench_extract(args) -> int:
+    """재무제표 추출 처리량(코어당 보고서/초)을 프로세스 수별로 측정"""
+    from dart_extract import benchmark_extraction
+
+    if not os.path.isdir(args.library):
+        print(f"❌ 폴더가 없습니다: {args.library}", file=sys.stderr)
+        return EXIT_USAGE
+
+    with _progress_to_stderr(args):
+        result = benchmark_extraction(args.library, workers=args.workers, work_dir=args.work_dir)
+    if not result['reports']:
+        print("❌ 추출할 보고서가 없습니다 (섹션 폴더 또는 PDF 매니페스트 필요)", file=sys.stderr)
+        return EXIT_USAGE
+
+    lines = [f"보고서 {result['reports']}개, CPU {result['cpu_count']}개, 저장 형식 {result['format']}"]
+    for run in result['runs']:
+        lines.append(f"  프로세스 {run['workers']:2d}개: {run['reports_per_sec']:8.2f} 보고서/초, "
+                     f"코어당 {run['reports_per_sec_per_core']:.2f}  ({run['seconds']:.3f}초, {run['rows']:,}행)")
+    _emit(args, result, lines)
+    return EXIT_OK
+
+
+def cmd_bench_write(args) -> int:
+    """PDF 쓰기 경로를 로컬 가짜 서버로 로컬 디스크와 느린 디스크 흉내에서 측정"""
+    from dart_write_bench import benchmark_write_paths
+
+    with _progress_to_stderr(args):
+        result = benchmark_write_paths(size_mb=args.size_mb, runs=args.runs, buffer_size=args.buffer_kb * 1024,
+                                       disk_latency_ms=args.disk_latency_ms, disk_mbps=args.disk_mbps,
+                                       work_dir=args.work_dir)
+
+    lines = [f"파일 {result['size_bytes']:,} bytes, {result['runs']}회 중앙값"]
+    for item in result['results']:
+        lines.append(f"  {item['disk']:5s} {item['path']:20s} {item['mb_per_sec']:8.1f} MB/s  "
+                     f"({item['seconds']:.3f}초, {item['speedup']:.2f}배)")
+    _emit(args, result, lines)
+    return EXIT_OK
+
+
+# --- 인자 해석 ---
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="DART 공시정보 검색/다운로드 (인자 없이 실행하면 대화형 메뉴)")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', help="결과를 JSON으로 출력 (진행 메시지는 stderr)")
+    common.add_argument('--rps', type=float, default=2.0, help="초당 요청 한도 (기본값: 2)")
+
+    search_args = argparse.ArgumentParser(add_help=False)
+    search_args.add_argument('company', nargs='?', help="회사명")
+    search_args.add_argument('--years', type=int, default=10, help="검색 기간 (년, 기본값: 10)")
+    search_args.add_argument('--max-pages', type=int, default=20, help="최대 검색 페이지 수")
+    search_args.add_argument('--all-types', action='store_true', help="정기공시 외 모든 공시 포함")
+
+    download_args = argparse.ArgumentParser(add_help=False)
+    download_args.add_argument('--links', help="보고서 링크 TXT 파일 (회사 검색 대신)")
+    download_args.add_argument('--download-dir', help="저장 폴더 (기본값: {회사명}_reports)")
+    download_args.add_argument('--keep-all-versions', action='store_true', help="정정 이전 버전도 받기")
+    download_args.add_argument('--quota-gb', type=float, help="다운로드 폴더 디스크 한도 (GB, 넘으면 오래된 보고서부터 삭제)")
+    download_args.add_argument('--pack', action='store_true', help="보고서를 개별 파일 대신 팩 파일(.dart_pack)에 저장")
+    download_args.add_argument('--s3-bucket', help="PDF를 로컬 대신 올릴 S3 호환 버킷 (인증: AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY)")
+    download_args.add_argument('--s3-endpoint', default="https://s3.amazonaws.com", help="S3 호환 저장소 주소")
+    download_args.add_argument('--s3-prefix', help="객체 키 앞에 붙일 경로")
+
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    p = commands.add_parser('search', parents=[common, search_args], help="보고서 검색")
+    p.set_defaults(func=cmd_search)
+
+    p = commands.add_parser('plan', parents=[common, search_args, download_args], help="받을 용량과 예상 시간 확인")
+    p.set_defaults(func=cmd_plan)
+
+    p = commands.add_parser('download', parents=[common, search_args, download_args], help="보고서 다운로드")
+    p.add_argument('--sections', nargs='+', help="PDF 대신 받을 목차 섹션 (예: 재무제표 주석)")
+    p.add_argument('--extract-dir', help="다운로드 후 재무제표를 추출할 폴더")
+    p.add_argument('--deadline', help="마감 시각 (HH:MM 또는 ISO 형식) - 우선순위 순서로 받고 남은 보고서는 다음 실행으로 넘김")
+    p.add_argument('--budget-minutes', type=float, help="마감 대신 사용할 시간 예산 (분)")
+    p.add_argument('--tiers', help="회사 등급 파일 (한 줄에 '회사명,등급', 목록의 최신 보고서를 우선)")
+    p.add_argument('--type-priority', nargs='+', help="급한 보고서 유형 순서 (기본값: 분기보고서 반기보고서 사업보고서)")
+    p.add_argument('--recent-days', type=int, default=120, help="최신 보고서로 볼 접수 후 일수 (기본값: 120)")
+    p.set_defaults(func=cmd_download)
+
+    p = commands.add_parser('sync', parents=[common], help="추적 회사 신규 공시 한 번 확인 후 다운로드")
+    p.add_argument('--tracked', default="tracked_companies.txt", help="추적 회사 목록 파일")
+    p.add_argument('--download-dir', help="저장 폴더 (기본값: watch_reports)")
+    p.add_argument('--days', type=int, default=3, help="조회할 최근 기간 (일)")
+    p.set_defaults(func=cmd_sync)
+
+    p = commands.add_parser('crawl', parents=[common], help="공유 작업 대기열로 여러 노드가 나눠 수집")
+    p.add_argument('--queue', required=True, help="공유 볼륨의 대기열 파일 (SQLite)")
+    p.add_argument('--companies', help="등록할 회사 목록 파일 (한 줄에 회사명 하나)")
+    p.add_argument('--download-dir', help="저장 폴더 (기본값: downloads)")
+    p.add_argument('--years', type=int, default=10, help="검색 기간 (년)")
+    p.add_argument('--global-rps', type=float, help="모든 노드가 나눠 쓸 전체 초당 요청 한도")
+    p.add_argument('--node-id', help="노드 이름 (기본값: 호스트명+임의값)")
+    p.add_argument('--lease', type=float, default=300, help="작업 임대 기간 (초)")
+    p.add_argument('--follow', action='store_true', help="작업이 없어도 종료하지 않고 대기")
+    p.set_defaults(func=cmd_crawl)
+
+    p = commands.add_parser('export', help="다운로드 기록 내보내기")
+    p.add_argument('--download-dir', help="다운로드 폴더")
+    p.add_argument('--format', choices=['json', 'csv', 'links'], default='json')
+    p.add_argument('--output', '-o', help="저장할 파일 (기본값: stdout)")
+    p.set_defaults(func=cmd_export)
+
+    p = commands.add_parser('status', parents=[common], help="다운로드 폴더 현황")
+    p.add_argument('--download-dir', help="다운로드 폴더")
+    p.set_defaults(func=cmd_status)
+
+    p = commands.add_parser('open', parents=[common], help="보고서 파일 경로 출력 (한도 때문에 삭제된 보고서는 다시 받음)")
+    p.add_argument('rcp_no', help="접수번호")
+    p.add_argument('--dcm-no', help="문서번호 (기본값: 매니페스트나 보고서 페이지에서 조회)")
+    p.add_argument('--download-dir', help="다운로드 폴더")
+    p.add_argument('--quota-gb', type=float, help="다운로드 폴더 디스크 한도 (GB)")
+    p.set_defaults(func=cmd_open)
+
+    p = commands.add_parser('audit', parents=[common], help="보고서 파일 무결성 점검 (문제 있으면 종료 코드 1)")
+    p.add_argument('--download-dir', help="점검할 폴더 (매니페스트가 없는 예전 PDF 폴더도 가능)")
+    p.add_argument('--workers', type=int, help="점검 프로세스 수 (기본값: CPU 코어 수)")
+    p.add_argument('--quick', action='store_true', help="해시 비교 없이 PDF 형식과 크기만 점검")
+    p.add_argument('--links-output', help="다시 받을 보고서 링크 TXT (기본값: {폴더명}_redownload_links.txt)")
+    p.set_defaults(func=cmd_audit)
+
+    p = commands.add_parser('rename', parents=[common], help="깨진 파일명 복원, 매니페스트 기준 고정 파일명으로 변경")
+    p.add_argument('--download-dir', help="다운로드 폴더")
+    p.add_argument('--dry-run', action='store_true', help="바꿀 목록만 출력")
+    p.set_defaults(func=cmd_rename)
+
+    p = commands.add_parser('pack', parents=[common], help="팩 파일 저장소 관리 (개별 파일 이동, 정리, 꺼내기)")
+    p.add_argument('action', choices=['stats', 'import', 'compact', 'extract'])
+    p.add_argument('--download-dir', help="다운로드 폴더")
+    p.add_argument('--keep-files', action='store_true', help="import 후 원본 파일 유지")
+    p.add_argument('--min-garbage', type=float, default=0.25, help="compact 대상 세그먼트의 최소 회수 비율")
+    p.add_argument('--name', help="extract할 파일 이름")
+    p.add_argument('--rcp-no', help="extract할 보고서 접수번호")
+    p.add_argument('--output', '-o', help="extract 저장 경로")
+    p.set_defaults(func=cmd_pack)
+
+    p = commands.add_parser('bench-startup', parents=[common], help="명령행 시작 시간 측정")
+    p.add_argument('--runs', type=int, default=5)
+    p.add_argument('--limit-ms', type=float, default=150.0, help="허용할 중앙값 (ms)")
+    p.set_defaults(func=cmd_bench_startup)
+
+    p = commands.add_parser('bench-cache', parents=[common], help="응답 캐시 압축률과 적중 지연 측정")
+    p.add_argument('--corpus', help="HTML 표본 폴더 (하위 폴더가 페이지 종류, 예: fixtures/dart_pages, 기본값: 응답 캐시에 쌓인 페이지)")
+    p.add_argument('--cache', help="표본으로 쓸 응답 캐시 파일 (기본값: .dart_responses.sqlite)")
+    p.add_argument('--network-ms', type=float, help="비교할 요청 시간 (ms, 기본값: --rps의 요청 간격)")
+    p.add_argument('--repeat', type=int, default=5, help="조회 반복 횟수")
+    p.add_argument('--min-speedup', type=float, default=100.0, help="적중이 요청보다 이만큼 빨라야 성공")
+    p.set_defaults(func=cmd_bench_cache)
+
+    p = commands.add_parser('bench-parse', parents=[common], help="HTML 파싱 처리량을 프로세스 수별로 측정")
+    p.add_argument('--corpus', default=_FIXTURE_PAGES, help="HTML 표본 폴더 (search/, viewer/ 하위 폴더, 기본값: fixtures/dart_pages)")
+    p.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4], help="측정할 프로세스 수 (0은 프로세스 풀 없이)")
+    p.add_argument('--repeat', type=int, default=3, help="표본 반복 횟수")
+    p.set_defaults(func=cmd_bench_parse)
+
+    p = commands.add_parser('bench-write', parents=[common], help="PDF 쓰기 경로를 이전 방식과 비교 측정")
+    p.add_argument('--size-mb', type=float, default=16, help="가짜 서버가 보낼 PDF 크기 (MB)")
+    p.add_argument('--runs', type=int, default=3)
+    p.add_argument('--buffer-kb', type=int, default=1024, help="읽기/쓰기 버퍼 크기 (KB)")
+    p.add_argument('--disk-latency-ms', type=float, default=1.0, help="느린 디스크 흉내의 쓰기당 지연 (ms)")
+    p.add_argument('--disk-mbps', type=float, default=50.0, help="느린 디스크 흉내의 처리량 (MB/s)")
+    p.add_argument('--work-dir', help="임시 파일을 만들 폴더 (기본값: 시스템 임시 폴더, 실제 NFS 측정 시 지정)")
+    p.set_defaults(func=cmd_bench_write)
+
+    p = commands.add_parser('bench-extract', parents=[common], help="재무제표 추출 처리량을 프로세스 수별로 측정")
+    p.add_argument('--library', default=_FIXTURE_LIBRARY,
+                   help="보고서 폴더 (섹션 폴더 또는 PDF 매니페스트, 기본값: fixtures/report_library)")
+    p.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help="측정할 프로세스 수")
+    p.add_argument('--work-dir', help="임시 저장 폴더를 만들 위치 (기본값: 시스템 임시 폴더)")
+    p.set_defaults(func=cmd_bench_extract)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'func', None):
+        parser.print_help()
+        return EXIT_USAGE
+    if args.command == 'search' and not args.company:
+        parser.error("search에는 회사명이 필요합니다")
+
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("\n👋 중단되었습니다.", file=sys.stderr)
+        return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
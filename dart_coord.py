@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+여러 노드가 나눠 수집하기 위한 공유 작업 대기열
+공유 볼륨의 SQLite 파일 하나에 회사/보고서 작업을 기록하고, 각 노드는 임대(lease) 방식으로 작업을 가져갑니다.
+작업 중인 노드는 주기적으로 임대를 연장하며(heartbeat), 멈춘 노드의 작업은 임대 만료 후 다른 노드가 이어받습니다.
+완료 기록은 임대를 가진 노드만 남길 수 있고, 보고서 작업은 rcpNo로 구분하므로 같은 공시를 두 번 받지 않습니다.
+전체 요청 한도는 살아 있는 노드 수로 나누어 각 노드의 RateLimiter에 적용합니다.
+"""
+
+import contextlib
+import json
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+from dart_scraper import DartScraper, REGULAR_PUBLIC_TYPES
+from dart_planner import plan_latest_versions
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    completed_by TEXT,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS items_claim ON items (kind, state, lease_until);
+CREATE TABLE IF NOT EXISTS nodes (
+    node_id TEXT PRIMARY KEY,
+    host TEXT,
+    last_heartbeat REAL NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class WorkQueue:
+    """SQLite 기반 임대형 작업 대기열 (노드마다 하나씩 생성)"""
+
+    def __init__(self, db_path: str, node_id: Optional[str] = None,
+                 lease_seconds: float = 300, max_attempts: int = 3):
+        """
+        Args:
+            db_path: 공유 볼륨의 대기열 파일
+            node_id: 노드 이름 (None이면 호스트명+임의값)
+            lease_seconds: 임대 기간 (heartbeat가 없으면 이 시간 후 다른 노드가 가져감)
+            max_attempts: 작업별 최대 시도 횟수 (넘으면 failed)
+        """
+        self.db_path = db_path
+        self.node_id = node_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        # 네트워크 파일시스템에서는 WAL을 쓸 수 없으므로 기본 저널 모드 사용
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA busy_timeout=30000')
+        with self._lock:
+            self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (여러 노드가 같은 작업을 가져가지 않도록)"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+
+    # --- 작업 등록/임대/완료 ---
+
+    def add(self, kind: str, items: Dict[str, Dict]) -> int:
+        """
+        작업 등록 (이미 있는 item_id는 무시)
+
+        Args:
+            kind: 'company' 또는 'report'
+            items: item_id → 작업 내용
+
+        Returns:
+            새로 등록된 작업 수
+        """
+        with self._lock, self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO items (item_id, kind, payload) VALUES (?, ?, ?)',
+                [(item_id, kind, json.dumps(payload, ensure_ascii=False)) for item_id, payload in items.items()]
+            )
+            return conn.total_changes - before
+
+    def claim(self, kind: str, limit: int = 1) -> List[Dict]:
+        """
+        대기 중이거나 임대가 만료된 작업을 임대
+
+        Returns:
+            [{'item_id', 'payload', 'attempts'}, ...]
+        """
+        now = time.time()
+        with self._lock, self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT item_id, payload, attempts FROM items "
+                "WHERE kind = ? AND (state = 'pending' OR (state = 'leased' AND lease_until < ?)) "
+                "ORDER BY attempts, rowid LIMIT ?",
+                (kind, now, limit)
+            ).fetchall()
+            for item_id, _, _ in rows:
+                conn.execute(
+                    "UPDATE items SET state = 'leased', lease_owner = ?, lease_until = ?, attempts = attempts + 1 "
+                    "WHERE item_id = ?",
+                    (self.node_id, now + self.lease_seconds, item_id)
+                )
+        return [{'item_id': item_id, 'payload': json.loads(payload), 'attempts': attempts + 1}
+                for item_id, payload, attempts in rows]
+
+    def complete(self, item_id: str, result: Optional[Dict] = None) -> bool:
+        """
+        완료 기록 - 이 노드가 임대 중인 작업만 완료 처리 (정확히 한 번)
+
+        Returns:
+            False이면 임대가 만료되어 다른 노드가 가져간 작업 (결과를 버려야 함)
+        """
+        with self._lock, self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE items SET state = 'done', result = ?, completed_by = ?, completed_at = ?, "
+                "lease_owner = NULL, lease_until = NULL "
+                "WHERE item_id = ? AND state = 'leased' AND lease_owner = ?",
+                (json.dumps(result or {}, ensure_ascii=False), self.node_id, time.time(), item_id, self.node_id)
+            )
+            if cursor.rowcount:
+                conn.execute('UPDATE nodes SET completed = completed + 1 WHERE node_id = ?', (self.node_id,))
+            return cursor.rowcount == 1
+
+    def fail(self, item_id: str, error: str) -> None:
+        """실패 기록 - 최대 시도 횟수 전까지는 다시 대기 상태로"""
+        with self._lock, self._transaction() as conn:
+            conn.execute(
+                "UPDATE items SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_owner = NULL, lease_until = NULL "
+                "WHERE item_id = ? AND lease_owner = ?",
+                (self.max_attempts, error, item_id, self.node_id)
+            )
+
+    def heartbeat(self) -> int:
+        """
+        노드 생존 신호 + 임대 중인 작업 연장
+
+        Returns:
+            살아 있는 노드 수 (임대 기간 안에 신호를 보낸 노드)
+        """
+        now = time.time()
+        with self._lock, self._transaction() as conn:
+            conn.execute(
+                'INSERT INTO nodes (node_id, host, last_heartbeat) VALUES (?, ?, ?) '
+                'ON CONFLICT(node_id) DO UPDATE SET last_heartbeat = excluded.last_heartbeat',
+                (self.node_id, socket.gethostname(), now)
+            )
+            conn.execute(
+                "UPDATE items SET lease_until = ? WHERE state = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, self.node_id)
+            )
+            return conn.execute('SELECT COUNT(*) FROM nodes WHERE last_heartbeat >= ?',
+                                (now - self.lease_seconds,)).fetchone()[0]
+
+    def leave(self) -> None:
+        """노드 종료 - 임대 중인 작업을 바로 돌려주고 노드 목록에서 제외"""
+        with self._lock, self._transaction() as conn:
+            conn.execute(
+                "UPDATE items SET state = 'pending', lease_owner = NULL, lease_until = NULL "
+                "WHERE state = 'leased' AND lease_owner = ?",
+                (self.node_id,)
+            )
+            conn.execute('DELETE FROM nodes WHERE node_id = ?', (self.node_id,))
+
+    # --- 전체 요청 한도 ---
+
+    def set_global_rate(self, requests_per_second: float) -> None:
+        """모든 노드가 나눠 쓸 전체 초당 요청 한도 설정"""
+        with self._lock, self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('global_rps', ?)",
+                         (str(requests_per_second),))
+
+    def global_rate(self) -> Optional[float]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM settings WHERE key = 'global_rps'").fetchone()
+        return float(row[0]) if row else None
+
+    def stats(self) -> Dict:
+        """작업 상태별 개수와 노드별 완료 수"""
+        with self._lock:
+            states = dict(self.conn.execute(
+                "SELECT kind || ':' || state, COUNT(*) FROM items GROUP BY kind, state"))
+            nodes = {node_id: {'completed': completed, 'last_heartbeat': last}
+                     for node_id, completed, last in self.conn.execute(
+                         'SELECT node_id, completed, last_heartbeat FROM nodes')}
+        return {'items': states, 'nodes': nodes}
+
+
+class CoordinatedWorker:
+    """공유 대기열에서 회사 검색/보고서 다운로드 작업을 가져와 처리하는 노드"""
+
+    def __init__(self, scraper: DartScraper, work_queue: WorkQueue, download_dir: str,
+                 years: int = 10, max_pages: int = 20,
+                 public_types: Optional[List[str]] = REGULAR_PUBLIC_TYPES,
+                 keep_all_versions: bool = False, heartbeat_interval: Optional[float] = None):
+        """
+        Args:
+            scraper: 이 노드의 DartScraper (요청 한도는 전체 한도의 노드 몫으로 조정됨)
+            work_queue: 공유 작업 대기열
+            download_dir: 다운로드 폴더 (공유 볼륨이면 다른 노드가 받은 파일도 확인)
+            years: 회사 작업의 검색 기간 (년)
+            max_pages: 회사별 최대 검색 페이지 수
+            public_types: 공시유형 코드 목록
+            keep_all_versions: False이면 정정 공시 중 최신본만 보고서 작업으로 등록
+            heartbeat_interval: 생존 신호 주기 (초, None이면 임대 기간의 1/3)
+        """
+        self.scraper = scraper
+        self.queue = work_queue
+        self.download_dir = download_dir
+        self.years = years
+        self.max_pages = max_pages
+        self.public_types = public_types
+        self.keep_all_versions = keep_all_versions
+        self.heartbeat_interval = heartbeat_interval or work_queue.lease_seconds / 3
+        self._stop = threading.Event()
+
+    def add_companies(self, company_names: List[str]) -> int:
+        """회사 작업 등록 (여러 노드가 같은 목록을 등록해도 한 번만 들어감)"""
+        return self.queue.add('company', {f"company:{name}": {'company': name} for name in company_names})
+
+    def _apply_rate_share(self, active_nodes: int) -> None:
+        global_rate = self.queue.global_rate()
+        if global_rate is None:
+            return
+        share = global_rate / max(1, active_nodes)
+        if abs(share - self.scraper.rate_limiter.rate) > 1e-9:
+            print(f"⚖️ 전체 한도 {global_rate:g}/s를 노드 {active_nodes}개가 나눠 사용: 이 노드 {share:.2f}/s")
+            self.scraper.rate_limiter.set_rate(share)
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self._apply_rate_share(self.queue.heartbeat())
+            except Exception as e:
+                print(f"⚠️ 생존 신호 실패: {e}")
+
+    def _process_company(self, item: Dict) -> bool:
+        company = item['payload']['company']
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=self.years * 365)
+
+        reports = []
+        for page in range(1, self.max_pages + 1):
+            try:
+                page_results = self.scraper.search_page(company, start_date.strftime('%Y%m%d'),
+                                                        end_date.strftime('%Y%m%d'), page=page,
+                                                        public_types=self.public_types, raise_errors=True)
+            except Exception as e:
+                # 일부 페이지만 보고 완료로 남기면 나머지 보고서를 영영 놓치므로 재시도 대상으로 돌려줌
+                print(f"  ❌ {company}: {page}페이지 검색 실패: {e}")
+                self.queue.fail(item['item_id'], f"{page}페이지 검색 실패: {e}")
+                return False
+            if not page_results:
+                break
+            reports.extend(page_results)
+
+        reports = [report for report in plan_latest_versions(reports, self.keep_all_versions) if report.get('rcp_no')]
+        added = self.queue.add('report', {f"report:{report['rcp_no']}": report for report in reports})
+        print(f"  🔍 {company}: 보고서 {len(reports)}건 (신규 작업 {added}건)")
+        return self.queue.complete(item['item_id'], {'reports': len(reports)})
+
+    def _is_stored(self, entry: Dict) -> bool:
+        """매니페스트 기록의 파일이 저장소(로컬·팩·S3)에 기록된 크기 그대로 있는지"""
+        if not entry.get('filename') or entry.get('evicted'):
+            return False
+        size = self.scraper.storage.exists(self.download_dir, entry['filename'])
+        return size is not None and entry.get('size') in (None, size)
+
+    def _process_report(self, item: Dict) -> bool:
+        report = item['payload']
+        rcp_no = report['rcp_no']
+
+        # 이전 임대 중에 받고 완료 기록 전에 멈춘 경우 - 공유 매니페스트에 있으면 다시 받지 않음
+        # (다른 노드가 덧붙인 기록만 이어 읽음)
+        manifest = self.scraper.get_manifest(self.download_dir)
+        manifest.refresh()
+        entry = manifest.find_rcp(rcp_no)
+        if entry and self._is_stored(entry):
+            print(f"  ⏭️ 이미 받은 보고서: {rcp_no}")
+            return self.queue.complete(item['item_id'], {'filename': entry['filename'], 'skipped': True})
+
+        download_info = self.scraper.get_report_download_info(report['report_url'])
+        if not download_info or not self.scraper.download_report_file(download_info, self.download_dir, report=report):
+            self.queue.fail(item['item_id'], "다운로드 실패")
+            return False
+
+        entry = manifest.get(download_info['rcp_no'], download_info['dcm_no'])
+        if not self.queue.complete(item['item_id'], {'filename': (entry or {}).get('filename')}):
+            print(f"  ⚠️ 임대가 만료되어 완료 기록을 남기지 못함: {rcp_no}")
+            return False
+        return True
+
+    def run(self, idle_exit: bool = True, poll_interval: float = 10.0) -> Dict:
+        """
+        작업이 없을 때까지 (idle_exit=False이면 중단될 때까지) 작업 처리
+
+        회사 작업을 먼저 처리하여 보고서 작업을 채우고, 이후 보고서 작업을 처리
+
+        Returns:
+            처리 현황 (대기열 전체 통계)
+        """
+        self._apply_rate_share(self.queue.heartbeat())
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat.start()
+
+        print(f"🤝 노드 {self.queue.node_id} 작업 시작")
+        done = failed = 0
+        try:
+            while not self._stop.is_set():
+                items = self.queue.claim('company') or self.queue.claim('report')
+                if not items:
+                    if idle_exit:
+                        break
+                    self._stop.wait(poll_interval)
+                    continue
+
+                item = items[0]
+                try:
+                    if item['item_id'].startswith('company:'):
+                        ok = self._process_company(item)
+                    else:
+                        ok = self._process_report(item)
+                except Exception as e:
+                    print(f"  ❌ 작업 실패 ({item['item_id']}): {e}")
+                    self.queue.fail(item['item_id'], str(e))
+                    ok = False
+
+                if ok:
+                    done += 1
+                else:
+                    failed += 1
+        except KeyboardInterrupt:
+            print("\n👋 작업을 중단합니다.")
+        finally:
+            self._stop.set()
+            self.queue.leave()
+
+        stats = self.queue.stats()
+        print(f"🏁 노드 {self.queue.node_id}: 완료 {done}건, 실패 {failed}건 / 전체 {stats['items']}")
+        return stats
+
+    def stop(self) -> None:
+        self._stop.set()
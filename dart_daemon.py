@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+DART 스크래퍼 상주 실행 (데몬)
+세션·캐시·색인을 메모리에 유지한 채 로컬 HTTP API로 검색/다운로드 작업을 받아 순서대로 처리합니다.
+
+    python dart_daemon.py --port 8765 --root /data/dart
+
+    작업과 검색의 폴더는 --root 아래로만 지정할 수 있으며 (상대 경로는 --root 기준),
+    로컬(루프백)이 아닌 주소에서 받으려면 --token을 지정하고 요청마다 'Authorization: Bearer <토큰>'을 보내야 합니다.
+
+    POST /jobs                 {"type": "download", "params": {"company": "삼성전자", "years": 3}}
+    GET  /jobs                 작업 목록
+    GET  /jobs/<id>            작업 상태와 결과
+    GET  /jobs/<id>/log?since=N  N번째 줄 이후 진행 기록
+    GET  /jobs/<id>/stream     작업이 끝날 때까지 진행 기록을 계속 전송
+    GET  /status               세션·대기열·차단기 상태
+    GET  /query?dir=..&q=..    다운로드 폴더 전문 검색 (색인은 메모리에 유지)
+    POST /shutdown             종료
+"""
+
+import argparse
+import contextlib
+import hmac
+import ipaddress
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+from dart_scraper import DartScraper, REGULAR_PUBLIC_TYPES
+
+
+DEFAULT_PORT = 8765
+
+
+class Job:
+    """데몬이 처리하는 작업 하나 (상태, 진행 기록, 결과)"""
+
+    def __init__(self, job_id: str, job_type: str, params: Dict):
+        self.id = job_id
+        self.type = job_type
+        self.params = params
+        self.status = 'queued'
+        self.result = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.log: List[str] = []
+        self._partial = ''
+        self.changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def write(self, text: str) -> None:
+        """작업 스레드의 print 출력을 줄 단위로 기록"""
+        with self.changed:
+            self._partial += text
+            *lines, self._partial = self._partial.split('\n')
+            if lines:
+                self.log.extend(lines)
+                self.changed.notify_all()
+
+    def set_status(self, status: str) -> None:
+        with self.changed:
+            if self._partial:
+                self.log.append(self._partial)
+                self._partial = ''
+            self.status = status
+            self.changed.notify_all()
+
+    def to_dict(self, with_result: bool = True) -> Dict:
+        data = {
+            'id': self.id,
+            'type': self.type,
+            'params': self.params,
+            'status': self.status,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'log_lines': len(self.log),
+        }
+        if with_result:
+            data['result'] = self.result
+        return data
+
+
+class _JobOutput:
+    """
+    sys.stdout 대체 - 작업 스레드에서 출력한 내용은 해당 작업의 진행 기록에도 남김
+
+    스크래퍼 모듈들이 print로 진행 상황을 알리므로 출력을 가로챌 곳은 sys.stdout뿐임.
+    _job_output()이 설치하고 되돌리지 않으며 (다른 출력 대체와 복원 순서가 꼬이지 않도록),
+    작업 스레드가 아닌 출력은 그대로 원래 스트림으로 보냄
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.jobs: Dict[int, Job] = {}
+
+    def write(self, text: str) -> int:
+        job = self.jobs.get(threading.get_ident())
+        if job is not None:
+            job.write(text)
+        return self.stream.write(text)
+
+    @contextlib.contextmanager
+    def capture(self, job: Job):
+        """이 스레드의 출력을 job 진행 기록에도 남김"""
+        self.jobs[threading.get_ident()] = job
+        try:
+            yield
+        finally:
+            self.jobs.pop(threading.get_ident(), None)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+_output_lock = threading.Lock()
+_output: Optional[_JobOutput] = None
+
+
+def _job_output() -> _JobOutput:
+    """
+    작업별 출력 기록기
+
+    현재 sys.stdout이 기록기를 거치지 않을 때만 (처음이거나 다른 코드가 sys.stdout을 바꾼 경우) 그 위에 설치
+    """
+    global _output
+    with _output_lock:
+        stream = sys.stdout
+        for _ in range(8):
+            if stream is None or stream is _output:
+                break
+            stream = getattr(stream, 'stream', None)
+        if _output is None or stream is not _output:
+            jobs = _output.jobs if _output is not None else {}
+            _output = _JobOutput(sys.stdout)
+            _output.jobs = jobs
+            sys.stdout = _output
+        return _output
+
+
+def is_loopback(host: str) -> bool:
+    """로컬 전용 바인딩 주소인지 확인"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ScraperDaemon:
+    """데워진 DartScraper 하나로 작업 대기열을 처리하는 상주 프로세스"""
+
+    # 요청으로 받는 폴더 인자 (모두 root 아래로 제한)
+    DIR_PARAMS = ('download_dir', 'extract_dir')
+
+    def __init__(self, scraper: Optional[DartScraper] = None, job_workers: int = 1,
+                 default_dir: str = "downloads", max_jobs: int = 200, root: Optional[str] = None):
+        """
+        Args:
+            scraper: 공유할 스크래퍼 (None이면 새로 생성)
+            job_workers: 동시에 처리할 작업 수 (요청 한도는 모든 작업이 공유)
+            default_dir: 작업에 폴더를 지정하지 않았을 때 사용할 다운로드 폴더 (root 기준)
+            max_jobs: 메모리에 보관할 완료 작업 수
+            root: 작업과 검색이 사용할 수 있는 최상위 폴더 (None이면 현재 폴더)
+
+        Raises:
+            ValueError: default_dir이 root 밖에 있음
+        """
+        self.root = os.path.realpath(root or os.getcwd())
+        self.default_dir = self.root
+        self.default_dir = self.resolve_dir(default_dir)
+        self.scraper = scraper or DartScraper()
+        self.max_jobs = max_jobs
+        self.jobs: Dict[str, Job] = {}
+        self.queue: queue.Queue = queue.Queue()
+        self.started_at = time.time()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, object] = {}
+
+        self.handlers: Dict[str, Callable[[Dict], object]] = {
+            'search': self._job_search,
+            'plan': self._job_plan,
+            'download': self._job_download,
+            'index': self._job_index,
+            'extract': self._job_extract,
+        }
+
+        self._workers = [threading.Thread(target=self._work, name=f"job-{i + 1}", daemon=True)
+                         for i in range(max(1, job_workers))]
+        for worker in self._workers:
+            worker.start()
+
+    # --- 작업 관리 ---
+
+    def resolve_dir(self, path: Optional[str]) -> str:
+        """
+        요청으로 받은 폴더를 root 아래의 절대 경로로 변환 (None이면 기본 다운로드 폴더)
+
+        Raises:
+            ValueError: root 밖을 가리키는 경로 (심볼릭 링크 포함)
+        """
+        if not path:
+            return self.default_dir
+        resolved = os.path.realpath(os.path.join(self.root, str(path)))
+        if os.path.commonpath([self.root, resolved]) != self.root:
+            raise ValueError(f"허용된 폴더({self.root}) 밖의 경로입니다: {path}")
+        return resolved
+
+    def submit(self, job_type: str, params: Dict) -> Job:
+        """
+        작업 등록 (바로 반환, 처리는 작업 스레드에서)
+
+        Raises:
+            ValueError: 지원하지 않는 작업 유형이거나 폴더 인자가 root 밖을 가리킴
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f"지원하지 않는 작업 유형: {job_type} (가능: {', '.join(self.handlers)})")
+        params = dict(params or {})
+        for key in self.DIR_PARAMS:
+            if params.get(key):
+                params[key] = self.resolve_dir(params[key])
+
+        with self._lock:
+            job = Job(f"{datetime.now().strftime('%Y%m%d')}-{next(self._ids):04d}", job_type, params)
+            self.jobs[job.id] = job
+            self._trim()
+        self.queue.put(job)
+        return job
+
+    def _trim(self) -> None:
+        """오래된 완료 작업 정리"""
+        finished = [job for job in self.jobs.values() if job.finished]
+        for job in finished[:max(0, len(finished) - self.max_jobs)]:
+            del self.jobs[job.id]
+
+    def _work(self) -> None:
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+
+            with _job_output().capture(job):
+                job.started_at = time.time()
+                job.set_status('running')
+                try:
+                    job.result = self.handlers[job.type](job.params)
+                    job.finished_at = time.time()
+                    job.set_status('done')
+                except Exception as e:
+                    print(f"❌ 작업 실패: {e}")
+                    traceback.print_exc(file=sys.stdout)
+                    job.error = str(e)
+                    job.finished_at = time.time()
+                    job.set_status('failed')
+
+    def status(self) -> Dict:
+        """세션·대기열·차단기 상태"""
+        counts: Dict[str, int] = {}
+        for job in list(self.jobs.values()):
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'uptime': time.time() - self.started_at,
+            'session_warm': self.scraper.sessions.is_warm(),
+            'rate_limit': self.scraper.rate_limiter.rate,
+            'circuit_open': self.scraper.circuit_breaker.is_open,
+            'cached_download_info': len(self.scraper._download_info_cache),
+            'response_cache': self.scraper.response_cache.stats(),
+            'open_indexes': list(self._indexes),
+            'queued': self.queue.qsize(),
+            'jobs': counts,
+        }
+
+    def shutdown(self) -> None:
+        for _ in self._workers:
+            self.queue.put(None)
+        for index in self._indexes.values():
+            index.close()
+        self.scraper.close()
+
+    # --- 작업 유형별 처리 ---
+
+    def _search_reports(self, params: Dict) -> List[Dict]:
+        if params.get('reports'):
+            return params['reports']
+        company = params.get('company')
+        if not company:
+            raise ValueError("company 또는 reports가 필요합니다")
+        years = int(params.get('years', 10))
+        max_pages = int(params.get('max_pages', 20))
+        if params.get('all_types'):
+            return self.scraper.search_company_all(company, years=years, max_pages=max_pages)
+
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=years * 365)
+        reports = []
+        for page in range(1, max_pages + 1):
+            page_results = self.scraper.search_page(company, start_date.strftime('%Y%m%d'),
+                                                    end_date.strftime('%Y%m%d'), page=page,
+                                                    public_types=REGULAR_PUBLIC_TYPES)
+            if not page_results:
+                break
+            reports.extend(page_results)
+        return reports
+
+    def _job_search(self, params: Dict) -> List[Dict]:
+        return self._search_reports(params)
+
+    def _job_plan(self, params: Dict) -> Dict:
+        reports = self._search_reports(params)
+        return self.scraper.download_reports_batch(
+            reports, params.get('download_dir', self.default_dir),
+            keep_all_versions=params.get('keep_all_versions', False), dry_run=True
+        ) or {}
+
+    def _job_download(self, params: Dict) -> Dict:
+        reports = self._search_reports(params)
+        download_dir = params.get('download_dir', self.default_dir)
+        self.scraper.download_reports_batch(
+            reports, download_dir,
+            keep_all_versions=params.get('keep_all_versions', False),
+            sections=params.get('sections'),
+            extract_dir=params.get('extract_dir')
+        )
+        return {'download_dir': os.path.abspath(download_dir), 'reports': len(reports)}
+
+    def _index_for(self, save_dir: str):
+        from dart_index import ReportIndex
+        with self._lock:
+            index = self._indexes.get(save_dir)
+            if index is None:
+                index = ReportIndex.for_library(save_dir)
+                self._indexes[save_dir] = index
+            return index
+
+    def _job_index(self, params: Dict) -> Dict:
+        save_dir = params.get('download_dir', self.default_dir)
+        return self._index_for(save_dir).update(save_dir, workers=params.get('workers'))
+
+    def _job_extract(self, params: Dict) -> Dict:
+        from dart_extract import FinancialExtractor
+        save_dir = params.get('download_dir', self.default_dir)
+        return FinancialExtractor(save_dir, params.get('extract_dir'), workers=params.get('workers'),
+                                  manifest=self.scraper.get_manifest(save_dir)).run()
+
+    def query(self, save_dir: Optional[str], text: str, limit: int = 20) -> List[Dict]:
+        """
+        전문 검색 (작업 대기열을 거치지 않고 바로 응답)
+
+        Raises:
+            ValueError: save_dir이 root 밖을 가리킴
+        """
+        return self._index_for(self.resolve_dir(save_dir)).search(text, limit=limit)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    daemon: ScraperDaemon = None
+    token: Optional[str] = None
+    server_version = "DartDaemon/1.0"
+
+    def log_message(self, format, *args):
+        # 요청 로그는 작업 진행 기록과 섞이지 않도록 stderr로
+        sys.stderr.write("%s - %s\n" % (self.address_string(), format % args))
+
+    def _send_json(self, data, status: int = 200) -> None:
+        body = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    def _authorized(self) -> bool:
+        """토큰이 설정되어 있으면 'Authorization: Bearer <토큰>' 확인 (실패 시 401 응답)"""
+        if not self.token:
+            return True
+        supplied = self.headers.get('Authorization', '')
+        if hmac.compare_digest(supplied.encode('utf-8'), f"Bearer {self.token}".encode('utf-8')):
+            return True
+        self._send_json({'error': "인증이 필요합니다"}, 401)
+        return False
+
+    def _job(self, job_id: str) -> Optional[Job]:
+        job = self.daemon.jobs.get(job_id)
+        if job is None:
+            self._send_json({'error': f"작업을 찾을 수 없음: {job_id}"}, 404)
+        return job
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if parts == ['status']:
+            return self._send_json(self.daemon.status())
+        if parts == ['jobs']:
+            return self._send_json([job.to_dict(with_result=False) for job in list(self.daemon.jobs.values())])
+        if parts == ['query']:
+            if not query.get('q'):
+                return self._send_json({'error': "q가 필요합니다"}, 400)
+            try:
+                results = self.daemon.query(query.get('dir'), query['q'], int(query.get('limit', 20)))
+            except ValueError as e:
+                return self._send_json({'error': str(e)}, 400)
+            return self._send_json(results)
+        if len(parts) >= 2 and parts[0] == 'jobs':
+            job = self._job(parts[1])
+            if job is None:
+                return
+            if len(parts) == 2:
+                return self._send_json(job.to_dict())
+            if parts[2] == 'log':
+                since = int(query.get('since', 0))
+                return self._send_json({'status': job.status, 'next': len(job.log), 'lines': job.log[since:]})
+            if parts[2] == 'stream':
+                return self._stream(job)
+        self._send_json({'error': "없는 경로"}, 404)
+
+    def _stream(self, job: Job) -> None:
+        """작업이 끝날 때까지 진행 기록을 줄 단위로 전송"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        sent = 0
+        try:
+            while True:
+                with job.changed:
+                    if len(job.log) == sent and not job.finished:
+                        job.changed.wait(timeout=15)
+                    lines = job.log[sent:]
+                    finished = job.finished
+                for line in lines:
+                    self.wfile.write((line + '\n').encode('utf-8'))
+                self.wfile.flush()
+                sent += len(lines)
+                if finished:
+                    self.wfile.write(f"[{job.status}]\n".encode('utf-8'))
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        parts = [part for part in urlparse(self.path).path.split('/') if part]
+        try:
+            payload = self._read_json()
+        except ValueError as e:
+            return self._send_json({'error': f"JSON 형식 오류: {e}"}, 400)
+
+        if parts == ['jobs']:
+            try:
+                job = self.daemon.submit(payload.get('type', ''), payload.get('params', {}))
+            except ValueError as e:
+                return self._send_json({'error': str(e)}, 400)
+            return self._send_json(job.to_dict(with_result=False), 202)
+        if parts == ['shutdown']:
+            self._send_json({'status': 'stopping'})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        self._send_json({'error': "없는 경로"}, 404)
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, job_workers: int = 1,
+          default_dir: str = "downloads", scraper: Optional[DartScraper] = None,
+          root: Optional[str] = None, token: Optional[str] = None) -> None:
+    """
+    데몬 실행 (종료 요청이나 Ctrl+C까지 대기)
+
+    Args:
+        host: 바인딩 주소 (기본값은 로컬 전용)
+        port: 포트
+        job_workers: 동시에 처리할 작업 수
+        default_dir: 기본 다운로드 폴더 (root 기준)
+        scraper: 공유할 스크래퍼 (None이면 새로 생성)
+        root: 작업과 검색이 사용할 수 있는 최상위 폴더 (None이면 현재 폴더)
+        token: 요청마다 확인할 Bearer 토큰 (루프백이 아닌 주소에서는 필수)
+
+    Raises:
+        ValueError: 루프백이 아닌 주소인데 토큰이 없음
+    """
+    if not token and not is_loopback(host):
+        raise ValueError(f"로컬이 아닌 주소({host})에서 받으려면 토큰이 필요합니다 (--token)")
+
+    # 추출·색인·파싱 프로세스 풀은 여러 스레드가 도는 서버에서 만들어지므로 fork 대신 spawn 사용
+    # (fork는 다른 스레드가 잡고 있던 잠금과 출력 기록기까지 자식에 복제함)
+    if multiprocessing.get_start_method(allow_none=True) != 'spawn':
+        multiprocessing.set_start_method('spawn', force=True)
+
+    daemon = ScraperDaemon(scraper, job_workers=job_workers, default_dir=default_dir, root=root)
+
+    # 작업을 받기 전에 세션을 한 번 데워 둠
+    daemon.scraper.get_search_page()
+
+    handler = type('DaemonHandler', (_Handler,), {'daemon': daemon, 'token': token})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"🛰️ DART 데몬 실행 중: http://{host}:{server.server_address[1]} (작업 {job_workers}개 동시 처리)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 데몬을 종료합니다.")
+    finally:
+        server.server_close()
+        daemon.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DART 스크래퍼 데몬 (로컬 HTTP 작업 API)")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--job-workers', type=int, default=1, help="동시에 처리할 작업 수")
+    parser.add_argument('--download-dir', default="downloads", help="기본 다운로드 폴더 (--root 기준)")
+    parser.add_argument('--root', default=os.getcwd(), help="작업과 검색에 허용할 최상위 폴더 (기본값: 현재 폴더)")
+    parser.add_argument('--token', default=os.environ.get('DART_DAEMON_TOKEN'),
+                        help="요청 인증 토큰 (루프백이 아닌 --host에는 필수, 기본값: DART_DAEMON_TOKEN 환경 변수)")
+    args = parser.parse_args()
+    try:
+        serve(args.host, args.port, args.job_workers, args.download_dir, root=args.root, token=args.token)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
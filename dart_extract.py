@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+다운로드한 보고서에서 주요 재무제표 추출
+섹션 HTML(sections.json 폴더)과 PDF(pdfplumber 설치 시)의 재무상태표·손익계산서·현금흐름표 등을
+(회사, rcpNo, 회계기간) 기준의 열 지향 데이터셋으로 모읍니다.
+pyarrow가 설치되어 있으면 Parquet, 없으면 CSV로 저장하며, 이미 처리한 파일은 건너뜁니다.
+
+    pip install 'ddownload[pdf,parquet]'   # PDF 표 추출과 Parquet 저장
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from dart_pack import PACK_SCHEME, read_file, resolve_file, file_signature
+from dart_planner import parse_report_name
+from dart_storage import DownloadManifest, SECTIONS_FILENAME, report_from_filename
+
+try:
+    import pyarrow
+    import pyarrow.compute as compute
+    import pyarrow.parquet as parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+# 선택 기능별 설치 방법 (pyproject.toml의 optional-dependencies)
+PDF_INSTALL_HINT = "pip install 'ddownload[pdf]'"
+PARQUET_INSTALL_HINT = "pip install 'ddownload[parquet]'"
+
+
+# 추출 대상 재무제표 (제목에 포함되는 이름, 긴 이름을 먼저 비교)
+STATEMENTS = ('연결재무상태표', '연결포괄손익계산서', '연결손익계산서', '연결자본변동표', '연결현금흐름표',
+              '재무상태표', '포괄손익계산서', '손익계산서', '자본변동표', '현금흐름표')
+
+# 추출 결과 행 튜플의 필드 순서 (프로세스 풀에서 튜플로 주고받음)
+# report_key는 추출 작업 키 - 같은 보고서를 다시 추출할 때 이전 행을 지우는 기준
+FINANCIAL_FIELDS = ('corp_name', 'rcp_no', 'period', 'report_name', 'statement',
+                    'account', 'column', 'value', 'source', 'report_key')
+
+EXTRACT_STATE_FILENAME = ".dart_extracted.json"
+
+_NUMBER_PATTERN = re.compile(r'^\(?-?[\d,]+(\.\d+)?\)?$')
+
+
+def parse_amount(text: str) -> Optional[float]:
+    """재무제표 금액 해석 - '1,234' → 1234, '(1,234)' → -1234, '-'/빈칸 → None"""
+    text = re.sub(r'\s+', '', text or '')
+    if not text or not _NUMBER_PATTERN.match(text):
+        return None
+    negative = text.startswith('(') or text.startswith('-')
+    value = float(text.strip('()').replace(',', '').lstrip('-'))
+    return -value if negative else value
+
+
+def _match_statement(text: str) -> Optional[str]:
+    compact = re.sub(r'\s+', '', text)
+    for name in STATEMENTS:
+        if name in compact:
+            return name
+    return None
+
+
+def _table_rows(statement: str, grid: List[List[str]]) -> List[Tuple[str, str, str, Optional[float]]]:
+    """
+    표(셀 텍스트 2차원 리스트)를 (재무제표, 계정, 열 이름, 금액) 행으로 변환
+
+    첫 번째 열이 계정명이고 나머지 열에 금액이 있는 표만 인정하며,
+    금액이 없는 앞쪽 행은 열 이름(제 55 기 등)으로 사용
+    """
+    header: List[str] = []
+    rows = []
+    for cells in grid:
+        cells = [re.sub(r'\s+', ' ', cell or '').strip() for cell in cells]
+        if len(cells) < 2 or not cells[0]:
+            continue
+        amounts = [parse_amount(cell) for cell in cells[1:]]
+        if not any(amount is not None for amount in amounts):
+            if not rows:
+                header = cells[1:]
+            continue
+        account = re.sub(r'\s+', '', cells[0])
+        for i, amount in enumerate(amounts):
+            column = header[i] if i < len(header) and header[i] else f"col{i + 1}"
+            rows.append((statement, account, column, amount))
+    return rows
+
+
+def extract_html_tables(html_content, encoding: Optional[str] = None) -> List[Tuple[str, str, str, Optional[float]]]:
+    """
+    섹션 HTML에서 재무제표 표 추출
+
+    표 바로 앞의 제목(또는 표 첫 행)에 재무제표 이름이 있는 표만 대상 (제목 없는 연속 표는 제외)
+
+    Returns:
+        (재무제표, 계정, 열 이름, 금액) 리스트
+    """
+    soup = BeautifulSoup(html_content, 'lxml', from_encoding=encoding) if isinstance(html_content, bytes) \
+        else BeautifulSoup(html_content, 'lxml')
+
+    rows = []
+    for table in soup.find_all('table'):
+        # 표 앞의 제목 - 바로 앞 표까지의 텍스트만 사용
+        title_parts = []
+        for text in table.find_all_previous(string=True, limit=8):
+            if text.find_parent('table') is not None:
+                break
+            title_parts.append(text)
+        title = ' '.join(title_parts[::-1])
+        first_row = table.find('tr')
+        statement = _match_statement(first_row.get_text(' ') if first_row else '') or _match_statement(title)
+        if not statement:
+            continue
+        grid = [[cell.get_text(' ') for cell in tr.find_all(['td', 'th'])] for tr in table.find_all('tr')]
+        rows.extend(_table_rows(statement, grid))
+    return rows
+
+
+def extract_pdf_tables(file_path: str) -> List[Tuple[str, str, str, Optional[float]]]:
+    """
+    PDF에서 재무제표 표 추출
+
+    Raises:
+        ImportError: pdfplumber가 설치되어 있지 않음
+    """
+    if pdfplumber is None:
+        raise ImportError(f"PDF 표 추출에는 pdfplumber가 필요합니다 ({PDF_INSTALL_HINT})")
+
+    rows = []
+    # 팩에 저장된 파일은 메모리에서 바로 열기
+    source = io.BytesIO(read_file(file_path)) if file_path.startswith(PACK_SCHEME) else file_path
+    with pdfplumber.open(source) as pdf:
+        statement = None
+        for page in pdf.pages:
+            statement = _match_statement(page.extract_text() or '') or statement
+            if not statement:
+                continue
+            for grid in page.extract_tables():
+                rows.extend(_table_rows(statement, grid))
+    return rows
+
+
+def extract_financials(task: Dict) -> Tuple[str, str, List[Tuple]]:
+    """
+    보고서 하나의 재무제표 추출 (프로세스 풀에서 실행되는 작업 단위)
+
+    Args:
+        task: key, signature, files(경로 목록), corp_name, rcp_no, report_name
+
+    Returns:
+        (key, signature, FINANCIAL_FIELDS 순서의 행 튜플 리스트)
+    """
+    period = parse_report_name(task.get('report_name', ''))['period']
+    rows = []
+    for file_path in task['files']:
+        try:
+            if file_path.lower().endswith('.pdf'):
+                tables = extract_pdf_tables(file_path)
+            else:
+                tables = extract_html_tables(bytes(read_file(file_path)))
+        except Exception as e:
+            print(f"  ⚠️ 표 추출 실패 ({os.path.basename(file_path)}): {e}")
+            continue
+        source = os.path.basename(file_path.rpartition('#')[2] if file_path.startswith(PACK_SCHEME) else file_path)
+        for statement, account, column, value in tables:
+            rows.append((task.get('corp_name', ''), task.get('rcp_no', ''), period, task.get('report_name', ''),
+                         statement, account, column, value, source, task['key']))
+    return task['key'], task['signature'], rows
+
+
+def _signature(paths: List[str]) -> str:
+    """파일 변경 여부 확인용 서명 (일반 파일은 크기와 수정 시각, 팩은 크기와 해시)"""
+    return '|'.join(file_signature(path) for path in sorted(paths))
+
+
+def _manifest_task(save_dir: str, entry: Dict) -> Optional[Dict]:
+    """매니페스트 기록 하나의 추출 작업 (삭제되었거나 파일이 없으면 None)"""
+    filename = entry.get('filename')
+    # 디스크 한도로 지운 보고서는 제외
+    if not filename or entry.get('evicted'):
+        return None
+    # 팩에 있는 파일도 찾도록 resolve_file로 위치 확인
+    file_path = resolve_file(save_dir, filename)
+    if not file_path:
+        return None
+    report = report_from_filename(filename)
+    return {
+        'key': f"{entry['rcp_no']}:{entry['dcm_no']}",
+        'files': [file_path],
+        'rcp_no': entry['rcp_no'],
+        'corp_name': entry.get('corp_name') or report.get('corp_name', ''),
+        'report_name': entry.get('report_name') or report.get('report_name', ''),
+    }
+
+
+def manifest_reports(save_dir: str, manifest: Optional[DownloadManifest] = None) -> List[Dict]:
+    """다운로드 매니페스트에 기록된 PDF 보고서 목록 (key, files, rcp_no, corp_name, report_name)"""
+    manifest = manifest or DownloadManifest(save_dir)
+    tasks = [_manifest_task(save_dir, entry) for entry in list(manifest.entries.values())]
+    return [task for task in tasks if task]
+
+
+def _section_task(save_dir: str, name: str) -> Optional[Dict]:
+    """섹션 폴더 하나({save_dir}/{name}/sections.json)의 추출 작업 (섹션 파일이 없으면 None)"""
+    meta_path = os.path.join(save_dir, name, SECTIONS_FILENAME)
+    if not os.path.isfile(meta_path):
+        return None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except Exception as e:
+        print(f"  ⚠️ 섹션 정보 파일 읽기 실패 ({name}): {e}")
+        return None
+    files = [resolve_file(save_dir, f"{name}/{item['filename']}") for item in metadata.get('sections', [])]
+    files = [path for path in files if path]
+    if not files:
+        return None
+    report = metadata.get('report', {})
+    return {
+        'key': f"sections:{metadata.get('rcp_no', name)}",
+        'files': files,
+        'rcp_no': metadata.get('rcp_no', name),
+        'corp_name': report.get('corp_name') or report.get('company', ''),
+        'report_name': report.get('report_name', ''),
+    }
+
+
+def section_reports(save_dir: str) -> List[Dict]:
+    """섹션 모드 폴더({rcpNo}/sections.json)의 보고서 목록 (key, files, rcp_no, corp_name, report_name)"""
+    if not os.path.isdir(save_dir):
+        return []
+    tasks = [_section_task(save_dir, name) for name in os.listdir(save_dir)]
+    return [task for task in tasks if task]
+
+
+def library_reports(save_dir: str) -> List[Dict]:
+    """다운로드 폴더의 모든 보고서 (PDF 매니페스트 + 섹션 폴더), 파일 서명 포함"""
+    reports = manifest_reports(save_dir) + section_reports(save_dir)
+    for report in reports:
+        report['signature'] = _signature(report['files'])
+    return reports
+
+
+class FinancialStore:
+    """추출한 재무제표 행을 열 지향 파일로 누적 저장 (Parquet 파트 파일 또는 CSV)"""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self.use_parquet = pyarrow is not None
+        self.csv_path = os.path.join(store_dir, 'financials.csv')
+        self._lock = threading.Lock()
+        self._part = 0
+        os.makedirs(store_dir, exist_ok=True)
+
+    def append(self, rows: List[Tuple]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            if self.use_parquet:
+                columns = list(zip(*rows))
+                table = pyarrow.table({name: list(values) for name, values in zip(FINANCIAL_FIELDS, columns)})
+                self._part += 1
+                stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+                parquet.write_table(table, os.path.join(self.store_dir, f"part-{stamp}-{os.getpid()}-{self._part:04d}.parquet"))
+            else:
+                if os.path.exists(self.csv_path) and self._csv_header() != list(FINANCIAL_FIELDS):
+                    # 열 구성이 바뀐 이전 파일은 새 열 구성으로 다시 씀
+                    self._rewrite_csv(set())
+                new_file = not os.path.exists(self.csv_path)
+                with open(self.csv_path, 'a', encoding='utf-8-sig' if new_file else 'utf-8', newline='') as f:
+                    writer = csv.writer(f)
+                    if new_file:
+                        writer.writerow(FINANCIAL_FIELDS)
+                    writer.writerows(rows)
+
+    def remove(self, keys: List[str]) -> None:
+        """추출 작업 키(report_key)가 keys에 속한 기존 행 삭제 (다시 추출한 보고서의 이전 결과)"""
+        keys = set(keys)
+        if not keys:
+            return
+        with self._lock:
+            if self.use_parquet:
+                self._remove_parquet(keys)
+            elif os.path.exists(self.csv_path):
+                self._rewrite_csv(keys)
+
+    def _csv_header(self) -> List[str]:
+        with open(self.csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            return next(csv.reader(f), [])
+
+    def _rewrite_csv(self, keys: set) -> None:
+        tmp_path = self.csv_path + '.tmp'
+        with open(self.csv_path, 'r', encoding='utf-8-sig', newline='') as src, \
+                open(tmp_path, 'w', encoding='utf-8-sig', newline='') as dst:
+            writer = csv.DictWriter(dst, FINANCIAL_FIELDS, restval='', extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(row for row in csv.DictReader(src) if row.get('report_key') not in keys)
+        os.replace(tmp_path, self.csv_path)
+
+    def _remove_parquet(self, keys: set) -> None:
+        value_set = pyarrow.array(sorted(keys))
+        for name in sorted(os.listdir(self.store_dir)):
+            if not (name.startswith('part-') and name.endswith('.parquet')):
+                continue
+            path = os.path.join(self.store_dir, name)
+            table = parquet.read_table(path)
+            if 'report_key' not in table.column_names:
+                continue
+            matched = compute.is_in(table['report_key'], value_set=value_set)
+            if not compute.any(matched).as_py():
+                continue
+            kept = table.filter(compute.invert(matched))
+            if kept.num_rows:
+                tmp_path = path + '.tmp'
+                parquet.write_table(kept, tmp_path)
+                os.replace(tmp_path, path)
+            else:
+                os.remove(path)
+
+
+class FinancialExtractor:
+    """다운로드 폴더의 보고서를 프로세스 풀로 병렬 추출하여 FinancialStore에 누적 (증분 처리)"""
+
+    def __init__(self, save_dir: str, store_dir: Optional[str] = None, workers: Optional[int] = None,
+                 manifest: Optional[DownloadManifest] = None, flush_every: int = 50):
+        """
+        Args:
+            save_dir: 보고서 다운로드 폴더 (PDF 매니페스트 또는 섹션 폴더)
+            store_dir: 추출 결과 저장 폴더 (None이면 {save_dir}/financials)
+            workers: 추출 프로세스 수 (None이면 CPU 코어 수)
+            manifest: 다운로드 중인 scraper의 매니페스트 (후처리에서 방금 받은 파일을 찾을 때 사용)
+            flush_every: 추출 결과를 모아서 저장할 보고서 수
+        """
+        self.save_dir = save_dir
+        self.manifest = manifest
+        self.flush_every = max(1, flush_every)
+        self.store_dir = store_dir or os.path.join(save_dir, 'financials')
+        self.workers = workers or os.cpu_count() or 1
+        self.store = FinancialStore(self.store_dir)
+        self.state_path = os.path.join(self.store_dir, EXTRACT_STATE_FILENAME)
+        self.state: Dict[str, Dict] = self._load_state()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.skipped_pdfs = 0
+
+        if not self.store.use_parquet:
+            print(f"ℹ️ pyarrow가 없어 CSV로 저장합니다. (Parquet 저장: {PARQUET_INSTALL_HINT})")
+
+    @property
+    def use_pdf(self) -> bool:
+        return pdfplumber is not None
+
+    def _load_state(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 추출 기록 파일 읽기 실패: {e}")
+            return {}
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _is_done(self, key: str, signature: str) -> bool:
+        return self.state.get(key, {}).get('signature') == signature
+
+    def pending_tasks(self) -> List[Dict]:
+        """아직 추출하지 않았거나 파일이 바뀐 보고서 목록 (pdfplumber가 없으면 PDF 보고서는 skipped_pdfs로 집계)"""
+        tasks = [task for task in library_reports(self.save_dir) if not self._is_done(task['key'], task['signature'])]
+        if self.use_pdf:
+            self.skipped_pdfs = 0
+            return tasks
+        pending = [task for task in tasks if not task['files'][0].lower().endswith('.pdf')]
+        self.skipped_pdfs = len(tasks) - len(pending)
+        return pending
+
+    def _record(self, results: List[Tuple[str, str, List[Tuple]]]) -> None:
+        """추출 결과 저장 후 처리 기록 (저장이 끝난 보고서만 완료로 표시)"""
+        with self._lock:
+            # 이미 추출한 적 있는 보고서(파일이 바뀌었거나 다시 받은 경우)는 이전 행을 지운 뒤 추가
+            self.store.remove([key for key, _, _ in results if key in self.state])
+            self.store.append([row for _, _, rows in results for row in rows])
+            extracted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for key, signature, rows in results:
+                self.state[key] = {'signature': signature, 'rows': len(rows), 'extracted_at': extracted_at}
+            self._save_state()
+
+    def run(self) -> Dict:
+        """
+        새로 받은 보고서만 추출
+
+        Returns:
+            처리 보고서 수, 추출 행 수, 소요 시간, 코어당 처리 속도 (reports/sec/core)
+        """
+        tasks = self.pending_tasks()
+        if self.skipped_pdfs:
+            print(f"⚠️ PDF 보고서 {self.skipped_pdfs}개는 pdfplumber가 없어 건너뜁니다. (설치: {PDF_INSTALL_HINT})")
+        if not tasks:
+            print("✅ 새로 추출할 보고서가 없습니다.")
+            return {'reports': 0, 'rows': 0, 'seconds': 0.0, 'reports_per_sec_per_core': 0.0}
+
+        print(f"\n📊 재무제표 추출: 보고서 {len(tasks)}개 (프로세스 {self.workers}개)")
+        started = time.perf_counter()
+        total_rows = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            # 작은 작업이 많으므로 묶어서 전달하여 프로세스 간 통신 횟수를 줄임
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            batch = []
+            for result in executor.map(extract_financials, tasks, chunksize=chunksize):
+                batch.append(result)
+                total_rows += len(result[2])
+                # 보고서마다 파일을 만들지 않도록 모아서 저장 (중단되면 저장 안 된 보고서만 다시 처리)
+                if len(batch) >= self.flush_every:
+                    self._record(batch)
+                    batch = []
+            if batch:
+                self._record(batch)
+
+        seconds = time.perf_counter() - started
+        per_core = len(tasks) / seconds / self.workers if seconds > 0 else 0.0
+        print(f"  ✅ 보고서 {len(tasks)}개, {total_rows:,}행 추출 ({seconds:.1f}초, 코어당 {per_core:.2f} 보고서/초)")
+        print(f"  📁 저장 위치: {os.path.abspath(self.store_dir)} ({'Parquet' if self.store.use_parquet else 'CSV'})")
+        return {
+            'reports': len(tasks),
+            'rows': total_rows,
+            'seconds': seconds,
+            'reports_per_sec_per_core': per_core,
+        }
+
+    # --- 파이프라인 후처리 연결 ---
+
+    def post_process(self, report: Dict, download_info: Dict) -> None:
+        """
+        ReportPipeline의 post_process로 사용 - 다운로드가 끝난 보고서를 프로세스 풀에 바로 넘김
+
+        결과는 완료되는 대로 저장되며, 파이프라인이 끝나면 close()로 남은 작업을 기다림
+        """
+        rcp_no = download_info['rcp_no']
+        task = _section_task(self.save_dir, rcp_no)
+        if task is None:
+            if not self.use_pdf:
+                print(f"  ⚠️ pdfplumber가 없어 재무제표 추출을 건너뜁니다 (rcpNo: {rcp_no}, 설치: {PDF_INSTALL_HINT})")
+                return
+            if self.manifest is None:
+                self.manifest = DownloadManifest(self.save_dir)
+            entry = self.manifest.get(rcp_no, download_info['dcm_no'])
+            task = _manifest_task(self.save_dir, entry) if entry else None
+            if task is None:
+                return
+        # 검색 결과가 있으면 회사명·보고서명은 검색 결과 기준
+        task['corp_name'] = report.get('corp_name') or report.get('company') or task['corp_name']
+        task['report_name'] = report.get('report_name') or task['report_name']
+        task['signature'] = _signature(task['files'])
+        if self._is_done(task['key'], task['signature']):
+            return
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            future = self._pool.submit(extract_financials, task)
+        future.add_done_callback(self._on_extracted)
+
+    def _on_extracted(self, future) -> None:
+        try:
+            self._record([future.result()])
+        except Exception as e:
+            print(f"  ❌ 재무제표 추출 실패: {e}")
+
+    def close(self) -> None:
+        """후처리로 넘긴 추출 작업이 모두 끝날 때까지 대기"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+# --- 벤치마크 ---
+
+def benchmark_extraction(save_dir: str, workers: List[int] = (1, 2, 4), work_dir: Optional[str] = None) -> Dict:
+    """
+    재무제표 추출 처리량을 프로세스 수별로 측정 (reports/sec/core)
+
+    측정마다 빈 저장 폴더를 써서 매번 전체 보고서를 추출하며, 프로세스 풀 시작 비용도 포함
+    (run()이 실행마다 풀을 새로 만드는 것과 같은 조건)
+
+    Args:
+        save_dir: 보고서 폴더 (PDF 매니페스트 또는 섹션 폴더, 예: fixtures/report_library)
+        workers: 측정할 프로세스 수 목록
+        work_dir: 임시 저장 폴더를 만들 위치 (None이면 시스템 임시 폴더)
+
+    Returns:
+        {'reports', 'cpu_count', 'format', 'runs': [{'workers', 'seconds', 'rows', 'reports_per_sec',
+        'reports_per_sec_per_core'}, ...]}
+    """
+    runs = []
+    reports = 0
+    store_format = 'parquet' if pyarrow is not None else 'csv'
+    for count in workers:
+        store_dir = tempfile.mkdtemp(prefix='dart_extract_bench_', dir=work_dir)
+        try:
+            result = FinancialExtractor(save_dir, store_dir, workers=max(1, count)).run()
+        finally:
+            shutil.rmtree(store_dir, ignore_errors=True)
+        reports = result['reports']
+        runs.append({
+            'workers': max(1, count),
+            'seconds': round(result['seconds'], 3),
+            'rows': result['rows'],
+            'reports_per_sec': round(result['reports'] / result['seconds'], 2) if result['seconds'] > 0 else 0.0,
+            'reports_per_sec_per_core': round(result['reports_per_sec_per_core'], 2),
+        })
+    return {'reports': reports, 'cpu_count': os.cpu_count(), 'format': store_format, 'runs': runs}
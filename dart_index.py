@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+다운로드한 보고서 전문 검색 색인
+보고서 본문(섹션 HTML, pdfplumber 설치 시 PDF)에서 텍스트를 추출하여 SQLite 역색인에 저장합니다.
+한국어는 띄어쓰기가 일정하지 않으므로 공백을 없앤 본문의 글자 2-gram을 색인하고,
+후보 문서의 본문에서 실제 포함 여부를 확인하여 키워드/구문 검색 결과를 돌려줍니다.
+다운로드 매니페스트 기준으로 새로 받았거나 바뀐 보고서만 색인하며, 중단되어도 이어서 색인합니다.
+"""
+
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from dart_extract import library_reports, pdfplumber, PDF_INSTALL_HINT
+from dart_pack import PACK_SCHEME, read_file
+
+
+INDEX_FILENAME = ".dart_index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    signature TEXT NOT NULL,
+    rcp_no TEXT,
+    corp_name TEXT,
+    report_name TEXT,
+    files TEXT,
+    text BLOB
+);
+CREATE TABLE IF NOT EXISTS postings (
+    gram TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (gram, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """색인/검색 공통 정규화 - NFKC, 소문자, 공백 제거 ('사업의 내용' → '사업의내용')"""
+    return re.sub(r'\s+', '', unicodedata.normalize('NFKC', text)).lower()
+
+
+def ngrams(text: str, n: int = 2) -> List[str]:
+    """정규화된 문자열의 글자 n-gram (n보다 짧으면 문자열 자체)"""
+    if len(text) < n:
+        return [text] if text else []
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+def extract_text(file_path: str) -> str:
+    """
+    보고서 파일 본문 텍스트 (HTML, 또는 pdfplumber가 있으면 PDF)
+
+    Raises:
+        ImportError: PDF인데 pdfplumber가 설치되어 있지 않음
+    """
+    if file_path.lower().endswith('.pdf'):
+        if pdfplumber is None:
+            raise ImportError(f"PDF 텍스트 추출에는 pdfplumber가 필요합니다 ({PDF_INSTALL_HINT})")
+        source = io.BytesIO(read_file(file_path)) if file_path.startswith(PACK_SCHEME) else file_path
+        with pdfplumber.open(source) as pdf:
+            return '\n'.join(page.extract_text() or '' for page in pdf.pages)
+
+    soup = BeautifulSoup(bytes(read_file(file_path)), 'lxml')
+    for tag in soup(['script', 'style']):
+        tag.decompose()
+    return soup.get_text(' ')
+
+
+def index_document(task: Dict) -> Tuple[Dict, bytes, List[Tuple[str, int]]]:
+    """
+    보고서 하나의 색인 데이터 생성 (프로세스 풀에서 실행되는 작업 단위)
+
+    Returns:
+        (보고서 정보, 압축한 정규화 본문, (gram, 빈도) 리스트)
+    """
+    parts = []
+    for file_path in task['files']:
+        try:
+            parts.append(extract_text(file_path))
+        except Exception as e:
+            print(f"  ⚠️ 텍스트 추출 실패 ({os.path.basename(file_path)}): {e}")
+    text = normalize_text(' '.join(parts))
+    return task, zlib.compress(text.encode('utf-8')), list(Counter(ngrams(text)).items())
+
+
+def parse_query(query: str) -> List[str]:
+    """
+    검색어 해석 - 따옴표로 묶은 구문은 하나의 단어로, 나머지는 띄어쓰기 단위로 나눔
+
+    예: '"재무제표 주석" 반도체' → ['재무제표주석', '반도체'] (모든 단어를 포함하는 보고서 검색)
+    """
+    terms = re.findall(r'"([^"]+)"', query)
+    rest = re.sub(r'"[^"]*"', ' ', query)
+    terms += rest.split()
+    return [term for term in (normalize_text(term) for term in terms) if term]
+
+
+class ReportIndex:
+    """SQLite 2-gram 역색인"""
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: 색인 파일 경로 (보통 {다운로드 폴더}/.dart_index.sqlite)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    @classmethod
+    def for_library(cls, save_dir: str) -> 'ReportIndex':
+        """다운로드 폴더의 기본 색인 열기"""
+        os.makedirs(save_dir, exist_ok=True)
+        return cls(os.path.join(save_dir, INDEX_FILENAME))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _signatures(self) -> Dict[str, str]:
+        return dict(self.conn.execute('SELECT key, signature FROM docs'))
+
+    def _store(self, task: Dict, text: bytes, grams: List[Tuple[str, int]]) -> None:
+        """보고서 하나를 한 트랜잭션으로 저장 (중단되면 다음 실행에서 다시 색인)"""
+        with self._lock, self.conn:
+            row = self.conn.execute('SELECT doc_id FROM docs WHERE key = ?', (task['key'],)).fetchone()
+            if row:
+                self.conn.execute('DELETE FROM postings WHERE doc_id = ?', row)
+                self.conn.execute('DELETE FROM docs WHERE doc_id = ?', row)
+            cursor = self.conn.execute(
+                'INSERT INTO docs (key, signature, rcp_no, corp_name, report_name, files, text) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (task['key'], task['signature'], task.get('rcp_no', ''), task.get('corp_name', ''),
+                 task.get('report_name', ''), '\n'.join(task['files']), text)
+            )
+            doc_id = cursor.lastrowid
+            self.conn.executemany('INSERT INTO postings (gram, doc_id, tf) VALUES (?, ?, ?)',
+                                  ((gram, doc_id, tf) for gram, tf in grams))
+
+    def update(self, save_dir: str, workers: Optional[int] = None) -> Dict:
+        """
+        다운로드 폴더에서 새로 받았거나 바뀐 보고서만 색인
+
+        Args:
+            save_dir: 보고서 다운로드 폴더
+            workers: 텍스트 추출 프로세스 수 (None이면 CPU 코어 수)
+
+        Returns:
+            색인한 보고서 수, 삭제한 보고서 수, 본문을 읽지 못해 건너뛴 보고서 수, 소요 시간
+        """
+        reports = library_reports(save_dir)
+        with self._lock:
+            indexed = self._signatures()
+        pending = [report for report in reports if indexed.get(report['key']) != report['signature']]
+
+        # pdfplumber가 없으면 PDF 보고서는 색인하지 않고 남겨 두어, 설치 후 다음 실행에서 색인
+        skipped = 0
+        if pdfplumber is None:
+            readable = [report for report in pending if not report['files'][0].lower().endswith('.pdf')]
+            skipped = len(pending) - len(readable)
+            pending = readable
+            if skipped:
+                print(f"⚠️ PDF 보고서 {skipped}개는 pdfplumber가 없어 색인하지 않습니다. (설치: {PDF_INSTALL_HINT})")
+
+        # 폴더에서 사라진 보고서는 색인에서도 제거
+        current = {report['key'] for report in reports}
+        removed = [key for key in indexed if key not in current]
+        if removed:
+            with self._lock, self.conn:
+                for key in removed:
+                    row = self.conn.execute('SELECT doc_id FROM docs WHERE key = ?', (key,)).fetchone()
+                    if row:
+                        self.conn.execute('DELETE FROM postings WHERE doc_id = ?', row)
+                        self.conn.execute('DELETE FROM docs WHERE doc_id = ?', row)
+
+        if not pending:
+            if not skipped:
+                print(f"✅ 색인이 최신 상태입니다. (보고서 {len(reports)}개)")
+            return {'indexed': 0, 'removed': len(removed), 'skipped': skipped, 'seconds': 0.0}
+
+        workers = workers or os.cpu_count() or 1
+        print(f"\n🗂️ 색인 중: 보고서 {len(pending)}개 (프로세스 {workers}개)")
+        started = time.perf_counter()
+        stored = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(pending) // (workers * 4))
+            for i, (task, text, grams) in enumerate(executor.map(index_document, pending, chunksize=chunksize), 1):
+                # 본문을 하나도 읽지 못한 보고서는 서명을 남기지 않아 다음 실행에서 다시 시도
+                if grams:
+                    self._store(task, text, grams)
+                    stored += 1
+                else:
+                    skipped += 1
+                    print(f"  ⚠️ 본문을 읽지 못해 색인하지 않음: {task['key']}")
+                if i % 100 == 0:
+                    print(f"  📊 {i}/{len(pending)}개 색인")
+
+        seconds = time.perf_counter() - started
+        print(f"  ✅ 보고서 {stored}개 색인 완료 ({seconds:.1f}초)")
+        return {'indexed': stored, 'removed': len(removed), 'skipped': skipped, 'seconds': seconds}
+
+    def _candidates(self, term: str) -> Dict[int, int]:
+        """
+        단어의 모든 gram을 가진 문서와 예상 일치 횟수 상한 (gram 빈도의 최솟값)
+
+        한 글자 단어는 그 글자로 시작하는 gram의 범위 검색으로 찾음 (본문 맨 끝에만 있는 글자는 찾지 못함).
+        실제 포함 여부는 본문으로 확인
+        """
+        if len(term) == 1:
+            rows = self.conn.execute(
+                'SELECT doc_id, SUM(tf) FROM postings WHERE gram >= ? AND gram < ? GROUP BY doc_id',
+                (term, chr(ord(term) + 1))
+            )
+            return dict(rows)
+
+        grams = sorted(set(ngrams(term)))
+        placeholders = ','.join('?' * len(grams))
+        rows = self.conn.execute(
+            f'SELECT doc_id, MIN(tf) FROM postings WHERE gram IN ({placeholders}) '
+            f'GROUP BY doc_id HAVING COUNT(*) = ?',
+            (*grams, len(grams))
+        )
+        return dict(rows)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        키워드/구문 검색
+
+        gram 빈도로 후보 순서를 정하고 앞에서부터 본문을 확인하므로,
+        흔한 단어라도 limit개를 찾으면 나머지 후보는 읽지 않음
+
+        Args:
+            query: 검색어 (띄어쓴 단어는 모두 포함, "따옴표"는 구문 그대로 포함)
+            limit: 최대 결과 수
+
+        Returns:
+            보고서 정보와 본문 일치 횟수, 주변 문맥(snippet) 리스트
+        """
+        terms = parse_query(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            scores: Optional[Dict[int, int]] = None
+            for term in terms:
+                found = self._candidates(term)
+                scores = found if scores is None else {
+                    doc_id: scores[doc_id] + tf for doc_id, tf in found.items() if doc_id in scores
+                }
+                if not scores:
+                    return []
+
+            results = []
+            for doc_id in sorted(scores, key=scores.get, reverse=True):
+                key, rcp_no, corp_name, report_name, files, blob = self.conn.execute(
+                    'SELECT key, rcp_no, corp_name, report_name, files, text FROM docs WHERE doc_id = ?', (doc_id,)
+                ).fetchone()
+                text = zlib.decompress(blob).decode('utf-8')
+                counts = [text.count(term) for term in terms]
+                if not all(counts):
+                    continue
+                position = text.find(terms[0])
+                results.append({
+                    'key': key,
+                    'rcp_no': rcp_no,
+                    'corp_name': corp_name,
+                    'report_name': report_name,
+                    'files': files.split('\n'),
+                    'matches': sum(counts),
+                    'snippet': text[max(0, position - 30):position + len(terms[0]) + 30],
+                })
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """색인 규모 (보고서 수, gram 수, postings 수)"""
+        with self._lock:
+            docs = self.conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+            postings = self.conn.execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+            grams = self.conn.execute('SELECT COUNT(DISTINCT gram) FROM postings').fetchone()[0]
+        return {'docs': docs, 'grams': grams, 'postings': postings}
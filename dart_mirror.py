@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+디스크 한도가 있는 보고서 미러
+다운로드 폴더의 사용량을 매니페스트로 추적하고, 한도를 넘으면 정정 이전 버전(superseded)부터,
+그다음 오래 쓰지 않은 파일(LRU) 순으로 PDF를 지웁니다.
+지운 보고서도 매니페스트 기록(rcpNo, dcmNo, 보고서 URL)은 남으므로 필요할 때 일반 다운로드 경로로 다시 받습니다.
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Set, Tuple
+
+from dart_planner import version_key
+from dart_storage import DownloadManifest, LocalStorage, StorageBackend
+
+
+# 접근 시각을 매니페스트에 다시 기록하는 최소 간격 (초) - 자주 여는 파일 때문에 매니페스트가 커지지 않도록
+ACCESS_RECORD_INTERVAL = 3600
+
+
+def _is_local(entry: Dict) -> bool:
+    return bool(entry.get('filename')) and not entry.get('evicted')
+
+
+def _last_used(entry: Dict) -> float:
+    """마지막 사용 시각 (접근 기록이 없으면 다운로드 시각)"""
+    if entry.get('last_access'):
+        return entry['last_access']
+    try:
+        return datetime.strptime(entry.get('updated_at', ''), '%Y-%m-%d %H:%M:%S').timestamp()
+    except ValueError:
+        return 0.0
+
+
+def mirror_usage(manifest: DownloadManifest) -> int:
+    """매니페스트 기준 로컬 보고서 총 용량 (bytes)"""
+    return sum(entry.get('size') or 0 for entry in list(manifest.entries.values()) if _is_local(entry))
+
+
+def superseded_keys(manifest: DownloadManifest) -> Set[Tuple[str, str]]:
+    """같은 회사·보고서 유형·기간에 더 최근 rcpNo가 있는 (정정 이전) 보고서"""
+    latest: Dict[Tuple[str, str, str], str] = {}
+    entries = list(manifest.entries.values())
+    for entry in entries:
+        key = version_key(entry)
+        if key is not None and entry.get('rcp_no', '') > latest.get(key, ''):
+            latest[key] = entry['rcp_no']
+    return {
+        (entry['rcp_no'], entry['dcm_no']) for entry in entries
+        if version_key(entry) is not None and entry['rcp_no'] < latest[version_key(entry)]
+    }
+
+
+def eviction_order(manifest: DownloadManifest) -> List[Dict]:
+    """삭제 순서 - 정정 이전 버전(오래된 것부터), 그다음 오래 쓰지 않은 순"""
+    superseded = superseded_keys(manifest)
+    local = [entry for entry in list(manifest.entries.values()) if _is_local(entry)]
+    return sorted(local, key=lambda entry: ((entry['rcp_no'], entry['dcm_no']) not in superseded, _last_used(entry)))
+
+
+def _require_local(storage: StorageBackend) -> None:
+    if not storage.is_local:
+        raise ValueError(f"디스크 한도 미러는 로컬 저장소에서만 사용할 수 있습니다 ({type(storage).__name__})")
+
+
+def enforce_quota(manifest: DownloadManifest, quota_bytes: int, low_watermark: float = 0.9,
+                  protect: Optional[Set[Tuple[str, str]]] = None,
+                  storage: Optional[StorageBackend] = None) -> List[Dict]:
+    """
+    사용량이 한도를 넘으면 한도의 low_watermark 비율까지 보고서 파일 삭제
+
+    Args:
+        manifest: 다운로드 폴더 매니페스트
+        quota_bytes: 디스크 한도
+        low_watermark: 삭제 후 목표 사용량 비율 (매 다운로드마다 지우지 않도록 여유를 둠)
+        protect: 지우지 않을 (rcpNo, dcmNo) - 방금 받은 보고서 등
+        storage: 보고서 저장소 (None이면 로컬 파일시스템)
+
+    Returns:
+        삭제한 매니페스트 기록 리스트
+
+    Raises:
+        ValueError: 로컬이 아닌 저장소 (팩·S3에는 매니페스트 크기와 디스크 사용량이 맞지 않음)
+    """
+    storage = storage or LocalStorage()
+    _require_local(storage)
+    usage = mirror_usage(manifest)
+    if usage <= quota_bytes:
+        return []
+
+    target = int(quota_bytes * low_watermark)
+    protect = protect or set()
+    evicted = []
+    for entry in eviction_order(manifest):
+        if usage <= target:
+            break
+        if (entry['rcp_no'], entry['dcm_no']) in protect:
+            continue
+
+        try:
+            storage.delete(manifest.save_dir, entry['filename'])
+        except OSError as e:
+            print(f"  ⚠️ 파일 삭제 실패 ({entry['filename']}): {e}")
+            continue
+
+        usage -= entry.get('size') or 0
+        evicted.append(manifest.record(entry['rcp_no'], entry['dcm_no'], evicted=True,
+                                       evicted_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+    if evicted:
+        print(f"🧹 디스크 한도 초과: 보고서 {len(evicted)}개 삭제 (사용량 {usage:,} / 한도 {quota_bytes:,} bytes)")
+        # 삭제 기록이 쌓이지 않도록 매니페스트 정리
+        manifest.compact()
+    return evicted
+
+
+class ReportMirror:
+    """디스크 한도 안에서 보고서를 보관하고, 삭제된 보고서는 요청 시 다시 받는 미러"""
+
+    def __init__(self, scraper, save_dir: str, quota_bytes: int, low_watermark: float = 0.9):
+        """
+        Args:
+            scraper: DartScraper (다시 받을 때 일반 다운로드 경로 사용, 로컬 저장소만 가능)
+            save_dir: 다운로드 폴더
+            quota_bytes: 디스크 한도
+            low_watermark: 삭제 후 목표 사용량 비율
+
+        Raises:
+            ValueError: scraper의 저장소가 로컬이 아님 (팩·S3에는 돌려줄 파일 경로가 없음)
+        """
+        _require_local(scraper.storage)
+        self.scraper = scraper
+        self.save_dir = save_dir
+        self.quota_bytes = quota_bytes
+        self.low_watermark = low_watermark
+
+    @property
+    def manifest(self) -> DownloadManifest:
+        return self.scraper.get_manifest(self.save_dir)
+
+    def touch(self, entry: Dict) -> None:
+        """접근 시각 기록 (LRU 판단용)"""
+        now = time.time()
+        if now - (entry.get('last_access') or 0) >= ACCESS_RECORD_INTERVAL:
+            self.manifest.record(entry['rcp_no'], entry['dcm_no'], last_access=now)
+
+    def open(self, rcp_no: str, dcm_no: Optional[str] = None) -> Optional[str]:
+        """
+        보고서 파일 경로 반환 - 삭제되었거나 없으면 다시 받음
+
+        Args:
+            rcp_no: 접수번호
+            dcm_no: 문서번호 (None이면 매니페스트에서 찾고, 없으면 뷰어 페이지에서 조회)
+
+        Returns:
+            로컬 파일 경로 (받지 못하면 None)
+        """
+        manifest = self.manifest
+        entry = manifest.get(rcp_no, dcm_no) if dcm_no else manifest.find_rcp(rcp_no)
+        if entry and _is_local(entry) and self.scraper.storage.exists(self.save_dir, entry['filename']) is not None:
+            self.touch(entry)
+            return os.path.join(self.save_dir, entry['filename'])
+
+        if entry:
+            print(f"♻️ 삭제된 보고서 다시 받기: {rcp_no}")
+            download_info = self.scraper.build_download_info(entry['rcp_no'], entry['dcm_no'])
+        else:
+            download_info = self.scraper.get_report_download_info(
+                f"{self.scraper.base_url}/dsaf001/main.do?rcpNo={rcp_no}")
+        # 기존 기록의 회사명·보고서명을 넘겨 삭제 전과 같은 파일명으로 받음
+        report = entry if entry and entry.get('report_name') else None
+        if not download_info or not self.scraper.download_report_file(download_info, self.save_dir, report=report):
+            return None
+
+        entry = manifest.get(download_info['rcp_no'], download_info['dcm_no'])
+        if not entry or not entry.get('filename'):
+            print(f"  ⚠️ 매니페스트에 다운로드 기록이 없음: {rcp_no}")
+            return None
+        file_path = os.path.join(self.save_dir, entry['filename'])
+        if self.scraper.storage.exists(self.save_dir, entry['filename']) is None:
+            print(f"  ⚠️ 로컬 파일 없음: {file_path}")
+            return None
+        self.touch(entry)
+        return file_path
+
+    def enforce(self, protect: Optional[Set[Tuple[str, str]]] = None) -> List[Dict]:
+        return enforce_quota(self.manifest, self.quota_bytes, self.low_watermark, protect, storage=self.scraper.storage)
+
+    def status(self) -> Dict:
+        """사용량, 한도, 로컬/삭제 보고서 수"""
+        entries = list(self.manifest.entries.values())
+        return {
+            'usage_bytes': mirror_usage(self.manifest),
+            'quota_bytes': self.quota_bytes,
+            'local': sum(1 for entry in entries if _is_local(entry)),
+            'evicted': sum(1 for entry in entries if entry.get('evicted')),
+            'superseded': len(superseded_keys(self.manifest)),
+        }
@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+"""
+팩 파일 저장소
+보고서 PDF와 섹션 HTML 수만 개를 개별 파일 대신 몇 개의 추가 전용 세그먼트 파일에 모아 저장합니다.
+색인(SQLite)은 이름과 (rcpNo, dcmNo)로 세그먼트 위치(offset, length)와 SHA-256을 찾고,
+파일 하나를 꺼낼 때는 세그먼트를 mmap으로 열어 복사 없이 memoryview로 돌려줍니다.
+지우거나 다시 받은 파일이 차지하던 공간은 compact()로 회수합니다.
+세그먼트는 쓰는 동안 파일 잠금(flock)을 잡으므로 공유 폴더에서 여러 프로세스가 같은 팩에 써도 레코드가 섞이지 않습니다.
+
+    {다운로드 폴더}/.dart_pack/segment-000001.pack
+    {다운로드 폴더}/.dart_pack/index.sqlite
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple, BinaryIO
+
+import requests
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from dart_storage import (StorageBackend, DownloadManifest, IncompleteDownload, DEFAULT_BUFFER_SIZE,
+                          SECTIONS_FILENAME, _expected_length)
+
+
+PACK_DIRNAME = ".dart_pack"
+PACK_INDEX_FILENAME = "index.sqlite"
+PACK_SCHEME = "pack://"
+DEFAULT_SEGMENT_SIZE = 1024 * 1024 * 1024
+
+# 레코드 = 헤더(매직, 플래그, 본문 길이, SHA-256, 메타 길이) + 메타 JSON + 본문
+_HEADER = struct.Struct('<4sBQ32sI')
+_MAGIC = b'DPK1'
+_FLAG_DELETED = 1
+_SEGMENT_PATTERN = re.compile(r'^segment-(\d+)\.pack$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    name TEXT PRIMARY KEY,
+    rcp_no TEXT,
+    dcm_no TEXT,
+    segment INTEGER NOT NULL,
+    record_offset INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    stored_at TEXT
+);
+CREATE INDEX IF NOT EXISTS objects_report ON objects (rcp_no, dcm_no);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = ('name', 'rcp_no', 'dcm_no', 'segment', 'record_offset', 'offset', 'length', 'sha256', 'seq', 'stored_at')
+
+
+def _try_lock(f: BinaryIO) -> bool:
+    """
+    세그먼트 배타 잠금 (기다리지 않음) - 다른 프로세스가 쓰거나 정리하는 중이면 False
+
+    fcntl이 없는 환경에서는 프로세스 내 잠금만 적용
+    """
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class PackFile:
+    """추가 전용 세그먼트 파일 + 색인"""
+
+    def __init__(self, pack_dir: str, segment_size: int = DEFAULT_SEGMENT_SIZE):
+        """
+        Args:
+            pack_dir: 팩 폴더 (보통 {다운로드 폴더}/.dart_pack)
+            segment_size: 세그먼트 파일 최대 크기 (넘으면 새 세그먼트에 기록)
+        """
+        os.makedirs(pack_dir, exist_ok=True)
+        self.pack_dir = pack_dir
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(pack_dir, PACK_INDEX_FILENAME), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+        segments = self._segment_ids()
+        # 쓰기는 스레드마다 다른 세그먼트를 빌려 쓰므로 동시 다운로드가 서로 기다리지 않음
+        # (다른 프로세스와는 세그먼트 파일 잠금으로 구분)
+        self._idle = [sid for sid in segments if os.path.getsize(self._segment_path(sid)) < segment_size]
+        self._leased: set = set()
+        self._maps: Dict[int, mmap.mmap] = {}
+
+    def close(self) -> None:
+        with self._lock:
+            for mm in self._maps.values():
+                try:
+                    mm.close()
+                except BufferError:
+                    pass  # 아직 사용 중인 memoryview가 있으면 참조가 사라질 때 해제
+            self._maps.clear()
+            self.conn.close()
+
+    # --- 세그먼트 ---
+
+    def _segment_path(self, sid: int) -> str:
+        return os.path.join(self.pack_dir, f"segment-{sid:06d}.pack")
+
+    def _segment_ids(self) -> List[int]:
+        return sorted(int(match.group(1)) for match in map(_SEGMENT_PATTERN.match, os.listdir(self.pack_dir)) if match)
+
+    def _new_segment_id(self) -> int:
+        """
+        새 세그먼트 번호 - 색인의 카운터로 발급하므로 다른 프로세스와 겹치지 않고,
+        정리로 지운 번호도 다시 쓰지 않음 (다른 프로세스의 mmap이 예전 파일을 가리킬 수 있으므로)
+        """
+        existing = self._segment_ids()
+        floor = existing[-1] + 1 if existing else 1
+        with self._lock:
+            # UPDATE가 쓰기 잠금을 잡은 채로 같은 트랜잭션에서 읽음
+            self.conn.execute("INSERT OR IGNORE INTO counters (name, value) VALUES ('segment', 0)")
+            self.conn.execute("UPDATE counters SET value = MAX(value + 1, ?) WHERE name = 'segment'", (floor,))
+            sid = self.conn.execute("SELECT value FROM counters WHERE name = 'segment'").fetchone()[0]
+            self.conn.commit()
+        return sid
+
+    def _open_segment(self, sid: int, create: bool = False) -> Optional[BinaryIO]:
+        """
+        세그먼트를 잠가서 열고 끝으로 이동 - 다른 프로세스가 잠갔거나 (정리로) 사라졌으면 None
+        """
+        flags = os.O_RDWR | (os.O_CREAT | os.O_EXCL if create else 0)
+        try:
+            f = os.fdopen(os.open(self._segment_path(sid), flags, 0o644), 'r+b')
+        except (FileNotFoundError, FileExistsError):
+            return None
+        if not _try_lock(f):
+            f.close()
+            return None
+        try:
+            # 잠금을 기다리지 않았어도 열고 잠그는 사이에 다른 프로세스가 정리로 지웠을 수 있음
+            same = os.fstat(f.fileno()).st_ino == os.stat(self._segment_path(sid)).st_ino
+        except FileNotFoundError:
+            same = False
+        if not same:
+            f.close()
+            return None
+        f.seek(0, os.SEEK_END)
+        return f
+
+    def _acquire(self) -> Tuple[int, BinaryIO]:
+        """쓸 세그먼트 빌리기 (다른 프로세스가 쓰는 중이거나 가득 찬 세그먼트는 건너뜀)"""
+        while True:
+            with self._lock:
+                sid = self._idle.pop() if self._idle else None
+                if sid is not None:
+                    self._leased.add(sid)
+            create = sid is None
+            if create:
+                sid = self._new_segment_id()
+                with self._lock:
+                    self._leased.add(sid)
+            f = self._open_segment(sid, create=create)
+            if f is not None and f.tell() < self.segment_size:
+                return sid, f
+            # 다른 프로세스가 쓰는 중이거나 채운 세그먼트는 이 프로세스의 대기 목록에서 뺌
+            if f is not None:
+                f.close()
+            with self._lock:
+                self._leased.discard(sid)
+
+    def _release(self, sid: int, f: BinaryIO) -> None:
+        size = f.seek(0, os.SEEK_END)
+        # 닫으면 잠금도 풀림
+        f.close()
+        with self._lock:
+            self._leased.discard(sid)
+            if size < self.segment_size:
+                self._idle.append(sid)
+
+    def _write_record(self, name: str, fill, key: Optional[Tuple[str, str]] = None,
+                      flags: int = 0, commit=None) -> Dict:
+        """
+        레코드 하나 추가 - 본문 길이와 해시는 fill(f)이 쓴 뒤 헤더에 채움
+
+        Args:
+            fill: 파일 객체를 받아 본문을 쓰고 (길이, sha256 digest)를 돌려주는 함수
+            commit: 세그먼트 잠금을 풀기 전에 기록을 받아 색인에 반영하는 함수
+                (잠금을 푼 뒤 색인하면 그 사이 다른 프로세스의 정리가 이 레코드를 빠뜨림)
+        """
+        seq = time.time_ns()
+        meta = json.dumps({'name': name, 'rcp_no': key[0] if key else None, 'dcm_no': key[1] if key else None,
+                           'seq': seq}, ensure_ascii=False).encode('utf-8')
+        sid, f = self._acquire()
+        record_offset = f.tell()
+        try:
+            f.write(_HEADER.pack(_MAGIC, flags, 0, bytes(32), len(meta)))
+            f.write(meta)
+            offset = f.tell()
+            length, digest = fill(f)
+            f.seek(record_offset)
+            f.write(_HEADER.pack(_MAGIC, flags, length, digest, len(meta)))
+            f.flush()
+        except BaseException:
+            # 쓰다 만 레코드는 잘라내어 세그먼트 끝을 항상 온전한 레코드로 유지
+            f.truncate(record_offset)
+            self._release(sid, f)
+            raise
+        row = {
+            'name': name, 'rcp_no': key[0] if key else None, 'dcm_no': key[1] if key else None,
+            'segment': sid, 'record_offset': record_offset, 'offset': offset, 'length': length,
+            'sha256': digest.hex(), 'seq': seq, 'stored_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        try:
+            if commit is not None:
+                commit(row)
+        finally:
+            self._release(sid, f)
+        return row
+
+    def _index(self, row: Dict) -> Dict:
+        with self._lock:
+            self.conn.execute(f"INSERT OR REPLACE INTO objects ({', '.join(_COLUMNS)}) "
+                              f"VALUES ({', '.join('?' * len(_COLUMNS))})", [row[c] for c in _COLUMNS])
+            self.conn.commit()
+        return row
+
+    # --- 쓰기 ---
+
+    def store_stream(self, name: str, raw, key: Optional[Tuple[str, str]] = None,
+                     buffer_size: int = DEFAULT_BUFFER_SIZE, expected_size: Optional[int] = None) -> Dict:
+        """
+        스트림(readinto 지원) 본문을 팩에 추가
+
+        Args:
+            name: 팩 안의 이름 (같은 이름이 있으면 새 레코드로 대체)
+            raw: response.raw 등 readinto를 지원하는 스트림
+            key: (rcpNo, dcmNo)
+            buffer_size: 읽기/쓰기 버퍼 크기
+            expected_size: 본문 크기 (Content-Length) - 다르면 레코드를 잘라내고 색인에 넣지 않음
+
+        Returns:
+            색인 기록
+
+        Raises:
+            IncompleteDownload: 받은 크기가 expected_size와 다른 경우
+        """
+        def fill(f):
+            digest = hashlib.sha256()
+            buf = bytearray(buffer_size)
+            view = memoryview(buf)
+            total = 0
+            while True:
+                length = raw.readinto(buf)
+                if not length:
+                    break
+                digest.update(view[:length])
+                f.write(view[:length])
+                total += length
+            if expected_size is not None and total != expected_size:
+                raise IncompleteDownload(f"파일 크기 불일치: {total} / {expected_size} bytes")
+            return total, digest.digest()
+
+        return self._write_record(name, fill, key, commit=self._index)
+
+    def put(self, name: str, data, key: Optional[Tuple[str, str]] = None) -> Dict:
+        """bytes(또는 memoryview) 본문을 팩에 추가"""
+        def fill(f):
+            f.write(data)
+            return len(data), hashlib.sha256(data).digest()
+
+        return self._write_record(name, fill, key, commit=self._index)
+
+    def delete(self, name: str) -> bool:
+        """삭제 기록(tombstone)을 추가하고 색인에서 제거 - 공간은 compact()에서 회수"""
+        if not self.get(name):
+            return False
+        def unindex(row: Dict) -> None:
+            with self._lock:
+                self.conn.execute('DELETE FROM objects WHERE name = ?', (name,))
+                self.conn.commit()
+
+        self._write_record(name, lambda f: (0, bytes(32)), flags=_FLAG_DELETED, commit=unindex)
+        return True
+
+    # --- 읽기 ---
+
+    def get(self, name: str) -> Optional[Dict]:
+        """이름으로 색인 기록 조회"""
+        with self._lock:
+            row = self.conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM objects WHERE name = ?", (name,)).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def find(self, rcp_no: str, dcm_no: Optional[str] = None) -> Optional[Dict]:
+        """(rcpNo, dcmNo)로 색인 기록 조회 (dcmNo가 없으면 해당 접수번호의 첫 문서)"""
+        query = f"SELECT {', '.join(_COLUMNS)} FROM objects WHERE rcp_no = ?"
+        params = [rcp_no]
+        if dcm_no:
+            query += " AND dcm_no = ?"
+            params.append(dcm_no)
+        with self._lock:
+            row = self.conn.execute(query + " ORDER BY dcm_no LIMIT 1", params).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def names(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            return [row[0] for row in self.conn.execute(
+                "SELECT name FROM objects WHERE substr(name, 1, ?) = ? ORDER BY name", (len(prefix), prefix))]
+
+    def _map(self, sid: int, end: int) -> mmap.mmap:
+        """세그먼트 mmap (기록이 현재 매핑 범위 밖이면 다시 매핑)"""
+        with self._lock:
+            mm = self._maps.get(sid)
+            if mm is None or len(mm) < end:
+                with open(self._segment_path(sid), 'rb') as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[sid] = mm
+            return mm
+
+    def read(self, name: str) -> Optional[memoryview]:
+        """
+        파일 본문 - 세그먼트 mmap 위의 memoryview (복사 없음, 읽기 전용)
+
+        Returns:
+            본문 memoryview (없으면 None)
+        """
+        for attempt in range(2):
+            entry = self.get(name)
+            if not entry:
+                return None
+            if not entry['length']:
+                return memoryview(b'')
+            try:
+                mm = self._map(entry['segment'], entry['offset'] + entry['length'])
+            except FileNotFoundError:
+                # 색인을 읽은 뒤 다른 프로세스가 세그먼트를 정리함 - 옮겨진 위치로 다시 조회
+                if attempt:
+                    raise
+                continue
+            return memoryview(mm)[entry['offset']:entry['offset'] + entry['length']]
+
+    def extract(self, name: str, dest_path: str) -> bool:
+        """파일 하나를 일반 파일로 꺼내기"""
+        data = self.read(name)
+        if data is None:
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        part_path = dest_path + '.part'
+        with open(part_path, 'wb') as f:
+            f.write(data)
+        os.replace(part_path, dest_path)
+        return True
+
+    # --- 관리 ---
+
+    def stats(self) -> Dict:
+        """파일 수, 유효 용량, 세그먼트 수/용량, 회수 가능한 비율"""
+        with self._lock:
+            count, live = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(offset + length - record_offset), 0) FROM objects').fetchone()
+        segments = self._segment_ids()
+        total = sum(os.path.getsize(self._segment_path(sid)) for sid in segments)
+        return {
+            'files': count,
+            'live_bytes': live,
+            'segments': len(segments),
+            'segment_bytes': total,
+            'garbage_ratio': round(1 - live / total, 3) if total else 0.0,
+        }
+
+    def compact(self, min_garbage: float = 0.25) -> Dict:
+        """
+        지웠거나 대체된 레코드가 min_garbage 비율 이상인 세그먼트를 유효 레코드만 새 세그먼트로 옮겨 정리
+
+        쓰는 중인 세그먼트가 있으면 건너뜀 (다운로드가 끝난 뒤 실행).
+        옮길 세그먼트는 파일 잠금을 잡은 뒤 옮기므로 다른 프로세스가 쓰는 중인 세그먼트는 이번 정리에서 제외.
+        옮긴 세그먼트의 삭제 기록도 함께 사라지므로, 이후 rebuild_index()는 다른 세그먼트에 남은
+        예전 버전을 되살릴 수 있음
+
+        Returns:
+            {'segments': 정리한 세그먼트 수, 'moved': 옮긴 파일 수, 'reclaimed_bytes': 회수한 용량}
+        """
+        with self._lock:
+            if self._leased:
+                print("  ⚠️ 쓰는 중인 세그먼트가 있어 정리를 건너뜀")
+                return {'segments': 0, 'moved': 0, 'reclaimed_bytes': 0}
+            live = dict(self.conn.execute(
+                'SELECT segment, SUM(offset + length - record_offset) FROM objects GROUP BY segment'))
+        sizes = {sid: os.path.getsize(self._segment_path(sid)) for sid in self._segment_ids()}
+        candidates = [sid for sid, size in sizes.items() if size and 1 - live.get(sid, 0) / size >= min_garbage]
+
+        # 옮기는 동안 다른 프로세스가 덧붙이지 않도록 잠금 - 잠그지 못한 세그먼트는 다음 정리로 미룸
+        locked: Dict[int, BinaryIO] = {}
+        for sid in candidates:
+            try:
+                f = open(self._segment_path(sid), 'rb')
+            except FileNotFoundError:
+                continue  # 다른 프로세스가 이미 정리함
+            if _try_lock(f):
+                locked[sid] = f
+            else:
+                f.close()
+        victims = sorted(locked)
+        if not victims:
+            return {'segments': 0, 'moved': 0, 'reclaimed_bytes': 0}
+
+        updates = []
+        moved_bytes = 0
+        victim_bytes = sum(os.fstat(f.fileno()).st_size for f in locked.values())
+        out_sid, out = None, None
+        try:
+            # 잠근 뒤에 읽으므로 잠금 전에 쓰인 레코드도 모두 색인에 있음 (쓰기는 잠금을 풀기 전에 색인)
+            with self._lock:
+                rows = self.conn.execute(
+                    f"SELECT name, segment, record_offset, offset, length FROM objects "
+                    f"WHERE segment IN ({', '.join('?' * len(victims))}) ORDER BY segment, record_offset",
+                    victims).fetchall()
+
+            for name, sid, record_offset, offset, length in rows:
+                if out is None or out.tell() >= self.segment_size:
+                    if out is not None:
+                        self._release(out_sid, out)
+                    out = None
+                    while out is None:
+                        out_sid = self._new_segment_id()
+                        out = self._open_segment(out_sid, create=True)
+                with mmap.mmap(locked[sid].fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    new_record_offset = out.tell()
+                    out.write(memoryview(mm)[record_offset:offset + length])
+                moved_bytes += offset + length - record_offset
+                updates.append((out_sid, new_record_offset, new_record_offset + offset - record_offset, name))
+            if out is not None:
+                out.flush()
+
+            with self._lock:
+                self.conn.executemany(
+                    'UPDATE objects SET segment = ?, record_offset = ?, offset = ? WHERE name = ?', updates)
+                self.conn.commit()
+
+                for sid in victims:
+                    mm = self._maps.pop(sid, None)
+                    if mm is not None:
+                        try:
+                            mm.close()
+                        except BufferError:
+                            pass
+                    os.remove(self._segment_path(sid))
+                self._idle = [sid for sid in self._idle if sid not in locked]
+        finally:
+            if out is not None:
+                self._release(out_sid, out)
+            # 지운 뒤에 잠금을 풀어 다른 프로세스가 옮기기 전 세그먼트에 덧붙이지 않도록 함
+            for f in locked.values():
+                f.close()
+
+        reclaimed = victim_bytes - moved_bytes
+        print(f"🗜️ 팩 정리: 세그먼트 {len(victims)}개, 파일 {len(updates)}개 이동, {reclaimed:,} bytes 회수")
+        return {'segments': len(victims), 'moved': len(updates), 'reclaimed_bytes': reclaimed}
+
+    def rebuild_index(self) -> int:
+        """
+        세그먼트를 처음부터 읽어 색인 다시 만들기 (색인 파일이 손상되었을 때)
+
+        이름마다 가장 최근(seq) 레코드를 사용하며, 헤더가 채워지지 않은 (쓰다 중단된) 레코드에서 해당 세그먼트 읽기를 멈춤
+
+        Returns:
+            색인한 파일 수
+        """
+        latest: Dict[str, Dict] = {}
+        for sid in self._segment_ids():
+            with open(self._segment_path(sid), 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                position = 0
+                while position + _HEADER.size <= size:
+                    f.seek(position)
+                    magic, flags, length, digest, meta_length = _HEADER.unpack(f.read(_HEADER.size))
+                    offset = position + _HEADER.size + meta_length
+                    if magic != _MAGIC or offset + length > size or (not flags and digest == bytes(32)):
+                        print(f"  ⚠️ 세그먼트 {sid}: {position} 위치 이후 레코드를 읽을 수 없음")
+                        break
+                    meta = json.loads(f.read(meta_length).decode('utf-8'))
+                    if meta['seq'] > latest.get(meta['name'], {}).get('seq', -1):
+                        latest[meta['name']] = {'seq': meta['seq'], 'deleted': True} if flags & _FLAG_DELETED else {
+                            'name': meta['name'], 'rcp_no': meta.get('rcp_no'), 'dcm_no': meta.get('dcm_no'),
+                            'segment': sid, 'record_offset': position, 'offset': offset, 'length': length,
+                            'sha256': digest.hex(), 'seq': meta['seq'], 'stored_at': None,
+                        }
+                    position = offset + length
+
+        rows = [row for row in latest.values() if not row.get('deleted')]
+        with self._lock:
+            self.conn.execute('DELETE FROM objects')
+            self.conn.executemany(f"INSERT INTO objects ({', '.join(_COLUMNS)}) "
+                                  f"VALUES ({', '.join('?' * len(_COLUMNS))})", [[row[c] for c in _COLUMNS] for row in rows])
+            self.conn.commit()
+        print(f"🔧 팩 색인 재구성: 파일 {len(rows)}개")
+        return len(rows)
+
+
+# 프로세스별로 연 팩 (프로세스 풀 작업에서도 SQLite 연결을 공유하지 않도록 pid로 구분)
+_open_packs: Dict[Tuple[int, str], PackFile] = {}
+_open_lock = threading.Lock()
+
+
+def pack_dir_for(save_dir: str) -> str:
+    return os.path.join(os.path.abspath(save_dir), PACK_DIRNAME)
+
+
+def has_pack(save_dir: str) -> bool:
+    return os.path.isfile(os.path.join(pack_dir_for(save_dir), PACK_INDEX_FILENAME))
+
+
+def open_pack(save_dir: str, segment_size: int = DEFAULT_SEGMENT_SIZE) -> PackFile:
+    """다운로드 폴더의 팩 열기 (같은 프로세스에서는 재사용)"""
+    key = (os.getpid(), pack_dir_for(save_dir))
+    with _open_lock:
+        pack = _open_packs.get(key)
+        if pack is None:
+            pack = _open_packs[key] = PackFile(key[1], segment_size)
+        return pack
+
+
+def pack_location(save_dir: str, name: str) -> str:
+    """매니페스트에 기록하는 위치 - pack://{다운로드 폴더 절대 경로}#{이름}"""
+    return f"{PACK_SCHEME}{os.path.abspath(save_dir)}#{name}"
+
+
+def split_location(location: str) -> Tuple[str, str]:
+    """pack:// 위치를 (다운로드 폴더, 이름)으로 분리"""
+    save_dir, _, name = location[len(PACK_SCHEME):].partition('#')
+    return save_dir, name
+
+
+def resolve_file(save_dir: str, name: str) -> Optional[str]:
+    """다운로드 폴더의 파일 위치 - 일반 파일이 있으면 그 경로, 팩에 있으면 pack:// 위치, 없으면 None"""
+    file_path = os.path.join(save_dir, name)
+    if os.path.isfile(file_path):
+        return file_path
+    if has_pack(save_dir) and open_pack(save_dir).get(name):
+        return pack_location(save_dir, name)
+    return None
+
+
+def read_file(path: str):
+    """일반 파일 경로나 pack:// 위치의 본문 (팩은 복사 없는 memoryview)"""
+    if path.startswith(PACK_SCHEME):
+        save_dir, name = split_location(path)
+        data = open_pack(save_dir).read(name)
+        if data is None:
+            raise FileNotFoundError(path)
+        return data
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def file_signature(path: str) -> str:
+    """변경 여부 확인용 서명 - 일반 파일은 크기와 수정 시각, 팩은 크기와 해시"""
+    if path.startswith(PACK_SCHEME):
+        save_dir, name = split_location(path)
+        entry = open_pack(save_dir).get(name) or {}
+        return f"{os.path.basename(name)}:{entry.get('length')}:{entry.get('sha256')}"
+    stat = os.stat(path)
+    return f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def pack_library(save_dir: str, remove_files: bool = True) -> Dict[str, int]:
+    """
+    기존 다운로드 폴더의 개별 파일(매니페스트 PDF, 섹션 HTML)을 팩으로 옮기기
+
+    Args:
+        save_dir: 다운로드 폴더
+        remove_files: 옮긴 원본 파일 삭제 여부
+
+    Returns:
+        {'files': 옮긴 파일 수, 'bytes': 옮긴 용량}
+    """
+    pack = open_pack(save_dir)
+    manifest = DownloadManifest(save_dir)
+    moved = total = 0
+
+    def move(name: str, key: Optional[Tuple[str, str]] = None) -> bool:
+        nonlocal moved, total
+        file_path = os.path.join(save_dir, name)
+        if not os.path.isfile(file_path):
+            return False
+        with open(file_path, 'rb') as f:
+            entry = pack.store_stream(name, f, key)
+        moved += 1
+        total += entry['length']
+        if remove_files:
+            os.remove(file_path)
+        return True
+
+    for entry in list(manifest.entries.values()):
+        if entry.get('filename') and move(entry['filename'], (entry['rcp_no'], entry['dcm_no'])):
+            manifest.record(entry['rcp_no'], entry['dcm_no'], location=pack_location(save_dir, entry['filename']))
+
+    for rcp_no in os.listdir(save_dir):
+        meta_path = os.path.join(save_dir, rcp_no, SECTIONS_FILENAME)
+        if not os.path.isfile(meta_path):
+            continue
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        for item in metadata.get('sections', []):
+            move(f"{rcp_no}/{item['filename']}", (rcp_no, item.get('dcm_no', '')))
+
+    manifest.compact()
+    print(f"📦 팩으로 이동: 파일 {moved}개 ({total:,} bytes) → {pack.pack_dir}")
+    return {'files': moved, 'bytes': total}
+
+
+class PackStorage(StorageBackend):
+    """다운로드 폴더마다 팩 하나에 저장하는 저장소"""
+
+    def __init__(self, segment_size: int = DEFAULT_SEGMENT_SIZE):
+        """
+        Args:
+            segment_size: 세그먼트 파일 최대 크기
+        """
+        self.segment_size = segment_size
+
+    def pack(self, save_dir: str) -> PackFile:
+        return open_pack(save_dir, self.segment_size)
+
+    def store(self, response: requests.Response, save_dir: str, filename: str,
+              buffer_size: int = DEFAULT_BUFFER_SIZE, key: Optional[Tuple[str, str]] = None) -> Tuple[int, str]:
+        raw = response.raw
+        raw.decode_content = True
+        entry = self.pack(save_dir).store_stream(filename, raw, key, buffer_size,
+                                                 expected_size=_expected_length(response))
+        return entry['length'], entry['sha256']
+
+    def write(self, save_dir: str, filename: str, data: bytes,
+              key: Optional[Tuple[str, str]] = None) -> None:
+        self.pack(save_dir).put(filename, data, key)
+
+    def location(self, save_dir: str, filename: str) -> str:
+        return pack_location(save_dir, filename)
+
+    def exists(self, save_dir: str, filename: str) -> Optional[int]:
+        entry = self.pack(save_dir).get(filename)
+        return entry['length'] if entry else None
+
+    def delete(self, save_dir: str, filename: str) -> None:
+        self.pack(save_dir).delete(filename)
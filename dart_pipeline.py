@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+검색 → dcmNo 조회 → PDF 다운로드 → 후처리 단계별 파이프라인
+단계마다 별도의 동시성과 크기가 제한된 대기열을 두어, 느린 단계가 있으면 앞 단계가 자연스럽게 멈추도록 합니다.
+"""
+
+from dart_scraper import DartScraper, REGULAR_PUBLIC_TYPES
+from dart_planner import plan_latest_versions
+from datetime import datetime, timedelta
+import threading
+import queue
+import time
+import os
+from typing import List, Dict, Optional, Callable, Iterable
+
+
+# 단계 종료 신호
+_STOP = object()
+
+
+class PipelineStage:
+    """파이프라인 한 단계 - 입력 대기열과 작업 스레드 묶음"""
+
+    def __init__(self, name: str, handler: Callable, workers: int, queue_size: int):
+        """
+        Args:
+            name: 단계 이름
+            handler: 항목 하나를 처리하는 함수 (다음 단계로 보낼 항목을 emit 콜백으로 전달)
+            workers: 작업 스레드 수
+            queue_size: 입력 대기열 최대 크기 (가득 차면 앞 단계가 대기)
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.next_stage: Optional['PipelineStage'] = None
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0
+        self._lock = threading.Lock()
+        self._finished_workers = 0
+        self._threads: List[threading.Thread] = []
+
+    def reset(self) -> None:
+        """이전 실행의 대기열, 작업 스레드, 처리 현황 초기화 (같은 파이프라인을 다시 실행할 때)"""
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0
+        self._finished_workers = 0
+        self._threads = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def _emit(self, item) -> None:
+        """다음 단계로 항목 전달 (대기열이 가득 차면 여기서 대기 - 배압)"""
+        if self.next_stage is not None:
+            self.next_stage.queue.put(item)
+
+    def _work(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+
+            with self._lock:
+                self.busy += 1
+            try:
+                ok = self.handler(item, self._emit)
+                with self._lock:
+                    if ok is False:
+                        self.failed += 1
+                    else:
+                        self.processed += 1
+            except Exception as e:
+                print(f"  ❌ [{self.name}] 처리 실패: {e}")
+                with self._lock:
+                    self.failed += 1
+            finally:
+                with self._lock:
+                    self.busy -= 1
+
+        # 마지막 작업 스레드가 끝나면 다음 단계 작업 스레드 수만큼 종료 신호 전달
+        with self._lock:
+            self._finished_workers += 1
+            last = self._finished_workers == self.workers
+        if last and self.next_stage is not None:
+            for _ in range(self.next_stage.workers):
+                self.next_stage.queue.put(_STOP)
+
+
+class ReportPipeline:
+    """검색 → dcmNo 조회 → PDF 다운로드 → 후처리 파이프라인"""
+
+    def __init__(self, scraper: DartScraper, download_dir: str,
+                 search_workers: int = 1, resolve_workers: int = 2,
+                 download_workers: int = 2, post_workers: int = 1,
+                 queue_size: int = 20, request_delay: float = 0.5,
+                 post_process: Optional[Callable[[Dict, Dict], None]] = None,
+                 status_interval: float = 10.0):
+        """
+        Args:
+            scraper: 세션이 준비된 DartScraper
+            download_dir: PDF 저장 폴더
+            search_workers: 검색 페이지 조회 동시성 (회사 단위로 병렬)
+            resolve_workers: dcmNo 조회 동시성
+            download_workers: PDF 다운로드 동시성
+            post_workers: 후처리 동시성
+            queue_size: 단계 사이 대기열 최대 크기
+            request_delay: 작업 스레드별 요청 후 대기 시간 (서버 부하 방지)
+            post_process: 다운로드 성공 후 호출할 함수 (report, download_info)
+            status_interval: 대기열 현황 출력 주기 (초, 0이면 출력 안 함)
+        """
+        self.scraper = scraper
+        self.download_dir = download_dir
+        self.request_delay = request_delay
+        self.post_process = post_process
+        self.status_interval = status_interval
+
+        self.stages = [
+            PipelineStage('search', self._search, search_workers, queue_size),
+            PipelineStage('resolve', self._resolve, resolve_workers, queue_size),
+            PipelineStage('download', self._download, download_workers, queue_size),
+            PipelineStage('post', self._post, post_workers, queue_size),
+        ]
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.next_stage = next_stage
+
+        self.search_options = {}
+
+    def queue_depths(self) -> Dict[str, int]:
+        """단계별 입력 대기열에 쌓인 항목 수 (병목 확인용)"""
+        return {stage.name: stage.queue.qsize() for stage in self.stages}
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """단계별 처리 현황"""
+        return {
+            stage.name: {
+                'queued': stage.queue.qsize(),
+                'capacity': stage.queue.maxsize,
+                'busy': stage.busy,
+                'workers': stage.workers,
+                'processed': stage.processed,
+                'failed': stage.failed,
+            }
+            for stage in self.stages
+        }
+
+    def print_status(self) -> None:
+        """단계별 대기열 현황 출력"""
+        parts = []
+        for name, stat in self.stats().items():
+            parts.append(f"{name} {stat['queued']}/{stat['capacity']} (작업 {stat['busy']}/{stat['workers']}, 완료 {stat['processed']}, 실패 {stat['failed']})")
+        print("📊 대기열: " + " | ".join(parts))
+
+    # --- 단계별 처리 함수 ---
+
+    def _search(self, company_name: str, emit: Callable) -> bool:
+        """회사 하나의 검색 결과를 모두 조회한 뒤 기간별 최신본만 다음 단계로 전달"""
+        options = self.search_options
+        found = []
+        ok = True
+        for page in range(1, options['max_pages'] + 1):
+            try:
+                page_results = self.scraper.search_page(
+                    company_name, options['start_date'], options['end_date'],
+                    page=page, public_types=options['public_types'], raise_errors=True
+                )
+            except Exception as e:
+                # 이미 찾은 보고서는 계속 처리하되, 나머지 페이지를 확인하지 못했으므로 실패로 집계
+                print(f"  ❌ {company_name}: {page}페이지 검색 실패 ({len(found)}건까지 전달): {e}")
+                ok = False
+                break
+            if not page_results:
+                break
+
+            found.extend(page_results)
+            time.sleep(self.request_delay)
+
+        # 정정 공시는 원본과 다른 페이지에 있을 수 있으므로 회사 단위로 모은 뒤 선별
+        planned = plan_latest_versions(found, options.get('keep_all_versions', False))
+        for report in planned:
+            emit(report)
+
+        if ok:
+            print(f"  🔍 {company_name}: {len(found)}건 발견")
+        return ok and bool(found)
+
+    def _resolve(self, report: Dict, emit: Callable) -> bool:
+        """보고서 페이지에서 dcmNo 조회"""
+        report_url = report.get('report_url')
+        if not report_url:
+            print("  ❌ 보고서 URL이 없습니다.")
+            return False
+
+        download_info = self.scraper.get_report_download_info(report_url)
+        time.sleep(self.request_delay)
+        if not download_info:
+            return False
+
+        emit((report, download_info))
+        return True
+
+    def _download(self, item, emit: Callable) -> bool:
+        """PDF 다운로드"""
+        report, download_info = item
+        ok = self.scraper.download_report_file(download_info, self.download_dir, report=report)
+        time.sleep(self.request_delay)
+        if not ok:
+            return False
+
+        emit(item)
+        return True
+
+    def _post(self, item, emit: Callable) -> bool:
+        """다운로드 후처리"""
+        if self.post_process is not None:
+            report, download_info = item
+            self.post_process(report, download_info)
+        return True
+
+    # --- 실행 ---
+
+    def _monitor(self, done: threading.Event) -> None:
+        while not done.wait(self.status_interval):
+            self.print_status()
+
+    def _run(self, first_stage: int, items: Iterable) -> Dict[str, Dict[str, int]]:
+        for stage in self.stages:
+            stage.reset()
+        active = self.stages[first_stage:]
+        for stage in active:
+            stage.start()
+
+        done = threading.Event()
+        monitor = None
+        if self.status_interval > 0:
+            monitor = threading.Thread(target=self._monitor, args=(done,), daemon=True)
+            monitor.start()
+
+        head = active[0]
+        try:
+            for item in items:
+                head.queue.put(item)
+            for _ in range(head.workers):
+                head.queue.put(_STOP)
+
+            for stage in active:
+                stage.join()
+        finally:
+            done.set()
+
+        print("\n" + "=" * 80)
+        print("🎉 파이프라인 완료!")
+        self.print_status()
+        if self.download_dir:
+            print(f"  📁 저장 위치: {os.path.abspath(self.download_dir)}")
+        return self.stats()
+
+    def run_companies(self, company_names: List[str], years: int = 10, max_pages: int = 20,
+                      public_types: Optional[List[str]] = REGULAR_PUBLIC_TYPES,
+                      keep_all_versions: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        회사 목록을 검색부터 다운로드까지 파이프라인으로 처리
+
+        Args:
+            company_names: 검색할 회사명 목록
+            years: 검색 기간 (년)
+            max_pages: 회사별 최대 검색 페이지 수
+            public_types: 공시유형 코드 목록 (None이면 전체)
+            keep_all_versions: False이면 같은 회사·기간의 정정 공시 중 최신본만 처리
+
+        Returns:
+            단계별 처리 현황
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=years * 365)
+        self.search_options = {
+            'start_date': start_date.strftime('%Y%m%d'),
+            'end_date': end_date.strftime('%Y%m%d'),
+            'max_pages': max_pages,
+            'public_types': public_types,
+            'keep_all_versions': keep_all_versions,
+        }
+
+        print(f"\n🚚 파이프라인 시작: 회사 {len(company_names)}개")
+        print(f"📁 다운로드 폴더: {self.download_dir}")
+        print("=" * 80)
+        return self._run(0, company_names)
+
+    def run_reports(self, reports: List[Dict], keep_all_versions: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        이미 검색된 보고서 목록을 dcmNo 조회 단계부터 처리
+
+        Args:
+            reports: 검색 결과 리스트
+            keep_all_versions: False이면 같은 회사·기간의 정정 공시 중 최신본만 처리
+
+        Returns:
+            단계별 처리 현황
+        """
+        reports = plan_latest_versions(reports, keep_all_versions)
+        print(f"\n🚚 파이프라인 시작: 보고서 {len(reports)}개")
+        print(f"📁 다운로드 폴더: {self.download_dir}")
+        print("=" * 80)
+        return self._run(1, reports)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+정기공시 다운로드 계획
+보고서명을 (보고서 유형, 회계기간, 정정 구분)으로 해석하여 같은 회사·기간의 정정 공시 중 최신본만 고르고,
+실제로 받기 전에 받을 용량과 소요 시간을 추정합니다.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+
+REPORT_TYPES = ('사업보고서', '반기보고서', '분기보고서')
+
+_FLAG_PATTERN = re.compile(r'\[([^\]]+)\]')
+_PERIOD_PATTERN = re.compile(r'\((\d{4})\.(\d{2})\)')
+
+
+def parse_report_name(report_name: str) -> Dict:
+    """
+    보고서명 해석
+
+    예: '[기재정정]사업보고서 (2022.12)' → {'report_type': '사업보고서', 'period': '2022.12', 'amendments': ['기재정정']}
+
+    Returns:
+        report_type, period, amendments (정정 구분 목록) - 해석하지 못한 항목은 ''
+    """
+    amendments = _FLAG_PATTERN.findall(report_name)
+    body = _FLAG_PATTERN.sub('', report_name)
+
+    report_type = ''
+    for name in REPORT_TYPES:
+        if name in body:
+            report_type = name
+            break
+
+    period_match = _PERIOD_PATTERN.search(body)
+    period = f"{period_match.group(1)}.{period_match.group(2)}" if period_match else ''
+
+    return {
+        'report_type': report_type,
+        'period': period,
+        'amendments': amendments,
+    }
+
+
+def version_key(report: Dict) -> Optional[Tuple[str, str, str]]:
+    """같은 보고서의 버전끼리 묶는 키 (회사, 보고서 유형, 회계기간) - 해석할 수 없으면 None"""
+    parsed = parse_report_name(report.get('report_name', ''))
+    if not parsed['report_type'] or not parsed['period']:
+        return None
+    company = report.get('corp_name') or report.get('company', '')
+    return company, parsed['report_type'], parsed['period']
+
+
+def _version_order(report: Dict) -> Tuple[str, str]:
+    """최신 버전 판단 기준 - rcpNo(접수일+일련번호), 없으면 접수일"""
+    return report.get('rcp_no', ''), report.get('submit_date', '')
+
+
+def plan_latest_versions(reports: List[Dict], keep_all_versions: bool = False) -> List[Dict]:
+    """
+    회사·보고서 유형·회계기간별로 가장 최근에 제출된 버전만 남김
+
+    Args:
+        reports: 검색 결과 리스트
+        keep_all_versions: True이면 정정 전 버전도 모두 유지
+
+    Returns:
+        다운로드할 보고서 리스트 (원래 순서 유지)
+    """
+    if keep_all_versions:
+        return list(reports)
+
+    latest: Dict[Tuple[str, str, str], Dict] = {}
+    for report in reports:
+        key = version_key(report)
+        if key is None:
+            continue
+        current = latest.get(key)
+        if current is None or _version_order(report) > _version_order(current):
+            latest[key] = report
+
+    keep_ids = {id(report) for report in latest.values()}
+    planned = [report for report in reports if version_key(report) is None or id(report) in keep_ids]
+
+    skipped = len(reports) - len(planned)
+    if skipped:
+        print(f"🗂️ 정정 이전 버전 {skipped}건 제외 - 기간별 최신본 {len(planned)}건만 다운로드")
+    return planned
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:,.1f}{unit}" if unit != 'B' else f"{int(size)}B"
+        size /= 1024
+    return f"{size:,.1f}GB"
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}시간 {minutes}분"
+    if minutes:
+        return f"{minutes}분 {seconds}초"
+    return f"{seconds}초"
+
+
+def estimate_downloads(scraper, reports: List[Dict], save_dir: str, workers: int = 4,
+                       keep_all_versions: bool = False,
+                       bandwidth: Optional[float] = None, pause: float = 1.0) -> Dict:
+    """
+    실제로 받지 않고 일괄 다운로드 규모 추정 (드라이런)
+
+    dcmNo는 캐시와 다운로드 매니페스트에서 먼저 찾고, 파일 크기는 HEAD/구간 요청으로 동시에 확인
+
+    Args:
+        scraper: DartScraper
+        reports: 검색 결과 리스트
+        save_dir: 다운로드 폴더 (이미 받은 파일 확인용)
+        workers: 동시 확인 수 (요청 한도는 scraper가 지킴)
+        keep_all_versions: False이면 정정 공시 중 최신본만 계산
+        bandwidth: 예상 전송 속도 (bytes/s, None이면 전송 시간 제외)
+        pause: 일괄 다운로드가 보고서마다 쉬는 시간 (초)
+
+    Returns:
+        총 파일 수, 이미 받은 파일, 받을 용량, 예상 소요 시간 등
+    """
+    planned = plan_latest_versions(reports, keep_all_versions)
+    manifest = scraper.get_manifest(save_dir)
+
+    def probe(report: Dict) -> Dict:
+        item = {'report': report, 'local': False, 'size': None, 'requests': 0, 'viewer': False}
+        report_url = report.get('report_url')
+        rcp_no = report.get('rcp_no', '')
+        if not report_url:
+            return item
+
+        # 매니페스트에 기록되어 있고 파일이 그대로 있으면 이미 받은 것으로 처리
+        entry = manifest.find_rcp(rcp_no) if rcp_no else None
+        if entry:
+            # 팩·S3 저장소도 확인할 수 있도록 저장소 백엔드로 조회
+            if scraper.storage.exists(save_dir, entry.get('filename', '')) == entry.get('size'):
+                item.update(local=True, size=entry['size'])
+                return item
+            download_info = scraper.build_download_info(entry['rcp_no'], entry['dcm_no'])
+            # 매니페스트로 만든 정보는 dcmNo 캐시에 없으므로 실제 다운로드 때 뷰어 페이지를 다시 조회
+            item['viewer'] = True
+        else:
+            download_info = scraper.get_report_download_info(report_url)
+            item['requests'] += 1
+        if not download_info:
+            return item
+
+        item['size'] = scraper.probe_download_size(download_info)
+        item['requests'] += 1
+        return item
+
+    print(f"\n🧮 다운로드 계획 확인 중... ({len(planned)}개 보고서)")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        items = list(executor.map(probe, planned))
+
+    local = [item for item in items if item['local']]
+    remote = [item for item in items if not item['local']]
+    known = [item['size'] for item in remote if item['size'] is not None]
+    unknown = len(remote) - len(known)
+    remote_bytes = sum(known)
+
+    # 다운로드할 보고서마다 PDF 요청 1회, 캐시에 없는 dcmNo는 뷰어 페이지 1회,
+    # 크기를 확인하지 못한 보고서(서버가 PDF를 바로 주지 않음)는 보고서/다운로드 페이지 방문 후 재요청 3회
+    rate = scraper.rate_limiter.rate
+    request_count = sum(1 + item['viewer'] + (3 if item['size'] is None else 0) for item in remote)
+    seconds = request_count / rate if rate > 0 else 0
+    seconds += pause * len(remote)
+    if bandwidth:
+        seconds += remote_bytes / bandwidth
+
+    estimate = {
+        'total_reports': len(planned),
+        'skipped_versions': len(reports) - len(planned),
+        'local_files': len(local),
+        'local_bytes': sum(item['size'] or 0 for item in local),
+        'download_files': len(remote),
+        'download_bytes': remote_bytes,
+        'unknown_sizes': unknown,
+        'probe_requests': sum(item['requests'] for item in items),
+        'estimated_requests': request_count,
+        'estimated_seconds': seconds,
+    }
+
+    print("=" * 80)
+    print(f"📋 다운로드 계획: {estimate['total_reports']}개 보고서")
+    print(f"  ✅ 이미 받음: {estimate['local_files']}개 ({_format_bytes(estimate['local_bytes'])})")
+    print(f"  📥 받을 파일: {estimate['download_files']}개 ({_format_bytes(remote_bytes)}"
+          + (f", 크기 확인 불가 {unknown}개" if unknown else "") + ")")
+    print(f"  ⏱️ 예상 소요: 약 {_format_duration(seconds)} (요청 {request_count}회, 초당 {rate:g}회 기준"
+          + (f", 보고서마다 {pause:g}초 대기" if pause else "")
+          + (f", 전송 {_format_bytes(bandwidth)}/s" if bandwidth else "") + ")")
+    return estimate
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+대화형 다운로드 미리 준비
+검색 결과를 보여준 직후, 사용자가 다운로드 여부를 고르는 동안 뒤에서 보고서별 dcmNo를 조회하고
+PDF 크기를 확인해 둡니다. (크기 확인 요청이 다운로드 서버 세션과 연결도 미리 데움)
+확인하면 캐시된 정보로 바로 전송을 시작하고, 취소하면 남은 작업만 버립니다.
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from typing import List, Dict, Optional
+
+from dart_planner import plan_latest_versions
+
+
+class _QuietThreads:
+    """sys.stdout 대체 - 미리 준비 스레드의 출력은 버려 입력 프롬프트를 어지럽히지 않음"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.threads = set()
+
+    def write(self, text: str) -> int:
+        if threading.get_ident() in self.threads:
+            return len(text)
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class ReportPrefetcher:
+    """다운로드 확인을 기다리는 동안 dcmNo 조회와 크기 확인을 미리 수행"""
+
+    def __init__(self, scraper, reports: List[Dict], save_dir: str, workers: int = 2,
+                 probe_sizes: bool = True, keep_all_versions: bool = False):
+        """
+        Args:
+            scraper: DartScraper (조회 결과는 scraper 캐시에 남아 일괄 다운로드와 용량 확인이 그대로 사용)
+            reports: 검색 결과 리스트
+            save_dir: 다운로드 폴더 (이미 받은 보고서는 건너뜀)
+            workers: 동시 조회 수 (요청 한도는 scraper가 지킴)
+            probe_sizes: PDF 크기도 확인할지 여부
+            keep_all_versions: False이면 일괄 다운로드와 같이 정정 공시 중 최신본만 준비
+        """
+        self.scraper = scraper
+        self.reports = plan_latest_versions(reports, keep_all_versions)
+        self.save_dir = save_dir
+        self.workers = max(1, workers)
+        self.probe_sizes = probe_sizes
+        self.resolved = 0
+        self.sized = 0
+        self.failed = 0
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures = []
+        self._output: Optional[_QuietThreads] = None
+
+    def start(self) -> None:
+        """뒤에서 준비 시작 (보고서 순서대로 - 일괄 다운로드가 먼저 받을 보고서부터)"""
+        self._output = _QuietThreads(sys.stdout)
+        sys.stdout = self._output
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='prefetch',
+                                            initializer=self._register_thread)
+        self._futures = [self._executor.submit(self._prefetch, report) for report in self.reports]
+
+    def _register_thread(self) -> None:
+        self._output.threads.add(threading.get_ident())
+
+    def _prefetch(self, report: Dict) -> None:
+        if self._cancelled.is_set() or not report.get('report_url'):
+            return
+
+        entry = self.scraper.get_manifest(self.save_dir).find_rcp(report.get('rcp_no', ''))
+        if entry:
+            return
+
+        download_info = self.scraper.get_report_download_info(report['report_url'])
+        with self._lock:
+            if download_info:
+                self.resolved += 1
+            else:
+                self.failed += 1
+        if not download_info or not self.probe_sizes or self._cancelled.is_set():
+            return
+
+        if self.scraper.probe_download_size(download_info) is not None:
+            with self._lock:
+                self.sized += 1
+
+    def progress(self) -> Dict[str, int]:
+        with self._lock:
+            return {'total': len(self.reports), 'resolved': self.resolved, 'sized': self.sized, 'failed': self.failed}
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """모든 준비가 끝날 때까지 대기 (용량 확인처럼 같은 정보가 전부 필요할 때)"""
+        wait_futures(self._futures, timeout=timeout)
+
+    def stop(self, wait: bool = True) -> Dict[str, int]:
+        """
+        남은 준비 작업 취소
+
+        Args:
+            wait: True이면 진행 중인 요청(최대 workers개)이 끝날 때까지 대기 - 다운로드가 같은 보고서를 중복 조회하지 않도록.
+                  False이면 바로 반환 (진행 중인 요청은 뒤에서 끝나고 결과는 캐시에만 남음)
+
+        Returns:
+            준비한 결과 (progress)
+        """
+        self._cancelled.set()
+        if self._executor is None:
+            return self.progress()
+
+        executor, self._executor = self._executor, None
+        if wait:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._restore_output()
+        else:
+            executor.shutdown(wait=False, cancel_futures=True)
+            threading.Thread(target=self._restore_after, args=(executor,), daemon=True).start()
+        return self.progress()
+
+    def _restore_after(self, executor: ThreadPoolExecutor) -> None:
+        executor.shutdown(wait=True)
+        self._restore_output()
+
+    def _restore_output(self) -> None:
+        if sys.stdout is self._output:
+            sys.stdout = self._output.stream
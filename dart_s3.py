@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+S3 호환 객체 저장소 (AWS S3, MinIO 등)
+다운로드 응답 본문을 임시 파일 없이 멀티파트 업로드로 바로 올립니다.
+파트마다 Content-MD5와 SigV4 본문 해시로 전송 무결성을 확인하고, 전체 SHA-256은 스트리밍 중에 계산합니다.
+서명(SigV4)은 requests로 직접 만들므로 boto3가 필요하지 않습니다.
+"""
+
+import base64
+import hashlib
+import hmac
+import mimetypes
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import quote, urlparse
+from xml.sax.saxutils import escape
+
+import requests
+
+from dart_storage import StorageBackend, IncompleteDownload, DEFAULT_BUFFER_SIZE, _expected_length
+
+
+# S3 멀티파트 최소 파트 크기 (마지막 파트 제외)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class S3Error(IOError):
+    """S3 요청 실패"""
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()
+
+
+def _read_full(raw, view: memoryview) -> int:
+    """버퍼가 가득 차거나 본문이 끝날 때까지 읽기"""
+    filled = 0
+    while filled < len(view):
+        n = raw.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+class S3Storage(StorageBackend):
+    """S3 호환 저장소 - 경로 방식 주소 (endpoint/bucket/key)"""
+
+    def __init__(self, endpoint: str, bucket: str, prefix: str = "",
+                 access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 region: str = "us-east-1", part_size: int = 8 * 1024 * 1024,
+                 session: Optional[requests.Session] = None):
+        """
+        Args:
+            endpoint: 저장소 주소 (예: https://s3.ap-northeast-2.amazonaws.com, http://127.0.0.1:9000)
+            bucket: 버킷 이름
+            prefix: 객체 키 앞에 붙일 경로
+            access_key: 접근 키 (None이면 AWS_ACCESS_KEY_ID 환경 변수)
+            secret_key: 비밀 키 (None이면 AWS_SECRET_ACCESS_KEY 환경 변수)
+            region: 서명에 사용할 리전
+            part_size: 멀티파트 파트 크기 (최소 5MB, 이보다 작은 파일은 한 번에 업로드)
+            session: 업로드용 세션 (None이면 새로 생성 - DART 세션과 분리)
+        """
+        self.endpoint = endpoint.rstrip('/')
+        self.host = urlparse(self.endpoint).netloc
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.access_key = access_key or os.environ.get('AWS_ACCESS_KEY_ID', '')
+        self.secret_key = secret_key or os.environ.get('AWS_SECRET_ACCESS_KEY', '')
+        self.region = region
+        self.part_size = max(MIN_PART_SIZE, part_size)
+        self._local = threading.local()
+        self._session = session
+
+    @property
+    def session(self) -> requests.Session:
+        """스레드별 업로드 세션"""
+        if self._session is not None:
+            return self._session
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def key_for(self, save_dir: str, filename: str) -> str:
+        """객체 키 - {prefix}/{다운로드 폴더 이름}/{파일명}"""
+        parts = [self.prefix, os.path.basename(os.path.normpath(save_dir)), filename]
+        return '/'.join(part for part in parts if part)
+
+    # --- SigV4 요청 ---
+
+    def _request(self, method: str, key: str, query: Optional[Dict[str, str]] = None,
+                 body: bytes = b'', headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        query = query or {}
+        headers = dict(headers or {})
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        date = now.strftime('%Y%m%d')
+        payload_hash = hashlib.sha256(body).hexdigest()
+
+        headers.update({'Host': self.host, 'x-amz-date': amz_date, 'x-amz-content-sha256': payload_hash})
+        canonical_uri = quote(f"/{self.bucket}/{key}", safe='/~')
+        canonical_query = '&'.join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}"
+                                   for k, v in sorted(query.items()))
+        signed = sorted((name.lower(), str(value).strip()) for name, value in headers.items())
+        signed_headers = ';'.join(name for name, _ in signed)
+        canonical_request = '\n'.join([
+            method, canonical_uri, canonical_query,
+            ''.join(f"{name}:{value}\n" for name, value in signed),
+            signed_headers, payload_hash,
+        ])
+
+        scope = f"{date}/{self.region}/s3/aws4_request"
+        string_to_sign = '\n'.join(['AWS4-HMAC-SHA256', amz_date, scope,
+                                    hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()])
+        signing_key = _hmac(_hmac(_hmac(_hmac(f"AWS4{self.secret_key}".encode('utf-8'), date),
+                                        self.region), 's3'), 'aws4_request')
+        signature = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+        headers['Authorization'] = (f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+                                    f"SignedHeaders={signed_headers}, Signature={signature}")
+
+        url = f"{self.endpoint}{canonical_uri}" + (f"?{canonical_query}" if canonical_query else '')
+        response = self.session.request(method, url, data=body, headers=headers, timeout=60)
+        if response.status_code >= 300 and not (method in ('HEAD', 'DELETE') and response.status_code == 404):
+            raise S3Error(f"S3 {method} {key} 실패: HTTP {response.status_code} {response.text[:200]}")
+        return response
+
+    def _put_part(self, key: str, upload_id: Optional[str], part_number: int, data: bytes) -> str:
+        """파트 하나 업로드 (upload_id가 None이면 단일 PUT) - ETag 반환"""
+        md5 = base64.b64encode(hashlib.md5(data).digest()).decode('ascii')
+        query = {'partNumber': str(part_number), 'uploadId': upload_id} if upload_id else {}
+        headers = {'Content-MD5': md5, 'Content-Length': str(len(data))}
+        if not upload_id:
+            headers['Content-Type'] = mimetypes.guess_type(key)[0] or 'application/octet-stream'
+        response = self._request('PUT', key, query, body=data, headers=headers)
+        return response.headers.get('ETag', '')
+
+    # --- StorageBackend ---
+
+    def store(self, response: requests.Response, save_dir: str, filename: str,
+              buffer_size: int = DEFAULT_BUFFER_SIZE, key: Optional[Tuple[str, str]] = None) -> Tuple[int, str]:
+        """
+        응답 본문을 파트 크기씩 읽어 멀티파트로 업로드 (파트 하나 크기의 메모리만 사용)
+
+        첫 파트를 읽은 뒤 본문이 끝났으면 단일 PUT으로 업로드.
+        받은 크기가 Content-Length와 다르면 완료 요청 전에 업로드를 취소하므로 잘린 객체가 생기지 않음
+        """
+        object_key = self.key_for(save_dir, filename)
+        expected = _expected_length(response)
+        raw = response.raw
+        raw.decode_content = True
+        digest = hashlib.sha256()
+        buf = bytearray(self.part_size)
+        view = memoryview(buf)
+        total = 0
+
+        length = _read_full(raw, view)
+        digest.update(view[:length])
+        total += length
+        first = bytes(view[:length])
+
+        next_length = _read_full(raw, view) if length == self.part_size else 0
+        if not next_length:
+            if expected is not None and total != expected:
+                raise IncompleteDownload(f"파일 크기 불일치: {total} / {expected} bytes")
+            self._put_part(object_key, None, 1, first)
+            return total, digest.hexdigest()
+
+        created = self._request('POST', object_key, {'uploads': ''}, headers={'Content-Type': 'application/pdf'})
+        upload_id_match = re.search(r'<UploadId>([^<]+)</UploadId>', created.text)
+        if not upload_id_match:
+            raise S3Error(f"멀티파트 업로드 시작 실패: {created.text[:200]}")
+        upload_id = upload_id_match.group(1)
+
+        parts: List[Tuple[int, str]] = []
+        try:
+            parts.append((1, self._put_part(object_key, upload_id, 1, first)))
+            length = next_length
+            while length:
+                digest.update(view[:length])
+                total += length
+                parts.append((len(parts) + 1, self._put_part(object_key, upload_id, len(parts) + 1, bytes(view[:length]))))
+                length = _read_full(raw, view)
+            if expected is not None and total != expected:
+                raise IncompleteDownload(f"파일 크기 불일치: {total} / {expected} bytes")
+
+            body = ('<CompleteMultipartUpload>' + ''.join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{escape(etag)}</ETag></Part>"
+                for number, etag in parts) + '</CompleteMultipartUpload>').encode('utf-8')
+            completed = self._request('POST', object_key, {'uploadId': upload_id}, body=body,
+                                      headers={'Content-Type': 'application/xml'})
+            # 완료 요청은 200 응답 본문에 오류를 담을 수 있음
+            if '<Error>' in completed.text:
+                raise S3Error(f"멀티파트 업로드 완료 실패: {completed.text[:200]}")
+        except BaseException:
+            try:
+                self._request('DELETE', object_key, {'uploadId': upload_id})
+            except Exception as e:
+                print(f"  ⚠️ 멀티파트 업로드 취소 실패: {e}")
+            raise
+
+        print(f"  ☁️ {len(parts)}개 파트로 업로드: s3://{self.bucket}/{object_key}")
+        return total, digest.hexdigest()
+
+    def write(self, save_dir: str, filename: str, data: bytes,
+              key: Optional[Tuple[str, str]] = None) -> None:
+        self._put_part(self.key_for(save_dir, filename), None, 1, data)
+
+    def location(self, save_dir: str, filename: str) -> str:
+        return f"s3://{self.bucket}/{self.key_for(save_dir, filename)}"
+
+    def exists(self, save_dir: str, filename: str) -> Optional[int]:
+        response = self._request('HEAD', self.key_for(save_dir, filename))
+        if response.status_code == 404:
+            return None
+        return int(response.headers.get('Content-Length', 0))
+
+    def delete(self, save_dir: str, filename: str) -> None:
+        self._request('DELETE', self.key_for(save_dir, filename))
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+마감 시각·우선순위 기반 일괄 다운로드 스케줄러
+검색 순서 대신 회사 등급, 보고서 유형, 최신성으로 점수를 매겨 중요한 보고서부터 받고,
+마감 시각 안에 끝낼 수 없는 보고서는 체크포인트 파일에 남겨 다음 실행에서 이어 받습니다.
+
+    scheduler = DownloadScheduler(scraper, download_dir, deadline=parse_deadline("08:00"),
+                                  rules=PriorityRules(tiers=load_company_tiers("index_companies.txt")))
+    scraper.download_reports_batch(reports, download_dir, scheduler=scheduler)
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterable, Tuple
+
+from dart_planner import REPORT_TYPES, parse_report_name, _format_duration
+
+
+SCHEDULE_CHECKPOINT_FILENAME = ".dart_schedule.json"
+
+# 아침 작업 기준 기본 유형 순서 - 새 분기보고서가 가장 급함
+DEFAULT_TYPE_ORDER = ('분기보고서', '반기보고서', '사업보고서')
+
+PRIORITY = 'priority'
+BACKFILL = 'backfill'
+
+_DEADLINE_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})$')
+
+
+def parse_deadline(value: str, now: Optional[datetime] = None) -> datetime:
+    """
+    마감 시각 해석
+
+    'HH:MM'이면 다음에 오는 그 시각 (이미 지났으면 다음 날), 그 외에는 ISO 형식 (예: 2024-03-15T08:00)
+
+    Raises:
+        ValueError: 해석할 수 없는 형식
+    """
+    now = now or datetime.now()
+    match = _DEADLINE_PATTERN.match(value.strip())
+    if match:
+        deadline = now.replace(hour=int(match.group(1)), minute=int(match.group(2)), second=0, microsecond=0)
+        return deadline if deadline > now else deadline + timedelta(days=1)
+    return datetime.fromisoformat(value.strip())
+
+
+def load_company_tiers(txt_file: str) -> Dict[str, int]:
+    """
+    회사 등급 파일 읽기
+
+    한 줄에 '회사명' 또는 '회사명,등급' (탭도 가능, 등급 생략 시 1, 1이 가장 높음), # 주석 허용
+    """
+    tiers = {}
+    with open(txt_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = re.split(r'[,\t]', line, maxsplit=1)
+            tier = parts[1].strip() if len(parts) > 1 else ''
+            tiers[parts[0].strip()] = int(tier) if tier.isdigit() and int(tier) > 0 else 1
+    return tiers
+
+
+class PriorityRules:
+    """보고서 우선순위 규칙 - 회사 등급, 보고서 유형, 최신성 점수의 합"""
+
+    def __init__(self, tiers: Optional[Dict[str, int]] = None,
+                 type_order: Iterable[str] = DEFAULT_TYPE_ORDER,
+                 recent_days: int = 120, tier_weight: float = 100.0,
+                 type_weight: float = 20.0, recency_weight: float = 30.0):
+        """
+        Args:
+            tiers: 회사명 → 등급 (1이 가장 높음, 없는 회사는 등급 점수 0)
+            type_order: 급한 보고서 유형 순서 (목록에 없는 유형은 유형 점수 0)
+            recent_days: 이 기간(일) 안에 접수된 보고서를 최신 보고서로 봄 - 최신성 점수의 반감기
+            tier_weight: 1등급 회사 점수 (n등급은 tier_weight / n)
+            type_weight: 가장 급한 유형의 점수
+            recency_weight: 오늘 접수된 보고서의 최신성 점수
+        """
+        self.tiers = dict(tiers or {})
+        self.type_order = [name for name in type_order if name in REPORT_TYPES]
+        self.recent_days = max(1, recent_days)
+        self.tier_weight = tier_weight
+        self.type_weight = type_weight
+        self.recency_weight = recency_weight
+
+    def tier(self, report: Dict) -> Optional[int]:
+        return self.tiers.get(report.get('corp_name') or '') or self.tiers.get(report.get('company') or '')
+
+    def age_days(self, report: Dict, today: Optional[datetime] = None) -> Optional[int]:
+        """접수 후 지난 일수 (rcpNo 앞 8자리, 없으면 접수일) - 알 수 없으면 None"""
+        digits = (report.get('rcp_no') or '')[:8]
+        if not (len(digits) == 8 and digits.isdigit()):
+            digits = re.sub(r'\D', '', report.get('submit_date') or '')[:8]
+        try:
+            submitted = datetime.strptime(digits, '%Y%m%d')
+        except ValueError:
+            return None
+        return max(0, ((today or datetime.now()) - submitted).days)
+
+    def score(self, report: Dict) -> float:
+        score = 0.0
+        tier = self.tier(report)
+        if tier:
+            score += self.tier_weight / tier
+
+        report_type = parse_report_name(report.get('report_name', ''))['report_type']
+        if report_type in self.type_order:
+            rank = self.type_order.index(report_type)
+            score += self.type_weight * (len(self.type_order) - rank) / len(self.type_order)
+
+        age = self.age_days(report)
+        if age is not None:
+            score += self.recency_weight * 0.5 ** (age / self.recent_days)
+        return round(score, 2)
+
+    def classify(self, report: Dict) -> str:
+        """우선 보고서(등급이 있는 회사의 최신 보고서, 등급 목록이 없으면 최신 보고서) 또는 후순위(백필)"""
+        if self.tiers and not self.tier(report):
+            return BACKFILL
+        age = self.age_days(report)
+        return PRIORITY if age is not None and age <= self.recent_days else BACKFILL
+
+
+class DownloadScheduler:
+    """
+    일괄 다운로드 순서와 속도 결정
+
+    plan()으로 지난 실행의 체크포인트와 합쳐 순서를 정하고, 보고서마다 admit()으로 마감 안에 끝낼 수 있는지 판단,
+    record()로 실제 소요 시간을 반영, finish()로 남은 보고서를 체크포인트에 저장하고 결정 내역을 출력합니다.
+    """
+
+    def __init__(self, scraper, download_dir: str, deadline: Optional[datetime] = None,
+                 rules: Optional[PriorityRules] = None, pause: float = 1.0,
+                 initial_estimate: float = 5.0, max_attempts: int = 3,
+                 checkpoint_file: Optional[str] = None):
+        """
+        Args:
+            scraper: DartScraper (요청 한도와 캐시, 매니페스트 확인용)
+            download_dir: 다운로드 폴더
+            deadline: 마감 시각 (None이면 마감 없이 우선순위 순서로만 받음)
+            rules: 우선순위 규칙 (None이면 기본 규칙 - 최신 보고서 우선)
+            pause: 보고서 사이 기본 대기 (초) - 마감이 급하면 우선 보고서에서만 생략
+            initial_estimate: 첫 보고서를 받기 전 보고서당 예상 소요 시간 (초)
+            max_attempts: 실패한 보고서를 다음 실행에서 다시 시도할 최대 횟수
+            checkpoint_file: 체크포인트 경로 (None이면 다운로드 폴더의 .dart_schedule.json)
+        """
+        self.scraper = scraper
+        self.download_dir = download_dir
+        self.deadline = deadline
+        self.rules = rules or PriorityRules()
+        self.pause = pause
+        self.initial_estimate = initial_estimate
+        self.max_attempts = max_attempts
+        self.checkpoint_file = checkpoint_file or os.path.join(download_dir, SCHEDULE_CHECKPOINT_FILENAME)
+
+        self.item_seconds = initial_estimate
+        self.pauses_skipped = 0
+        self.carried_over = 0
+        self._plan: List[Dict] = []
+        self._state: Dict[str, Dict] = {}
+
+    @staticmethod
+    def _key(report: Dict) -> str:
+        return report.get('rcp_no') or report.get('report_url') or f"id:{id(report)}"
+
+    # --- 체크포인트 ---
+
+    def _load_checkpoint(self) -> List[Dict]:
+        if not os.path.exists(self.checkpoint_file):
+            return []
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('pending', [])
+        except Exception as e:
+            print(f"⚠️ 스케줄 체크포인트 읽기 실패: {e}")
+            return []
+
+    def _save_checkpoint(self) -> int:
+        """받지 못한 보고서 저장 (없으면 체크포인트 삭제) - 저장한 건수 반환"""
+        pending = [
+            {'report': state['report'], 'attempts': state['attempts'], 'reason': state['reason'] or 'not_started'}
+            for state in self._state.values()
+            if state['decision'] != 'done' and state['attempts'] < self.max_attempts
+        ]
+        try:
+            if not pending:
+                if os.path.exists(self.checkpoint_file):
+                    os.remove(self.checkpoint_file)
+                return 0
+            os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_file)), exist_ok=True)
+            tmp_path = self.checkpoint_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'saved_at': datetime.now().isoformat(timespec='seconds'),
+                           'deadline': self.deadline.isoformat(timespec='seconds') if self.deadline else None,
+                           'pending': pending}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.checkpoint_file)
+        except Exception as e:
+            print(f"⚠️ 스케줄 체크포인트 저장 실패: {e}")
+        return len(pending)
+
+    # --- 계획 ---
+
+    def plan(self, reports: List[Dict]) -> List[Dict]:
+        """
+        지난 실행에서 남은 보고서와 합친 뒤 우선순위 순서로 정렬 (이미 받은 보고서는 제외)
+
+        Returns:
+            다운로드 순서대로 정렬한 보고서 리스트
+        """
+        manifest = self.scraper.get_manifest(self.download_dir)
+        merged: Dict[str, Tuple[Dict, int]] = {}
+        for item in self._load_checkpoint():
+            report = item.get('report') or {}
+            if (report.get('rcp_no') or report.get('report_url')) and not manifest.find_rcp(report.get('rcp_no', '')):
+                merged[self._key(report)] = (report, item.get('attempts', 0))
+        self.carried_over = len(merged)
+        for report in reports:
+            key = self._key(report)
+            if key in merged:
+                # 검색 결과가 더 최신 정보 - 시도 횟수만 이어받음
+                merged[key] = (report, merged[key][1])
+            elif not report.get('rcp_no') or manifest.find_rcp(report['rcp_no']) is None:
+                merged[key] = (report, 0)
+
+        self._state = {}
+        for key, (report, attempts) in merged.items():
+            self._state[key] = {
+                'report': report,
+                'class': self.rules.classify(report),
+                'score': self.rules.score(report),
+                'attempts': attempts,
+                'decision': 'pending',
+                'reason': '',
+                'seconds': None,
+            }
+
+        order = sorted(self._state.values(),
+                       key=lambda state: (state['class'] != PRIORITY, -state['score'],
+                                          state['report'].get('rcp_no', '')))
+        self._plan = [state['report'] for state in order]
+
+        already = len(reports) - sum(1 for report in reports if self._key(report) in self._state)
+        counts = self._counts()
+        print(f"🗓️ 스케줄: 우선 {counts[PRIORITY]['planned']}건, 후순위 {counts[BACKFILL]['planned']}건"
+              + (f" (지난 실행에서 이어받음 {self.carried_over}건)" if self.carried_over else "")
+              + (f", 이미 받음 {already}건 제외" if already else ""))
+        if self.deadline:
+            print(f"  ⏰ 마감 {self.deadline:%Y-%m-%d %H:%M} (남은 시간 {_format_duration(self.remaining())})")
+        self._save_checkpoint()
+        return list(self._plan)
+
+    def remaining(self) -> float:
+        """마감까지 남은 시간 (초, 마감이 없으면 무한대)"""
+        if self.deadline is None:
+            return float('inf')
+        return (self.deadline - datetime.now()).total_seconds()
+
+    def estimate(self, report: Dict) -> float:
+        """보고서 하나의 예상 소요 시간 (초) - 지금까지 받은 보고서의 소요 시간 이동 평균"""
+        return self.item_seconds
+
+    def _pending_priority_seconds(self) -> float:
+        return sum(self.estimate(state['report']) + self.pause for state in self._state.values()
+                   if state['class'] == PRIORITY and state['decision'] == 'pending')
+
+    # --- 실행 중 결정 ---
+
+    def admit(self, report: Dict) -> bool:
+        """마감 안에 끝낼 수 있으면 True, 아니면 다음 실행으로 미루고 False"""
+        state = self._state.get(self._key(report))
+        if state is None:
+            return True
+        needed = self.estimate(report)
+        if needed <= self.remaining():
+            return True
+        state.update(decision='deferred', reason='deadline')
+        print(f"  ⏭️ 마감 전 완료 불가 - 다음 실행으로 미룸: {report.get('company', '')} {report.get('report_name', '')} "
+              f"(예상 {needed:.1f}초, 남은 시간 {max(0.0, self.remaining()):.0f}초)")
+        return False
+
+    def record(self, report: Dict, succeeded: bool, seconds: float) -> None:
+        """실제 소요 시간 반영 (지수 이동 평균) 및 결과 기록"""
+        # 이미 받은 보고서처럼 요청 없이 끝난 경우는 평균에서 제외
+        if seconds >= 0.05:
+            self.item_seconds = 0.7 * self.item_seconds + 0.3 * seconds
+        state = self._state.get(self._key(report))
+        if state is None:
+            return
+        state['seconds'] = round(seconds, 2)
+        if succeeded:
+            state.update(decision='done', reason='')
+        else:
+            state['attempts'] += 1
+            state.update(decision='failed', reason='failed')
+
+        # 중간에 중단되어도 다음 실행이 이어받을 수 있도록 주기적으로 저장
+        finished = sum(1 for item in self._state.values() if item['decision'] in ('done', 'failed'))
+        if finished % 10 == 0:
+            self._save_checkpoint()
+
+    def pause_after(self, report: Dict) -> float:
+        """
+        다음 보고서 전 대기 시간
+
+        남은 우선 보고서를 기본 대기와 함께 마감 안에 끝낼 수 없으면 우선 보고서 사이의 대기만 생략
+        (요청 한도는 scraper의 RateLimiter가 계속 지킴), 후순위 보고서는 항상 기본 대기
+        """
+        if self.deadline is None or not self._plan:
+            return self.pause
+        upcoming = next((state for state in (self._state.get(self._key(r)) for r in self._plan)
+                         if state and state['decision'] == 'pending'), None)
+        if upcoming is None or upcoming['class'] != PRIORITY:
+            return self.pause
+        if self._pending_priority_seconds() > self.remaining():
+            self.pauses_skipped += 1
+            return 0.0
+        return self.pause
+
+    # --- 결과 ---
+
+    def _counts(self) -> Dict[str, Dict[str, int]]:
+        counts = {name: {'planned': 0, 'done': 0, 'failed': 0, 'deferred': 0} for name in (PRIORITY, BACKFILL)}
+        for state in self._state.values():
+            bucket = counts[state['class']]
+            bucket['planned'] += 1
+            if state['decision'] in ('done', 'failed', 'deferred'):
+                bucket[state['decision']] += 1
+            else:
+                bucket['deferred'] += 1
+        return counts
+
+    def finish(self) -> Dict:
+        """
+        남은 보고서를 체크포인트에 저장하고 스케줄 결정 내역 출력
+
+        Returns:
+            마감, 등급별 계획/완료/실패/미룸 건수, 평균 소요 시간, 대기 생략 횟수, 체크포인트 건수, 보고서별 결정
+        """
+        for state in self._state.values():
+            if state['decision'] == 'pending':
+                state.update(decision='deferred', reason=state['reason'] or 'not_started')
+        saved = self._save_checkpoint()
+        counts = self._counts()
+        remaining = self.remaining()
+
+        reasons: Dict[str, int] = {}
+        for state in self._state.values():
+            if state['decision'] in ('deferred', 'failed'):
+                reasons[state['reason']] = reasons.get(state['reason'], 0) + 1
+
+        print("\n🗓️ 스케줄 결정")
+        if self.deadline:
+            status = f"남은 시간 {_format_duration(remaining)}" if remaining >= 0 else f"{_format_duration(-remaining)} 초과"
+            print(f"  ⏰ 마감 {self.deadline:%Y-%m-%d %H:%M} ({status})")
+        for name, label in ((PRIORITY, "🎯 우선"), (BACKFILL, "🗃️ 후순위")):
+            bucket = counts[name]
+            if bucket['planned']:
+                print(f"  {label}: 완료 {bucket['done']}/{bucket['planned']}건, 실패 {bucket['failed']}건, "
+                      f"미룸 {bucket['deferred']}건")
+        print(f"  ⏱️ 보고서당 평균 {self.item_seconds:.1f}초 (초기 추정 {self.initial_estimate:.1f}초)"
+              + (f", 마감 때문에 대기 생략 {self.pauses_skipped}회" if self.pauses_skipped else ""))
+        if saved:
+            detail = ', '.join(f"{reason} {count}" for reason, count in sorted(reasons.items()))
+            print(f"  💾 다음 실행으로 {saved}건 넘김 ({detail}): {self.checkpoint_file}")
+
+        return {
+            'deadline': self.deadline.isoformat(timespec='seconds') if self.deadline else None,
+            'remaining_seconds': round(remaining, 1) if self.deadline else None,
+            'priority': counts[PRIORITY],
+            'backfill': counts[BACKFILL],
+            'carried_over': self.carried_over,
+            'deferred_reasons': reasons,
+            'avg_item_seconds': round(self.item_seconds, 2),
+            'pauses_skipped': self.pauses_skipped,
+            'checkpointed': saved,
+            'checkpoint_file': os.path.abspath(self.checkpoint_file) if saved else None,
+            'decisions': [
+                {
+                    'rcp_no': state['report'].get('rcp_no', ''),
+                    'company': state['report'].get('corp_name') or state['report'].get('company', ''),
+                    'report_name': state['report'].get('report_name', ''),
+                    'class': state['class'],
+                    'score': state['score'],
+                    'decision': state['decision'],
+                    'reason': state['reason'],
+                    'seconds': state['seconds'],
+                }
+                for state in (self._state[self._key(report)] for report in self._plan)
+            ],
+        }
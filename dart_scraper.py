@@ -9,32 +9,447 @@ from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import time
 import json
+import hashlib
 import re
 import os
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+from dart_session import (SessionPool, RateLimiter, NegativeCache, CircuitBreaker,
+                          DEFAULT_COOKIE_FILE, DEFAULT_NEGATIVE_CACHE_FILE)
+from dart_planner import plan_latest_versions, estimate_downloads
+from dart_cache import ResponseCache, DEFAULT_RESPONSE_CACHE_FILE, NEW, CHANGED, NOT_MODIFIED, UNCHANGED
+from dart_mirror import enforce_quota
+from dart_storage import (DownloadManifest, StorageBackend, LocalStorage, IncompleteDownload,
+                          download_segmented, report_filename, filename_from_disposition, sanitize_filename,
+                          DEFAULT_BUFFER_SIZE, SECTIONS_FILENAME)
+
+
+# 검색 결과 행 튜플의 필드 순서 (프로세스 풀에서 dict 대신 튜플로 주고받음)
+SEARCH_ROW_FIELDS = ('no', 'company', 'corp_name', 'report_name', 'submitter',
+                     'submit_date', 'note', 'report_url', 'rcp_no')
+
+# 정기공시 공시유형 코드 (사업보고서, 반기보고서, 분기보고서)
+REGULAR_PUBLIC_TYPES = ['A001', 'A002', 'A003']
+
+# 섹션 모드 기본 대상 (목차 제목에 포함되는 단어, 공백 무시)
+DEFAULT_SECTIONS = ['재무제표', '주석', '사업의 내용']
+
+# 점검/오류 안내 페이지에 나타나는 문구 (일반 안내문에도 흔한 '잠시 후 다시' 같은 문구는 제외)
+MAINTENANCE_MARKERS = ('시스템 점검', '서비스 점검', '점검 중', '일시 중단', 'under maintenance')
+
+
+class SearchPageError(ValueError):
+    """검색 결과 페이지를 해석하지 못함 (결과 행도 '조회 결과가 없습니다' 안내도 없음 - 레이아웃 변경, 오류 페이지 등)"""
+
+
+def looks_like_maintenance(html_text: str) -> bool:
+    """점검/오류 안내 페이지인지 확인"""
+    lowered = html_text.lower()
+    return any(marker in lowered for marker in MAINTENANCE_MARKERS)
+
+
+def _make_soup(html_content, encoding: Optional[str] = None) -> BeautifulSoup:
+    """str 또는 원본 바이트로부터 BeautifulSoup 생성"""
+    if isinstance(html_content, bytes):
+        return BeautifulSoup(html_content, 'html.parser', from_encoding=encoding)
+    return BeautifulSoup(html_content, 'html.parser')
+
+
+def parse_search_rows(html_content, encoding: Optional[str] = None,
+                      base_url: str = "https://dart.fss.or.kr") -> Tuple[List[Tuple[str, ...]], str]:
+    """
+    검색 결과 HTML에서 행 튜플 추출 (프로세스 풀에서 실행할 수 있도록 모듈 함수로 분리)
+
+    Args:
+        html_content: 검색 결과 HTML (str 또는 원본 바이트)
+        encoding: 바이트인 경우 응답 인코딩
+        base_url: 상대 링크를 절대 링크로 바꿀 기준 URL
+
+    Returns:
+        (SEARCH_ROW_FIELDS 순서의 행 튜플 리스트, 상태)
+        상태는 'ok', 'no_result' 또는 'unknown:<HTML 샘플>'
+    """
+    soup = _make_soup(html_content, encoding)
+    rows = []
+
+    # 결과 테이블 찾기 (실제 DART 구조)
+    table = soup.find('table', {'class': 'tbList'})
+    if not table:
+        # 다른 방식으로 찾기
+        table = soup.find('table')
+
+    tbody = table.find('tbody') if table else None
+    for row in tbody.find_all('tr') if tbody else []:
+        cols = row.find_all('td')
+        if len(cols) < 6:  # 최소 6개 컬럼이 있어야 함
+            continue
+        try:
+            # 보고서명 컬럼에서 링크 추출
+            report_link = cols[2].find('a')
+            report_url = ''
+
+            if report_link and report_link.get('href'):
+                href = report_link.get('href')
+                if href.startswith('/'):
+                    report_url = base_url + href
+                elif href.startswith('http'):
+                    report_url = href
+                else:
+                    report_url = base_url + '/' + href
+
+            # 회사명 셀에는 시장 구분 배지(유/코/넥/기)가 붙어 있으므로 링크 텍스트를 따로 보관
+            company = cols[1].get_text(strip=True)
+            corp_link = cols[1].find('a')
+            rcp_no_match = re.search(r'rcpNo=(\d+)', report_url)
+            report_name = cols[2].get_text(strip=True)
+
+            # 빈 결과가 아닌 경우만 추가
+            if company and report_name:
+                rows.append((
+                    cols[0].get_text(strip=True),
+                    company,
+                    corp_link.get_text(strip=True) if corp_link else company,
+                    report_name,
+                    cols[3].get_text(strip=True),
+                    cols[4].get_text(strip=True),
+                    cols[5].get_text(strip=True),
+                    report_url,
+                    rcp_no_match.group(1) if rcp_no_match else ''
+                ))
+
+        except Exception as e:
+            print(f"행 파싱 오류: {e}")
+            continue
+
+    if rows:
+        return rows, 'ok'
+    if soup.find(string=lambda text: text and '조회 결과가 없습니다' in text):
+        return rows, 'no_result'
+    return rows, 'unknown:' + soup.prettify()[:500]
+
+
+def extract_dcm_no(html_content, encoding: Optional[str] = None) -> Tuple[Optional[str], str]:
+    """
+    보고서 뷰어 페이지 HTML에서 dcmNo 추출 (프로세스 풀에서 실행할 수 있도록 모듈 함수로 분리)
+
+    Returns:
+        (dcmNo 또는 None, 발견 위치 설명)
+    """
+    soup = _make_soup(html_content, encoding)
+
+    # 방법 1: JavaScript 변수에서 찾기
+    for script in soup.find_all('script'):
+        if script.string:
+            content = script.string
+
+            # dcmNo 변수 찾기
+            dcm_match = re.search(r'dcmNo\s*[=:]\s*["\']?(\d+)["\']?', content, re.IGNORECASE)
+            if dcm_match:
+                return dcm_match.group(1), f"JavaScript 변수에서 dcmNo 발견: {dcm_match.group(1)}"
+
+            # openPdfDownload 함수 호출 찾기 - openPdfDownload에서 찾은 dcmNo가 정확함
+            pdf_match = re.search(r'openPdfDownload\s*\(\s*["\']?(\d+)["\']?\s*,\s*["\']?(\d+)["\']?\s*\)', content)
+            if pdf_match:
+                return pdf_match.group(2), f"openPdfDownload 호출에서 발견: rcpNo={pdf_match.group(1)}, dcmNo={pdf_match.group(2)}"
+
+    # 방법 2: HTML 속성에서 찾기
+    elements_with_dcm = soup.find_all(attrs={'data-dcm-no': True})
+    if elements_with_dcm:
+        dcm_no = elements_with_dcm[0]['data-dcm-no']
+        return dcm_no, f"HTML data-dcm-no 속성에서 발견: {dcm_no}"
+
+    # 방법 3: 숨겨진 input 필드에서 찾기
+    for inp in soup.find_all('input', {'type': 'hidden'}):
+        name = inp.get('name', '').lower()
+        if 'dcm' in name or 'doc' in name:
+            value = inp.get('value', '')
+            if value and value.isdigit():
+                return value, f"숨겨진 input[{inp.get('name')}]에서 발견: {value}"
+
+    # 방법 4: 다운로드 버튼/링크에서 찾기
+    download_elements = soup.find_all(['a', 'button'],
+        string=re.compile(r'다운로드|download|PDF', re.IGNORECASE))
+
+    for elem in download_elements:
+        onclick = elem.get('onclick', '')
+        href = elem.get('href', '')
+
+        # onclick에서 dcmNo 추출 (openPdfDownload 함수 호출에서)
+        if onclick:
+            pdf_onclick_match = re.search(r'openPdfDownload\s*\(\s*["\']?(\d+)["\']?\s*,\s*["\']?(\d+)["\']?\s*\)', onclick)
+            if pdf_onclick_match:
+                dcm_no = pdf_onclick_match.group(2)
+                return dcm_no, f"다운로드 버튼 onclick에서 발견: dcmNo={dcm_no} (전체 onclick: {onclick})"
+
+        # href에서 dcmNo 추출
+        if href and 'dcm' in href.lower():
+            dcm_match = re.search(r'dcm[_-]?no=(\d+)', href, re.IGNORECASE)
+            if dcm_match:
+                return dcm_match.group(1), f"다운로드 링크 href에서 발견: {dcm_match.group(1)}"
+
+    return None, ''
+
+
+_NODE_DECL_PATTERN = re.compile(r'var\s+(node\d+)\s*=\s*\{\s*\}\s*;')
+_NODE_FIELD_PATTERN = re.compile(r'(node\d+)\[\s*[\'"](\w+)[\'"]\s*\]\s*=\s*[\'"]([^\'"]*)[\'"]')
+
+
+def parse_viewer_tree(html_content, encoding: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    보고서 뷰어(dsaf001/main.do) 페이지의 목차 트리 노드 추출
+
+    뷰어 스크립트의 `var node1 = {}; node1['text'] = "..."; node1['dcmNo'] = "...";` 선언을 순서대로 읽음
+
+    Returns:
+        노드 리스트 (text, rcpNo, dcmNo, eleId, offset, length, dtd, tocNo 등)
+    """
+    if isinstance(html_content, bytes):
+        html_content = html_content.decode(encoding or 'utf-8', errors='replace')
+
+    nodes = []
+    current: Dict[str, Dict[str, str]] = {}
+    events = sorted(
+        [(m.start(), 'decl', m.group(1), None, None) for m in _NODE_DECL_PATTERN.finditer(html_content)] +
+        [(m.start(), 'field', m.group(1), m.group(2), m.group(3)) for m in _NODE_FIELD_PATTERN.finditer(html_content)]
+    )
+    for _, kind, var, key, value in events:
+        if kind == 'decl':
+            current[var] = {}
+            nodes.append(current[var])
+        elif var in current:
+            current[var][key] = value
+    return [node for node in nodes if node.get('dcmNo')]
+
+
+def parse_viewer_documents(html_content, encoding: Optional[str] = None,
+                           tree: Optional[List[Dict[str, str]]] = None) -> List[Tuple[str, str, str]]:
+    """
+    보고서 뷰어 페이지에서 공시에 포함된 모든 문서 (dcmNo, 제목, rcpNo) 추출
+
+    본문 목차 트리의 dcmNo와 첨부 선택 목록(select#att)의 dcmNo를 모두 모음 (본문이 먼저).
+    첨부 목록에는 별도 접수번호로 제출된 감사보고서 등도 있으므로 rcpNo는 각 항목의 값에서 읽음
+
+    Args:
+        tree: 이미 추출한 목차 트리 노드 (None이면 새로 추출)
+
+    Returns:
+        (dcmNo, 제목, rcpNo) 리스트 - 중복 제외, 나타난 순서 유지 (rcpNo를 알 수 없으면 '')
+    """
+    if tree is None:
+        tree = parse_viewer_tree(html_content, encoding)
+
+    documents: Dict[str, Tuple[str, str, str]] = {}
+    for node in tree:
+        documents.setdefault(node['dcmNo'], (node['dcmNo'], node.get('text', '').strip(), node.get('rcpNo', '')))
+
+    soup = _make_soup(html_content, encoding)
+    for option in soup.select('select#att option, select[name=att] option'):
+        value = option.get('value', '')
+        dcm_match = re.search(r'dcmNo=(\d+)', value)
+        if dcm_match:
+            rcp_match = re.search(r'rcpNo=(\d+)', value)
+            documents.setdefault(dcm_match.group(1), (dcm_match.group(1), option.get_text(strip=True),
+                                                      rcp_match.group(1) if rcp_match else ''))
+
+    if not documents:
+        dcm_no, _ = extract_dcm_no(html_content, encoding)
+        if dcm_no:
+            documents[dcm_no] = (dcm_no, '', '')
+    return list(documents.values())
+
+
+def parse_viewer_page(html_content, encoding: Optional[str] = None) -> Dict[str, List]:
+    """
+    뷰어 페이지 한 번으로 문서 목록과 목차(섹션) 노드를 함께 추출
+
+    Returns:
+        {'documents': [(dcmNo, 제목, rcpNo), ...], 'sections': [목차 노드, ...]}
+    """
+    tree = parse_viewer_tree(html_content, encoding)
+    return {
+        'documents': parse_viewer_documents(html_content, encoding, tree=tree),
+        'sections': [node for node in tree if node.get('eleId')],
+    }
+
+
+def _normalize_title(title: str) -> str:
+    """목차 제목 비교용 - 공백 제거 ('사 업 보 고 서' → '사업보고서')"""
+    return re.sub(r'\s+', '', title)
+
+
+def select_sections(sections: List[Dict[str, str]], keywords: List[str]) -> List[Dict[str, str]]:
+    """
+    목차 노드 중 제목에 키워드가 포함된 섹션 선택
+
+    상위 섹션이 선택되면 그 아래 노드는 상위 섹션 본문에 포함되므로 따로 받지 않도록
+    같은 문서에서 이미 선택한 구간(offset~offset+length)에 들어가는 노드는 제외
+
+    Returns:
+        선택된 목차 노드 리스트 (목차 순서 유지)
+    """
+    wanted = [_normalize_title(keyword) for keyword in keywords]
+    selected = []
+    covered: Dict[str, List[Tuple[int, int]]] = {}
+
+    for node in sections:
+        title = _normalize_title(node.get('text', ''))
+        if not any(keyword in title for keyword in wanted):
+            continue
+        try:
+            offset, length = int(node.get('offset', 0)), int(node.get('length', 0))
+        except ValueError:
+            offset, length = 0, 0
+
+        spans = covered.setdefault(node['dcmNo'], [])
+        if length and any(start <= offset and offset + length <= end for start, end in spans):
+            continue
+        if length:
+            spans.append((offset, offset + length))
+        selected.append(node)
+    return selected
+
+
+def declared_charset(response: requests.Response) -> Optional[str]:
+    """
+    서버가 Content-Type에 밝힌 charset
+
+    없으면 None - requests가 text/*에 채우는 기본값(ISO-8859-1)을 from_encoding으로 넘기면
+    bs4가 문서의 <meta charset>을 보고 감지하지 못함
+    """
+    match = re.search(r'charset=["\']?([\w.:-]+)', response.headers.get('Content-Type', ''), re.IGNORECASE)
+    return match.group(1) if match else None
+
+
+# 파싱 벤치마크 표본 종류(하위 폴더) → 파싱 함수
+BENCH_PARSERS = {'/search': parse_search_rows, '/viewer': parse_viewer_page}
+
+
+def _parse_bench_page(kind: str, body: bytes):
+    return BENCH_PARSERS[kind](body, 'utf-8')
+
+
+def benchmark_parsing(pages: List[Tuple[str, bytes]], workers: List[int] = (0, 1, 2, 4), repeat: int = 3) -> Dict:
+    """
+    검색·뷰어 HTML 파싱 처리량을 프로세스 수별로 측정
+
+    0은 호출 스레드에서 바로 파싱 (parse_workers=0), n은 n개 프로세스 풀에 모든 페이지를 한꺼번에 넘겨
+    여러 스레드(파이프라인 단계, 동시 다운로드)가 동시에 파싱을 요청하는 경우를 흉내 냄
+    (스크레이퍼는 풀을 한 번 만들어 계속 쓰므로 프로세스 시작 비용은 제외)
+
+    Args:
+        pages: (종류, 본문) 리스트 - dart_cache.load_corpus 결과, BENCH_PARSERS에 없는 종류는 제외
+        workers: 측정할 프로세스 수 목록
+        repeat: 표본을 반복해 파싱할 횟수
+
+    Returns:
+        {'pages', 'cpu_count', 'runs': [{'workers', 'seconds', 'pages_per_sec', 'speedup'}, ...]}
+        speedup은 첫 번째 측정 대비 처리량
+    """
+    jobs = [(kind, body) for kind, body in pages if kind in BENCH_PARSERS] * max(1, repeat)
+    kinds = [kind for kind, _ in jobs]
+    bodies = [body for _, body in jobs]
+    runs = []
+
+    for count in workers:
+        if count <= 0:
+            started = time.perf_counter()
+            for kind, body in jobs:
+                _parse_bench_page(kind, body)
+            elapsed = time.perf_counter() - started
+        else:
+            with ProcessPoolExecutor(max_workers=count) as pool:
+                list(pool.map(_parse_bench_page, kinds[:count], bodies[:count]))
+                started = time.perf_counter()
+                list(pool.map(_parse_bench_page, kinds, bodies))
+                elapsed = time.perf_counter() - started
+
+        rate = len(jobs) / elapsed if elapsed > 0 else 0.0
+        runs.append({'workers': count, 'seconds': round(elapsed, 3), 'pages_per_sec': round(rate, 1),
+                     'speedup': round(rate / runs[0]['pages_per_sec'], 2) if runs and runs[0]['pages_per_sec'] else 1.0})
+
+    return {'pages': len(jobs), 'cpu_count': os.cpu_count(), 'runs': runs}
 
 
 class DartScraper:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, parse_workers: int = 0, session_pool_size: int = 4,
+                 cookie_file: Optional[str] = DEFAULT_COOKIE_FILE,
+                 write_buffer_size: int = DEFAULT_BUFFER_SIZE, background_writes: bool = False,
+                 requests_per_second: float = 2.0, download_segments: int = 1,
+                 segment_min_size: int = 8 * 1024 * 1024,
+                 negative_cache_file: Optional[str] = DEFAULT_NEGATIVE_CACHE_FILE,
+                 mirror_quota: Optional[int] = None, storage: Optional[StorageBackend] = None,
+                 response_cache_file: Optional[str] = DEFAULT_RESPONSE_CACHE_FILE):
+        """
+        Args:
+            parse_workers: HTML 파싱 전용 프로세스 수 (0이면 요청 스레드에서 직접 파싱)
+                           네트워크 동시성과 별개로 CPU 코어 수에 맞춰 설정
+            session_pool_size: 스레드별로 나눠 쓸 세션 수
+            cookie_file: 세션 쿠키 보존 파일 (None이면 실행 간에 보존하지 않음)
+            write_buffer_size: PDF 저장 시 읽기/쓰기 버퍼 크기
+            background_writes: True이면 디스크 쓰기를 별도 스레드에서 수행 (느린 저장소용)
+            requests_per_second: 모든 스레드가 공유하는 초당 요청 한도 (0이면 제한 없음)
+            download_segments: 큰 PDF를 나눠 받을 동시 연결 수 (1이면 단일 스트림)
+            segment_min_size: 구간 다운로드를 사용할 최소 파일 크기
+            negative_cache_file: 실패한 보고서 기록 파일 (None이면 메모리에만 보관)
+            mirror_quota: 다운로드 폴더별 디스크 한도 (bytes, None이면 제한 없음)
+                          넘으면 정정 이전 버전과 오래 쓰지 않은 보고서부터 삭제 (다시 받을 수 있음)
+            storage: PDF 저장소 (None이면 로컬 파일시스템, 매니페스트는 항상 로컬 폴더에 기록)
+            response_cache_file: 검색·뷰어 응답 재검증 캐시 파일 (None이면 메모리에만 보관)
+        """
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        self.write_buffer_size = write_buffer_size
+        self.background_writes = background_writes
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.negative_cache = NegativeCache(cache_file=negative_cache_file)
+        self.response_cache = ResponseCache(response_cache_file)
+        self.circuit_breaker = CircuitBreaker()
+        self.download_segments = download_segments
+        self.segment_min_size = segment_min_size
+        self.mirror_quota = mirror_quota
+        self.storage = storage or LocalStorage(background=background_writes)
+        if mirror_quota and not self.storage.is_local:
+            print("⚠️ 디스크 한도(mirror_quota)는 로컬 저장소에서만 적용됩니다 - 한도 정리를 하지 않습니다")
+        self._manifests: Dict[str, DownloadManifest] = {}
+        self._download_info_cache: Dict[str, Dict[str, str]] = {}
+        self._size_cache: Dict[str, int] = {}
+        self._lock = threading.Lock()
         self.base_url = "https://dart.fss.or.kr"
         self.main_url = f"{self.base_url}/dsab007/main.do"
         self.search_url = f"{self.base_url}/dsab007/detailSearch.ax"
         
         # 기본 헤더 설정
-        self.session.headers.update({
+        self.sessions = SessionPool({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
+        }, size=session_pool_size, cookie_file=cookie_file)
+    
+    @property
+    def session(self) -> requests.Session:
+        """현재 스레드에 배정된 세션"""
+        return self.sessions.get()
     
-    def get_search_page(self) -> bool:
-        """검색 페이지에 접속하여 세션 초기화"""
+    def get_search_page(self, force: bool = False) -> bool:
+        """
+        검색 페이지에 접속하여 세션 초기화
+        
+        저장된 세션 쿠키가 유효하면 접속을 생략하고, 서버가 요청을 거부할 때 _request에서 다시 데움
+        
+        Args:
+            force: 저장된 세션이 있어도 검색 페이지에 다시 접속
+        """
+        if not force and self.sessions.is_warm():
+            print("✓ 저장된 DART 세션 사용 (검색 페이지 접속 생략)")
+            return True
+        
         try:
-            response = self.session.get(self.main_url)
+            response = self._send('GET', self.main_url)
             response.raise_for_status()
             
             # HTML 파싱하여 필요한 정보 확인
@@ -43,6 +458,7 @@ class DartScraper:
             # 검색 폼이 있는지 확인
             search_form = soup.find('form')
             if search_form:
+                self.sessions.mark_warm(self.session)
                 print("✓ DART 검색 페이지 접속 성공")
                 return True
             else:
@@ -53,6 +469,36 @@ class DartScraper:
             print(f"✗ 페이지 접속 실패: {e}")
             return False
     
+    def _is_rejected(self, response: requests.Response, url: str) -> bool:
+        """세션 만료 등으로 서버가 요청을 거부했는지 확인"""
+        if response.status_code in (401, 403, 419, 440):
+            return True
+        # 요청한 페이지 대신 검색 메인 페이지로 돌려보낸 경우
+        return bool(response.history) and response.url.startswith(self.main_url) and not url.startswith(self.main_url)
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """요청 한도를 지켜 현재 스레드의 세션으로 요청"""
+        self.rate_limiter.acquire()
+        return self.session.request(method, url, **kwargs)
+    
+    def _probe_host(self) -> bool:
+        """차단기 확인 요청 - 검색 메인 페이지가 점검 안내 없이 열리는지 확인"""
+        response = self._send('GET', self.main_url, timeout=30)
+        return response.status_code == 200 and not looks_like_maintenance(response.text)
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """세션 요청 - 서버가 거부하면 그때 세션을 데운 뒤 한 번 재시도"""
+        # 서버 점검 등으로 차단기가 열려 있으면 확인 요청이 성공할 때까지 대기
+        self.circuit_breaker.wait_until_closed(self._probe_host)
+        response = self._send(method, url, **kwargs)
+        if self._is_rejected(response, url):
+            print("  🔄 세션이 거부되어 다시 연결합니다")
+            response.close()
+            self.sessions.invalidate()
+            if self.get_search_page(force=True):
+                response = self._send(method, url, **kwargs)
+        return response
+    
     def search_company_regular_reports(self, company_name: str, max_pages: int = 20) -> List[Dict]:
         """
         회사명으로 정기공시 검색 (10년, 정기공시 체크박스 사용)
@@ -99,12 +545,9 @@ class DartScraper:
                 
                 print(f"   페이지 {page} 검색 중...")
                 
-                # POST 요청으로 검색 실행 (data 파라미터 사용)
-                response = self.session.post(self.search_url, data=search_data, headers=ajax_headers)
-                response.raise_for_status()
-                
-                # 결과 파싱
-                page_results = self._parse_search_results(response.text)
+                # POST 요청으로 검색 실행 (data 파라미터 사용, 이전 결과와 같으면 다시 파싱하지 않음)
+                page_results = self._fetch_parsed('POST', self.search_url, 'search', self._parse_search_response,
+                                                  data=search_data, headers=ajax_headers)
                 
                 if not page_results:
                     print(f"   페이지 {page}: 결과 없음 - 검색 종료")
@@ -168,12 +611,9 @@ class DartScraper:
                 
                 print(f"   페이지 {page} 검색 중...")
                 
-                # POST 요청으로 검색 실행
-                response = self.session.post(self.search_url, data=search_params, headers=ajax_headers)
-                response.raise_for_status()
-                
-                # 결과 파싱
-                page_results = self._parse_search_results(response.text)
+                # POST 요청으로 검색 실행 (이전 결과와 같으면 다시 파싱하지 않음)
+                page_results = self._fetch_parsed('POST', self.search_url, 'search', self._parse_search_response,
+                                                  data=search_params, headers=ajax_headers)
                 
                 if not page_results:
                     print(f"   페이지 {page}: 결과 없음 - 검색 종료")
@@ -192,76 +632,212 @@ class DartScraper:
             print(f"✗ 검색 실패: {e}")
             return []
     
-    def _parse_search_results(self, html_content: str) -> List[Dict]:
-        """검색 결과 HTML 파싱"""
+    def search_latest_disclosures(self, start_date: str, end_date: str, page: int = 1,
+                                  public_types: Optional[List[str]] = None,
+                                  raise_errors: bool = False) -> List[Dict]:
+        """
+        회사 조건 없이 시장 전체 최신 공시 목록 한 페이지 조회 (접수일 내림차순)
+
+        Args:
+            start_date: 검색 시작일 (YYYYMMDD)
+            end_date: 검색 종료일 (YYYYMMDD)
+            page: 조회할 페이지 번호
+            public_types: 공시유형 코드 목록 (예: ['A001', 'A002', 'A003']), None이면 전체
+            raise_errors: True이면 조회 실패 시 빈 목록 대신 예외 발생
+
+        Returns:
+            해당 페이지의 검색 결과 리스트
+        """
+        return self.search_page('', start_date, end_date, page=page, public_types=public_types,
+                                raise_errors=raise_errors)
+
+    def search_page(self, company_name: str, start_date: str, end_date: str, page: int = 1,
+                    public_types: Optional[List[str]] = None, raise_errors: bool = False) -> List[Dict]:
+        """
+        검색 결과 한 페이지 조회 (접수일 내림차순)
+
+        Args:
+            company_name: 검색할 회사명 (빈 문자열이면 시장 전체)
+            start_date: 검색 시작일 (YYYYMMDD)
+            end_date: 검색 종료일 (YYYYMMDD)
+            page: 조회할 페이지 번호
+            public_types: 공시유형 코드 목록 (예: ['A001', 'A002', 'A003']), None이면 전체
+            raise_errors: True이면 조회 실패나 해석하지 못한 페이지(SearchPageError)에서 빈 목록 대신 예외 발생
+                          (마지막 페이지와 조회 실패를 구분해야 하는 호출용)
+
+        Returns:
+            해당 페이지의 검색 결과 리스트
+        """
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            results = []
-            
-            # 결과 테이블 찾기 (실제 DART 구조)
-            table = soup.find('table', {'class': 'tbList'})
-            if not table:
-                # 다른 방식으로 찾기
-                table = soup.find('table')
-                
-            if table:
-                tbody = table.find('tbody')
-                if tbody:
-                    rows = tbody.find_all('tr')
-                    
-                    for row in rows:
-                        cols = row.find_all('td')
-                        if len(cols) >= 6:  # 최소 6개 컬럼이 있어야 함
-                            try:
-                                # 보고서명 컬럼에서 링크 추출
-                                report_cell = cols[2]
-                                report_link = report_cell.find('a')
-                                report_url = ''
-                                
-                                if report_link and report_link.get('href'):
-                                    href = report_link.get('href')
-                                    if href.startswith('/'):
-                                        report_url = self.base_url + href
-                                    elif href.startswith('http'):
-                                        report_url = href
-                                    else:
-                                        report_url = self.base_url + '/' + href
-                                
-                                # 각 컬럼에서 텍스트 추출
-                                result = {
-                                    'no': cols[0].get_text(strip=True),
-                                    'company': cols[1].get_text(strip=True),
-                                    'report_name': cols[2].get_text(strip=True),
-                                    'submitter': cols[3].get_text(strip=True),
-                                    'submit_date': cols[4].get_text(strip=True),
-                                    'note': cols[5].get_text(strip=True) if len(cols) > 5 else '',
-                                    'report_url': report_url  # 보고서 링크 추가
-                                }
-                                
-                                # 빈 결과가 아닌 경우만 추가
-                                if result['company'] and result['report_name']:
-                                    results.append(result)
-                                    
-                            except Exception as e:
-                                print(f"행 파싱 오류: {e}")
-                                continue
-            
-            # 결과가 없는 경우 "조회 결과가 없습니다" 메시지 확인
-            if not results:
-                no_result = soup.find(string=lambda text: text and '조회 결과가 없습니다' in text)
-                if no_result:
-                    print("📭 검색 결과가 없습니다.")
-                else:
-                    print("⚠️ 결과 파싱 중 문제가 발생했습니다.")
-                    # 디버그용: HTML 일부 출력
-                    print("HTML 샘플:")
-                    print(soup.prettify()[:500] + "...")
-            
-            return results
-            
+            ajax_headers = {
+                'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
+                'X-Requested-With': 'XMLHttpRequest',
+                'Referer': self.main_url
+            }
+
+            search_data = [
+                ('option', 'corp'),
+                ('textCrpNm', company_name),
+                ('startDate', start_date),
+                ('endDate', end_date),
+                ('sort', 'date'),
+                ('series', 'desc'),
+            ]
+            for public_type in public_types or []:
+                search_data.append(('publicType', public_type))
+            search_data.extend([
+                ('currentPage', str(page)),
+                ('pageCount', '100')
+            ])
+
+            # raise_errors이면 해석하지 못한 페이지를 마지막 페이지로 오인하지 않도록 예외 발생 (캐시에도 남기지 않음)
+            parse = self._parse_search_response_strict if raise_errors else self._parse_search_response
+            return self._fetch_parsed('POST', self.search_url, 'search', parse,
+                                      data=search_data, headers=ajax_headers)
+
+        except Exception as e:
+            print(f"✗ 검색 페이지 조회 실패: {e}")
+            if raise_errors:
+                raise
+            return []
+
+    def _parse_search_results(self, html_content, encoding: Optional[str] = None,
+                              strict: bool = False) -> List[Dict]:
+        """
+        검색 결과 HTML 파싱
+
+        Args:
+            strict: True이면 결과 행도 '결과 없음' 안내도 없는 페이지에서 빈 목록 대신 SearchPageError 발생
+                    (마지막 페이지와 해석하지 못한 페이지를 구분해야 하는 호출용)
+        """
+        try:
+            rows, status = self._run_parser(parse_search_rows, html_content, encoding, self.base_url)
         except Exception as e:
             print(f"✗ 결과 파싱 실패: {e}")
+            if strict:
+                raise SearchPageError(f"검색 결과 파싱 실패: {e}") from e
             return []
+        results = [dict(zip(SEARCH_ROW_FIELDS, row)) for row in rows]
+
+        # 결과가 없는 경우 "조회 결과가 없습니다" 메시지 확인
+        if not results:
+            if status == 'no_result':
+                print("📭 검색 결과가 없습니다.")
+            else:
+                print("⚠️ 결과 파싱 중 문제가 발생했습니다.")
+                # 디버그용: HTML 일부 출력
+                print("HTML 샘플:")
+                print(status.split(':', 1)[-1] + "...")
+                if strict:
+                    raise SearchPageError("검색 결과 행도 '조회 결과가 없습니다' 안내도 없는 페이지")
+
+        return results
+
+    def _parse_search_response(self, response: requests.Response, strict: bool = False) -> List[Dict]:
+        """검색 응답 파싱 - 프로세스 풀 사용 시 디코딩 전 원본 바이트를 그대로 전달"""
+        if self.parse_workers > 0:
+            return self._parse_search_results(response.content, declared_charset(response), strict)
+        return self._parse_search_results(response.text, strict=strict)
+
+    def _parse_search_response_strict(self, response: requests.Response) -> List[Dict]:
+        return self._parse_search_response(response, strict=True)
+    
+    def _parse_html(self, func, response: requests.Response):
+        """HTML 파싱 함수 실행 - parse_workers > 0이면 원본 바이트를 프로세스 풀로 전달"""
+        if self.parse_workers > 0:
+            return self._run_parser(func, response.content, declared_charset(response))
+        return self._run_parser(func, response.text)
+    
+    def _fetch_parsed(self, method: str, url: str, parser_name: str, parse, **kwargs):
+        """
+        요청 후 파싱 - 응답 캐시로 조건부 재검증
+        
+        보관한 검증자(ETag/Last-Modified)를 붙여 요청하고, 304이거나 본문 해시가 같으면
+        이전 파싱 결과를 그대로 반환 (같은 본문을 다른 파서로 읽은 적만 있으면 보관한 본문을 파싱)
+        
+        Args:
+            method: HTTP 메서드
+            url: 요청 URL
+            parser_name: 파싱 결과를 보관할 이름 (같은 페이지를 여러 방식으로 파싱할 때 구분)
+            parse: 응답을 받아 결과를 반환하는 함수 (결과는 JSON으로 보관 - 튜플은 리스트로 돌아옴)
+            **kwargs: _request 인자 (data, headers 등)
+        
+        Returns:
+            parse 결과
+        
+        Raises:
+            requests.HTTPError: 오류 응답
+        """
+        cache = self.response_cache
+        key = cache.key(method, url, kwargs.get('data'))
+        entry = cache.lookup(key)
+        if entry:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **cache.conditional_headers(entry, method))
+        
+        response = self._request(method, url, **kwargs)
+        if response.status_code == 304 and entry:
+            cache.revalidated(key, entry, response, NOT_MODIFIED)
+            return self._reuse_parsed(key, entry, parser_name, parse)
+        response.raise_for_status()
+        
+        digest = hashlib.sha256(response.content).hexdigest()
+        if entry and entry['sha256'] == digest:
+            cache.revalidated(key, entry, response, UNCHANGED)
+            return self._reuse_parsed(key, entry, parser_name, parse, response)
+        
+        parsed = parse(response)
+        cache.store(key, url, response, digest, {parser_name: parsed}, CHANGED if entry else NEW)
+        return parsed
+    
+    def _reuse_parsed(self, key: str, entry: Dict, parser_name: str, parse,
+                      response: Optional[requests.Response] = None):
+        """내용이 그대로인 응답의 파싱 결과 - 없으면 받은(또는 보관한) 본문을 한 번 파싱해 보관"""
+        if parser_name in entry['parsed']:
+            return entry['parsed'][parser_name]
+        if response is None:
+            response = requests.Response()
+            response.status_code = 200
+            response._content = entry['body']
+            response.encoding = entry['encoding']
+        parsed = parse(response)
+        self.response_cache.add_parsed(key, dict(entry['parsed'], **{parser_name: parsed}))
+        return parsed
+
+    def _run_parser(self, func, *args):
+        """파싱 함수 실행 - parse_workers > 0이면 프로세스 풀에서 실행하여 GIL 경합 방지"""
+        if self.parse_workers <= 0:
+            return func(*args)
+
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._parse_pool.submit(func, *args).result()
+
+    def _can_segment(self, response: requests.Response) -> bool:
+        """구간 다운로드 사용 여부 (Accept-Ranges 지원, 비압축, 충분히 큰 파일)"""
+        if self.download_segments <= 1:
+            return False
+        if response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+            return False
+        if response.headers.get('Content-Encoding'):
+            return False
+        length = response.headers.get('Content-Length', '')
+        return length.isdigit() and int(length) >= self.segment_min_size
+    
+    def get_manifest(self, save_dir: str) -> DownloadManifest:
+        """다운로드 폴더의 매니페스트 (폴더별로 한 번만 읽음)"""
+        key = os.path.abspath(save_dir)
+        with self._lock:
+            if key not in self._manifests:
+                self._manifests[key] = DownloadManifest(save_dir)
+            return self._manifests[key]
+    
+    def close(self) -> None:
+        """파싱 프로세스 풀 등 사용 중인 자원 정리"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
+        self.sessions.close()
+        self.response_cache.close()
     
     def display_results(self, results: List[Dict]) -> None:
         """검색 결과를 보기 좋게 출력"""
@@ -302,8 +878,9 @@ class DartScraper:
         except Exception as e:
             print(f"✗ 파일 저장 실패: {e}")
     
-    def save_links_to_txt(self, results: List[Dict], filename: str = None) -> None:
-        """필터링된 보고서의 링크를 텍스트 파일로 저장"""
+    @staticmethod
+    def save_links_to_txt(results: List[Dict], filename: str = None) -> None:
+        """필터링된 보고서의 링크를 텍스트 파일로 저장 (download_all_reports_from_txt로 다시 받을 수 있음)"""
         if not results:
             print("저장할 링크가 없습니다.")
             return
@@ -346,17 +923,62 @@ class DartScraper:
             
         except Exception as e:
             print(f"✗ 링크 파일 저장 실패: {e}")
+
+    @staticmethod
+    def load_links_from_txt(txt_file: str) -> List[Dict]:
+        """
+        링크 TXT 파일의 보고서 목록 (save_links_to_txt 형식이면 회사명·보고서명·접수일 포함)
+
+        링크만 있는 줄도 읽으며, 같은 링크는 한 번만 (파일에 나타난 순서 유지)
+
+        Returns:
+            [{'report_url', 'rcp_no', 'company', 'corp_name', 'report_name', 'submit_date'}, ...]
+            - 링크만 있는 보고서는 report_url과 rcp_no만 있음
+        """
+        link_prefix = 'https://dart.fss.or.kr/dsaf001/main.do?rcpNo='
+        reports: Dict[str, Dict] = {}
+        pending: Dict[str, str] = {}
+        with open(txt_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                header = re.match(r'^\[\s*\d+\]\s*(.*?) - (.*)$', line)
+                if header:
+                    pending = {'company': header.group(1), 'corp_name': header.group(1),
+                               'report_name': header.group(2)}
+                    continue
+                if line.startswith('접수일:'):
+                    pending['submit_date'] = line.split(':', 1)[1].strip()
+                    continue
+
+                labeled = line.startswith('링크:')
+                link = line.split(':', 1)[1].strip() if labeled else line
+                rcp_match = re.match(re.escape(link_prefix) + r'(\d+)', link)
+                if not rcp_match:
+                    continue
+                report = reports.setdefault(link, {'report_url': link, 'rcp_no': rcp_match.group(1)})
+                if labeled:
+                    report.update({key: value for key, value in pending.items() if value})
+                    pending = {}
+        return list(reports.values())
+
+    def build_download_info(self, rcp_no: str, dcm_no: str) -> Dict[str, str]:
+        """rcpNo/dcmNo로 다운로드 정보 구성"""
+        return {
+            'rcp_no': rcp_no,
+            'dcm_no': dcm_no,
+            'download_page_url': f"{self.base_url}/pdf/download/main.do?rcp_no={rcp_no}&dcm_no={dcm_no}",
+            'download_url': f"{self.base_url}/pdf/download/pdf.do?rcp_no={rcp_no}&dcm_no={dcm_no}"
+        }
     
     def get_report_download_info(self, report_url: str) -> Optional[Dict[str, str]]:
-        """보고서 페이지에서 다운로드 정보 추출"""
+        """보고서 페이지에서 다운로드 정보 추출 (한 번 조회한 보고서는 캐시 사용)"""
+        cached = self._download_info_cache.get(report_url)
+        if cached:
+            return dict(cached)
+        
         try:
             print(f"📄 보고서 페이지 분석: {report_url}")
             
-            response = self.session.get(report_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
             # rcpNo 추출 (URL에서)
             rcp_no_match = re.search(r'rcpNo=(\d+)', report_url)
             rcp_no = rcp_no_match.group(1) if rcp_no_match else None
@@ -365,85 +987,17 @@ class DartScraper:
                 print("  ❌ rcpNo를 찾을 수 없음")
                 return None
             
-            # dcmNo 찾기 - 여러 방법으로 시도
-            dcm_no = None
+            # dcmNo 찾기 - 여러 방법으로 시도 (뷰어 페이지가 바뀌지 않았으면 이전 결과 사용)
+            dcm_no, found = self._fetch_parsed('GET', report_url, 'dcm_no',
+                                               lambda response: self._parse_html(extract_dcm_no, response))
             
-            # 방법 1: JavaScript 변수에서 찾기
-            scripts = soup.find_all('script')
-            for script in scripts:
-                if script.string:
-                    content = script.string
-                    
-                    # dcmNo 변수 찾기
-                    dcm_match = re.search(r'dcmNo\s*[=:]\s*["\']?(\d+)["\']?', content, re.IGNORECASE)
-                    if dcm_match:
-                        dcm_no = dcm_match.group(1)
-                        print(f"  ✅ JavaScript 변수에서 dcmNo 발견: {dcm_no}")
-                        break
-                    
-                    # openPdfDownload 함수 호출 찾기
-                    pdf_match = re.search(r'openPdfDownload\s*\(\s*["\']?(\d+)["\']?\s*,\s*["\']?(\d+)["\']?\s*\)', content)
-                    if pdf_match:
-                        rcp_param = pdf_match.group(1)
-                        dcm_param = pdf_match.group(2)
-                        print(f"  ✅ openPdfDownload 호출에서 발견: rcpNo={rcp_param}, dcmNo={dcm_param}")
-                        dcm_no = dcm_param  # openPdfDownload에서 찾은 dcmNo가 정확함
-                        break
-            
-            # 방법 2: HTML 속성에서 찾기
-            if not dcm_no:
-                elements_with_dcm = soup.find_all(attrs={'data-dcm-no': True})
-                if elements_with_dcm:
-                    dcm_no = elements_with_dcm[0]['data-dcm-no']
-                    print(f"  ✅ HTML data-dcm-no 속성에서 발견: {dcm_no}")
-            
-            # 방법 3: 숨겨진 input 필드에서 찾기
-            if not dcm_no:
-                hidden_inputs = soup.find_all('input', {'type': 'hidden'})
-                for inp in hidden_inputs:
-                    name = inp.get('name', '').lower()
-                    if 'dcm' in name or 'doc' in name:
-                        value = inp.get('value', '')
-                        if value and value.isdigit():
-                            dcm_no = value
-                            print(f"  ✅ 숨겨진 input[{inp.get('name')}]에서 발견: {dcm_no}")
-                            break
-            
-            # 방법 4: 다운로드 버튼/링크에서 찾기
-            if not dcm_no:
-                download_elements = soup.find_all(['a', 'button'], 
-                    string=re.compile(r'다운로드|download|PDF', re.IGNORECASE))
-                
-                for elem in download_elements:
-                    onclick = elem.get('onclick', '')
-                    href = elem.get('href', '')
-                    
-                    # onclick에서 dcmNo 추출 (openPdfDownload 함수 호출에서)
-                    if onclick:
-                        pdf_onclick_match = re.search(r'openPdfDownload\s*\(\s*["\']?(\d+)["\']?\s*,\s*["\']?(\d+)["\']?\s*\)', onclick)
-                        if pdf_onclick_match:
-                            rcp_param = pdf_onclick_match.group(1)
-                            dcm_param = pdf_onclick_match.group(2)
-                            dcm_no = dcm_param
-                            print(f"  ✅ 다운로드 버튼 onclick에서 발견: dcmNo={dcm_no}")
-                            print(f"  전체 onclick: {onclick}")
-                            break
-                    
-                    # href에서 dcmNo 추출
-                    if href and 'dcm' in href.lower():
-                        dcm_match = re.search(r'dcm[_-]?no=(\d+)', href, re.IGNORECASE)
-                        if dcm_match:
-                            dcm_no = dcm_match.group(1)
-                            print(f"  ✅ 다운로드 링크 href에서 발견: {dcm_no}")
-                            break
+            if dcm_no:
+                print(f"  ✅ {found}")
             
             if rcp_no and dcm_no:
-                return {
-                    'rcp_no': rcp_no,
-                    'dcm_no': dcm_no,
-                    'download_page_url': f"https://dart.fss.or.kr/pdf/download/main.do?rcp_no={rcp_no}&dcm_no={dcm_no}",
-                    'download_url': f"https://dart.fss.or.kr/pdf/download/pdf.do?rcp_no={rcp_no}&dcm_no={dcm_no}"
-                }
+                download_info = self.build_download_info(rcp_no, dcm_no)
+                self._download_info_cache[report_url] = download_info
+                return dict(download_info)
             else:
                 print(f"  ❌ 다운로드 파라미터를 찾을 수 없음 (rcpNo: {rcp_no}, dcmNo: {dcm_no})")
                 return None
@@ -452,8 +1006,280 @@ class DartScraper:
             print(f"  ❌ 다운로드 정보 추출 실패: {e}")
             return None
     
-    def download_report_file(self, download_info: Dict[str, str], save_dir: str = "downloads") -> bool:
-        """보고서 파일 다운로드"""
+    def probe_download_size(self, download_info: Dict[str, str]) -> Optional[int]:
+        """
+        PDF를 받지 않고 파일 크기 확인 (HEAD, 안 되면 1바이트 구간 요청, 확인한 크기는 캐시)
+        
+        Returns:
+            파일 크기 (bytes), PDF가 아니거나 알 수 없으면 None
+        """
+        cached = self._size_cache.get(download_info['download_url'])
+        if cached is not None:
+            return cached
+        size = self._probe_download_size(download_info)
+        if size is not None:
+            self._size_cache[download_info['download_url']] = size
+        return size
+    
+    def _probe_download_size(self, download_info: Dict[str, str]) -> Optional[int]:
+        headers = {
+            'Referer': download_info.get('download_page_url', self.main_url),
+            'Accept': 'application/pdf,*/*'
+        }
+        try:
+            response = self._request('HEAD', download_info['download_url'], headers=headers, allow_redirects=True)
+            length = response.headers.get('Content-Length', '')
+            if response.status_code == 200 and 'application/pdf' in response.headers.get('Content-Type', '') and length.isdigit():
+                return int(length)
+            
+            response = self._request('GET', download_info['download_url'],
+                                     headers=dict(headers, Range='bytes=0-0'), allow_redirects=True, stream=True)
+            try:
+                content_range = response.headers.get('Content-Range', '')
+                if response.status_code == 206 and '/' in content_range:
+                    total = content_range.rsplit('/', 1)[1]
+                    return int(total) if total.isdigit() else None
+                length = response.headers.get('Content-Length', '')
+                if response.status_code == 200 and 'application/pdf' in response.headers.get('Content-Type', '') and length.isdigit():
+                    return int(length)
+            finally:
+                response.close()
+        except Exception as e:
+            print(f"  ⚠️ 파일 크기 확인 실패: {e}")
+        return None
+    
+    def get_report_documents(self, report_url: str) -> Optional[Dict]:
+        """
+        공시(rcpNo)에 포함된 모든 문서 조회 - 뷰어 페이지를 한 번만 읽어 본문과 첨부(감사보고서 등)의 dcmNo를 모두 추출
+        
+        Returns:
+            {'rcp_no', 'documents': [{'dcm_no', 'title', 'rcp_no', 'download_info'}, ...], 'sections': [목차 노드, ...]}
+        """
+        try:
+            rcp_no_match = re.search(r'rcpNo=(\d+)', report_url)
+            if not rcp_no_match:
+                print("  ❌ rcpNo를 찾을 수 없음")
+                return None
+            rcp_no = rcp_no_match.group(1)
+            
+            print(f"📄 보고서 문서 목록 조회: {report_url}")
+            page = self._fetch_parsed('GET', report_url, 'viewer_page',
+                                      lambda response: self._parse_html(parse_viewer_page, response))
+            documents = page['documents']
+            
+            if not documents:
+                print(f"  ❌ 문서를 찾을 수 없음 (rcpNo: {rcp_no})")
+                return None
+            
+            # 첨부된 감사보고서 등은 별도 rcpNo로 제출되므로 문서마다 자기 rcpNo로 다운로드 정보 구성
+            # (이전 형식으로 캐시된 결과는 rcpNo가 없으므로 공시의 rcpNo 사용)
+            documents = [
+                {'dcm_no': doc[0], 'title': doc[1], 'rcp_no': (doc[2] if len(doc) > 2 else '') or rcp_no}
+                for doc in documents
+            ]
+            for doc in documents:
+                doc['download_info'] = self.build_download_info(doc['rcp_no'], doc['dcm_no'])
+            
+            # 첫 문서(본문)는 기존 단일 문서 조회와 같은 결과이므로 캐시에 보관
+            self._download_info_cache.setdefault(report_url, self.build_download_info(rcp_no, documents[0]['dcm_no']))
+            
+            print(f"  ✅ 문서 {len(documents)}개, 목차 {len(page['sections'])}개 발견")
+            return {
+                'rcp_no': rcp_no,
+                'sections': page['sections'],
+                'documents': documents
+            }
+            
+        except Exception as e:
+            print(f"  ❌ 문서 목록 조회 실패: {e}")
+            return None
+    
+    def download_report_documents(self, report_url: str, save_dir: str = "downloads",
+                                  titles: Optional[List[str]] = None, workers: int = 3,
+                                  report: Optional[Dict] = None) -> Dict[str, bool]:
+        """
+        공시에 포함된 문서(본문 + 첨부)를 동시에 다운로드
+        
+        뷰어 페이지 조회가 세션 설정을 겸하므로 문서마다 뷰어를 다시 방문하지 않음
+        
+        Args:
+            report_url: 보고서 뷰어 URL
+            save_dir: 저장 폴더
+            titles: 제목에 이 단어 중 하나가 포함된 문서만 다운로드 (None이면 전체)
+            workers: 동시 다운로드 수 (요청 한도는 공유)
+            report: 검색 결과 (파일명용 회사명·보고서명·접수일, None이면 매니페스트 기록이나 문서 제목 사용)
+        
+        Returns:
+            dcmNo별 다운로드 성공 여부
+        """
+        filing = self.get_report_documents(report_url)
+        if not filing:
+            return {}
+        
+        main_document = filing['documents'][0]
+        documents = filing['documents']
+        if titles:
+            documents = [doc for doc in documents if any(word in doc['title'] for word in titles)]
+        
+        # 검색 결과가 없으면 이전에 받은 같은 공시의 기록으로 파일명 구성
+        base = report or self.get_manifest(save_dir).find_rcp(filing['rcp_no']) or {}
+        base = {key: base[key] for key in ('corp_name', 'company', 'report_name', 'submit_date') if base.get(key)}
+        
+        def document_report(doc: Dict) -> Dict:
+            # 첨부 문서는 보고서명에 문서 제목을 붙여 본문과 구분, 별도 접수번호의 첨부는 그 접수일 사용
+            doc_report = dict(base)
+            if doc is not main_document or not base.get('report_name'):
+                doc_report['report_name'] = ' '.join(filter(None, [base.get('report_name'), doc['title']])) or '문서'
+            if doc['rcp_no'] != filing['rcp_no']:
+                doc_report.pop('submit_date', None)
+            return doc_report
+        
+        for doc in documents:
+            print(f"  📎 {doc['dcm_no']}: {doc['title'] or '(제목 없음)'}")
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                doc['dcm_no']: executor.submit(self.download_report_file, doc['download_info'], save_dir,
+                                               report=document_report(doc))
+                for doc in documents
+            }
+            return {dcm_no: future.result() for dcm_no, future in futures.items()}
+    
+    def build_section_url(self, rcp_no: str, section: Dict[str, str]) -> str:
+        """목차 노드의 본문 HTML URL (뷰어가 섹션을 열 때 쓰는 주소)"""
+        return (f"{self.base_url}/report/viewer.do?rcpNo={section.get('rcpNo') or rcp_no}"
+                f"&dcmNo={section['dcmNo']}&eleId={section.get('eleId', '')}"
+                f"&offset={section.get('offset', '')}&length={section.get('length', '')}"
+                f"&dtd={section.get('dtd', '')}")
+    
+    def download_report_sections(self, report_url: str, save_dir: str = "sections",
+                                 sections: Optional[List[str]] = None, report: Optional[Dict] = None,
+                                 workers: int = 3) -> Optional[Dict]:
+        """
+        PDF 전체 대신 필요한 목차 섹션의 HTML만 다운로드
+        
+        보고서별 폴더({save_dir}/{rcpNo})에 섹션 HTML(self.storage 경유)과 sections.json(보고서 정보 + 섹션 목록)을 저장하며,
+        이미 받은 섹션은 다시 받지 않음
+        
+        Args:
+            report_url: 보고서 뷰어 URL
+            save_dir: 저장 폴더
+            sections: 목차 제목에 포함될 단어 목록 (None이면 DEFAULT_SECTIONS)
+            report: 함께 저장할 검색 결과 (회사명, 보고서명 등)
+            workers: 동시 다운로드 수 (요청 한도는 공유)
+        
+        Returns:
+            저장한 메타데이터 (선택한 섹션 중 하나라도 받지 못하면 None - 받지 못한 섹션은 missing에 기록)
+        """
+        filing = self.get_report_documents(report_url)
+        if not filing:
+            return None
+        
+        rcp_no = filing['rcp_no']
+        selected = select_sections(filing['sections'], sections or DEFAULT_SECTIONS)
+        if not selected:
+            print(f"  ❌ 선택한 섹션을 찾을 수 없음: {', '.join(sections or DEFAULT_SECTIONS)}")
+            return None
+        
+        report_dir = os.path.join(save_dir, rcp_no)
+        os.makedirs(report_dir, exist_ok=True)
+        meta_path = os.path.join(report_dir, SECTIONS_FILENAME)
+        
+        previous = {}
+        if os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    previous = {item['url']: item for item in json.load(f).get('sections', [])}
+            except Exception as e:
+                print(f"  ⚠️ 섹션 정보 파일 읽기 실패: {e}")
+        
+        def fetch(index: int, section: Dict[str, str]) -> Optional[Dict]:
+            url = self.build_section_url(rcp_no, section)
+            title = section.get('text', '').strip()
+            
+            done = previous.get(url)
+            if done and self.storage.exists(save_dir, f"{rcp_no}/{done['filename']}") == done['size']:
+                print(f"  ⏭️ 이미 받은 섹션: {title}")
+                return done
+            
+            try:
+                response = self._request('GET', url, headers={'Referer': report_url})
+                response.raise_for_status()
+            except Exception as e:
+                print(f"  ❌ 섹션 다운로드 실패 ({title}): {e}")
+                return None
+            
+            safe_title = re.sub(r'[^\w\-.()\[\] ]', '', title).strip() or 'section'
+            filename = f"{index:02d}_{safe_title}.html"
+            self.storage.write(save_dir, f"{rcp_no}/{filename}", response.content, key=(rcp_no, section['dcmNo']))
+            
+            print(f"  ✅ 섹션 저장: {title} ({len(response.content):,} bytes)")
+            return {
+                'title': title,
+                'dcm_no': section['dcmNo'],
+                'ele_id': section.get('eleId', ''),
+                'offset': section.get('offset', ''),
+                'length': section.get('length', ''),
+                'url': url,
+                'filename': filename,
+                'size': len(response.content),
+                'sha256': hashlib.sha256(response.content).hexdigest(),
+                'encoding': response.encoding,
+            }
+        
+        print(f"📑 섹션 {len(selected)}개 다운로드 (rcpNo: {rcp_no})")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = list(executor.map(fetch, range(1, len(selected) + 1), selected))
+        
+        fetched = [item for item in results if item]
+        missing = [section.get('text', '').strip() for section, item in zip(selected, results) if not item]
+        metadata = {
+            'rcp_no': rcp_no,
+            'report_url': report_url,
+            'report': report or {},
+            'fetched_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'sections': fetched,
+            'missing': missing,
+        }
+        # 일부만 받았어도 받은 섹션은 기록해 두어 다음 실행에서 나머지만 받음
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        
+        total = sum(item['size'] for item in fetched)
+        print(f"  📦 섹션 {len(fetched)}/{len(selected)}개 저장 ({total:,} bytes): {report_dir}")
+        if missing:
+            print(f"  ❌ 받지 못한 섹션 {len(missing)}개: {', '.join(missing)}")
+            return None
+        return metadata
+    
+    def _resolve_filename(self, response: requests.Response, save_dir: str, rcp_no: str, dcm_no: str,
+                          report: Optional[Dict] = None) -> str:
+        """
+        저장 파일명 - 이미 받은 보고서는 기존 이름, 검색 결과가 있으면 고정 이름,
+        둘 다 없을 때만 서버 파일명(Content-Disposition) 사용
+        """
+        entry = self.get_manifest(save_dir).get(rcp_no, dcm_no)
+        if entry and entry.get('filename'):
+            return entry['filename']
+        if report and report.get('report_name'):
+            return report_filename(report, rcp_no, dcm_no)
+        
+        fallback = f"report_{rcp_no}_{dcm_no}.pdf"
+        server_name = filename_from_disposition(response.headers.get('Content-Disposition', ''))
+        filename = sanitize_filename(server_name, fallback) if server_name else fallback
+        return filename if filename.lower().endswith('.pdf') else filename + '.pdf'
+    
+    def download_report_file(self, download_info: Dict[str, str], save_dir: str = "downloads",
+                             prime: bool = False, report: Optional[Dict] = None) -> bool:
+        """
+        보고서 파일 다운로드
+        
+        Args:
+            download_info: get_report_download_info 결과
+            save_dir: 저장 폴더
+            prime: True이면 PDF 요청 전에 항상 보고서/다운로드 페이지를 방문하여 세션 설정
+            report: 검색 결과 (회사명, 보고서명, 접수일) - 있으면 응답 헤더 대신 이 정보로 파일명을 정하고 매니페스트에 기록
+        """
         try:
             download_url = download_info['download_url']
             rcp_no = download_info['rcp_no']
@@ -461,27 +1287,42 @@ class DartScraper:
             
             print(f"📥 파일 다운로드 시도: rcpNo={rcp_no}, dcmNo={dcm_no}")
             
+            # 최근 실패한 보고서는 백오프 시간이 지날 때까지 건너뜀
+            failure_key = f"{rcp_no}:{dcm_no}"
+            remaining = self.negative_cache.remaining(failure_key)
+            if remaining > 0:
+                print(f"  ⏭️ 최근 실패한 보고서 - {int(remaining)}초 후 재시도 가능")
+                return False
+            
             # 다운로드 폴더 생성
             os.makedirs(save_dir, exist_ok=True)
             
-            # 1단계: 보고서 페이지 방문하여 세션 설정
-            report_page_url = f"https://dart.fss.or.kr/dsaf001/main.do?rcpNo={rcp_no}"
-            self.session.get(report_page_url)
-            
-            # 2단계: 다운로드 페이지 방문 (필요시)
-            if 'download_page_url' in download_info:
-                download_page_url = download_info['download_page_url']
-                self.session.get(download_page_url)
-                referer_url = download_page_url
-            else:
-                referer_url = report_page_url
-            
-            # 3단계: 실제 PDF 파일 다운로드
+            report_page_url = f"{self.base_url}/dsaf001/main.do?rcpNo={rcp_no}"
+            referer_url = download_info.get('download_page_url', report_page_url)
             headers = {
                 'Referer': referer_url,
                 'Accept': 'application/pdf,*/*'
             }
-            response = self.session.get(download_url, headers=headers, allow_redirects=True, stream=True)
+            
+            # 세션 설정 페이지 방문은 서버가 PDF 대신 다른 응답을 줄 때만 수행
+            response = None
+            if not prime:
+                response = self._request('GET', download_url, headers=headers, allow_redirects=True, stream=True)
+                if response.status_code != 200 or 'application/pdf' not in response.headers.get('Content-Type', ''):
+                    print("  🔄 세션 설정 후 재시도")
+                    response.close()
+                    response = None
+            
+            if response is None:
+                # 1단계: 보고서 페이지 방문하여 세션 설정
+                self._request('GET', report_page_url)
+                
+                # 2단계: 다운로드 페이지 방문 (필요시)
+                if 'download_page_url' in download_info:
+                    self._request('GET', download_info['download_page_url'])
+                
+                # 3단계: 실제 PDF 파일 다운로드
+                response = self._request('GET', download_url, headers=headers, allow_redirects=True, stream=True)
             
             print(f"  응답 상태: {response.status_code}")
             print(f"  Content-Type: {response.headers.get('Content-Type', '없음')}")
@@ -491,84 +1332,77 @@ class DartScraper:
                 content_type = response.headers.get('Content-Type', '')
                 
                 if 'application/pdf' in content_type:
-                    # 파일명 생성 - 한글 인코딩 문제 해결
-                    content_disposition = response.headers.get('Content-Disposition', '')
-                    filename = None
+                    filename = self._resolve_filename(response, save_dir, rcp_no, dcm_no, report)
+                    print(f"  📝 파일명: {filename}")
                     
-                    if content_disposition:
-                        try:
-                            # filename*= 형태 (RFC 6266) 우선 처리
-                            filename_star_match = re.search(r'filename\*=UTF-8\'\'([^;]+)', content_disposition)
-                            if filename_star_match:
-                                import urllib.parse
-                                filename = urllib.parse.unquote(filename_star_match.group(1))
-                                print(f"  📝 UTF-8 파일명: {filename}")
-                            else:
-                                # 일반 filename= 형태 처리
-                                filename_match = re.search(r'filename=["\']?([^"\';\s][^"\';]*)["\']?', content_disposition)
-                                if filename_match:
-                                    raw_filename = filename_match.group(1)
-                                    print(f"  🔍 원본 파일명: {repr(raw_filename)}")
-                                    
-                                    # 여러 인코딩 방식 시도
-                                    encodings_to_try = [
-                                        ('euc-kr', 'EUC-KR'),      # 한국어 주요 인코딩
-                                        ('cp949', 'CP949'),        # 한국어 확장 인코딩  
-                                        ('utf-8', 'UTF-8'),        # 일반적인 UTF-8
-                                        ('iso-8859-1', 'ISO-8859-1')  # 서버 기본값
-                                    ]
-                                    
-                                    filename = None
-                                    for encoding, desc in encodings_to_try:
-                                        try:
-                                            # 먼저 ISO-8859-1로 바이트화한 후 해당 인코딩으로 디코딩
-                                            decoded = raw_filename.encode('iso-8859-1').decode(encoding)
-                                            # 한글이 포함되어 있는지 확인 (유효성 검사)
-                                            if any('\uac00' <= c <= '\ud7a3' for c in decoded):
-                                                filename = decoded
-                                                print(f"  ✅ {desc} 디코딩 성공: {filename}")
-                                                break
-                                        except (UnicodeDecodeError, UnicodeEncodeError):
-                                            continue
-                                    
-                                    # 모든 디코딩이 실패한 경우 원본 사용
-                                    if not filename:
-                                        filename = raw_filename
-                                        print(f"  ⚠️  원본 파일명 사용: {filename}")
-                        except Exception as e:
-                            print(f"  ❌ 파일명 처리 오류: {e}")
+                    # 파일 저장
+                    file_path = os.path.join(save_dir, filename)
                     
-                    # 기본 파일명 설정
-                    if not filename:
-                        filename = f"report_{rcp_no}_{dcm_no}.pdf"
+                    # Content-Length로 사전 할당하고 큰 버퍼로 읽으면서 해시 계산
+                    size = sha256 = None
                     
-                    # 파일명 정리 (안전한 파일명 생성)
-                    import string
-                    # 한글, 영문, 숫자, 기본 기호만 허용
-                    safe_filename = ""
-                    for c in filename:
-                        if (c.isalnum() or c in "-_.() []" or 
-                            '\uac00' <= c <= '\ud7a3' or  # 한글 음절
-                            '\u3131' <= c <= '\u318e'):   # 한글 자모
-                            safe_filename += c
+                    # 서버가 구간 요청을 지원하고 파일이 크면 여러 연결로 나눠 받음 (로컬 저장소만)
+                    if self.storage.is_local and self._can_segment(response):
+                        try:
+                            size, sha256 = download_segmented(
+                                response,
+                                lambda start, end: self._request(
+                                    'GET', download_url,
+                                    headers=dict(headers, Range=f'bytes={start}-{end}'),
+                                    stream=True),
+                                file_path,
+                                segments=self.download_segments,
+                                buffer_size=self.write_buffer_size
+                            )
+                            print(f"  🧩 {self.download_segments}개 구간으로 나눠 받음")
+                        except Exception as e:
+                            print(f"  ⚠️ 구간 다운로드 실패, 단일 스트림으로 재시도: {e}")
+                            response = self._request('GET', download_url, headers=headers, allow_redirects=True, stream=True)
+                            # 재시도 응답도 첫 응답과 같이 확인 (오류·차단 페이지를 .pdf로 저장하지 않도록)
+                            retry_type = response.headers.get('Content-Type', '')
+                            if response.status_code != 200 or 'application/pdf' not in retry_type:
+                                print(f"  ❌ 재시도 응답이 PDF가 아님: HTTP {response.status_code}, {retry_type or '없음'}")
+                                if response.status_code >= 500:
+                                    self.circuit_breaker.record_failure(f"HTTP {response.status_code}")
+                                response.close()
+                                self.negative_cache.record_failure(
+                                    failure_key, f"재시도 응답: HTTP {response.status_code} {retry_type}")
+                                return False
                     
-                    filename = safe_filename if safe_filename else f"report_{rcp_no}_{dcm_no}.pdf"
+                    if size is None:
+                        # 크기가 Content-Length와 다르면 저장소가 잘린 본문을 버리고 IncompleteDownload 발생
+                        try:
+                            size, sha256 = self.storage.store(response, save_dir, filename,
+                                                              buffer_size=self.write_buffer_size,
+                                                              key=(rcp_no, dcm_no))
+                        except IncompleteDownload as e:
+                            print(f"  ⚠️ {e}")
+                            return False
                     
-                    # PDF 확장자 확인
-                    if not filename.lower().endswith('.pdf'):
-                        filename += '.pdf'
-                        
-                    print(f"  📝 최종 파일명: {filename}")
+                    self.get_manifest(save_dir).record(
+                        rcp_no, dcm_no,
+                        filename=filename,
+                        size=size,
+                        sha256=sha256,
+                        report_url=report_page_url,
+                        location=self.storage.location(save_dir, filename),
+                        evicted=False,
+                        **({
+                            'corp_name': report.get('corp_name') or report.get('company', ''),
+                            'report_name': report.get('report_name', ''),
+                            'submit_date': report.get('submit_date', ''),
+                        } if report else {})
+                    )
                     
-                    # 파일 저장
-                    file_path = os.path.join(save_dir, filename)
+                    # 미러 모드: 디스크 한도를 넘으면 오래된 보고서 정리 (방금 받은 보고서 제외)
+                    if self.mirror_quota and self.storage.is_local:
+                        enforce_quota(self.get_manifest(save_dir), self.mirror_quota, protect={(rcp_no, dcm_no)},
+                                      storage=self.storage)
                     
-                    with open(file_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
+                    self.circuit_breaker.record_success()
+                    self.negative_cache.record_success(failure_key)
                     
-                    print(f"  ✅ 다운로드 완료: {file_path}")
+                    print(f"  ✅ 다운로드 완료: {self.storage.location(save_dir, filename)} ({size:,} bytes)")
                     return True
                     
                 else:
@@ -576,17 +1410,34 @@ class DartScraper:
                     # HTML 응답인 경우 로그인 페이지일 가능성
                     if 'text/html' in content_type:
                         print(f"  📄 HTML 응답 - 로그인이 필요하거나 다른 처리가 필요할 수 있음")
+                        sample = response.raw.read(4096, decode_content=True).decode('utf-8', errors='ignore')
+                        # 점검 페이지일 때만 서버 전체 문제로 보고 회로 차단기에 기록 (로그인/안내 페이지는 이 보고서만의 문제)
+                        if looks_like_maintenance(sample):
+                            print(f"  🚧 점검/오류 페이지로 보임")
+                            self.circuit_breaker.record_failure(f"rcpNo={rcp_no} 점검 페이지")
+                    response.close()
+                    ttl = self.negative_cache.record_failure(failure_key, f"PDF가 아닌 응답: {content_type}")
+                    print(f"  ⏭️ {int(ttl)}초 동안 이 보고서는 다시 시도하지 않습니다")
                     return False
             else:
                 print(f"  ❌ 다운로드 실패: HTTP {response.status_code}")
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure(f"HTTP {response.status_code}")
+                response.close()
+                self.negative_cache.record_failure(failure_key, f"HTTP {response.status_code}")
                 return False
                 
         except Exception as e:
             print(f"  ❌ 파일 다운로드 실패: {e}")
             return False
     
-    def download_all_reports_from_txt(self, txt_file: str, save_dir: str = "downloads") -> None:
-        """TXT 파일의 모든 링크에서 보고서 다운로드"""
+    def download_all_reports_from_txt(self, txt_file: str, save_dir: str = "downloads", dry_run: bool = False):
+        """
+        TXT 파일의 모든 링크에서 보고서 다운로드
+        
+        Returns:
+            성공/실패 건수 (dry_run이면 용량/소요 시간 추정 결과, 파일 오류 시 None)
+        """
         try:
             print(f"📁 링크 파일 읽기: {txt_file}")
             
@@ -594,19 +1445,19 @@ class DartScraper:
                 print(f"❌ 파일이 없습니다: {txt_file}")
                 return
             
-            # 링크 추출
-            links = []
-            with open(txt_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('https://dart.fss.or.kr/dsaf001/main.do?rcpNo='):
-                        links.append(line)
+            # 링크 추출 (save_links_to_txt 형식이면 회사명·보고서명·접수일도 함께)
+            reports = self.load_links_from_txt(txt_file)
+            links = [report['report_url'] for report in reports]
             
             if not links:
                 print("❌ 유효한 링크를 찾을 수 없습니다")
                 return
             
             print(f"🔍 총 {len(links)}개 링크 발견")
+            
+            if dry_run:
+                return estimate_downloads(self, reports, save_dir, keep_all_versions=True)
+            
             print(f"📁 다운로드 폴더: {save_dir}")
             print("=" * 80)
             
@@ -614,15 +1465,16 @@ class DartScraper:
             success_count = 0
             fail_count = 0
             
-            for i, link in enumerate(links, 1):
+            for i, (link, report) in enumerate(zip(links, reports), 1):
                 print(f"\n[{i:2d}/{len(links)}] 처리 중...")
                 
                 # 다운로드 정보 추출
                 download_info = self.get_report_download_info(link)
                 
                 if download_info:
-                    # 파일 다운로드
-                    if self.download_report_file(download_info, save_dir):
+                    # 파일 다운로드 (링크 파일에 보고서명이 있으면 검색 다운로드와 같은 고정 파일명)
+                    if self.download_report_file(download_info, save_dir,
+                                                 report=report if report.get('report_name') else None):
                         success_count += 1
                     else:
                         fail_count += 1
@@ -639,6 +1491,7 @@ class DartScraper:
             print(f"  ✅ 성공: {success_count}건")
             print(f"  ❌ 실패: {fail_count}건")
             print(f"  📁 저장 위치: {os.path.abspath(save_dir)}")
+            return {'success': success_count, 'failed': fail_count, 'download_dir': os.path.abspath(save_dir)}
             
         except Exception as e:
             print(f"❌ 일괄 다운로드 실패: {e}")
@@ -665,11 +1518,11 @@ class DartScraper:
                 search_data['textRptNm'] = report_name
             
             # DART 검색 요청
-            response = self.session.post(self.search_url, data=search_data)
+            response = self._request('POST', self.search_url, data=search_data)
             
             if response.status_code == 200:
                 # HTML 파싱하여 결과 추출
-                results = self._parse_search_results(response.text)
+                results = self._parse_search_response(response)
                 
                 # 보고서 유형별 필터링
                 if report_name:
@@ -739,13 +1592,70 @@ class DartScraper:
             print(f"❌ 보고서 검색 오류: {e}")
             return []
     
-    def download_reports_batch(self, reports: List[Dict[str, str]], download_dir: str):
-        """보고서 목록 일괄 다운로드"""
+    def download_report(self, report: Dict[str, str], download_dir: str,
+                        sections: Optional[List[str]] = None) -> bool:
+        """
+        검색 결과 보고서 하나 다운로드 (일괄 다운로드와 스케줄러의 작업 단위)
+        
+        Args:
+            report: 검색 결과 항목
+            download_dir: 저장 폴더
+            sections: 지정하면 PDF 대신 제목에 이 단어가 포함된 목차 섹션 HTML만 다운로드
+        
+        Returns:
+            성공 여부
+        """
+        # 보고서 URL 추출
+        report_url = report.get('report_url')
+        if not report_url:
+            print("  ❌ 보고서 URL이 없습니다.")
+            return False
+        
+        # 섹션 모드: 필요한 목차 섹션만 받음
+        if sections:
+            return bool(self.download_report_sections(report_url, download_dir, sections, report=report))
+        
+        # 다운로드 정보 추출
+        download_info = self.get_report_download_info(report_url)
+        if not download_info:
+            return False
+        
+        # PDF 다운로드 (파일명과 후처리용 회사명/보고서명은 검색 결과에서)
+        return bool(self.download_report_file(download_info, download_dir, report=report))
+    
+    def download_reports_batch(self, reports: List[Dict[str, str]], download_dir: str,
+                               keep_all_versions: bool = False, dry_run: bool = False,
+                               sections: Optional[List[str]] = None, extract_dir: Optional[str] = None,
+                               scheduler=None):
+        """
+        보고서 목록 일괄 다운로드
+        
+        Args:
+            reports: 검색 결과 리스트
+            download_dir: 저장 폴더
+            keep_all_versions: False이면 같은 회사·기간의 정정 공시 중 최신본만 다운로드
+            dry_run: True이면 받지 않고 용량/소요 시간 추정 결과만 반환
+            sections: 지정하면 PDF 대신 제목에 이 단어가 포함된 목차 섹션 HTML만 다운로드
+            extract_dir: 지정하면 다운로드 후 새로 받은 보고서의 재무제표를 이 폴더에 추출
+            scheduler: DownloadScheduler - 지정하면 검색 순서 대신 우선순위 순서로 마감 시각 안에 받고
+                       남은 보고서는 다음 실행을 위해 체크포인트에 저장
+        
+        Returns:
+            성공/실패 건수 (dry_run이면 용량/소요 시간 추정 결과, scheduler가 있으면 schedule에 스케줄 결정 포함)
+        """
         try:
-            if not reports:
+            # 스케줄러는 새 보고서가 없어도 지난 실행의 체크포인트를 이어 받음
+            if not reports and scheduler is None:
                 print("❌ 다운로드할 보고서가 없습니다.")
                 return
             
+            if dry_run:
+                return estimate_downloads(self, reports, download_dir, keep_all_versions=keep_all_versions)
+            
+            reports = plan_latest_versions(reports, keep_all_versions)
+            if scheduler is not None:
+                reports = scheduler.plan(reports)
+            
             print(f"\n📥 {len(reports)}개 보고서 일괄 다운로드 시작")
             print(f"📁 다운로드 폴더: {download_dir}")
             print("=" * 80)
@@ -754,29 +1664,25 @@ class DartScraper:
             fail_count = 0
             
             for i, report in enumerate(reports, 1):
-                print(f"\n[{i:2d}/{len(reports)}] 처리 중...")
-                
-                # 보고서 URL 추출
-                report_url = report.get('report_url')
-                if not report_url:
-                    print("  ❌ 보고서 URL이 없습니다.")
-                    fail_count += 1
+                # 마감 시각 안에 끝낼 수 없는 보고서는 다음 실행으로 미룸
+                if scheduler is not None and not scheduler.admit(report):
                     continue
                 
-                # 다운로드 정보 추출
-                download_info = self.get_report_download_info(report_url)
+                print(f"\n[{i:2d}/{len(reports)}] 처리 중...")
+                started = time.monotonic()
                 
-                if download_info:
-                    # PDF 다운로드
-                    if self.download_report_file(download_info, download_dir):
-                        success_count += 1
-                    else:
-                        fail_count += 1
+                succeeded = self.download_report(report, download_dir, sections)
+                if succeeded:
+                    success_count += 1
                 else:
                     fail_count += 1
                 
-                # 서버 부하 방지를 위한 대기
-                time.sleep(1)
+                # 서버 부하 방지를 위한 대기 (스케줄러는 마감이 급한 우선 보고서에서 대기를 줄임)
+                if scheduler is not None:
+                    scheduler.record(report, succeeded, time.monotonic() - started)
+                    time.sleep(scheduler.pause_after(report))
+                else:
+                    time.sleep(1)
             
             print("\n" + "=" * 80)
             print("🎉 다운로드 완료!")
@@ -784,6 +1690,16 @@ class DartScraper:
             print(f"  ❌ 실패: {fail_count}건")
             if download_dir:
                 print(f"  📁 저장 위치: {os.path.abspath(download_dir)}")
+            self.response_cache.print_stats()
+            
+            if extract_dir and success_count:
+                from dart_extract import FinancialExtractor
+                FinancialExtractor(download_dir, extract_dir, manifest=self.get_manifest(download_dir)).run()
+            
+            result = {'success': success_count, 'failed': fail_count, 'download_dir': os.path.abspath(download_dir)}
+            if scheduler is not None:
+                result['schedule'] = scheduler.finish()
+            return result
                 
         except Exception as e:
             print(f"❌ 일괄 다운로드 오류: {e}")
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+DART 세션 풀과 요청 한도
+스레드별로 세션을 나눠 주고, 쿠키를 파일에 보존하여 실행할 때마다 검색 페이지로 세션을 데우지 않도록 합니다.
+모든 스레드의 요청은 하나의 요청 한도(RateLimiter)를 공유하며,
+실패한 보고서는 NegativeCache가, 서버 점검 상황은 CircuitBreaker가 걸러 냅니다.
+"""
+
+import requests
+import threading
+import time
+import json
+import os
+import atexit
+import weakref
+from typing import Callable, List, Dict, Optional
+
+
+DEFAULT_COOKIE_FILE = ".dart_session.json"
+DEFAULT_NEGATIVE_CACHE_FILE = ".dart_failures.json"
+
+# 닫지 않은 세션 풀 - 종료 시 한 번에 쿠키 저장 (풀을 붙잡아 두지 않도록 약한 참조)
+_open_pools = weakref.WeakSet()
+
+
+def _save_open_pools() -> None:
+    for pool in list(_open_pools):
+        pool.save()
+
+
+atexit.register(_save_open_pools)
+
+
+class SessionPool:
+    """쿠키를 실행 간에 보존하는 스레드별 requests 세션 풀"""
+
+    def __init__(self, headers: Dict[str, str], size: int = 4,
+                 cookie_file: Optional[str] = DEFAULT_COOKIE_FILE, max_age: int = 3600):
+        """
+        Args:
+            headers: 모든 세션에 적용할 기본 헤더
+            size: 미리 만들어 둘 세션 수 (초과하는 스레드는 기존 세션을 나눠 씀)
+            cookie_file: 쿠키 보존 파일 (None이면 보존하지 않음)
+            max_age: 저장된 쿠키를 데워진 세션으로 인정할 시간 (초)
+        """
+        self.headers = dict(headers)
+        self.size = max(1, size)
+        self.cookie_file = cookie_file
+        self.max_age = max_age
+        self.warmed_at = 0.0
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next = 0
+
+        saved_cookies = self._load_cookies()
+        self._sessions = [self._new_session(saved_cookies) for _ in range(self.size)]
+        _open_pools.add(self)
+
+    def _new_session(self, cookies: List[Dict]) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(self.headers)
+        for cookie in cookies:
+            session.cookies.set(cookie['name'], cookie['value'],
+                                domain=cookie.get('domain', ''), path=cookie.get('path', '/'),
+                                expires=cookie.get('expires'), secure=cookie.get('secure', False))
+        return session
+
+    def _load_cookies(self) -> List[Dict]:
+        """저장된 쿠키 불러오기 (만료된 쿠키 제외)"""
+        if not self.cookie_file or not os.path.exists(self.cookie_file):
+            return []
+        try:
+            with open(self.cookie_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 세션 파일 읽기 실패: {e}")
+            return []
+
+        now = time.time()
+        cookies = [c for c in data.get('cookies', []) if not c.get('expires') or c['expires'] > now]
+        if cookies:
+            self.warmed_at = data.get('warmed_at', 0.0)
+        return cookies
+
+    def save(self) -> None:
+        """모든 세션의 쿠키를 합쳐 파일에 저장"""
+        if not self.cookie_file:
+            return
+
+        cookies = {}
+        with self._lock:
+            for session in self._sessions:
+                for cookie in session.cookies:
+                    cookies[(cookie.domain, cookie.path, cookie.name)] = {
+                        'name': cookie.name,
+                        'value': cookie.value,
+                        'domain': cookie.domain,
+                        'path': cookie.path,
+                        'expires': cookie.expires,
+                        'secure': cookie.secure,
+                    }
+
+        if not cookies:
+            return
+        try:
+            with open(self.cookie_file, 'w', encoding='utf-8') as f:
+                json.dump({'warmed_at': self.warmed_at, 'cookies': list(cookies.values())},
+                          f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"⚠️ 세션 파일 저장 실패: {e}")
+
+    def get(self) -> requests.Session:
+        """현재 스레드에 배정된 세션 반환"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            with self._lock:
+                session = self._sessions[self._next % len(self._sessions)]
+                self._next += 1
+            self._local.session = session
+        return session
+
+    def is_warm(self) -> bool:
+        """저장되었거나 최근에 데운 세션 쿠키가 유효한지 여부"""
+        return self.warmed_at > 0 and time.time() - self.warmed_at < self.max_age
+
+    def mark_warm(self, source: requests.Session) -> None:
+        """세션을 데운 뒤 얻은 쿠키를 풀의 모든 세션에 공유하고 저장"""
+        with self._lock:
+            for session in self._sessions:
+                if session is not source:
+                    session.cookies.update(source.cookies)
+            self.warmed_at = time.time()
+        self.save()
+
+    def invalidate(self) -> None:
+        """서버가 세션을 거부한 경우 데워진 상태 해제"""
+        self.warmed_at = 0.0
+
+    def close(self) -> None:
+        """쿠키 저장 후 모든 세션 종료"""
+        _open_pools.discard(self)
+        self.save()
+        for session in self._sessions:
+            session.close()
+
+
+class RateLimiter:
+    """모든 스레드가 공유하는 초당 요청 수 제한 (토큰 버킷)"""
+
+    def __init__(self, requests_per_second: float = 2.0, burst: int = 1):
+        """
+        Args:
+            requests_per_second: 초당 허용 요청 수 (0 이하이면 제한 없음)
+            burst: 연속으로 허용할 최대 요청 수
+        """
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self.rate = requests_per_second
+
+    def set_rate(self, requests_per_second: float) -> None:
+        """요청 한도 변경 (여러 노드가 전체 한도를 나눠 쓸 때 사용)"""
+        with self._lock:
+            self.rate = requests_per_second
+
+    def acquire(self) -> None:
+        """요청 하나를 보낼 수 있을 때까지 대기"""
+        while True:
+            with self._lock:
+                if self.rate <= 0:
+                    return
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class NegativeCache:
+    """실패한 요청 키를 지수 백오프 TTL 동안 기억하여 같은 실패를 반복하지 않도록 함"""
+
+    def __init__(self, base_ttl: float = 300, max_ttl: float = 86400,
+                 cache_file: Optional[str] = None):
+        """
+        Args:
+            base_ttl: 첫 실패 후 재시도까지 대기 시간 (초), 실패할 때마다 두 배
+            max_ttl: 최대 대기 시간 (초)
+            cache_file: 실행 간에 보존할 파일 (None이면 메모리에만 보관)
+        """
+        self.base_ttl = base_ttl
+        self.max_ttl = max_ttl
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 실패 기록 파일 읽기 실패: {e}")
+            return
+        now = time.time()
+        self._entries = {key: entry for key, entry in entries.items() if entry.get('until', 0) > now}
+
+    def _save(self) -> None:
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"⚠️ 실패 기록 파일 저장 실패: {e}")
+
+    def remaining(self, key: str) -> float:
+        """재시도까지 남은 시간 (초, 0이면 바로 시도 가능)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return 0.0
+            return max(0.0, entry['until'] - time.time())
+
+    def record_failure(self, key: str, reason: str = '') -> float:
+        """실패 기록 - 다음 재시도까지의 대기 시간 반환"""
+        with self._lock:
+            failures = self._entries.get(key, {}).get('failures', 0) + 1
+            ttl = min(self.max_ttl, self.base_ttl * (2 ** (failures - 1)))
+            self._entries[key] = {'failures': failures, 'until': time.time() + ttl, 'reason': reason}
+            self._save()
+            return ttl
+
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+
+class CircuitBreaker:
+    """점검/오류 페이지가 연속되면 모든 작업을 멈추고, 확인 요청이 성공할 때까지 대기시키는 차단기"""
+
+    def __init__(self, failure_threshold: int = 3, probe_interval: float = 60,
+                 max_probe_interval: float = 900):
+        """
+        Args:
+            failure_threshold: 차단기를 여는 연속 실패 횟수
+            probe_interval: 차단 후 첫 확인 요청까지 대기 시간 (초), 확인 실패 시 두 배
+            max_probe_interval: 최대 확인 간격 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self._cond = threading.Condition()
+        self._failures = 0
+        self._open = False
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    def record_failure(self, reason: str = '') -> None:
+        with self._cond:
+            self._failures += 1
+            if not self._open and self._failures >= self.failure_threshold:
+                self._open = True
+                print(f"🚧 서버 점검/오류 응답이 {self._failures}회 연속되어 모든 작업을 일시 중지합니다: {reason}")
+
+    def record_success(self) -> None:
+        with self._cond:
+            self._failures = 0
+            if self._open:
+                self._open = False
+                self._cond.notify_all()
+
+    def wait_until_closed(self, probe: Callable[[], bool]) -> None:
+        """
+        차단기가 열려 있으면 닫힐 때까지 대기
+
+        한 스레드만 확인 요청(probe)을 보내고 나머지 스레드는 결과를 기다림
+        """
+        with self._cond:
+            if not self._open:
+                return
+            while self._open and self._probing:
+                self._cond.wait()
+            if not self._open:
+                return
+            self._probing = True
+
+        interval = self.probe_interval
+        try:
+            while True:
+                print(f"⏸️ {int(interval)}초 후 서버 상태를 확인합니다...")
+                time.sleep(interval)
+                try:
+                    ok = probe()
+                except Exception:
+                    ok = False
+                if ok:
+                    print("▶️ 서버가 정상 응답하여 작업을 재개합니다.")
+                    self.record_success()
+                    return
+                interval = min(self.max_probe_interval, interval * 2)
+        finally:
+            with self._cond:
+                self._probing = False
+                self._cond.notify_all()
@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+보고서 파일 저장
+Content-Length 기반 사전 할당, 재사용 버퍼를 이용한 대용량 쓰기, 스트리밍 중 해시 계산,
+여러 연결로 나눠 받는 구간 다운로드와 다운로드 매니페스트를 제공합니다.
+저장 위치는 StorageBackend로 바꿀 수 있습니다. (기본값 LocalStorage, 객체 저장소는 dart_s3.S3Storage, 팩 파일은 dart_pack.PackStorage)
+"""
+
+import abc
+import contextlib
+import hashlib
+import mmap
+import threading
+import queue
+import json
+import os
+import re
+import unicodedata
+from datetime import datetime
+from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional, Tuple
+
+import requests
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+MANIFEST_FILENAME = ".dart_manifest.jsonl"
+
+# 섹션 모드 메타데이터 파일 (보고서별 폴더에 저장)
+SECTIONS_FILENAME = "sections.json"
+
+# 파일명에 남길 문자 (한글 포함 \w, 기본 기호) - 나머지는 제거
+_UNSAFE_FILENAME = re.compile(r'[^\w\-.()\[\] ]')
+# 회사명/보고서명 최대 길이 (한글은 UTF-8로 3바이트이므로 파일명 255바이트 제한 안쪽으로 유지)
+_MAX_NAME_PART = 60
+
+
+def _preallocate(f, size: int) -> None:
+    """파일 공간 미리 확보 (지원하지 않는 파일시스템에서는 크기만 지정)"""
+    if size <= 0:
+        return
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except (AttributeError, OSError):
+        f.truncate(size)
+
+
+class IncompleteDownload(IOError):
+    """받은 본문 크기가 Content-Length와 다름 (연결이 끊겨 잘린 파일)"""
+
+
+def _expected_length(response: requests.Response) -> Optional[int]:
+    """압축되지 않은 응답의 Content-Length (알 수 없으면 None)"""
+    if response.headers.get('Content-Encoding', 'identity') not in ('', 'identity'):
+        return None
+    try:
+        return int(response.headers.get('Content-Length', ''))
+    except ValueError:
+        return None
+
+
+class BackgroundWriter:
+    """별도 스레드에서 디스크 쓰기 - 네트워크 읽기가 저장소를 기다리지 않도록 버퍼를 돌려 씀"""
+
+    def __init__(self, f, buffer_size: int, buffer_count: int = 4):
+        self.f = f
+        self.free = queue.Queue()
+        for _ in range(max(2, buffer_count)):
+            self.free.put(bytearray(buffer_size))
+        self.pending = queue.Queue()
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            buf, length = item
+            try:
+                if self.error is None:
+                    self.f.write(memoryview(buf)[:length])
+            except BaseException as e:
+                self.error = e
+            finally:
+                self.free.put(buf)
+
+    def acquire(self) -> bytearray:
+        """비어 있는 버퍼 받기 (모든 버퍼가 쓰기 대기 중이면 대기)"""
+        if self.error is not None:
+            raise self.error
+        return self.free.get()
+
+    def submit(self, buf: bytearray, length: int) -> None:
+        self.pending.put((buf, length))
+
+    def release(self, buf: bytearray) -> None:
+        self.free.put(buf)
+
+    def close(self) -> None:
+        self.pending.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+def stream_to_file(response: requests.Response, file_path: str,
+                   buffer_size: int = DEFAULT_BUFFER_SIZE, background: bool = False,
+                   opener: Callable = open) -> Tuple[int, str]:
+    """
+    응답 본문을 파일로 저장하면서 SHA-256 계산
+
+    임시 파일(.part)에 쓰고 완료되면 이름을 바꾸므로 중단되거나 Content-Length보다 짧게 끝난 다운로드가
+    완성된 파일로 남지 않음
+
+    Args:
+        response: stream=True로 받은 응답
+        file_path: 저장할 파일 경로
+        buffer_size: 읽기/쓰기 버퍼 크기
+        background: True이면 디스크 쓰기를 별도 스레드에서 수행
+        opener: 임시 파일을 여는 함수 (open과 같은 인자 - 벤치마크의 느린 저장소 흉내 등)
+
+    Returns:
+        (저장한 바이트 수, SHA-256 hex)
+
+    Raises:
+        IncompleteDownload: 받은 크기가 Content-Length와 다른 경우 (임시 파일은 삭제)
+    """
+    expected = _expected_length(response)
+    raw = response.raw
+    raw.decode_content = True
+    digest = hashlib.sha256()
+    total = 0
+    part_path = file_path + '.part'
+
+    try:
+        with opener(part_path, 'wb', buffering=0) as f:
+            if expected:
+                _preallocate(f, expected)
+
+            if background:
+                writer = BackgroundWriter(f, buffer_size)
+                try:
+                    while True:
+                        buf = writer.acquire()
+                        length = raw.readinto(buf)
+                        if not length:
+                            writer.release(buf)
+                            break
+                        digest.update(memoryview(buf)[:length])
+                        total += length
+                        writer.submit(buf, length)
+                finally:
+                    writer.close()
+            else:
+                buf = bytearray(buffer_size)
+                view = memoryview(buf)
+                while True:
+                    length = raw.readinto(buf)
+                    if not length:
+                        break
+                    digest.update(view[:length])
+                    f.write(view[:length])
+                    total += length
+
+        if expected is not None and total != expected:
+            raise IncompleteDownload(f"파일 크기 불일치: {total} / {expected} bytes")
+        os.replace(part_path, file_path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return total, digest.hexdigest()
+
+
+class StorageBackend(abc.ABC):
+    """보고서 저장소 인터페이스 - 다운로드 응답 본문을 저장소에 바로 기록"""
+
+    # 로컬 파일로 저장되는지 여부 (구간 다운로드, 디스크 한도 관리는 로컬 저장소에서만 사용)
+    is_local = False
+
+    @abc.abstractmethod
+    def store(self, response: requests.Response, save_dir: str, filename: str,
+              buffer_size: int = DEFAULT_BUFFER_SIZE, key: Optional[Tuple[str, str]] = None) -> Tuple[int, str]:
+        """
+        응답 본문 저장
+
+        Args:
+            key: (rcpNo, dcmNo) - 색인을 가진 저장소(팩)에서 사용
+
+        Returns:
+            (저장한 바이트 수, SHA-256 hex)
+
+        Raises:
+            IncompleteDownload: 받은 크기가 Content-Length와 다른 경우 (잘린 본문은 저장소에 남기지 않음)
+        """
+
+    @abc.abstractmethod
+    def write(self, save_dir: str, filename: str, data: bytes,
+              key: Optional[Tuple[str, str]] = None) -> None:
+        """작은 본문(섹션 HTML 등) 저장 - filename에 하위 폴더('rcpNo/파일명') 포함 가능"""
+
+    @abc.abstractmethod
+    def location(self, save_dir: str, filename: str) -> str:
+        """저장 위치 (매니페스트 기록용)"""
+
+    @abc.abstractmethod
+    def exists(self, save_dir: str, filename: str) -> Optional[int]:
+        """저장된 크기 (없으면 None)"""
+
+    @abc.abstractmethod
+    def delete(self, save_dir: str, filename: str) -> None:
+        """저장된 본문 삭제 (없으면 무시)"""
+
+
+class LocalStorage(StorageBackend):
+    """로컬 파일시스템 저장소 (기본값)"""
+
+    is_local = True
+
+    def __init__(self, background: bool = False):
+        """
+        Args:
+            background: True이면 디스크 쓰기를 별도 스레드에서 수행
+        """
+        self.background = background
+
+    def store(self, response: requests.Response, save_dir: str, filename: str,
+              buffer_size: int = DEFAULT_BUFFER_SIZE, key: Optional[Tuple[str, str]] = None) -> Tuple[int, str]:
+        os.makedirs(save_dir, exist_ok=True)
+        return stream_to_file(response, os.path.join(save_dir, filename),
+                              buffer_size=buffer_size, background=self.background)
+
+    def write(self, save_dir: str, filename: str, data: bytes,
+              key: Optional[Tuple[str, str]] = None) -> None:
+        file_path = os.path.join(save_dir, filename)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as f:
+            f.write(data)
+
+    def location(self, save_dir: str, filename: str) -> str:
+        return os.path.abspath(os.path.join(save_dir, filename))
+
+    def exists(self, save_dir: str, filename: str) -> Optional[int]:
+        file_path = os.path.join(save_dir, filename)
+        return os.path.getsize(file_path) if os.path.isfile(file_path) else None
+
+    def delete(self, save_dir: str, filename: str) -> None:
+        file_path = os.path.join(save_dir, filename)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def sha256_file(file_path: str) -> str:
+    """파일 SHA-256 (mmap으로 읽어 복사 최소화)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            digest.update(m)
+    return digest.hexdigest()
+
+
+def _read_range_into(raw, fd: int, start: int, length: int, buffer_size: int) -> int:
+    """응답 본문에서 length 바이트를 읽어 파일의 start 위치부터 기록"""
+    buf = bytearray(min(buffer_size, max(length, 1)))
+    view = memoryview(buf)
+    written = 0
+    while written < length:
+        want = min(len(buf), length - written)
+        n = raw.readinto(view[:want])
+        if not n:
+            break
+        os.pwrite(fd, view[:n], start + written)
+        written += n
+    return written
+
+
+def download_segmented(response: requests.Response,
+                       fetch_range: Callable[[int, int], requests.Response],
+                       file_path: str, segments: int = 4,
+                       buffer_size: int = DEFAULT_BUFFER_SIZE) -> Tuple[int, str]:
+    """
+    여러 연결로 구간을 나눠 받아 미리 할당한 하나의 파일에 조립
+
+    첫 구간은 이미 열린 응답에서 읽고, 나머지 구간은 fetch_range(start, end)로 Range 요청
+    (요청 한도는 fetch_range 쪽에서 지킴)
+
+    Args:
+        response: 전체 파일에 대한 stream=True 응답 (Content-Length 필요)
+        fetch_range: 구간 응답을 돌려주는 함수 (end 포함)
+        file_path: 저장할 파일 경로
+        segments: 구간 수
+        buffer_size: 구간별 읽기 버퍼 크기
+
+    Returns:
+        (저장한 바이트 수, SHA-256 hex)
+
+    Raises:
+        IOError: 구간 응답이 올바르지 않거나 조립된 크기가 다른 경우
+    """
+    total = int(response.headers['Content-Length'])
+    segment_size = -(-total // segments)
+    ranges = [(start, min(start + segment_size, total) - 1) for start in range(0, total, segment_size)]
+    part_path = file_path + '.part'
+
+    def fetch(start: int, end: int) -> int:
+        segment = fetch_range(start, end)
+        try:
+            content_range = segment.headers.get('Content-Range', '')
+            if segment.status_code != 206 or not content_range.startswith(f'bytes {start}-{end}/'):
+                raise IOError(f"구간 응답 오류: HTTP {segment.status_code} {content_range}")
+            segment.raw.decode_content = True
+            return _read_range_into(segment.raw, fd, start, end - start + 1, buffer_size)
+        finally:
+            segment.close()
+
+    try:
+        with open(part_path, 'wb') as f:
+            _preallocate(f, total)
+            fd = f.fileno()
+
+            with ThreadPoolExecutor(max_workers=len(ranges) - 1 or 1) as executor:
+                futures = [executor.submit(fetch, start, end) for start, end in ranges[1:]]
+
+                # 첫 구간은 이미 열린 응답에서 읽음
+                first_start, first_end = ranges[0]
+                response.raw.decode_content = True
+                written = _read_range_into(response.raw, fd, first_start, first_end - first_start + 1, buffer_size)
+                response.close()
+
+                written += sum(future.result() for future in futures)
+
+        if written != total or os.path.getsize(part_path) != total:
+            raise IOError(f"조립된 파일 크기 불일치: {written} / {total} bytes")
+
+        sha256 = sha256_file(part_path)
+        os.replace(part_path, file_path)
+    except BaseException:
+        response.close()
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return total, sha256
+
+
+@contextlib.contextmanager
+def _locked_append(path: str):
+    """
+    다른 프로세스와 겹치지 않게 덧붙이기 위해 파일을 배타 잠금(flock)으로 열기
+
+    잠금을 기다리는 동안 다른 프로세스가 compact로 파일을 바꿨으면 새 파일을 다시 열어 잠금
+    (fcntl이 없는 환경에서는 프로세스 내 잠금만 적용)
+    """
+    while True:
+        f = open(path, 'a+b')
+        if fcntl is None:
+            break
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        f.close()
+    try:
+        yield f
+    finally:
+        # 닫으면 잠금도 풀림
+        f.close()
+
+
+class DownloadManifest:
+    """
+    다운로드 폴더별 매니페스트 (JSON Lines, 같은 키는 마지막 기록이 유효)
+
+    공유 볼륨에서 여러 노드가 같은 매니페스트에 기록해도 줄이 섞이지 않도록 덧붙일 때 파일 잠금을 잡고,
+    refresh()로 다른 노드가 덧붙인 줄만 이어 읽음
+    """
+
+    def __init__(self, save_dir: str):
+        self.save_dir = save_dir
+        self.path = os.path.join(save_dir, MANIFEST_FILENAME)
+        self.entries: Dict[Tuple[str, str], Dict] = {}
+        self._by_rcp: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'rb') as f:
+                self._read_new(f)
+        except FileNotFoundError:
+            return
+
+    def _read_new(self, f) -> bool:
+        """
+        마지막으로 읽은 위치 이후의 완성된 줄 읽기 (다른 프로세스가 파일을 바꿨으면 처음부터)
+
+        Returns:
+            끝에 줄바꿈 없이 끝난 줄(기록 도중 중단되었거나 다른 프로세스가 쓰는 중)이 남아 있는지 여부
+        """
+        inode = os.fstat(f.fileno()).st_ino
+        if inode != self._inode:
+            self._inode, self._offset = inode, 0
+            self.entries.clear()
+            self._by_rcp.clear()
+        f.seek(self._offset)
+        data = f.read()
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # 기록 도중 중단된 줄
+                continue
+            self.entries[(entry.get('rcp_no', ''), entry.get('dcm_no', ''))] = entry
+            self._by_rcp.setdefault(entry.get('rcp_no', ''), entry)
+        self._offset += end
+        return end < len(data)
+
+    def refresh(self) -> None:
+        """다른 프로세스(공유 볼륨의 다른 노드)가 덧붙인 기록 반영 - 새로 추가된 부분만 읽음"""
+        with self._lock:
+            self._load()
+
+    def get(self, rcp_no: str, dcm_no: str) -> Optional[Dict]:
+        return self.entries.get((rcp_no, dcm_no))
+
+    def find_rcp(self, rcp_no: str) -> Optional[Dict]:
+        """rcpNo로 기록 찾기 (dcmNo를 모를 때)"""
+        entry = self._by_rcp.get(rcp_no)
+        return self.entries.get((rcp_no, entry['dcm_no'])) if entry else None
+
+    def record(self, rcp_no: str, dcm_no: str, **fields) -> Dict:
+        """다운로드 결과 기록 (기존 기록에 덮어씀)"""
+        with self._lock:
+            os.makedirs(self.save_dir, exist_ok=True)
+            with _locked_append(self.path) as f:
+                # 잠금을 기다리는 사이 다른 노드가 남긴 기록도 반영한 뒤 덮어씀
+                partial = self._read_new(f)
+                entry = dict(self.entries.get((rcp_no, dcm_no), {}))
+                entry.update(fields)
+                entry.update({
+                    'rcp_no': rcp_no,
+                    'dcm_no': dcm_no,
+                    'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                })
+                self.entries[(rcp_no, dcm_no)] = entry
+                self._by_rcp.setdefault(rcp_no, entry)
+
+                line = json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n'
+                # 잠금을 잡은 상태에서 남아 있는 미완성 줄은 중단된 기록이므로 줄을 끊고 이어 씀
+                f.write(b'\n' + line if partial else line)
+                f.flush()
+                self._offset = f.tell()
+            return entry
+
+    def compact(self) -> None:
+        """같은 키의 이전 기록을 정리하여 매니페스트 다시 쓰기"""
+        with self._lock:
+            os.makedirs(self.save_dir, exist_ok=True)
+            with _locked_append(self.path) as f:
+                self._read_new(f)
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'wb') as out:
+                    for entry in self.entries.values():
+                        out.write(json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n')
+                os.replace(tmp_path, self.path)
+                stat = os.stat(self.path)
+                self._inode, self._offset = stat.st_ino, stat.st_size
+
+
+def sanitize_filename(name: str, fallback: str) -> str:
+    """파일명에 쓸 수 없는 문자 제거 (남는 것이 없으면 fallback)"""
+    name = re.sub(r'\s+', ' ', _UNSAFE_FILENAME.sub('', unicodedata.normalize('NFC', name))).strip()
+    return name or fallback
+
+
+def report_filename(report: Dict, rcp_no: str, dcm_no: str) -> str:
+    """
+    검색 결과 정보로 만드는 고정 파일명 - 서버 응답 헤더 없이 같은 보고서는 항상 같은 이름
+
+    예: '[삼성전자]반기보고서 (2024.06)(2024.08.14)_20240814000123_9876543.pdf'
+    접수일이 없으면 접수번호 앞 8자리를 사용
+    """
+    company = sanitize_filename(report.get('corp_name') or report.get('company') or '', '')[:_MAX_NAME_PART]
+    report_name = sanitize_filename(report.get('report_name') or '', 'report')[:_MAX_NAME_PART]
+    submit_date = report.get('submit_date') or f"{rcp_no[:4]}.{rcp_no[4:6]}.{rcp_no[6:8]}"
+    prefix = f"[{company}]" if company else ''
+    return f"{prefix}{report_name}({sanitize_filename(submit_date, '')})_{rcp_no}_{dcm_no}.pdf"
+
+
+# 서버 파일명 '[회사]보고서(접수일).pdf', 고정 파일명 '[회사]보고서명(접수일)_{rcpNo}_{dcmNo}.pdf'
+_REPORT_FILENAME_PATTERN = re.compile(
+    r'^\[([^\]]+)\](.+?)(?:\((\d{4}\.\d{2}\.\d{2})\))?(?:_\d{14}_\d+)?\.pdf$', re.IGNORECASE)
+
+
+def report_from_filename(filename: str) -> Dict[str, str]:
+    """'[삼성전자]반기보고서(2024.08.14).pdf' 또는 고정 파일명에서 회사명, 보고서명, 접수일 추정 (형식이 다르면 빈 dict)"""
+    match = _REPORT_FILENAME_PATTERN.match(os.path.basename(filename))
+    if not match:
+        return {}
+    report = {'corp_name': match.group(1), 'report_name': match.group(2).strip()}
+    if match.group(3):
+        report['submit_date'] = match.group(3)
+    return report
+
+
+def filename_from_disposition(content_disposition: str) -> Optional[str]:
+    """
+    Content-Disposition의 파일명 (서버 파일명 - 검색 결과 정보가 없을 때만 사용)
+
+    filename*=UTF-8''...를 우선하고, filename=은 DART가 보내는 CP949 바이트(헤더에서는 ISO-8859-1 문자)로 한 번만 해석
+    """
+    star = re.search(r"filename\*=UTF-8''([^;]+)", content_disposition, re.IGNORECASE)
+    if star:
+        return unquote(star.group(1))
+    plain = re.search(r'filename=["\']?([^"\';]+)', content_disposition)
+    if not plain:
+        return None
+    return repair_mojibake(plain.group(1).strip()) or plain.group(1).strip()
+
+
+def repair_mojibake(name: str) -> Optional[str]:
+    """
+    CP949 바이트를 ISO-8859-1로 읽어 깨진 파일명 복원 ('[»ï¼ºÀüÀÚ]...' → '[삼성전자]...')
+
+    macOS에서 받은 파일명처럼 NFD로 분해된 경우도 처리. 깨진 이름이 아니면 None
+    """
+    name = unicodedata.normalize('NFC', name)
+    try:
+        repaired = name.encode('iso-8859-1').decode('cp949')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return None
+    return repaired if repaired != name else None
+
+
+def migrate_filenames(save_dir: str, dry_run: bool = False) -> List[Tuple[str, str]]:
+    """
+    기존 다운로드 폴더의 파일명 정리
+
+    매니페스트에 있는 보고서는 report_filename 고정 이름으로, 매니페스트 밖의 깨진 이름은 CP949로 복원하여 바꿈.
+    회사명·보고서명이 없는 기록은 기존 파일명에서 채우고, 파일명에서도 알 수 없으면 이름을 바꾸지 않음.
+    팩에 저장된 보고서는 이름을 바꾸지 않음
+
+    Args:
+        save_dir: 다운로드 폴더
+        dry_run: True이면 바꿀 목록만 반환
+
+    Returns:
+        (이전 이름, 새 이름) 리스트
+    """
+    manifest = DownloadManifest(save_dir)
+    renames: List[Tuple[str, str]] = []
+    known = set()
+
+    for entry in list(manifest.entries.values()):
+        old = entry.get('filename')
+        if not old or old.startswith('.'):
+            continue
+        known.add(old)
+        old_path = os.path.join(save_dir, old)
+        if not os.path.isfile(old_path):
+            continue
+        report = dict(report_from_filename(old), **{key: value for key, value in entry.items() if value})
+        if not report.get('report_name'):
+            # 보고서명을 모르면 'report' 대체 이름이 되므로 기존 이름 유지
+            continue
+        new = report_filename(report, entry['rcp_no'], entry['dcm_no'])
+        if new == old or os.path.exists(os.path.join(save_dir, new)):
+            continue
+        renames.append((old, new))
+        if not dry_run:
+            os.replace(old_path, os.path.join(save_dir, new))
+            fields = {'filename': new, **{key: report[key] for key in ('corp_name', 'report_name', 'submit_date')
+                                          if report.get(key) and not entry.get(key)}}
+            if entry.get('location'):
+                fields['location'] = os.path.abspath(os.path.join(save_dir, new))
+            manifest.record(entry['rcp_no'], entry['dcm_no'], **fields)
+
+    manifest_renames = len(renames)
+    for name in sorted(os.listdir(save_dir)) if os.path.isdir(save_dir) else []:
+        # 매니페스트 등 내부 파일 제외
+        if name in known or name.startswith('.') or not os.path.isfile(os.path.join(save_dir, name)):
+            continue
+        repaired = repair_mojibake(name)
+        if not repaired or not re.search(r'[\uac00-\ud7a3]', repaired):
+            continue
+        new = sanitize_filename(repaired, name)
+        if os.path.exists(os.path.join(save_dir, new)):
+            continue
+        renames.append((name, new))
+        if not dry_run:
+            os.replace(os.path.join(save_dir, name), os.path.join(save_dir, new))
+
+    if manifest_renames and not dry_run:
+        manifest.compact()
+    print(f"🏷️ 파일명 정리{' (미리보기)' if dry_run else ''}: {len(renames)}개")
+    for old, new in renames[:20]:
+        print(f"    {old} → {new}")
+    if len(renames) > 20:
+        print(f"    ... 외 {len(renames) - 20}개")
+    return renames
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+추적 회사 신규 공시 감시
+회사별 검색 대신 시장 전체 최신 공시 목록을 한 번 훑어 추적 회사의 신규 보고서만 다운로드합니다.
+"""
+
+from dart_scraper import DartScraper, REGULAR_PUBLIC_TYPES
+from datetime import datetime, timedelta
+import time
+import json
+import os
+from typing import List, Dict, Optional, Iterable, Tuple
+
+
+def load_tracked_companies(txt_file: str) -> List[str]:
+    """추적 회사 목록 파일 읽기 (한 줄에 회사명 하나, # 주석 허용)"""
+    companies = []
+    with open(txt_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                companies.append(line)
+    return companies
+
+
+class DisclosureWatcher:
+    """시장 전체 최신 공시 목록으로 추적 회사의 신규 공시를 감시"""
+
+    def __init__(self, scraper: DartScraper, tracked_companies: Iterable[str],
+                 download_dir: str = "watch_reports", state_file: str = ".dart_watch_state.json",
+                 days: int = 3, max_pages: int = 50,
+                 public_types: Optional[List[str]] = REGULAR_PUBLIC_TYPES):
+        """
+        Args:
+            scraper: 세션이 준비된 DartScraper
+            tracked_companies: 추적할 회사명 목록
+            download_dir: 신규 보고서 다운로드 폴더
+            state_file: 이미 확인한 rcpNo를 보관하는 상태 파일
+            days: 조회할 최근 기간 (일)
+            max_pages: 한 번의 감시에서 조회할 최대 페이지 수
+            public_types: 공시유형 코드 목록 (None이면 전체 공시)
+        """
+        self.scraper = scraper
+        self.tracked = {name.strip() for name in tracked_companies if name.strip()}
+        self.download_dir = download_dir
+        self.state_file = state_file
+        self.days = days
+        self.max_pages = max_pages
+        self.public_types = public_types
+        self.seen, self.pending = self._load_state()
+        # 목록 조회가 중간에 실패한 감시에서 받은 보고서 - 확인 처리 전까지 다시 받지 않음
+        self.downloaded = set()
+        self.last_poll_complete = True
+
+    def _load_state(self) -> Tuple[set, Dict[str, Dict]]:
+        """이미 확인한 rcpNo 목록과 다운로드에 실패해 다시 시도할 공시 불러오기"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return set(), {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return set(state.get('seen', [])), dict(state.get('pending', {}))
+        except Exception as e:
+            print(f"⚠️ 감시 상태 파일 읽기 실패: {e}")
+            return set(), {}
+
+    def _save_state(self) -> None:
+        """감시 기간을 벗어난 rcpNo는 정리한 뒤 상태 저장"""
+        if not self.state_file:
+            return
+
+        # rcpNo 앞 8자리는 접수일(YYYYMMDD)
+        cutoff = (datetime.now() - timedelta(days=self.days + 1)).strftime('%Y%m%d')
+        self.seen = {rcp_no for rcp_no in self.seen if rcp_no[:8] >= cutoff}
+        expired = [rcp_no for rcp_no in self.pending if rcp_no[:8] < cutoff]
+        for rcp_no in expired:
+            print(f"⚠️ 감시 기간이 지나 재시도를 중단합니다: rcpNo={rcp_no}")
+            del self.pending[rcp_no]
+
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({'seen': sorted(self.seen), 'pending': self.pending}, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"⚠️ 감시 상태 파일 저장 실패: {e}")
+
+    def _is_tracked(self, result: Dict) -> bool:
+        """추적 대상 회사의 공시인지 확인 (해시 조회)"""
+        return result.get('corp_name') in self.tracked or result.get('company') in self.tracked
+
+    def poll(self) -> List[Dict]:
+        """
+        최신 공시 목록을 이미 확인한 rcpNo가 나올 때까지 조회하여 추적 회사의 신규 공시 반환
+
+        추적하지 않는 회사의 공시만 바로 확인 처리하고, 추적 회사 공시는 record()로 다운로드 성공을 기록할 때 확인 처리합니다.
+        목록 조회가 중간에 실패하거나 해석하지 못한 페이지(레이아웃 변경, 오류 페이지)가 나오면
+        아직 보지 못한 이전 공시를 잃지 않도록 이번 감시 결과는 확인 처리하지 않습니다.
+
+        Returns:
+            추적 회사의 신규 공시와 지난 감시에서 받지 못한 공시 리스트
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=self.days)
+
+        print(f"👀 최신 공시 확인 중... (기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}, 추적 회사: {len(self.tracked)}개)")
+
+        hits = []
+        new_rcp_nos = set()
+        pages = 0
+        complete = True
+
+        for page in range(1, self.max_pages + 1):
+            try:
+                page_results = self.scraper.search_latest_disclosures(
+                    start_date.strftime('%Y%m%d'),
+                    end_date.strftime('%Y%m%d'),
+                    page=page,
+                    public_types=self.public_types,
+                    raise_errors=True
+                )
+            except Exception as e:
+                print(f"⚠️ {page}페이지 조회 실패: {e}")
+                complete = False
+                break
+            pages += 1
+
+            # '조회 결과가 없습니다' 안내가 있는 빈 페이지만 마지막 페이지 (해석하지 못한 페이지는 위에서 예외)
+            if not page_results:
+                break
+
+            reached_seen = False
+            for result in page_results:
+                rcp_no = result.get('rcp_no')
+                if not rcp_no:
+                    continue
+                if rcp_no in self.seen:
+                    reached_seen = True
+                    continue
+                if rcp_no in new_rcp_nos:
+                    continue
+
+                new_rcp_nos.add(rcp_no)
+                if self._is_tracked(result) and rcp_no not in self.downloaded:
+                    hits.append(result)
+
+            # 접수일 내림차순이므로 이미 본 공시가 나오면 이후 페이지는 모두 확인된 공시
+            if reached_seen:
+                break
+
+            time.sleep(0.5)
+
+        # 지난 감시에서 다운로드에 실패한 공시는 목록에 다시 나오지 않아도 재시도
+        listed = {hit['rcp_no'] for hit in hits}
+        retries = [hit for rcp_no, hit in self.pending.items()
+                   if rcp_no not in listed and rcp_no not in self.downloaded]
+        hits.extend(retries)
+
+        self.last_poll_complete = complete
+        if complete:
+            self.seen.update(new_rcp_nos - listed)
+            self.downloaded -= self.seen
+            self._save_state()
+        else:
+            print("   ⚠️ 목록을 끝까지 조회하지 못해 이번 감시 결과는 확인 처리하지 않습니다 (다음 감시에서 다시 확인)")
+
+        print(f"   {pages}페이지 조회, 신규 공시 {len(new_rcp_nos)}건 중 추적 회사 {len(listed)}건"
+              + (f", 재시도 {len(retries)}건" if retries else ""))
+        return hits
+
+    def record(self, hit: Dict, succeeded: bool) -> None:
+        """
+        추적 회사 공시의 다운로드 결과 기록
+
+        성공하면 확인 처리하고, 실패하면 다음 감시에서 다시 시도하도록 상태 파일에 남김
+        (목록 조회가 중간에 실패한 감시에서는 상태를 저장하지 않고 다시 받지 않도록만 기억)
+        """
+        rcp_no = hit['rcp_no']
+        if succeeded:
+            self.pending.pop(rcp_no, None)
+            if self.last_poll_complete:
+                self.seen.add(rcp_no)
+            else:
+                self.downloaded.add(rcp_no)
+        else:
+            self.pending[rcp_no] = hit
+
+        if self.last_poll_complete:
+            self._save_state()
+
+    def sync(self) -> Dict:
+        """
+        신규 공시를 한 번 확인하고 추적 회사의 보고서 다운로드
+
+        Returns:
+            신규 공시 목록과 성공/실패 건수
+        """
+        hits = self.poll()
+        success_count = 0
+        fail_count = 0
+
+        for i, hit in enumerate(hits, 1):
+            print(f"\n[{i:2d}/{len(hits)}] 🆕 {hit.get('corp_name', '')} - {hit.get('report_name', '')} ({hit.get('submit_date', '')})")
+            succeeded = self.scraper.download_report(hit, self.download_dir)
+            self.record(hit, succeeded)
+            if succeeded:
+                success_count += 1
+            else:
+                fail_count += 1
+
+            # 서버 부하 방지를 위한 대기
+            time.sleep(1)
+
+        return {'new_reports': hits, 'success': success_count, 'failed': fail_count,
+                'download_dir': os.path.abspath(self.download_dir)}
+
+    def run(self, interval: int = 300, max_polls: Optional[int] = None) -> None:
+        """
+        주기적으로 신규 공시를 확인하고 추적 회사의 보고서 다운로드
+
+        Args:
+            interval: 감시 주기 (초)
+            max_polls: 최대 감시 횟수 (None이면 중단될 때까지 반복)
+        """
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                self.sync()
+                polls += 1
+
+                if max_polls is not None and polls >= max_polls:
+                    break
+
+                print(f"⏳ {interval}초 후 다시 확인합니다...")
+                time.sleep(interval)
+
+        except KeyboardInterrupt:
+            print("\n👋 감시를 중단합니다.")
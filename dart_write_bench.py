@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+PDF 쓰기 경로 벤치마크 (bench-write)
+로컬 가짜 PDF 서버에서 받은 본문을 이전 방식(8KB iter_content)과 dart_storage.stream_to_file로 저장해
+로컬 디스크와 느린 저장소 흉내에서 처리량을 비교합니다.
+느린 저장소는 파일을 여는 함수(opener)를 넘겨 흉내 내므로 같은 프로세스의 다른 쓰기에는 영향이 없습니다.
+"""
+
+import http.server
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+from dart_storage import DEFAULT_BUFFER_SIZE, stream_to_file
+
+
+def _legacy_write(response: requests.Response, file_path: str, opener: Callable = open) -> int:
+    """이전 저장 방식 - 8KB iter_content 조각을 open(..., 'wb')로 기록"""
+    total = 0
+    with opener(file_path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=8192):
+            if chunk:
+                f.write(chunk)
+                total += len(chunk)
+    return total
+
+
+class _SlowDiskFile:
+    """느린 저장소(NFS 등) 흉내 - 쓰기마다 고정 지연과 처리량 제한"""
+
+    def __init__(self, f, latency: float, bytes_per_second: float):
+        self._f = f
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+
+    def write(self, data) -> int:
+        time.sleep(self.latency + len(data) / self.bytes_per_second)
+        return self._f.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._f.close()
+
+
+def slow_opener(latency: float, bytes_per_second: float) -> Callable:
+    """느린 저장소 흉내 파일을 여는 함수 (open과 같은 인자)"""
+    return lambda *args, **kwargs: _SlowDiskFile(open(*args, **kwargs), latency, bytes_per_second)
+
+
+def _serve_pdf(body: bytes, chunk_size: int = 64 * 1024):
+    """로컬 가짜 PDF 서버 시작 - (서버, URL) 반환"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/pdf')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            view = memoryview(body)
+            for start in range(0, len(body), chunk_size):
+                self.wfile.write(view[start:start + chunk_size])
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/report.pdf"
+
+
+def benchmark_write_paths(size_mb: float = 16, runs: int = 3, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                          disk_latency_ms: float = 1.0, disk_mbps: float = 50.0,
+                          work_dir: Optional[str] = None) -> Dict:
+    """
+    PDF 쓰기 경로 벤치마크 - 로컬 가짜 서버에서 받아 이전 방식과 비교
+
+    이전 방식(8KB iter_content + open), 큰 버퍼 + 사전 할당 + 해시, 여기에 백그라운드 쓰기를 더한 방식을
+    로컬 디스크와 느린 디스크 흉내(쓰기마다 disk_latency_ms 지연, disk_mbps 처리량)에서 각각 측정
+
+    Returns:
+        {'size_bytes', 'runs', 'results': [{'disk', 'path', 'seconds', 'mb_per_sec', 'speedup'}, ...]}
+        speedup은 같은 디스크에서 이전 방식 대비 처리량
+    """
+    body = os.urandom(int(size_mb * 1024 * 1024))
+    server, url = _serve_pdf(body)
+    paths = [
+        ('legacy_8k', lambda response, path, opener: _legacy_write(response, path, opener)),
+        ('buffered', lambda response, path, opener: stream_to_file(response, path, buffer_size=buffer_size,
+                                                                   opener=opener)),
+        ('buffered_background', lambda response, path, opener: stream_to_file(
+            response, path, buffer_size=buffer_size, background=True, opener=opener)),
+    ]
+    disks = [('local', open), ('slow', slow_opener(disk_latency_ms / 1000, disk_mbps * 1024 * 1024))]
+    results = []
+
+    try:
+        with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir, requests.Session() as session:
+            target = os.path.join(tmp_dir, 'report.pdf')
+            for disk, opener in disks:
+                baseline = None
+                for name, write in paths:
+                    timings = []
+                    for _ in range(max(1, runs)):
+                        started = time.perf_counter()
+                        with session.get(url, stream=True) as response:
+                            written = write(response, target, opener)
+                            written = written[0] if isinstance(written, tuple) else written
+                        timings.append(time.perf_counter() - started)
+                        if written != len(body):
+                            raise IOError(f"벤치마크 크기 불일치: {written} / {len(body)} bytes")
+                        os.remove(target)
+                    seconds = sorted(timings)[len(timings) // 2]
+                    rate = len(body) / seconds / (1024 * 1024)
+                    baseline = baseline or rate
+                    results.append({'disk': disk, 'path': name, 'seconds': round(seconds, 3),
+                                    'mb_per_sec': round(rate, 1), 'speedup': round(rate / baseline, 2)})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {'size_bytes': len(body), 'runs': runs, 'results': results}
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+벤치마크·테스트용 DART 페이지 표본 생성
+실제 검색 결과(dsab007)와 보고서 뷰어(dsaf001) 페이지의 마크업 구조를 따른 합성 HTML을 고정 시드로 만듭니다.
+같은 인자로 실행하면 항상 같은 파일이 나오므로 벤치마크 수치를 다시 잴 수 있습니다.
+
+    python fixtures/make_dart_pages.py fixtures/dart_pages --pages 12
+"""
+
+import argparse
+import os
+import random
+
+
+COMPANIES = ['삼성전자', 'SK하이닉스', 'LG에너지솔루션', '현대자동차', '기아', 'NAVER', '카카오', '셀트리온',
+             'POSCO홀딩스', 'KB금융', '신한지주', '삼성바이오로직스', 'LG화학', '삼성SDI', '현대모비스'] + \
+            [f'테스트기업{i}' for i in range(200)]
+REPORT_TYPES = ['사업보고서', '반기보고서', '분기보고서', '[기재정정]사업보고서',
+                '주요사항보고서(자기주식취득결정)', '임원ㆍ주요주주특정증권등소유상황보고서']
+SECTIONS = ['회사의 개요', '사업의 내용', '재무에 관한 사항', '요약재무정보', '연결재무제표', '연결재무제표 주석',
+            '재무제표', '재무제표 주석', '배당에 관한 사항', '감사인의 감사의견 등', '이사회 등 회사의 기관에 관한 사항',
+            '주주에 관한 사항', '임원 및 직원 등에 관한 사항', '계열회사 등에 관한 사항', '대주주 등과의 거래내용']
+
+HEAD = '''<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta http-equiv="Content-Type" content="text/html; charset=utf-8" />
+<title>전자공시시스템 DART</title>
+<link rel="stylesheet" type="text/css" href="/css/common.css?v=20240101" />
+<script type="text/javascript" src="/js/jquery-3.6.0.min.js"></script>
+<script type="text/javascript" src="/js/common.js?v=20240101"></script>
+'''
+
+
+def _rcp_no(rng: random.Random) -> str:
+    return f"2024{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}{rng.randint(0, 999999):06d}"
+
+
+def search_page(rng: random.Random, page: int, total_pages: int, rows: int = 100) -> str:
+    """검색 결과 한 페이지 (tbList 표, 행마다 회사 배지·보고서 링크·제출인·접수일·비고)"""
+    lines = []
+    for i in range(rows):
+        company = rng.choice(COMPANIES)
+        report_type = rng.choice(REPORT_TYPES)
+        date = f"2024.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}"
+        rcp_no = _rcp_no(rng)
+        lines.append(f'''<tr>
+\t<td>{page * rows + i + 1}</td>
+\t<td class="tL"><span class="innerWrap"><span class="tagCom_kospi" title="유가증권시장">유</span><a href="#none" onclick="openCorpInfoNew('{rng.randint(100000, 999999):08d}', 'winCorpInfo', '/dsae001/selectPopup.ax');return false;" title="{company} 기업개황 새창">{company}</a></span></td>
+\t<td class="tL"><a href="/dsaf001/main.do?rcpNo={rcp_no}" target="_blank" title="{report_type} 공시뷰어 새창" onclick="openReportViewer('{rcp_no}'); return false;">{report_type} ({date[:7]})</a></td>
+\t<td class="tL ellipsis" title="{company}">{company}</td>
+\t<td>{date}</td>
+\t<td class="tC"><span class="tagCom_end" title="유가증권시장본부 공시">유</span></td>
+</tr>''')
+    return HEAD + '''</head><body><div class="tbWrap"><table class="tbList"><caption>공시검색 결과</caption>
+<colgroup><col style="width:5%" /><col style="width:20%" /><col style="width:40%" /><col style="width:15%" /><col style="width:10%" /><col style="width:10%" /></colgroup>
+<thead><tr><th scope="col">번호</th><th scope="col">공시대상회사</th><th scope="col">보고서명</th><th scope="col">제출인</th><th scope="col">접수일자</th><th scope="col">비고</th></tr></thead>
+<tbody>
+''' + '\n'.join(lines) + f'''
+</tbody></table></div>
+<div class="pageSkip"><ul><li><a href="#none" onclick="search({page});">이전</a></li><li class="on"><a href="#none">{page + 1}</a></li><li><a href="#none" onclick="search({page + 2});">다음</a></li></ul></div>
+<p class="pageInfo">[{page + 1}/{total_pages}] [총 {total_pages * rows:,}건]</p></body></html>'''
+
+
+def viewer_page(rng: random.Random) -> str:
+    """
+    보고서 뷰어 페이지 (목차 트리 스크립트, 첨부 선택 목록, PDF 다운로드 버튼)
+
+    첨부 목록에는 같은 공시의 첨부 문서와 별도 공시로 접수된 감사보고서(다른 rcpNo)가 함께 있음
+    """
+    rcp_no = _rcp_no(rng)
+    dcm_no = str(rng.randint(9000000, 9999999))
+    functions = '\n'.join(
+        f"\tfunction viewDoc{i}(rcpNo, dcmNo, eleId, offset, length, dtd) {{ var url = '/report/viewer.do?rcpNo=' + rcpNo"
+        f" + '&dcmNo=' + dcmNo + '&eleId=' + eleId + '&offset=' + offset + '&length=' + length + '&dtd=' + dtd;"
+        f" $('#ifrm').attr('src', url); }}"
+        for i in range(40))
+    nodes = []
+    for i, section in enumerate(SECTIONS * 2):
+        nodes.append(f'''\tvar node{i + 2} = {{}};
+\tnode{i + 2}['text'] = "{i // 15 + 1}. {section}";
+\tnode{i + 2}['id'] = "{i + 2}";
+\tnode{i + 2}['rcpNo'] = "{rcp_no}";
+\tnode{i + 2}['dcmNo'] = "{dcm_no}";
+\tnode{i + 2}['eleId'] = "{i + 1}";
+\tnode{i + 2}['offset'] = "{rng.randint(1000, 900000)}";
+\tnode{i + 2}['length'] = "{rng.randint(1000, 90000)}";
+\tnode{i + 2}['dtd'] = "dart4.xsd";
+\tnode{i + 2}['tocNo'] = "{i + 1}";
+\tcnt++;
+\ttreeData.push(node{i + 2});''')
+    audit_rcp_no = _rcp_no(rng)
+    audit_dcm_no = str(rng.randint(9000000, 9999999))
+    node_script = '\n'.join(nodes)
+    return HEAD + f'''<script type="text/javascript">
+\tvar treeData = [];
+\tvar cnt = 0;
+{functions}
+\t$(document).ready(function() {{
+\t\tvar currentDocValue = "{dcm_no}";
+{node_script}
+\t\tmakeToc();
+\t}});
+</script></head>
+<body><div id="north"><h1>{rng.choice(COMPANIES)}</h1><select id="att"><option value="null">+첨부선택+</option><option value="rcpNo={rcp_no}&dcmNo={int(dcm_no) + 1}">[첨부]연결감사보고서</option><option value="rcpNo={audit_rcp_no}&dcmNo={audit_dcm_no}">[감사보고서]</option></select>
+<button class="btnDown" onclick="openPdfDownload('{rcp_no}', '{dcm_no}'); return false;">다운로드</button></div>
+<div id="listTree"></div><iframe id="ifrm" src="about:blank"></iframe></body></html>'''
+
+
+def generate(out_dir: str, pages: int = 12, seed: int = 7) -> int:
+    """out_dir/search, out_dir/viewer에 종류별 pages개씩 생성 - 만든 파일 수 반환"""
+    rng = random.Random(seed)
+    for kind in ('search', 'viewer'):
+        os.makedirs(os.path.join(out_dir, kind), exist_ok=True)
+    for page in range(pages):
+        with open(os.path.join(out_dir, 'search', f'page{page:03d}.html'), 'w', encoding='utf-8', newline='\n') as f:
+            f.write(search_page(rng, page, pages))
+    for page in range(pages):
+        with open(os.path.join(out_dir, 'viewer', f'page{page:03d}.html'), 'w', encoding='utf-8', newline='\n') as f:
+            f.write(viewer_page(rng))
+    return pages * 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크·테스트용 DART 페이지 표본 생성")
+    parser.add_argument('out_dir', nargs='?', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dart_pages'))
+    parser.add_argument('--pages', type=int, default=12, help="종류별 페이지 수 (기본: 12)")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    count = generate(args.out_dir, args.pages, args.seed)
+    print(f"✅ {count}개 페이지 생성: {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
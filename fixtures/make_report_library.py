@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+벤치마크·테스트용 섹션 모드 보고서 폴더 생성
+download_report_sections가 만드는 구조({rcpNo}/sections.json + 섹션 HTML)와 DART 재무제표 표 마크업을 따른
+합성 보고서를 고정 시드로 만듭니다. 같은 인자로 실행하면 항상 같은 파일이 나옵니다.
+
+    python fixtures/make_report_library.py fixtures/report_library --reports 30
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+
+from make_dart_pages import COMPANIES, _rcp_no
+
+
+STATEMENTS = ('연결 재무상태표', '연결 손익계산서', '연결 현금흐름표', '재무상태표')
+ACCOUNTS = ['유동자산', '현금및현금성자산', '단기금융상품', '매출채권', '재고자산', '비유동자산', '유형자산', '무형자산',
+            '자산총계', '유동부채', '매입채무', '단기차입금', '비유동부채', '사채', '부채총계', '자본금', '주식발행초과금',
+            '이익잉여금', '자본총계', '매출액', '매출원가', '매출총이익', '판매비와관리비', '영업이익', '기타수익',
+            '기타비용', '금융수익', '금융비용', '법인세비용차감전순이익', '법인세비용', '당기순이익', '영업활동현금흐름',
+            '투자활동현금흐름', '재무활동현금흐름']
+PERIODS = [('사업보고서', '12'), ('반기보고서', '06'), ('분기보고서', '03'), ('분기보고서', '09')]
+
+
+def _amount(rng: random.Random) -> str:
+    value = rng.randint(-50_000_000, 400_000_000)
+    return f"({-value:,})" if value < 0 else f"{value:,}"
+
+
+def statements_section(rng: random.Random, term: int) -> str:
+    """재무제표 섹션 HTML - 제목 문단 뒤에 (과목, 당기, 전기) 표가 이어짐"""
+    parts = ['<html><head><meta http-equiv="Content-Type" content="text/html; charset=utf-8" /></head><body>',
+             '<p class="section-2">2. 연결재무제표</p>']
+    for i, statement in enumerate(STATEMENTS, 1):
+        rows = '\n'.join(
+            f'<tr><td class="left">{account}</td><td class="right">{_amount(rng)}</td><td class="right">{_amount(rng)}</td></tr>'
+            for account in rng.sample(ACCOUNTS, 24))
+        parts.append(f'''<p class="table-title">2-{i}. {statement}</p>
+<p class="table-unit">(단위 : 백만원)</p>
+<table border="1" class="fin"><thead><tr><th>과 목</th><th>제 {term} 기</th><th>제 {term - 1} 기</th></tr></thead>
+<tbody>
+{rows}
+</tbody></table>''')
+    parts.append('<p>※ 상기 재무제표는 외부감사인의 감사를 받은 재무제표입니다.</p></body></html>')
+    return '\n'.join(parts)
+
+
+def generate(out_dir: str, reports: int = 30, seed: int = 11) -> int:
+    """out_dir/{rcpNo}/에 섹션 HTML과 sections.json을 보고서 reports개만큼 생성 - 만든 보고서 수 반환"""
+    rng = random.Random(seed)
+    for _ in range(reports):
+        rcp_no = _rcp_no(rng)
+        dcm_no = str(rng.randint(9000000, 9999999))
+        company = rng.choice(COMPANIES)
+        report_type, month = rng.choice(PERIODS)
+        year = rng.randint(2015, 2024)
+        body = statements_section(rng, year - 1968).encode('utf-8')
+
+        report_dir = os.path.join(out_dir, rcp_no)
+        os.makedirs(report_dir, exist_ok=True)
+        filename = '01_연결재무제표.html'
+        with open(os.path.join(report_dir, filename), 'wb') as f:
+            f.write(body)
+        metadata = {
+            'rcp_no': rcp_no,
+            'report_url': f"https://dart.fss.or.kr/dsaf001/main.do?rcpNo={rcp_no}",
+            'report': {'corp_name': company, 'report_name': f"{report_type} ({year}.{month})", 'rcp_no': rcp_no},
+            'fetched_at': '2024-06-01 09:00:00',
+            'sections': [{'title': '2. 연결재무제표', 'dcm_no': dcm_no, 'ele_id': '12', 'offset': '', 'length': '',
+                          'url': f"https://dart.fss.or.kr/report/viewer.do?rcpNo={rcp_no}&dcmNo={dcm_no}&eleId=12",
+                          'filename': filename, 'size': len(body),
+                          'sha256': hashlib.sha256(body).hexdigest(), 'encoding': 'utf-8'}],
+        }
+        with open(os.path.join(report_dir, 'sections.json'), 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크·테스트용 섹션 모드 보고서 폴더 생성")
+    parser.add_argument('out_dir', nargs='?', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_library'))
+    parser.add_argument('--reports', type=int, default=30, help="보고서 수 (기본: 30)")
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+    count = generate(args.out_dir, args.reports, args.seed)
+    print(f"✅ 보고서 {count}개 생성: {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,22 @@
 """
 DART 공시정보 다운로드 시스템
 회사명으로 검색하여 정기공시 보고서를 일괄 다운로드합니다.
+
+인자를 주면 비대화식 명령행 도구(dart_cli)로 실행합니다. (python main.py --help)
 """
 
+import sys
+
+# 명령행 모드는 필요한 모듈만 불러오도록 무거운 import보다 먼저 분기
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from dart_cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
 from dart_scraper import DartScraper
+from dart_prefetch import ReportPrefetcher
+from dart_watcher import DisclosureWatcher, load_tracked_companies
 from datetime import datetime, timedelta
 import os
-import sys
 
 def show_menu():
     """메인 메뉴 출력"""
@@ -16,7 +26,8 @@ def show_menu():
     print("="*60)
     print("1. 회사 검색 및 정기공시 다운로드")
     print("2. 링크 파일로부터 다운로드")
-    print("3. 종료")
+    print("3. 추적 회사 신규 공시 감시")
+    print("4. 종료")
     print("="*60)
 
 def search_and_download():
@@ -49,76 +60,95 @@ def search_and_download():
     
     # 스크래퍼 초기화
     scraper = DartScraper()
-    
-    if not scraper.get_search_page():
-        print("❌ DART 사이트 접속 실패")
-        return
-    
-    print("✅ DART 사이트 접속 성공")
-    
-    # 회사 검색
-    print(f"\n🔍 '{company_name}' 검색 중...")
-    search_results = scraper.search_company(company_name)
-    
-    if not search_results:
-        print(f"❌ '{company_name}'을(를) 찾을 수 없습니다.")
-        return
-    
-    # 회사 선택
-    if len(search_results) > 1:
-        print(f"\n📋 검색된 회사 목록:")
-        for i, company in enumerate(search_results, 1):
-            print(f"{i}. {company['name']} (종목코드: {company.get('stock_code', 'N/A')})")
+    try:
+        if not scraper.get_search_page():
+            print("❌ DART 사이트 접속 실패")
+            return
         
-        try:
-            choice = int(input(f"\n선택할 회사 번호 (1-{len(search_results)}): ")) - 1
-            if choice < 0 or choice >= len(search_results):
-                print("❌ 잘못된 선택입니다.")
+        print("✅ DART 사이트 접속 성공")
+        
+        # 회사 검색
+        print(f"\n🔍 '{company_name}' 검색 중...")
+        search_results = scraper.search_company(company_name)
+        
+        if not search_results:
+            print(f"❌ '{company_name}'을(를) 찾을 수 없습니다.")
+            return
+        
+        # 회사 선택
+        if len(search_results) > 1:
+            print(f"\n📋 검색된 회사 목록:")
+            for i, company in enumerate(search_results, 1):
+                print(f"{i}. {company['name']} (종목코드: {company.get('stock_code', 'N/A')})")
+            
+            try:
+                choice = int(input(f"\n선택할 회사 번호 (1-{len(search_results)}): ")) - 1
+                if choice < 0 or choice >= len(search_results):
+                    print("❌ 잘못된 선택입니다.")
+                    return
+                selected_company = search_results[choice]
+            except ValueError:
+                print("❌ 잘못된 입력입니다.")
                 return
-            selected_company = search_results[choice]
-        except ValueError:
-            print("❌ 잘못된 입력입니다.")
+        else:
+            selected_company = search_results[0]
+        
+        print(f"✅ 선택된 회사: {selected_company['name']}")
+        
+        # 정기공시 검색
+        print(f"\n📊 정기공시 보고서 검색 중...")
+        
+        # 정기공시 유형 필터
+        report_types = ['분기보고서', '반기보고서', '사업보고서']
+        
+        reports = scraper.search_reports(
+            company_name=selected_company['name'],
+            start_date=start_date.strftime('%Y%m%d'),
+            end_date=end_date.strftime('%Y%m%d'),
+            report_types=report_types
+        )
+        
+        if not reports:
+            print("❌ 정기공시 보고서를 찾을 수 없습니다.")
             return
-    else:
-        selected_company = search_results[0]
-    
-    print(f"✅ 선택된 회사: {selected_company['name']}")
-    
-    # 정기공시 검색
-    print(f"\n📊 정기공시 보고서 검색 중...")
-    
-    # 정기공시 유형 필터
-    report_types = ['분기보고서', '반기보고서', '사업보고서']
-    
-    reports = scraper.search_reports(
-        company_name=selected_company['name'],
-        start_date=start_date.strftime('%Y%m%d'),
-        end_date=end_date.strftime('%Y%m%d'),
-        report_types=report_types
-    )
-    
-    if not reports:
-        print("❌ 정기공시 보고서를 찾을 수 없습니다.")
-        return
-    
-    print(f"✅ {len(reports)}개의 정기공시 보고서를 찾았습니다.")
-    
-    # 다운로드 여부 확인
-    print(f"\n📥 {len(reports)}개 파일을 다운로드하시겠습니까?")
-    confirm = input("계속하시겠습니까? (y/N): ").strip().lower()
-    
-    if confirm not in ['y', 'yes']:
-        print("❌ 다운로드를 취소했습니다.")
-        return
-    
-    # 다운로드 폴더 설정
-    safe_company_name = "".join(c for c in selected_company['name'] if c.isalnum() or c in "._- ")
-    download_dir = f"{safe_company_name}_reports"
-    
-    print(f"📁 다운로드 폴더: {download_dir}")
-    
-    # 일괄 다운로드
-    scraper.download_reports_batch(reports, download_dir)
+        
+        print(f"✅ {len(reports)}개의 정기공시 보고서를 찾았습니다.")
+        
+        # 다운로드 폴더 설정
+        safe_company_name = "".join(c for c in selected_company['name'] if c.isalnum() or c in "._- ")
+        download_dir = f"{safe_company_name}_reports"
+        
+        # 사용자가 고르는 동안 뒤에서 dcmNo 조회와 크기 확인을 미리 해 둠
+        prefetcher = ReportPrefetcher(scraper, reports, download_dir)
+        prefetcher.start()
+        
+        try:
+            # 다운로드 규모 확인 (선택)
+            estimate_choice = input("\n📏 받을 용량과 예상 시간을 먼저 확인하시겠습니까? (y/N): ").strip().lower()
+            if estimate_choice in ['y', 'yes']:
+                # 용량 확인에 필요한 정보는 미리 준비하던 것과 같으므로 끝나기를 기다린 뒤 캐시로 계산
+                prefetcher.wait()
+                scraper.download_reports_batch(reports, download_dir, dry_run=True)
+        
+            # 다운로드 여부 확인
+            print(f"\n📥 {len(reports)}개 파일을 다운로드하시겠습니까?")
+            confirm = input("계속하시겠습니까? (y/N): ").strip().lower()
+        
+            if confirm not in ['y', 'yes']:
+                print("❌ 다운로드를 취소했습니다.")
+                return
+        
+            prepared = prefetcher.stop()
+            print(f"⚡ 미리 준비한 보고서: {prepared['resolved']}/{prepared['total']}개")
+            print(f"📁 다운로드 폴더: {download_dir}")
+        
+            # 일괄 다운로드
+            scraper.download_reports_batch(reports, download_dir)
+        finally:
+            # 입력 중 Ctrl+C나 오류로 빠져나가도 스레드를 멈추고 sys.stdout을 되돌린 뒤 세션을 닫음 (이미 멈췄으면 그대로 반환)
+            prefetcher.stop()
+    finally:
+        scraper.close()
 
 def download_from_file():
     """링크 파일로부터 다운로드"""
@@ -158,15 +188,56 @@ def download_from_file():
     
     # 스크래퍼 초기화
     scraper = DartScraper()
+    try:
+        if not scraper.get_search_page():
+            print("❌ DART 사이트 접속 실패")
+            return
+        
+        print("✅ DART 사이트 접속 성공")
+        
+        # 파일에서 다운로드
+        scraper.download_all_reports_from_txt(txt_file, download_dir)
+    finally:
+        scraper.close()
+
+def watch_tracked_companies():
+    """추적 회사 목록의 신규 공시 감시 후 다운로드"""
+    print("\n👀 추적 회사 신규 공시 감시")
+    print("-" * 40)
+    
+    default_file = "tracked_companies.txt"
+    txt_file = input(f"추적 회사 목록 파일 (한 줄에 회사명 하나, 기본값: {default_file}): ").strip()
+    txt_file = txt_file if txt_file else default_file
     
-    if not scraper.get_search_page():
-        print("❌ DART 사이트 접속 실패")
+    if not os.path.exists(txt_file):
+        print(f"❌ 파일이 없습니다: {txt_file}")
         return
     
-    print("✅ DART 사이트 접속 성공")
+    tracked = load_tracked_companies(txt_file)
+    if not tracked:
+        print("❌ 추적할 회사가 없습니다.")
+        return
     
-    # 파일에서 다운로드
-    scraper.download_all_reports_from_txt(txt_file, download_dir)
+    interval = input("감시 주기(초)를 입력하세요 (기본값: 300): ").strip()
+    try:
+        interval = max(int(interval), 60) if interval else 300
+    except ValueError:
+        interval = 300
+    
+    # 스크래퍼 초기화
+    scraper = DartScraper()
+    try:
+        if not scraper.get_search_page():
+            print("❌ DART 사이트 접속 실패")
+            return
+        
+        print("✅ DART 사이트 접속 성공")
+        print(f"📋 추적 회사: {len(tracked)}개 (중단: Ctrl+C)")
+        
+        watcher = DisclosureWatcher(scraper, tracked)
+        watcher.run(interval=interval)
+    finally:
+        scraper.close()
 
 def main():
     """메인 함수"""
@@ -174,17 +245,19 @@ def main():
         show_menu()
         
         try:
-            choice = input("\n메뉴를 선택하세요 (1-3): ").strip()
+            choice = input("\n메뉴를 선택하세요 (1-4): ").strip()
             
             if choice == '1':
                 search_and_download()
             elif choice == '2':
                 download_from_file()
             elif choice == '3':
+                watch_tracked_companies()
+            elif choice == '4':
                 print("\n👋 프로그램을 종료합니다.")
                 break
             else:
-                print("❌ 잘못된 선택입니다. 1-3 중에서 선택해주세요.")
+                print("❌ 잘못된 선택입니다. 1-4 중에서 선택해주세요.")
                 
         except KeyboardInterrupt:
             print("\n\n👋 프로그램을 종료합니다.")
@@ -0,0 +1,20 @@
+import pytest
+
+from dart_scraper import DartScraper
+
+
+@pytest.fixture
+def make_scraper():
+    """파일에 상태를 남기지 않는 DartScraper (테스트 종료 시 정리)"""
+    scrapers = []
+
+    def make(**kwargs):
+        options = dict(cookie_file=None, negative_cache_file=None, response_cache_file=None)
+        options.update(kwargs)
+        scraper = DartScraper(**options)
+        scrapers.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in scrapers:
+        scraper.close()
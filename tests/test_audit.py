@@ -0,0 +1,76 @@
+"""라이브러리 무결성 점검 - 문제 분류와 다시 받을 링크"""
+
+import hashlib
+import os
+
+import pytest
+
+from dart_audit import audit_library, inspect_pdf, redownload_reports
+from dart_storage import DownloadManifest
+
+
+PDF = b'%PDF-1.4\n' + b'0' * 2000 + b'\n%%EOF\n'
+
+
+@pytest.mark.parametrize('data, problems', [
+    (PDF, []),
+    (b'', ['empty']),
+    (b'\n<!DOCTYPE html><html><body>login</body></html>', ['html']),
+    (b'PK\x03\x04', ['not_pdf']),
+    (PDF[:-10], ['truncated']),
+    (b'\xef\xbb\xbf' + PDF + b'\x00' * 10, []),
+])
+def test_inspect_pdf(data, problems):
+    assert inspect_pdf(data) == problems
+
+
+def test_audit_library_classifies_files(tmp_path):
+    save_dir = str(tmp_path)
+    files = {
+        'report_20240101000001_1.pdf': PDF,
+        'report_20240101000002_1.pdf': b'<html><body>error</body></html>',
+        'report_20240101000003_1.pdf': PDF[:-10],
+        'report_20240101000004_1.pdf': PDF,
+        'old/report_20240101000005_1.pdf': b'',
+    }
+    for name, data in files.items():
+        os.makedirs(os.path.dirname(os.path.join(save_dir, name)), exist_ok=True)
+        with open(os.path.join(save_dir, name), 'wb') as f:
+            f.write(data)
+
+    manifest = DownloadManifest(save_dir)
+    manifest.record('20240101000001', '1', filename='report_20240101000001_1.pdf', size=len(PDF),
+                    sha256=hashlib.sha256(PDF).hexdigest())
+    # 크기는 같고 내용만 다른 기록
+    manifest.record('20240101000004', '1', filename='report_20240101000004_1.pdf', size=len(PDF),
+                    sha256=hashlib.sha256(b'other').hexdigest())
+    manifest.record('20240101000006', '1', filename='report_20240101000006_1.pdf', size=10,
+                    corp_name='삼성전자', report_name='사업보고서 (2023.12)')
+    manifest.record('20240101000007', '1', filename='report_20240101000007_1.pdf', size=10, evicted=True)
+
+    result = audit_library(save_dir, workers=1)
+    problems = {item['rcp_no']: item['problems'] for item in result['problems']}
+    assert problems == {
+        '20240101000002': ['html'],
+        '20240101000003': ['truncated'],
+        '20240101000004': ['hash_mismatch'],
+        '20240101000005': ['empty'],
+        '20240101000006': ['missing'],
+    }
+    assert result['files'] == 6 and result['ok'] == 1
+
+    quick = audit_library(save_dir, workers=1, hash_files=False)
+    assert '20240101000004' not in {item['rcp_no'] for item in quick['problems']}
+
+    links = {link['report_url'].rsplit('=', 1)[1]: link for link in redownload_reports(result['problems'])}
+    assert set(links) == set(problems)
+    assert links['20240101000006']['company'] == '삼성전자'
+    assert links['20240101000006']['submit_date'] == '2024.01.01'
+
+
+def test_size_mismatch(tmp_path):
+    with open(tmp_path / 'a.pdf', 'wb') as f:
+        f.write(PDF)
+    DownloadManifest(str(tmp_path)).record('20240101000001', '1', filename='a.pdf', size=len(PDF) + 1)
+    result = audit_library(str(tmp_path), workers=1, hash_files=False)
+    assert result['problems'][0]['problems'] == ['size_mismatch']
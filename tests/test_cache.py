@@ -0,0 +1,111 @@
+"""응답 캐시 - 조건부 재검증과 사전 압축 왕복"""
+
+import os
+
+import pytest
+import requests
+
+from dart_cache import (ZLIB, ZSTD, ResponseCache, build_zdict, compress_body, decompress_body, load_corpus,
+                        page_kind)
+
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'dart_pages')
+VIEWER_URL = "https://dart.fss.or.kr/dsaf001/main.do?rcpNo=20240312000736"
+SEARCH_URL = "https://dart.fss.or.kr/dsab007/detailSearch.ax"
+
+
+def _response(status: int, body: bytes = b'', **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.encoding = 'utf-8'
+    response.headers.update(headers)
+    return response
+
+
+@pytest.fixture
+def fetch(make_scraper, monkeypatch):
+    """정해 둔 응답을 차례로 돌려주고 요청 헤더와 파싱 횟수를 기록"""
+    scraper = make_scraper()
+    calls = {'headers': [], 'parsed': 0, 'responses': []}
+
+    def fake_request(method, url, **kwargs):
+        calls['headers'].append(dict(kwargs.get('headers') or {}))
+        return calls['responses'].pop(0)
+
+    def parse(response):
+        calls['parsed'] += 1
+        return {'title': response.text}
+
+    monkeypatch.setattr(scraper, '_request', fake_request)
+
+    def run(method, *responses):
+        calls['responses'].extend(responses)
+        return scraper._fetch_parsed(method, VIEWER_URL, 'viewer_page', parse)
+
+    run.calls = calls
+    run.cache = scraper.response_cache
+    return run
+
+
+def test_revalidation_reuses_parsed_results(fetch):
+    first = fetch('GET', _response(200, b'<html>v1</html>', ETag='"v1"', **{'Last-Modified': 'Tue, 12 Mar 2024'}))
+    assert first == {'title': '<html>v1</html>'}
+
+    assert fetch('GET', _response(304)) == first
+    assert fetch.calls['headers'][1] == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Tue, 12 Mar 2024'}
+
+    # 검증자를 무시하고 같은 본문을 보내면 해시 비교로 파싱 생략
+    assert fetch('GET', _response(200, b'<html>v1</html>')) == first
+    assert fetch.calls['parsed'] == 1
+
+    assert fetch('GET', _response(200, b'<html>v2</html>', ETag='"v2"')) == {'title': '<html>v2</html>'}
+    assert fetch.calls['parsed'] == 2
+
+    stats = fetch.cache.stats()
+    assert (stats['new'], stats['not_modified'], stats['unchanged'], stats['changed']) == (1, 1, 1, 1)
+    assert stats['bytes_saved'] == len(b'<html>v1</html>')
+
+
+def test_post_does_not_send_if_none_match(fetch):
+    fetch('POST', _response(200, b'<html>list</html>', ETag='"a"', **{'Last-Modified': 'Tue, 12 Mar 2024'}))
+    fetch('POST', _response(304))
+    assert fetch.calls['headers'][1] == {'If-Modified-Since': 'Tue, 12 Mar 2024'}
+
+
+def test_error_response_is_not_cached(fetch):
+    with pytest.raises(requests.HTTPError):
+        fetch('GET', _response(500, b'error'))
+    assert fetch('GET', _response(200, b'<html>ok</html>')) == {'title': '<html>ok</html>'}
+    assert fetch.calls['headers'][1] == {}
+
+
+@pytest.mark.parametrize('codec', [ZLIB, ZSTD])
+def test_compression_round_trip(codec):
+    if codec == ZSTD:
+        pytest.importorskip('zstandard')
+    pages = [body for _, body in load_corpus(CORPUS)]
+    dictionary = build_zdict(pages[:20]) if codec == ZLIB else None
+    for body in pages[20:30]:
+        assert decompress_body(compress_body(body, codec, dictionary), codec, dictionary) == body
+    assert decompress_body(b'plain', None) == b'plain'
+
+
+def test_cache_trains_dictionary_and_reopens(tmp_path):
+    pages = [(kind, body) for kind, body in load_corpus(CORPUS) if kind == '/search'][:12]
+    path = str(tmp_path / 'responses.sqlite')
+    cache = ResponseCache(path, train_after=4, train_samples=8)
+    cache.codec = ZLIB
+    for i, (_, body) in enumerate(pages):
+        cache._put(f"key{i}", f"{SEARCH_URL}?page={i}", body, str(i), 'utf-8', None, None, {})
+    stats = cache.storage_stats()
+    assert stats['kinds'][page_kind(SEARCH_URL)]['dictionary'].startswith(ZLIB)
+    assert stats['ratio'] > 1
+    cache.close()
+
+    reopened = ResponseCache(path)
+    try:
+        for i, (_, body) in enumerate(pages):
+            assert reopened.lookup(f"key{i}")['body'] == body
+    finally:
+        reopened.close()
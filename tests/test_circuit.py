@@ -0,0 +1,50 @@
+"""PDF 자리에 HTML이 올 때 회로 차단기 기록"""
+
+import io
+
+import pytest
+import requests
+from urllib3.response import HTTPResponse
+
+from dart_scraper import looks_like_maintenance
+
+
+def _html_response(text: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response.raw = HTTPResponse(body=io.BytesIO(text.encode('utf-8')), preload_content=False)
+    return response
+
+
+def _download(scraper, rcp_no: str) -> bool:
+    return scraper.download_report_file({'download_url': 'https://dart/pdf', 'rcp_no': rcp_no,
+                                         'dcm_no': '9601234'}, 'unused', prime=True)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('<html><body>시스템 점검 중입니다</body></html>', True),
+    ('<html><body>Site is under maintenance</body></html>', True),
+    ('<html><body>로그인 후 이용해 주세요. 잠시 후 다시 시도하세요</body></html>', False),
+    ('<html><body>maintenance fee disclosure</body></html>', False),
+])
+def test_maintenance_markers(text, expected):
+    assert looks_like_maintenance(text) is expected
+
+
+def test_only_maintenance_pages_trip_the_breaker(make_scraper, monkeypatch, tmp_path):
+    scraper = make_scraper()
+    monkeypatch.chdir(tmp_path)
+    pages = iter([])
+    monkeypatch.setattr(scraper, '_request', lambda method, url, **kwargs: next(pages))
+
+    # 로그인 안내 페이지는 보고서별 실패로만 기록
+    for i in range(scraper.circuit_breaker.failure_threshold):
+        pages = iter([_html_response('<html>로그인이 필요합니다</html>')] * 3)
+        assert not _download(scraper, f"2024031200000{i}")
+    assert not scraper.circuit_breaker.is_open
+
+    for i in range(scraper.circuit_breaker.failure_threshold):
+        pages = iter([_html_response('<html>서비스 점검 안내</html>')] * 3)
+        assert not _download(scraper, f"2024031200010{i}")
+    assert scraper.circuit_breaker.is_open
@@ -0,0 +1,79 @@
+"""명령행 도구 종료 코드와 scraper 정리 (실제 프로세스로 실행)"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DartScraper를 네트워크 없는 가짜로 바꾼 뒤 dart_cli.main 실행 (STUB_MODE: offline, empty, found)
+LAUNCHER = textwrap.dedent('''
+    import os
+    import sys
+
+    import dart_scraper
+    from dart_cli import main
+
+    MODE = os.environ['STUB_MODE']
+
+
+    class StubCache:
+        def print_stats(self):
+            pass
+
+
+    class StubScraper:
+        def __init__(self, **kwargs):
+            self.response_cache = StubCache()
+
+        def get_search_page(self):
+            return MODE != 'offline'
+
+        def search_page(self, company_name, start_date, end_date, page=1, public_types=None):
+            if MODE == 'empty' or page > 1:
+                return []
+            return [{'corp_name': company_name, 'report_name': '사업보고서 (2023.12)', 'submit_date': '2024.03.12',
+                     'rcp_no': '20240312000736', 'report_url': 'https://dart/dsaf001/main.do?rcpNo=20240312000736'}]
+
+        def download_reports_batch(self, reports, download_dir, dry_run=False, **kwargs):
+            return {'total_reports': len(reports), 'download_files': len(reports), 'dry_run': dry_run}
+
+        def close(self):
+            open('closed', 'a').close()
+
+
+    dart_scraper.DartScraper = StubScraper
+    sys.exit(main(sys.argv[1:]))
+''')
+
+
+def _run(tmp_path, mode, *argv):
+    launcher = tmp_path / 'launch.py'
+    launcher.write_text(LAUNCHER, encoding='utf-8')
+    env = dict(os.environ, STUB_MODE=mode, PYTHONPATH=ROOT, PYTHONIOENCODING='utf-8')
+    return subprocess.run([sys.executable, str(launcher), *argv], cwd=tmp_path, env=env,
+                          capture_output=True, text=True, encoding='utf-8', timeout=60)
+
+
+@pytest.mark.parametrize('command', ['search', 'plan'])
+@pytest.mark.parametrize('mode, code', [('found', 0), ('empty', 1), ('offline', 3)])
+def test_exit_codes_and_scraper_is_closed(tmp_path, command, mode, code):
+    result = _run(tmp_path, mode, command, '삼성전자', '--json')
+    assert result.returncode == code, result.stderr
+    # 접속에 실패하거나 결과가 없어도 scraper는 정리
+    assert (tmp_path / 'closed').exists()
+    if code == 0 and command == 'search':
+        assert [report['rcp_no'] for report in json.loads(result.stdout)] == ['20240312000736']
+    elif code == 0:
+        assert json.loads(result.stdout)['dry_run'] is True
+
+
+def test_plan_without_company_is_usage_error(tmp_path):
+    result = _run(tmp_path, 'found', 'plan')
+    assert result.returncode == 2
+    assert not (tmp_path / 'closed').exists()
@@ -0,0 +1,172 @@
+"""다중 노드 작업 대기열 - 임대, 실패 재시도, 공유 매니페스트"""
+
+import io
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from dart_coord import CoordinatedWorker, WorkQueue
+from dart_pack import PackStorage
+from dart_storage import DownloadManifest, LocalStorage
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / 'queue.sqlite')
+
+
+def _queue(path: str, node_id: str, **kwargs) -> WorkQueue:
+    queue = WorkQueue(path, node_id=node_id, **kwargs)
+    queue.heartbeat()
+    return queue
+
+
+def test_lease_is_exclusive_until_it_expires(queue_path):
+    a = _queue(queue_path, 'a', lease_seconds=0.2)
+    b = _queue(queue_path, 'b', lease_seconds=0.2)
+    a.add('report', {'report:1': {'rcp_no': '1'}})
+
+    assert [item['item_id'] for item in a.claim('report')] == ['report:1']
+    assert b.claim('report') == []
+
+    time.sleep(0.3)
+    taken = b.claim('report')
+    assert taken[0]['attempts'] == 2
+    # 임대가 넘어간 뒤의 완료 기록은 거부되고, 새 임대를 가진 노드만 완료할 수 있음
+    assert a.complete('report:1') is False
+    assert b.complete('report:1') is True
+    assert b.stats()['items'] == {'report:done': 1}
+
+
+def test_heartbeat_extends_the_lease(queue_path):
+    a = _queue(queue_path, 'a', lease_seconds=0.2)
+    b = _queue(queue_path, 'b', lease_seconds=0.2)
+    a.add('report', {'report:1': {'rcp_no': '1'}})
+    a.claim('report')
+    for _ in range(3):
+        time.sleep(0.1)
+        a.heartbeat()
+    assert b.claim('report') == []
+
+
+def test_failures_retry_until_max_attempts(queue_path):
+    a = _queue(queue_path, 'a', max_attempts=2)
+    a.add('company', {'company:삼성전자': {'company': '삼성전자'}})
+    for expected in ('company:pending', 'company:failed'):
+        item = a.claim('company')[0]
+        a.fail(item['item_id'], "검색 실패")
+        assert expected in a.stats()['items']
+
+
+def test_leave_returns_leased_items(queue_path):
+    a = _queue(queue_path, 'a')
+    b = _queue(queue_path, 'b')
+    a.add('report', {'report:1': {'rcp_no': '1'}})
+    a.claim('report')
+    a.leave()
+    assert b.claim('report')[0]['item_id'] == 'report:1'
+
+
+class FakeScraper:
+    """검색 페이지와 다운로드 결과를 정해 둔 가짜 스크레이퍼"""
+
+    def __init__(self, pages, fail_page=None, storage=None):
+        self.pages = pages
+        self.fail_page = fail_page
+        self.storage = storage or LocalStorage()
+        self.manifests = {}
+        self.downloads = []
+
+    def search_page(self, company, start_date, end_date, page=1, public_types=None, raise_errors=False):
+        if page == self.fail_page:
+            raise ConnectionError("연결 끊김")
+        return self.pages[page - 1] if page <= len(self.pages) else []
+
+    def get_manifest(self, save_dir):
+        return self.manifests.setdefault(save_dir, DownloadManifest(save_dir))
+
+    def get_report_download_info(self, report_url):
+        rcp_no = report_url.rsplit('=', 1)[1]
+        return {'rcp_no': rcp_no, 'dcm_no': '1'}
+
+    def download_report_file(self, download_info, save_dir, report=None):
+        self.downloads.append(download_info['rcp_no'])
+        filename = f"{download_info['rcp_no']}.pdf"
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Length'] = '4'
+        response.raw = io.BytesIO(b'%PDF')
+        self.storage.store(response, save_dir, filename, key=(download_info['rcp_no'], '1'))
+        self.get_manifest(save_dir).record(download_info['rcp_no'], '1', filename=filename, size=4)
+        return True
+
+
+def _report(rcp_no: str) -> dict:
+    return {'rcp_no': rcp_no, 'report_url': f"https://dart/dsaf001/main.do?rcpNo={rcp_no}",
+            'corp_name': '삼성전자', 'report_name': f"분기보고서 ({rcp_no[:4]}.03)"}
+
+
+def test_company_search_error_is_not_completed(queue_path, tmp_path):
+    scraper = FakeScraper([[_report('20240515000001')], [_report('20230515000001')]], fail_page=2)
+    worker = CoordinatedWorker(scraper, _queue(queue_path, 'a'), str(tmp_path), max_pages=3)
+    worker.add_companies(['삼성전자'])
+
+    item = worker.queue.claim('company')[0]
+    assert worker._process_company(item) is False
+    assert worker.queue.stats()['items'] == {'company:pending': 1}
+
+
+@pytest.mark.parametrize('storage', [LocalStorage, PackStorage])
+def test_report_downloaded_by_another_node_is_skipped(queue_path, tmp_path, storage):
+    # 팩 저장소에는 개별 파일이 없으므로 저장소 백엔드로 확인해야 건너뜀
+    a = FakeScraper([[_report('20240515000001')]], storage=storage())
+    b = FakeScraper([], storage=storage())
+    worker_a = CoordinatedWorker(a, _queue(queue_path, 'a'), str(tmp_path))
+    worker_b = CoordinatedWorker(b, _queue(queue_path, 'b'), str(tmp_path))
+
+    # b가 매니페스트를 먼저 읽어 둔 뒤 a가 받음
+    b.get_manifest(str(tmp_path))
+    worker_a.add_companies(['삼성전자'])
+    worker_a.run()
+    assert a.downloads == ['20240515000001']
+
+    worker_b.queue.add('report', {'report:20240515000001': _report('20240515000001')})
+    worker_b.queue.conn.execute("UPDATE items SET state = 'pending' WHERE kind = 'report'")
+    worker_b.run()
+    assert b.downloads == []
+
+
+def test_manifest_appends_from_several_writers(tmp_path):
+    manifests = [DownloadManifest(str(tmp_path)) for _ in range(4)]
+
+    def write(index: int) -> None:
+        for i in range(50):
+            manifests[index].record(f"2024{index:02d}{i:08d}", '1', filename=f"{index}-{i}.pdf", size=i)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(tmp_path / '.dart_manifest.jsonl', encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 200
+    fresh = DownloadManifest(str(tmp_path))
+    assert len(fresh.entries) == 200
+
+    manifests[0].compact()
+    manifests[1].record('20990101000001', '1', filename='late.pdf', size=1)
+    assert len(DownloadManifest(str(tmp_path)).entries) == 201
+
+
+def test_manifest_recovers_from_a_torn_line(tmp_path):
+    manifest = DownloadManifest(str(tmp_path))
+    manifest.record('20240101000001', '1', filename='a.pdf')
+    with open(tmp_path / '.dart_manifest.jsonl', 'ab') as f:
+        f.write(b'{"rcp_no": "2024')
+    DownloadManifest(str(tmp_path)).record('20240101000002', '1', filename='b.pdf')
+    assert set(DownloadManifest(str(tmp_path)).entries) == {('20240101000001', '1'), ('20240101000002', '1')}
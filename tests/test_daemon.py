@@ -0,0 +1,72 @@
+"""데몬 - 폴더 제한, 토큰 인증, 작업별 진행 기록"""
+
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from dart_daemon import ScraperDaemon, _Handler, serve
+
+
+@pytest.fixture
+def daemon(make_scraper, tmp_path):
+    daemon = ScraperDaemon(make_scraper(), root=str(tmp_path / 'root'))
+    yield daemon
+    for _ in daemon._workers:
+        daemon.queue.put(None)
+
+
+def test_dirs_are_confined_to_root(daemon, tmp_path):
+    root = str(tmp_path / 'root')
+    assert daemon.default_dir == os.path.join(root, 'downloads')
+    assert daemon.resolve_dir('삼성전자_reports') == os.path.join(root, '삼성전자_reports')
+
+    os.makedirs(root, exist_ok=True)
+    os.symlink(str(tmp_path), os.path.join(root, 'escape'))
+    for path in ('../outside', '/etc', 'escape/x'):
+        with pytest.raises(ValueError):
+            daemon.resolve_dir(path)
+
+    with pytest.raises(ValueError):
+        daemon.submit('index', {'download_dir': '../outside'})
+    with pytest.raises(ValueError):
+        daemon.query('/tmp', '삼성')
+    assert not (tmp_path / 'outside').exists()
+
+
+def test_job_output_goes_to_its_own_log(daemon):
+    daemon.handlers['echo'] = lambda params: print(f"echo {params['n']}") or params['n']
+    jobs = [daemon.submit('echo', {'n': n}) for n in range(3)]
+    for job in jobs:
+        with job.changed:
+            job.changed.wait_for(lambda: job.finished, timeout=5)
+
+    assert [job.result for job in jobs] == [0, 1, 2]
+    assert [job.log for job in jobs] == [['echo 0'], ['echo 1'], ['echo 2']]
+
+
+def test_remote_host_requires_token():
+    with pytest.raises(ValueError):
+        serve(host='0.0.0.0', port=0)
+
+
+def test_requests_need_the_token(daemon):
+    handler = type('TestHandler', (_Handler,), {'daemon': daemon, 'token': 's3cret'})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/status"
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(url, timeout=5)
+        assert error.value.code == 401
+
+        request = urllib.request.Request(url, headers={'Authorization': 'Bearer s3cret'})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert 'queued' in json.load(response)
+    finally:
+        server.shutdown()
+        server.server_close()
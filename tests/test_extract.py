@@ -0,0 +1,130 @@
+"""재무제표 추출 - 섹션 폴더 증분 처리, 재추출 시 이전 행 교체, 팩·매니페스트 보고서 찾기, 선택 의존성 안내"""
+
+import csv
+import io
+import os
+import shutil
+from concurrent.futures import Future
+
+import pytest
+import requests
+
+import dart_extract
+from dart_extract import FinancialExtractor, benchmark_extraction, extract_pdf_tables, manifest_reports
+from dart_pack import PACK_SCHEME, PackStorage
+from dart_storage import DownloadManifest
+
+
+LIBRARY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'report_library')
+
+
+@pytest.fixture
+def library(tmp_path):
+    names = sorted(os.listdir(LIBRARY))[:3]
+    for name in names:
+        shutil.copytree(os.path.join(LIBRARY, name), tmp_path / 'library' / name)
+    return str(tmp_path / 'library')
+
+
+def test_sections_are_extracted_once(library, tmp_path, monkeypatch):
+    monkeypatch.setattr(dart_extract, 'pyarrow', None)
+    extractor = FinancialExtractor(library, str(tmp_path / 'store'), workers=1)
+
+    first = extractor.run()
+    assert first['reports'] == 3
+    assert first['rows'] > 0
+    with open(tmp_path / 'store' / 'financials.csv', encoding='utf-8-sig') as f:
+        assert sum(1 for _ in f) == first['rows'] + 1
+
+    assert FinancialExtractor(library, str(tmp_path / 'store'), workers=1).run()['reports'] == 0
+
+
+def _csv_rows(store_dir) -> list:
+    with open(os.path.join(store_dir, 'financials.csv'), encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_reextracted_report_replaces_previous_rows(library, tmp_path, monkeypatch):
+    monkeypatch.setattr(dart_extract, 'pyarrow', None)
+    store_dir = str(tmp_path / 'store')
+    first = FinancialExtractor(library, store_dir, workers=1).run()
+    before = _csv_rows(store_dir)
+    assert len(before) == first['rows']
+
+    # 섹션 파일이 바뀌면 같은 보고서를 다시 추출 - 이전 행은 지우고 새 행으로 교체
+    rcp_no = sorted(os.listdir(library))[0]
+    section = next(name for name in os.listdir(os.path.join(library, rcp_no)) if name.endswith('.html'))
+    os.utime(os.path.join(library, rcp_no, section), ns=(1, 1))
+    second = FinancialExtractor(library, store_dir, workers=1).run()
+    assert second['reports'] == 1
+
+    after = _csv_rows(store_dir)
+    assert sorted(tuple(row.values()) for row in after) == sorted(tuple(row.values()) for row in before)
+    assert {row['report_key'] for row in after} == {f"sections:{name}" for name in os.listdir(library)}
+
+
+def _pdf_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Length'] = str(len(body))
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class _CapturingPool:
+    def __init__(self):
+        self.tasks = []
+
+    def submit(self, func, task):
+        self.tasks.append(task)
+        return Future()
+
+
+def test_packed_and_evicted_manifest_reports(tmp_path, monkeypatch):
+    save_dir = str(tmp_path)
+    body = b'%PDF-1.4\n%%EOF\n'
+    PackStorage().store(_pdf_response(body), save_dir, '[삼성전자]사업보고서(2024.03.12).pdf',
+                        key=('20240312000736', '9601234'))
+    manifest = DownloadManifest(save_dir)
+    manifest.record('20240312000736', '9601234', filename='[삼성전자]사업보고서(2024.03.12).pdf', size=len(body))
+    (tmp_path / '[LG화학]사업보고서(2024.03.13).pdf').write_bytes(body)
+    manifest.record('20240313000001', '9601235', filename='[LG화학]사업보고서(2024.03.13).pdf', size=len(body),
+                    evicted=True)
+
+    # 팩에 있는 보고서는 pack:// 위치로 찾고, 지운 것으로 기록된 보고서는 파일이 남아 있어도 제외
+    tasks = manifest_reports(save_dir)
+    assert [task['key'] for task in tasks] == ['20240312000736:9601234']
+    assert tasks[0]['files'][0].startswith(PACK_SCHEME)
+    assert tasks[0]['corp_name'] == '삼성전자'
+
+    monkeypatch.setattr(dart_extract, 'pdfplumber', object())
+    extractor = FinancialExtractor(save_dir, str(tmp_path / 'store'), workers=1, manifest=manifest)
+    extractor._pool = pool = _CapturingPool()
+    extractor.post_process({'corp_name': '삼성전자', 'report_name': '사업보고서 (2023.12)'},
+                           {'rcp_no': '20240312000736', 'dcm_no': '9601234'})
+    extractor.post_process({}, {'rcp_no': '20240313000001', 'dcm_no': '9601235'})
+    assert [task['files'] for task in pool.tasks] == [tasks[0]['files']]
+    assert pool.tasks[0]['report_name'] == '사업보고서 (2023.12)'
+
+
+def test_missing_pdfplumber_is_reported(library, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(dart_extract, 'pdfplumber', None)
+    with pytest.raises(ImportError, match=r"ddownload\[pdf\]"):
+        extract_pdf_tables(str(tmp_path / 'report.pdf'))
+
+    pdf = tmp_path / 'library' / '[삼성전자]사업보고서(2024.03.12).pdf'
+    pdf.write_bytes(b'%PDF-1.4\n%%EOF\n')
+    with open(tmp_path / 'library' / '.dart_manifest.jsonl', 'w', encoding='utf-8') as f:
+        f.write('{"rcp_no": "20240312000736", "dcm_no": "9601234", "filename": "%s"}\n' % pdf.name)
+
+    extractor = FinancialExtractor(library, str(tmp_path / 'store'), workers=1)
+    extractor.run()
+    assert extractor.skipped_pdfs == 1
+    assert "pdfplumber" in capsys.readouterr().out
+
+
+def test_benchmark_reports_per_core(library, tmp_path):
+    result = benchmark_extraction(library, workers=[1], work_dir=str(tmp_path))
+    assert result['reports'] == 3
+    assert result['runs'][0]['reports_per_sec_per_core'] > 0
+    assert os.listdir(tmp_path) == ['library']
@@ -0,0 +1,56 @@
+"""전문 검색 색인 - 증분 색인, 읽지 못한 PDF, 한 글자 검색"""
+
+import os
+import shutil
+
+import pytest
+
+import dart_index
+from dart_index import ReportIndex
+
+
+LIBRARY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'report_library')
+
+
+@pytest.fixture
+def library(tmp_path):
+    for name in sorted(os.listdir(LIBRARY))[:2]:
+        shutil.copytree(os.path.join(LIBRARY, name), tmp_path / 'library' / name)
+    return str(tmp_path / 'library')
+
+
+@pytest.fixture
+def index(library):
+    index = ReportIndex.for_library(library)
+    yield index
+    index.close()
+
+
+def test_update_is_incremental(index, library):
+    assert index.update(library, workers=1)['indexed'] == 2
+    assert index.update(library, workers=1)['indexed'] == 0
+    assert len(index.search('"연결 재무상태표" 영업이익')) == 2
+
+
+def test_single_character_term(index, library):
+    index.update(library, workers=1)
+    results = index.search('익')
+    assert len(results) == 2
+    assert all(result['matches'] > 0 for result in results)
+    assert index.search('뷁') == []
+
+
+def test_unreadable_pdf_is_retried_later(index, library, monkeypatch):
+    monkeypatch.setattr(dart_index, 'pdfplumber', None)
+    pdf_name = '[삼성전자]사업보고서(2024.03.12).pdf'
+    with open(os.path.join(library, pdf_name), 'wb') as f:
+        f.write(b'%PDF-1.4\n%%EOF\n')
+    with open(os.path.join(library, '.dart_manifest.jsonl'), 'w', encoding='utf-8') as f:
+        f.write('{"rcp_no": "20240312000736", "dcm_no": "9601234", "filename": "%s"}\n' % pdf_name)
+
+    first = index.update(library, workers=1)
+    assert first['indexed'] == 2 and first['skipped'] == 1
+    assert '20240312000736:9601234' not in index._signatures()
+
+    # 다시 실행해도 서명이 없으므로 색인 대상으로 남음
+    assert index.update(library, workers=1)['skipped'] == 1
@@ -0,0 +1,54 @@
+"""대화형 메뉴 - 입력 도중 빠져나가도 미리 준비 스레드 정리"""
+
+import sys
+
+import pytest
+
+import main
+
+
+class FakeScraper:
+    def __init__(self):
+        self.closed = False
+
+    def get_search_page(self):
+        return True
+
+    def search_company(self, name):
+        return [{'name': name}]
+
+    def search_reports(self, company_name, start_date, end_date, report_types):
+        return [{'rcp_no': f"2024010100000{i}", 'report_url': f"https://dart/dsaf001/main.do?rcpNo=2024010100000{i}",
+                 'report_name': f"분기보고서 (2023.0{i})", 'corp_name': company_name} for i in range(1, 4)]
+
+    def get_manifest(self, save_dir):
+        return type('Manifest', (), {'find_rcp': lambda self, rcp_no: None})()
+
+    def get_report_download_info(self, report_url):
+        return {'rcp_no': report_url.rsplit('=', 1)[1], 'dcm_no': '1'}
+
+    def probe_download_size(self, download_info):
+        return 100
+
+    def close(self):
+        self.closed = True
+
+
+def test_interrupted_prompt_stops_prefetcher(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    scraper = FakeScraper()
+    monkeypatch.setattr(main, 'DartScraper', lambda: scraper)
+    answers = iter(['삼성전자', '1'])
+
+    def fake_input(prompt=''):
+        try:
+            return next(answers)
+        except StopIteration:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr('builtins.input', fake_input)
+    stdout = sys.stdout
+    with pytest.raises(KeyboardInterrupt):
+        main.search_and_download()
+    assert sys.stdout is stdout
+    assert scraper.closed
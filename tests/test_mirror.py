@@ -0,0 +1,112 @@
+"""디스크 한도 미러 - 한도 정리 순서, 삭제된 보고서 다시 받기, 로컬 저장소 전용"""
+
+import os
+
+import pytest
+
+from dart_mirror import ReportMirror, enforce_quota
+from dart_pack import PackStorage
+from dart_storage import DownloadManifest, LocalStorage
+
+
+class FakeScraper:
+    """다운로드 결과를 매니페스트에 기록하는 가짜 스크레이퍼"""
+
+    base_url = "https://dart.fss.or.kr"
+
+    def __init__(self, record=True, storage=None):
+        self.record = record
+        self.storage = storage or LocalStorage()
+        self.manifests = {}
+        self.downloads = []
+
+    def get_manifest(self, save_dir):
+        return self.manifests.setdefault(save_dir, DownloadManifest(save_dir))
+
+    def build_download_info(self, rcp_no, dcm_no):
+        return {'rcp_no': rcp_no, 'dcm_no': dcm_no}
+
+    def get_report_download_info(self, report_url):
+        return {'rcp_no': report_url.rsplit('=', 1)[1], 'dcm_no': '9601234'}
+
+    def download_report_file(self, download_info, save_dir, report=None):
+        self.downloads.append((download_info['rcp_no'], report))
+        if self.record:
+            filename = f"{download_info['rcp_no']}.pdf"
+            with open(os.path.join(save_dir, filename), 'wb') as f:
+                f.write(b'%PDF')
+            self.get_manifest(save_dir).record(download_info['rcp_no'], download_info['dcm_no'],
+                                               filename=filename, size=4, evicted=False)
+        return True
+
+
+def _add(manifest, rcp_no, size, report_name, last_access):
+    filename = f"{rcp_no}.pdf"
+    with open(os.path.join(manifest.save_dir, filename), 'wb') as f:
+        f.write(b'%' * size)
+    manifest.record(rcp_no, '1', filename=filename, size=size, corp_name='삼성전자',
+                    report_name=report_name, last_access=last_access)
+
+
+def test_superseded_reports_are_evicted_first(tmp_path):
+    manifest = DownloadManifest(str(tmp_path))
+    _add(manifest, '20240312000001', 100, '사업보고서 (2023.12)', last_access=3)
+    _add(manifest, '20240401000001', 100, '[기재정정]사업보고서 (2023.12)', last_access=1)
+    _add(manifest, '20230515000001', 100, '분기보고서 (2023.03)', last_access=2)
+
+    evicted = enforce_quota(manifest, quota_bytes=250, low_watermark=0.8)
+    assert [entry['rcp_no'] for entry in evicted] == ['20240312000001']
+    assert not (tmp_path / '20240312000001.pdf').exists()
+    assert DownloadManifest(str(tmp_path)).get('20240312000001', '1')['evicted'] is True
+
+
+def test_evicted_report_is_downloaded_again(tmp_path):
+    scraper = FakeScraper()
+    manifest = scraper.get_manifest(str(tmp_path))
+    manifest.record('20240312000736', '9601234', filename='old.pdf', size=4, corp_name='삼성전자',
+                    report_name='사업보고서 (2023.12)', evicted=True)
+
+    path = ReportMirror(scraper, str(tmp_path), quota_bytes=0).open('20240312000736')
+    assert path == os.path.join(str(tmp_path), '20240312000736.pdf')
+    assert scraper.downloads[0][1]['report_name'] == '사업보고서 (2023.12)'
+    assert manifest.find_rcp('20240312000736')['last_access']
+
+
+def test_unrecorded_download_returns_none(tmp_path):
+    scraper = FakeScraper(record=False)
+    assert ReportMirror(scraper, str(tmp_path), quota_bytes=0).open('20240312000736') is None
+    assert scraper.downloads == [('20240312000736', None)]
+
+
+class RecordingStorage(LocalStorage):
+    def __init__(self):
+        super().__init__()
+        self.deleted = []
+
+    def delete(self, save_dir, filename):
+        self.deleted.append(filename)
+        super().delete(save_dir, filename)
+
+
+def test_eviction_deletes_through_the_storage_backend(tmp_path):
+    manifest = DownloadManifest(str(tmp_path))
+    _add(manifest, '20240312000001', 100, '사업보고서 (2023.12)', last_access=1)
+    _add(manifest, '20240313000001', 100, '사업보고서 (2023.12)', last_access=2)
+    storage = RecordingStorage()
+
+    evicted = enforce_quota(manifest, quota_bytes=150, low_watermark=1.0, storage=storage)
+    assert [entry['rcp_no'] for entry in evicted] == ['20240312000001']
+    assert storage.deleted == ['20240312000001.pdf']
+    assert not (tmp_path / '20240312000001.pdf').exists()
+
+
+def test_mirror_refuses_non_local_storage(tmp_path):
+    manifest = DownloadManifest(str(tmp_path))
+    manifest.record('20240312000001', '1', filename='a.pdf', size=100)
+
+    # 팩에 있는 보고서를 로컬 파일이 없다는 이유로 삭제 기록하지 않음
+    with pytest.raises(ValueError):
+        enforce_quota(manifest, quota_bytes=10, storage=PackStorage())
+    with pytest.raises(ValueError):
+        ReportMirror(FakeScraper(storage=PackStorage()), str(tmp_path), quota_bytes=10)
+    assert not DownloadManifest(str(tmp_path)).get('20240312000001', '1').get('evicted')
@@ -0,0 +1,143 @@
+"""팩 파일 저장소 - 정리(compact), 색인 재구성, 기존 폴더 이동, 여러 프로세스의 세그먼트 잠금"""
+
+import fcntl
+import multiprocessing
+import os
+
+import pytest
+
+from dart_pack import PackFile, pack_library, open_pack
+from dart_storage import DownloadManifest
+
+
+@pytest.fixture
+def pack(tmp_path):
+    pack = PackFile(str(tmp_path / '.dart_pack'), segment_size=4096)
+    yield pack
+    pack.close()
+
+
+def _fill(pack, count: int, size: int = 1000) -> dict:
+    bodies = {f"{i:02d}.pdf": bytes([i]) * size for i in range(count)}
+    for name, body in bodies.items():
+        pack.put(name, body, key=(f"2024{name[:2]}", '1'))
+    return bodies
+
+
+def test_compact_keeps_live_records(pack):
+    bodies = _fill(pack, 8)
+    assert pack.stats()['segments'] == 2
+    for name in ('00.pdf', '01.pdf', '02.pdf'):
+        assert pack.delete(name)
+        del bodies[name]
+    pack.put('03.pdf', b'%PDF-new')
+    bodies['03.pdf'] = b'%PDF-new'
+
+    before = pack.stats()
+    result = pack.compact()
+    after = pack.stats()
+    assert result['segments'] >= 1 and result['reclaimed_bytes'] > 0
+    assert after['segment_bytes'] < before['segment_bytes']
+    assert after['files'] == len(bodies)
+    assert {name: bytes(pack.read(name)) for name in pack.names()} == bodies
+    assert pack.find('202404')['name'] == '04.pdf'
+
+
+def test_compact_skips_when_little_garbage(pack):
+    _fill(pack, 2)
+    assert pack.compact()['segments'] == 0
+
+
+def test_rebuild_index_uses_latest_records(pack):
+    bodies = _fill(pack, 3)
+    pack.put('01.pdf', b'%PDF-replaced')
+    pack.delete('02.pdf')
+    pack.conn.execute('DELETE FROM objects')
+    pack.conn.commit()
+
+    assert pack.rebuild_index() == 2
+    assert bytes(pack.read('00.pdf')) == bodies['00.pdf']
+    assert bytes(pack.read('01.pdf')) == b'%PDF-replaced'
+    assert pack.get('02.pdf') is None
+
+
+def test_rebuild_index_stops_at_torn_record(pack):
+    _fill(pack, 2)
+    segment = pack._segment_path(pack._segment_ids()[-1])
+    with open(segment, 'ab') as f:
+        f.write(b'DPK1\x00')
+    assert pack.rebuild_index() == 2
+
+
+def test_pack_library_moves_manifest_files(tmp_path):
+    save_dir = str(tmp_path / 'reports')
+    os.makedirs(save_dir)
+    with open(os.path.join(save_dir, 'a.pdf'), 'wb') as f:
+        f.write(b'%PDF-a')
+    DownloadManifest(save_dir).record('20240101000001', '1', filename='a.pdf', size=6)
+
+    assert pack_library(save_dir) == {'files': 1, 'bytes': 6}
+    assert not os.path.exists(os.path.join(save_dir, 'a.pdf'))
+    assert bytes(open_pack(save_dir).read('a.pdf')) == b'%PDF-a'
+    assert DownloadManifest(save_dir).get('20240101000001', '1')['location'].startswith('pack://')
+
+
+def _lock_segment(pack, sid):
+    f = open(pack._segment_path(sid), 'rb')
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    return f
+
+
+def test_segment_locked_by_another_writer_is_skipped(pack):
+    pack.put('a.pdf', b'%PDF-a')
+    first = pack.get('a.pdf')['segment']
+
+    # 다른 프로세스가 쓰는 중인 세그먼트에는 덧붙이지 않고 새 세그먼트에 기록
+    with _lock_segment(pack, first):
+        pack.put('b.pdf', b'%PDF-b')
+        other = PackFile(pack.pack_dir, segment_size=4096)
+        other.put('c.pdf', b'%PDF-c')
+        other.close()
+    assert first not in {pack.get(name)['segment'] for name in ('b.pdf', 'c.pdf')}
+    assert bytes(pack.read('c.pdf')) == b'%PDF-c'
+
+
+def test_compact_skips_segment_locked_by_another_process(pack):
+    bodies = _fill(pack, 8)
+    for name in ('00.pdf', '01.pdf', '05.pdf', '06.pdf'):
+        pack.delete(name)
+        del bodies[name]
+    locked_sid = pack.get('02.pdf')['segment']
+
+    with _lock_segment(pack, locked_sid):
+        pack.compact()
+    assert os.path.exists(pack._segment_path(locked_sid))
+    assert pack.get('02.pdf')['segment'] == locked_sid
+    assert {name: bytes(pack.read(name)) for name in pack.names()} == bodies
+
+
+def _write_many(pack_dir, prefix, count):
+    pack = PackFile(pack_dir, segment_size=64 * 1024)
+    for i in range(count):
+        pack.put(f"{prefix}{i:03d}.pdf", bytes([i % 256]) * (1000 + i), key=(prefix, str(i)))
+    pack.close()
+
+
+def test_processes_share_a_pack_without_mixing_records(tmp_path):
+    pack_dir = str(tmp_path / '.dart_pack')
+    PackFile(pack_dir).close()
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_write_many, args=(pack_dir, prefix, 40)) for prefix in ('a', 'b', 'c')]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    # 세그먼트를 처음부터 다시 읽어도 모든 레코드가 온전해야 함
+    pack = PackFile(pack_dir, segment_size=64 * 1024)
+    assert pack.rebuild_index() == 120
+    for prefix in ('a', 'b', 'c'):
+        for i in range(40):
+            assert bytes(pack.read(f"{prefix}{i:03d}.pdf")) == bytes([i % 256]) * (1000 + i)
+    pack.close()
@@ -0,0 +1,112 @@
+"""검색·뷰어 HTML 파싱 (프로세스 풀, 인코딩 감지)"""
+
+import os
+
+import requests
+
+from dart_scraper import (declared_charset, parse_search_rows, parse_viewer_page, parse_viewer_documents,
+                          benchmark_parsing)
+from dart_cache import load_corpus
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'dart_pages')
+
+
+def _fixture(kind: str, name: str = 'page000.html') -> bytes:
+    with open(os.path.join(FIXTURES, kind, name), 'rb') as f:
+        return f.read()
+
+
+def _response(body: bytes, content_type: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers['Content-Type'] = content_type
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def test_declared_charset_ignores_requests_default():
+    assert declared_charset(_response(b'', 'text/html')) is None
+    assert declared_charset(_response(b'', 'text/html; charset=UTF-8')) == 'UTF-8'
+    assert declared_charset(_response(b'', 'text/html;charset="euc-kr"')) == 'euc-kr'
+
+
+def test_undeclared_charset_is_detected_from_meta():
+    body = '<html><head><meta charset="euc-kr"></head><body><table class="tbList"><tbody><tr>' \
+           '<td>1</td><td><a>삼성전자</a></td><td><a href="/dsaf001/main.do?rcpNo=20240312000736">사업보고서</a></td>' \
+           '<td>삼성전자</td><td>2024.03.12</td><td></td></tr></tbody></table></body></html>'
+    response = _response(body.encode('euc-kr'), 'text/html')
+    assert response.encoding == 'ISO-8859-1'
+
+    rows, status = parse_search_rows(response.content, declared_charset(response))
+    assert status == 'ok'
+    assert rows[0][2] == '삼성전자'
+    assert rows[0][8] == '20240312000736'
+
+
+def test_process_pool_matches_sequential_parsing(make_scraper):
+    search = _response(_fixture('search'), 'text/html; charset=UTF-8')
+    viewer = _response(_fixture('viewer'), 'text/html')
+    sequential = make_scraper(parse_workers=0)
+    pooled = make_scraper(parse_workers=2)
+
+    expected = sequential._parse_search_response(search)
+    assert len(expected) == 100
+    assert pooled._parse_search_response(search) == expected
+    assert pooled._parse_html(parse_viewer_page, viewer) == parse_viewer_page(viewer.content, 'utf-8')
+
+
+def test_benchmark_parsing_reports_each_worker_count():
+    pages = [(kind, body) for kind, body in load_corpus(FIXTURES)][:4] + [('/other', b'')]
+    result = benchmark_parsing(pages, workers=[0, 1], repeat=1)
+    assert result['pages'] == 4
+    assert [run['workers'] for run in result['runs']] == [0, 1]
+    assert result['runs'][0]['speedup'] == 1.0
+
+
+def test_attachment_documents_keep_their_own_rcp_no():
+    body = _fixture('viewer')
+    documents = parse_viewer_documents(body.decode('utf-8'))
+    by_title = {title: rcp_no for _, title, rcp_no in documents}
+
+    assert by_title['[감사보고서]'] == '20241106178572'
+    assert by_title['[첨부]연결감사보고서'] == '20241220974707'
+
+
+def test_report_documents_download_each_document_under_its_rcp_no(make_scraper, monkeypatch):
+    scraper = make_scraper()
+    body = _fixture('viewer')
+    monkeypatch.setattr(scraper, '_request', lambda method, url, **kwargs: _response(body, 'text/html; charset=utf-8'))
+
+    filing = scraper.get_report_documents('https://dart.fss.or.kr/dsaf001/main.do?rcpNo=20241220974707')
+
+    audit = next(doc for doc in filing['documents'] if doc['title'] == '[감사보고서]')
+    assert audit['download_info']['rcp_no'] == '20241106178572'
+    assert 'rcp_no=20241106178572' in audit['download_info']['download_url']
+
+
+def test_report_documents_are_named_from_the_search_result(make_scraper, monkeypatch, tmp_path):
+    scraper = make_scraper()
+    body = _fixture('viewer', 'page001.html')
+    monkeypatch.setattr(scraper, '_request', lambda method, url, **kwargs: _response(body, 'text/html; charset=utf-8'))
+    reports = {}
+    monkeypatch.setattr(scraper, 'download_report_file',
+                        lambda info, save_dir, report=None: reports.setdefault(info['dcm_no'], report) is not None)
+    report = {'corp_name': '테스트기업103', 'report_name': '사업보고서 (2023.12)', 'submit_date': '2024.10.17'}
+
+    results = scraper.download_report_documents(
+        'https://dart.fss.or.kr/dsaf001/main.do?rcpNo=20241017222316', str(tmp_path), report=report)
+    assert results == {'9501651': True, '9501652': True, '9566011': True}
+    assert reports['9501651'] == report
+    assert reports['9501652']['report_name'] == '사업보고서 (2023.12) [첨부]연결감사보고서'
+    # 별도 접수번호로 제출된 감사보고서는 검색 결과의 접수일을 쓰지 않음
+    assert reports['9566011']['report_name'] == '사업보고서 (2023.12) [감사보고서]'
+    assert 'submit_date' not in reports['9566011']
+
+    # 검색 결과가 없으면 같은 공시의 매니페스트 기록으로 이름을 정함
+    reports.clear()
+    scraper.get_manifest(str(tmp_path)).record('20241017222316', '9501651', filename='a.pdf', **report)
+    scraper.download_report_documents('https://dart.fss.or.kr/dsaf001/main.do?rcpNo=20241017222316', str(tmp_path),
+                                      titles=['첨부'])
+    assert reports == {'9501652': dict(report, report_name='사업보고서 (2023.12) [첨부]연결감사보고서')}
@@ -0,0 +1,87 @@
+"""ReportPipeline 재실행, 검색 실패 집계, 정정 공시 선별"""
+
+import threading
+
+from dart_pipeline import ReportPipeline
+
+
+class FakeScraper:
+    def __init__(self, pages_by_company, fail_on=None):
+        self.pages_by_company = pages_by_company
+        self.fail_on = fail_on or {}
+        self.downloaded = []
+        self._lock = threading.Lock()
+
+    def search_page(self, company_name, start_date, end_date, page=1, public_types=None, raise_errors=False):
+        if self.fail_on.get(company_name) == page:
+            raise ConnectionError("연결 끊김")
+        pages = self.pages_by_company.get(company_name, [])
+        return pages[page - 1] if page <= len(pages) else []
+
+    def get_report_download_info(self, report_url):
+        return {'rcp_no': report_url.rsplit('=', 1)[1], 'dcm_no': '1', 'download_url': report_url}
+
+    def download_report_file(self, download_info, save_dir, report=None):
+        with self._lock:
+            self.downloaded.append(download_info['rcp_no'])
+        return True
+
+
+def _report(company: str, rcp_no: str) -> dict:
+    return {'corp_name': company, 'company': company, 'report_name': f'사업보고서 ({rcp_no[:4]}.12)',
+            'rcp_no': rcp_no, 'report_url': f'https://dart/dsaf001/main.do?rcpNo={rcp_no}'}
+
+
+def _run_with_timeout(func, *args, timeout=10):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(stats=func(*args)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "파이프라인이 끝나지 않음"
+    return result['stats']
+
+
+def test_pipeline_can_run_again_with_fresh_stats(tmp_path):
+    scraper = FakeScraper({'삼성전자': [[_report('삼성전자', '20240312000001')]],
+                           'LG화학': [[_report('LG화학', '20230312000002')]]})
+    pipeline = ReportPipeline(scraper, str(tmp_path), resolve_workers=2, download_workers=3,
+                              request_delay=0, status_interval=0)
+
+    first = _run_with_timeout(pipeline.run_companies, ['삼성전자', 'LG화학'])
+    assert first['download']['processed'] == 2
+
+    second = _run_with_timeout(pipeline.run_companies, ['삼성전자'])
+    assert second['search']['processed'] == 1
+    assert second['download']['processed'] == 1
+
+    third = _run_with_timeout(pipeline.run_reports, [_report('LG화학', '20220312000003')])
+    assert third['search']['processed'] == 0
+    assert third['post']['processed'] == 1
+    assert len(scraper.downloaded) == 4
+
+
+def test_search_error_counts_as_failure_but_keeps_earlier_pages(tmp_path):
+    scraper = FakeScraper({'삼성전자': [[_report('삼성전자', '20240312000001')],
+                                      [_report('삼성전자', '20230312000002')]]},
+                          fail_on={'삼성전자': 2})
+    pipeline = ReportPipeline(scraper, str(tmp_path), request_delay=0, status_interval=0)
+
+    stats = _run_with_timeout(pipeline.run_companies, ['삼성전자'])
+    assert stats['search']['failed'] == 1
+    assert stats['search']['processed'] == 0
+    assert scraper.downloaded == ['20240312000001']
+
+
+def test_search_keeps_latest_amendment_across_pages(tmp_path):
+    original = _report('삼성전자', '20230315000001')
+    corrected = dict(_report('삼성전자', '20230410000003'), report_name='[기재정정]사업보고서 (2022.12)')
+    original['report_name'] = '사업보고서 (2022.12)'
+    scraper = FakeScraper({'삼성전자': [[corrected], [original]]})
+    pipeline = ReportPipeline(scraper, str(tmp_path), request_delay=0, status_interval=0)
+
+    _run_with_timeout(pipeline.run_companies, ['삼성전자'])
+    assert scraper.downloaded == ['20230410000003']
+
+    scraper.downloaded.clear()
+    _run_with_timeout(lambda names: pipeline.run_companies(names, keep_all_versions=True), ['삼성전자'])
+    assert sorted(scraper.downloaded) == ['20230315000001', '20230410000003']
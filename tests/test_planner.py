@@ -0,0 +1,104 @@
+"""보고서명 해석, 정정 공시 최신본 선별, estimate_downloads 예상 요청 수와 소요 시간"""
+
+import io
+import re
+
+import pytest
+import requests
+
+from dart_pack import PackStorage
+from dart_planner import estimate_downloads, parse_report_name, plan_latest_versions
+
+
+def _report(rcp_no: str) -> dict:
+    return {'rcp_no': rcp_no, 'report_url': f"https://dart.fss.or.kr/dsaf001/main.do?rcpNo={rcp_no}",
+            'corp_name': f"회사{rcp_no[-1]}", 'report_name': '사업보고서 (2023.12)'}
+
+
+def _filing(rcp_no: str, report_name: str, corp_name: str = '삼성전자') -> dict:
+    return {'rcp_no': rcp_no, 'corp_name': corp_name, 'report_name': report_name}
+
+
+def test_parse_report_name_splits_amendment_flags():
+    assert parse_report_name('[기재정정][첨부정정]사업보고서 (2022.12)') == {
+        'report_type': '사업보고서', 'period': '2022.12', 'amendments': ['기재정정', '첨부정정']}
+    assert parse_report_name('주요사항보고서') == {'report_type': '', 'period': '', 'amendments': []}
+
+
+def test_latest_amendment_wins_regardless_of_flag():
+    original = _filing('20230315000001', '사업보고서 (2022.12)')
+    attached = _filing('20230320000002', '[첨부정정]사업보고서 (2022.12)')
+    corrected = _filing('20230410000003', '[기재정정]사업보고서 (2022.12)')
+    other_period = _filing('20220315000004', '사업보고서 (2021.12)')
+    other_company = _filing('20230316000005', '사업보고서 (2022.12)', corp_name='LG화학')
+    unparsed = _filing('20230501000006', '주요사항보고서')
+
+    # 검색 결과는 최신순이 아닐 수 있으므로 섞어서 전달 - 결과는 원래 순서 유지
+    reports = [attached, other_period, corrected, unparsed, original, other_company]
+    assert plan_latest_versions(reports) == [other_period, corrected, unparsed, other_company]
+
+    # 기재정정 뒤에 첨부정정이 나오면 더 늦게 제출된 첨부정정이 최신본
+    late_attached = _filing('20230420000007', '[첨부정정]사업보고서 (2022.12)')
+    assert plan_latest_versions([original, corrected, late_attached]) == [late_attached]
+
+
+def test_keep_all_versions_returns_every_filing():
+    reports = [_filing('20230315000001', '사업보고서 (2022.12)'),
+               _filing('20230410000003', '[기재정정]사업보고서 (2022.12)')]
+    planned = plan_latest_versions(reports, keep_all_versions=True)
+    assert planned == reports and planned is not reports
+
+
+@pytest.fixture
+def scraper(make_scraper, monkeypatch):
+    scraper = make_scraper(requests_per_second=2.0)
+    sizes = {'20240312000001': 1000, '20240312000002': None}
+    monkeypatch.setattr(scraper, 'get_report_download_info',
+                        lambda url: scraper.build_download_info(re.search(r'rcpNo=(\d+)', url).group(1), '9601234'))
+    monkeypatch.setattr(scraper, 'probe_download_size', lambda info: sizes[info['rcp_no']])
+    return scraper
+
+
+def test_estimate_counts_priming_requests_and_pause(scraper, tmp_path):
+    reports = [_report('20240312000001'), _report('20240312000002')]
+    estimate = estimate_downloads(scraper, reports, str(tmp_path), workers=1, pause=1.0)
+
+    # 크기를 확인한 보고서는 PDF 1회, 확인하지 못한 보고서는 PDF 1회 + 세션 설정 후 재요청 3회
+    assert estimate['estimated_requests'] == 1 + 4
+    assert estimate['estimated_seconds'] == pytest.approx(5 / 2.0 + 2 * 1.0)
+    assert estimate['download_bytes'] == 1000
+    assert estimate['unknown_sizes'] == 1
+
+
+def test_txt_dry_run_strips_trailing_params(scraper, tmp_path):
+    save_dir = tmp_path / "out"
+    save_dir.mkdir()
+    (save_dir / "a.pdf").write_bytes(b"%PDF" + b"0" * 996)
+    scraper.get_manifest(str(save_dir)).record('20240312000001', '9601234', filename='a.pdf', size=1000)
+    links = tmp_path / "report_links.txt"
+    links.write_text("https://dart.fss.or.kr/dsaf001/main.do?rcpNo=20240312000001&dcmNo=9601234\n",
+                     encoding='utf-8')
+
+    estimate = scraper.download_all_reports_from_txt(str(links), str(save_dir), dry_run=True)
+
+    # rcpNo 뒤의 파라미터를 떼어내야 매니페스트에서 이미 받은 파일을 찾음
+    assert estimate['local_files'] == 1
+    assert estimate['download_files'] == 0
+
+
+def test_packed_report_counts_as_local(make_scraper, monkeypatch, tmp_path):
+    scraper = make_scraper(storage=PackStorage())
+    body = b'%PDF-1.4\n' + b'0' * 991
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Length'] = str(len(body))
+    response.raw = io.BytesIO(body)
+    scraper.storage.store(response, str(tmp_path), 'a.pdf', key=('20240312000001', '9601234'))
+    scraper.get_manifest(str(tmp_path)).record('20240312000001', '9601234', filename='a.pdf', size=len(body))
+    monkeypatch.setattr(scraper, 'probe_download_size', lambda info: pytest.fail('이미 받은 보고서를 조회함'))
+
+    # 팩 저장소에는 a.pdf 파일이 따로 없으므로 저장소 백엔드로 확인해야 함
+    estimate = estimate_downloads(scraper, [_report('20240312000001')], str(tmp_path), pause=0)
+    assert estimate['local_files'] == 1
+    assert estimate['local_bytes'] == len(body)
+    assert not (tmp_path / 'a.pdf').exists()
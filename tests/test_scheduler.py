@@ -0,0 +1,93 @@
+"""마감 스케줄러 - 우선순위 순서, 마감 판단, 체크포인트 이어받기"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from dart_scheduler import DownloadScheduler, PriorityRules, parse_deadline
+from dart_storage import DownloadManifest
+
+
+class FakeScraper:
+    def __init__(self):
+        self.manifests = {}
+
+    def get_manifest(self, save_dir):
+        return self.manifests.setdefault(save_dir, DownloadManifest(save_dir))
+
+
+def _report(rcp_no: str, company: str, report_name: str) -> dict:
+    return {'rcp_no': rcp_no, 'corp_name': company, 'report_name': report_name,
+            'report_url': f"https://dart/dsaf001/main.do?rcpNo={rcp_no}"}
+
+
+def _recent(days: int, seq: int) -> str:
+    return f"{(datetime.now() - timedelta(days=days)):%Y%m%d}{seq:06d}"
+
+
+@pytest.fixture
+def reports():
+    return [
+        _report(_recent(900, 1), '삼성전자', '사업보고서 (2021.12)'),
+        _report(_recent(10, 2), '카카오', '분기보고서 (2024.03)'),
+        _report(_recent(10, 3), '삼성전자', '분기보고서 (2024.03)'),
+        _report(_recent(30, 4), '삼성전자', '사업보고서 (2023.12)'),
+    ]
+
+
+def test_parse_deadline():
+    now = datetime(2024, 3, 15, 9, 30)
+    assert parse_deadline('08:00', now) == datetime(2024, 3, 16, 8, 0)
+    assert parse_deadline('18:05', now) == datetime(2024, 3, 15, 18, 5)
+    assert parse_deadline('2024-03-20T07:00', now) == datetime(2024, 3, 20, 7, 0)
+    with pytest.raises(ValueError):
+        parse_deadline('8시')
+
+
+def test_plan_orders_tiered_recent_reports_first(tmp_path, reports):
+    scheduler = DownloadScheduler(FakeScraper(), str(tmp_path), rules=PriorityRules(tiers={'삼성전자': 1}))
+    order = [report['rcp_no'][-1] for report in scheduler.plan(reports)]
+    # 등급 회사의 최신 보고서(분기 > 사업) → 후순위는 점수 순 (등급 점수가 최신성보다 큼)
+    assert order == ['3', '4', '1', '2']
+
+
+def test_admit_defers_reports_past_the_deadline(tmp_path, reports):
+    scheduler = DownloadScheduler(FakeScraper(), str(tmp_path), deadline=datetime.now() + timedelta(seconds=30),
+                                  initial_estimate=10.0)
+    plan = scheduler.plan(reports)
+    assert scheduler.admit(plan[0])
+    scheduler.record(plan[0], True, 40.0)
+    assert scheduler.estimate(plan[1]) == pytest.approx(19.0)
+    scheduler.record(plan[1], True, 80.0)
+    assert not scheduler.admit(plan[2])
+
+    result = scheduler.finish()
+    assert result['deferred_reasons'] == {'deadline': 1, 'not_started': 1}
+    assert result['checkpointed'] == 2
+
+
+def test_checkpoint_carries_over_and_drops_downloaded(tmp_path, reports):
+    scraper = FakeScraper()
+    first = DownloadScheduler(scraper, str(tmp_path), max_attempts=2)
+    plan = first.plan(reports)
+    first.record(plan[0], True, 1.0)
+    first.record(plan[1], False, 1.0)
+    first.finish()
+    with open(tmp_path / '.dart_schedule.json', encoding='utf-8') as f:
+        pending = {item['report']['rcp_no']: item for item in json.load(f)['pending']}
+    assert set(pending) == {plan[1]['rcp_no'], plan[2]['rcp_no'], plan[3]['rcp_no']}
+    assert pending[plan[1]['rcp_no']]['reason'] == 'failed'
+
+    # 다른 실행이 받은 보고서는 이어받지 않고, 검색 결과에 없어도 남은 보고서는 이어받음
+    scraper.get_manifest(str(tmp_path)).record(plan[2]['rcp_no'], '1', filename='a.pdf')
+    second = DownloadScheduler(scraper, str(tmp_path), max_attempts=2)
+    replanned = second.plan([])
+    assert second.carried_over == 2
+    assert {report['rcp_no'] for report in replanned} == {plan[1]['rcp_no'], plan[3]['rcp_no']}
+
+    # 최대 시도 횟수에 닿은 보고서는 더 넘기지 않음
+    for report in replanned:
+        second.record(report, report['rcp_no'] != plan[1]['rcp_no'], 1.0)
+    assert second.finish()['checkpointed'] == 0
+    assert not (tmp_path / '.dart_schedule.json').exists()
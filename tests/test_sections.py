@@ -0,0 +1,108 @@
+"""목차 섹션 선택과 섹션 HTML 다운로드"""
+
+import json
+
+import requests
+
+from dart_scraper import parse_viewer_page, select_sections
+from dart_storage import SECTIONS_FILENAME
+
+
+REPORT_URL = 'https://dart.fss.or.kr/dsaf001/main.do?rcpNo=20240312000736'
+
+VIEWER_HTML = """<script>
+    var node1 = {};
+    node1['text'] = "사 업 보 고 서";
+    node1['rcpNo'] = "20240312000736";
+    node1['dcmNo'] = "9601234";
+    treeData.push(node1);
+    var node2 = {};
+    node2['text'] = "III. 재 무 에  관 한  사 항";
+    node2['rcpNo'] = "20240312000736";
+    node2['dcmNo'] = "9601234";
+    node2['eleId'] = "10";
+    node2['offset'] = "1000";
+    node2['length'] = "5000";
+    treeData.push(node2);
+    var node3 = {};
+    node3['text'] = "2. 연결재무제표";
+    node3['rcpNo'] = "20240312000736";
+    node3['dcmNo'] = "9601234";
+    node3['eleId'] = "11";
+    node3['offset'] = "1500";
+    node3['length'] = "800";
+    treeData.push(node3);
+    var node4 = {};
+    node4['text'] = "3. 연결재무제표 주석";
+    node4['rcpNo'] = "20240312000736";
+    node4['dcmNo'] = "9601299";
+    node4['eleId'] = "2";
+    node4['offset'] = "1500";
+    node4['length'] = "800";
+    treeData.push(node4);
+    var node5 = {};
+    node5['text'] = "II. 사업의 내용";
+    node5['rcpNo'] = "20240312000736";
+    node5['dcmNo'] = "9601234";
+    node5['eleId'] = "5";
+    node5['offset'] = "300";
+    node5['length'] = "600";
+    treeData.push(node5);
+</script>"""
+
+
+def test_viewer_sections_skip_nodes_without_body():
+    sections = parse_viewer_page(VIEWER_HTML)['sections']
+    # 표지 노드(eleId 없음)는 본문이 없으므로 목차 섹션에서 제외
+    assert [node['eleId'] for node in sections] == ['10', '11', '2', '5']
+    assert sections[0]['text'] == 'III. 재 무 에  관 한  사 항'
+
+
+def test_select_sections_normalizes_titles_and_skips_nested_nodes():
+    sections = parse_viewer_page(VIEWER_HTML)['sections']
+    selected = select_sections(sections, ['재무에 관한 사항', '재무제표', '주석'])
+
+    # node3은 같은 문서에서 이미 선택한 node2 구간 안에 있으므로 제외,
+    # node4는 구간이 겹쳐도 다른 문서(dcmNo)이므로 선택
+    assert [node['eleId'] for node in selected] == ['10', '2']
+    assert select_sections(sections, ['사 업 의 내용']) == [sections[3]]
+
+
+def _html(body: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body.encode('utf-8')
+    response.encoding = 'utf-8'
+    return response
+
+
+def test_partial_sections_fail_and_resume_only_missing(make_scraper, monkeypatch, tmp_path):
+    scraper = make_scraper()
+    sections = parse_viewer_page(VIEWER_HTML)['sections']
+    monkeypatch.setattr(scraper, 'get_report_documents',
+                        lambda url: {'rcp_no': '20240312000736', 'sections': sections, 'documents': []})
+    requested = []
+    failing = {'2'}
+
+    def fake_request(method, url, **kwargs):
+        ele_id = url.split('eleId=')[1].split('&')[0]
+        requested.append(ele_id)
+        if ele_id in failing:
+            raise requests.ConnectionError('연결 끊김')
+        return _html(f'<html>{ele_id}</html>')
+    monkeypatch.setattr(scraper, '_request', fake_request)
+    keywords = ['재무에 관한 사항', '주석']
+
+    assert scraper.download_report_sections(REPORT_URL, str(tmp_path), keywords, workers=1) is None
+    with open(tmp_path / '20240312000736' / SECTIONS_FILENAME, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert [item['ele_id'] for item in saved['sections']] == ['10']
+    assert saved['missing'] == ['3. 연결재무제표 주석']
+
+    # 다시 실행하면 이미 받은 섹션은 건너뛰고 받지 못한 섹션만 요청
+    requested.clear()
+    failing.clear()
+    metadata = scraper.download_report_sections(REPORT_URL, str(tmp_path), keywords, workers=1)
+    assert requested == ['2']
+    assert [item['ele_id'] for item in metadata['sections']] == ['10', '2']
+    assert metadata['missing'] == []
@@ -0,0 +1,44 @@
+"""SessionPool 쿠키 보존"""
+
+import gc
+import json
+import weakref
+
+import dart_session
+from dart_session import SessionPool
+
+
+def test_unclosed_pools_are_saved_once_at_exit(tmp_path):
+    cookie_file = tmp_path / 'session.json'
+    pool = SessionPool({}, size=1, cookie_file=str(cookie_file))
+    pool.get().cookies.set('JSESSIONID', 'abc', domain='dart.fss.or.kr')
+    pool.mark_warm(pool.get())
+    pool.get().cookies.set('JSESSIONID', 'rotated', domain='dart.fss.or.kr')
+
+    dart_session._save_open_pools()
+    saved = json.loads(cookie_file.read_text(encoding='utf-8'))
+    assert {cookie['value'] for cookie in saved['cookies']} == {'rotated'}
+
+    pool.close()
+    assert pool not in dart_session._open_pools
+
+
+def test_registry_does_not_keep_pools_alive(tmp_path):
+    pool = SessionPool({}, cookie_file=str(tmp_path / 'session.json'))
+    ref = weakref.ref(pool)
+    del pool
+    gc.collect()
+    assert ref() is None
+
+
+def test_mark_warm_copies_cookies_into_every_session(tmp_path):
+    pool = SessionPool({}, size=3, cookie_file=None)
+    source = pool.get()
+    source.cookies.set('WMONID', 'x', domain='dart.fss.or.kr')
+    pool.mark_warm(source)
+
+    assert pool.is_warm()
+    assert all(session.cookies.get('WMONID') == 'x' for session in pool._sessions)
+    # 세션마다 쿠키 저장소는 따로 - 복사된 것
+    assert len({id(session.cookies) for session in pool._sessions}) == 3
+    pool.close()
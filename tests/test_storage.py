@@ -0,0 +1,220 @@
+"""보고서 저장 - 잘린 본문 처리"""
+
+import hashlib
+import io
+import os
+
+import pytest
+import requests
+
+from dart_pack import PackStorage
+from dart_s3 import MIN_PART_SIZE, S3Storage
+import dart_scraper
+import dart_storage
+from dart_storage import (DownloadManifest, IncompleteDownload, LocalStorage, StorageBackend, download_segmented,
+                          migrate_filenames, stream_to_file)
+
+
+def _response(body: bytes, content_length: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/pdf'
+    response.headers['Content-Length'] = str(content_length)
+    response.raw = io.BytesIO(body)
+    return response
+
+
+@pytest.mark.parametrize('background', [False, True])
+def test_complete_body_is_stored_with_hash(tmp_path, background):
+    body = b'%PDF-1.4\n' + os.urandom(300_000)
+    path = tmp_path / 'report.pdf'
+    size, sha256 = stream_to_file(_response(body, len(body)), str(path), buffer_size=64 * 1024,
+                                  background=background)
+    assert size == len(body)
+    assert sha256 == hashlib.sha256(body).hexdigest()
+    assert path.read_bytes() == body
+
+
+@pytest.mark.parametrize('background', [False, True])
+def test_truncated_body_leaves_no_file(tmp_path, background):
+    body = b'%PDF-1.4\n' + os.urandom(1000)
+    path = tmp_path / 'report.pdf'
+    with pytest.raises(IncompleteDownload):
+        stream_to_file(_response(body, len(body) + 500), str(path), background=background)
+    assert os.listdir(tmp_path) == []
+
+
+def test_truncated_body_keeps_previous_local_file(tmp_path):
+    (tmp_path / 'report.pdf').write_bytes(b'old')
+    with pytest.raises(IncompleteDownload):
+        LocalStorage().store(_response(b'%PDF-new', 100), str(tmp_path), 'report.pdf')
+    assert (tmp_path / 'report.pdf').read_bytes() == b'old'
+    assert not (tmp_path / 'report.pdf.part').exists()
+
+
+def test_truncated_body_is_not_indexed_in_pack(tmp_path):
+    storage = PackStorage()
+    body = b'%PDF-1.4\n' + os.urandom(5000)
+    storage.store(_response(body, len(body)), str(tmp_path), 'good.pdf', key=('20240312000001', '1'))
+    pack = storage.pack(str(tmp_path))
+    segment_sizes = {name: os.path.getsize(os.path.join(pack.pack_dir, name)) for name in os.listdir(pack.pack_dir)
+                     if not name.endswith(('.sqlite', '-wal', '-shm'))}
+
+    with pytest.raises(IncompleteDownload):
+        storage.store(_response(body[:100], len(body)), str(tmp_path), 'bad.pdf', key=('20240312000002', '1'))
+
+    assert storage.exists(str(tmp_path), 'bad.pdf') is None
+    assert storage.exists(str(tmp_path), 'good.pdf') == len(body)
+    # 쓰다 만 레코드는 잘라내어 세그먼트 크기가 그대로
+    assert {name: os.path.getsize(os.path.join(pack.pack_dir, name)) for name in segment_sizes} == segment_sizes
+
+
+def test_download_report_file_rejects_truncated_pdf(tmp_path, make_scraper, monkeypatch):
+    scraper = make_scraper()
+    body = b'%PDF-1.4\n' + os.urandom(2000)
+    monkeypatch.setattr(scraper, '_request', lambda method, url, **kwargs: _response(body[:500], len(body)))
+    report = {'corp_name': '삼성전자', 'report_name': '사업보고서 (2023.12)', 'submit_date': '2024.03.12'}
+
+    ok = scraper.download_report_file({'download_url': 'https://dart/pdf', 'rcp_no': '20240312000736',
+                                       'dcm_no': '9601234'}, str(tmp_path), report=report)
+    assert ok is False
+    assert [name for name in os.listdir(tmp_path) if not name.startswith('.')] == []
+    assert scraper.get_manifest(str(tmp_path)).get('20240312000736', '9601234') is None
+
+
+def _range_response(body: bytes, start: int, end: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 206
+    response.headers['Content-Range'] = f'bytes {start}-{end}/{len(body)}'
+    response.raw = io.BytesIO(body[start:end + 1])
+    return response
+
+
+def test_segmented_download_assembles_ranges(tmp_path):
+    body = b'%PDF-1.4\n' + os.urandom(100_000)
+    path = tmp_path / 'report.pdf'
+    size, sha256 = download_segmented(_response(body, len(body)),
+                                      lambda start, end: _range_response(body, start, end),
+                                      str(path), segments=3)
+    assert (size, sha256) == (len(body), hashlib.sha256(body).hexdigest())
+    assert path.read_bytes() == body
+
+
+def test_segmented_fallback_rejects_non_pdf_retry(tmp_path, make_scraper, monkeypatch):
+    scraper = make_scraper(download_segments=2, segment_min_size=1)
+    body = b'%PDF-1.4\n' + os.urandom(2000)
+    first = _response(body, len(body))
+    first.headers['Accept-Ranges'] = 'bytes'
+    retry = requests.Response()
+    retry.status_code = 200
+    retry.headers['Content-Type'] = 'text/html; charset=utf-8'
+    retry.raw = io.BytesIO('<html>잠시 후 다시 시도</html>'.encode())
+    responses = iter([first, retry])
+    monkeypatch.setattr(scraper, '_request', lambda method, url, **kwargs: next(responses))
+
+    def broken_segmented(*args, **kwargs):
+        raise IOError('구간 응답 오류')
+    monkeypatch.setattr(dart_scraper, 'download_segmented', broken_segmented)
+    report = {'corp_name': '삼성전자', 'report_name': '사업보고서 (2023.12)', 'submit_date': '2024.03.12'}
+
+    ok = scraper.download_report_file({'download_url': 'https://dart/pdf', 'rcp_no': '20240312000736',
+                                       'dcm_no': '9601234'}, str(tmp_path), report=report)
+    assert ok is False
+    assert [name for name in os.listdir(tmp_path) if not name.startswith('.')] == []
+    assert scraper.get_manifest(str(tmp_path)).get('20240312000736', '9601234') is None
+
+
+class FakeS3Session:
+    """S3 요청을 기록하고 성공 응답을 돌려주는 가짜 세션"""
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, data=b'', headers=None, timeout=None):
+        self.calls.append((method, url))
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['ETag'] = '"etag"'
+        response._content = b'<UploadId>upload-1</UploadId>' if url.endswith('?uploads=') else b''
+        return response
+
+
+def test_truncated_body_is_not_uploaded_to_s3():
+    session = FakeS3Session()
+    storage = S3Storage('http://127.0.0.1:9000', 'reports', access_key='a', secret_key='b',
+                        part_size=MIN_PART_SIZE, session=session)
+
+    # 한 번에 올리는 작은 파일은 PUT을 보내지 않음
+    body = os.urandom(1000)
+    with pytest.raises(IncompleteDownload):
+        storage.store(_response(body, len(body) + 100), 'downloads', 'report.pdf')
+    assert session.calls == []
+
+    # 멀티파트는 완료 요청 없이 취소
+    body = os.urandom(MIN_PART_SIZE + 1000)
+    with pytest.raises(IncompleteDownload):
+        storage.store(_response(body, len(body) + 100), 'downloads', 'report.pdf')
+    assert [method for method, _ in session.calls] == ['POST', 'PUT', 'PUT', 'DELETE']
+    assert session.calls[-1][1].endswith('?uploadId=upload-1')
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+
+def test_migrate_filenames_fills_names_from_server_filename(tmp_path):
+    save_dir = str(tmp_path)
+    for name in ('[삼성전자]사업보고서(2024.03.12).pdf', 'report_20240515000001_1.pdf'):
+        (tmp_path / name).write_bytes(b'%PDF')
+    manifest = DownloadManifest(save_dir)
+    manifest.record('20240312000736', '9601234', filename='[삼성전자]사업보고서(2024.03.12).pdf', size=4)
+    manifest.record('20240515000001', '1', filename='report_20240515000001_1.pdf', size=4)
+
+    renames = migrate_filenames(save_dir)
+    new = '[삼성전자]사업보고서(2024.03.12)_20240312000736_9601234.pdf'
+    assert renames == [('[삼성전자]사업보고서(2024.03.12).pdf', new)]
+    assert sorted(os.listdir(tmp_path)) == ['.dart_manifest.jsonl', new, 'report_20240515000001_1.pdf']
+
+    entry = DownloadManifest(save_dir).get('20240312000736', '9601234')
+    assert (entry['filename'], entry['corp_name'], entry['report_name']) == (new, '삼성전자', '사업보고서')
+    assert migrate_filenames(save_dir) == []
+
+
+def test_links_file_keeps_report_names_for_fixed_filenames(tmp_path, make_scraper, monkeypatch):
+    links = tmp_path / 'links.txt'
+    dart_scraper.DartScraper.save_links_to_txt([
+        {'company': '삼성전자', 'report_name': '사업보고서 (2023.12)', 'submit_date': '2024.03.12',
+         'report_url': 'https://dart.fss.or.kr/dsaf001/main.do?rcpNo=20240312000736'},
+    ], str(links))
+    with open(links, 'a', encoding='utf-8') as f:
+        f.write('https://dart.fss.or.kr/dsaf001/main.do?rcpNo=20240515000001&dcmNo=1\n')
+
+    scraper = make_scraper()
+    reports = scraper.load_links_from_txt(str(links))
+    assert [(report['rcp_no'], report.get('report_name')) for report in reports] == [
+        ('20240312000736', '사업보고서 (2023.12)'), ('20240515000001', None)]
+
+    calls = []
+    monkeypatch.setattr(dart_scraper.time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(scraper, 'get_report_download_info',
+                        lambda url: scraper.build_download_info(url.split('rcpNo=')[1][:14], '9601234'))
+    monkeypatch.setattr(scraper, 'download_report_file',
+                        lambda info, save_dir, report=None: calls.append((info['rcp_no'], report)) or True)
+
+    result = scraper.download_all_reports_from_txt(str(links), str(tmp_path / 'out'))
+    assert result['success'] == 2
+    # 보고서명이 있는 링크는 검색 결과처럼 고정 파일명, 링크만 있으면 매니페스트·서버 파일명으로 결정
+    assert calls[0][1]['corp_name'] == '삼성전자' and calls[0][1]['submit_date'] == '2024.03.12'
+    assert dart_storage.report_filename(calls[0][1], '20240312000736', '9601234') == \
+        '[삼성전자]사업보고서 (2023.12)(2024.03.12)_20240312000736_9601234.pdf'
+    assert calls[1] == ('20240515000001', None)
+
+
+def test_write_benchmark_uses_its_own_opener():
+    from dart_write_bench import benchmark_write_paths
+
+    result = benchmark_write_paths(size_mb=0.25, runs=1, buffer_size=64 * 1024, disk_latency_ms=0, disk_mbps=1000)
+    assert [(item['disk'], item['path']) for item in result['results']][:2] == [('local', 'legacy_8k'), ('local', 'buffered')]
+    assert len(result['results']) == 6
+    assert 'open' not in vars(dart_storage)
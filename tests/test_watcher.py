@@ -0,0 +1,127 @@
+"""DisclosureWatcher 확인 처리와 재시도"""
+
+import json
+import os
+from datetime import datetime
+
+import pytest
+import requests
+
+import dart_watcher
+from dart_watcher import DisclosureWatcher
+
+
+TODAY = datetime.now().strftime('%Y%m%d')
+
+
+def _result(seq: int, corp_name: str) -> dict:
+    return {'rcp_no': f"{TODAY}{seq:06d}", 'corp_name': corp_name, 'company': corp_name,
+            'report_name': '분기보고서 (2024.03)', 'submit_date': TODAY, 'report_url': f"https://dart/{seq}"}
+
+
+class FakeScraper:
+    """페이지별 검색 결과와 다운로드 성공 여부를 정해 둔 가짜 스크레이퍼"""
+
+    def __init__(self, pages, fail_pages=(), fail_downloads=()):
+        self.pages = pages
+        self.fail_pages = set(fail_pages)
+        self.fail_downloads = set(fail_downloads)
+        self.downloads = []
+
+    def search_latest_disclosures(self, start_date, end_date, page=1, public_types=None, raise_errors=False):
+        if page in self.fail_pages:
+            raise ConnectionError("연결 끊김")
+        return self.pages[page - 1] if page <= len(self.pages) else []
+
+    def download_report(self, report, download_dir, sections=None):
+        self.downloads.append(report['rcp_no'])
+        return report['rcp_no'] not in self.fail_downloads
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(dart_watcher.time, 'sleep', lambda seconds: None)
+
+
+def _watcher(scraper, tmp_path):
+    return DisclosureWatcher(scraper, ['삼성전자'], download_dir=str(tmp_path / 'reports'),
+                             state_file=str(tmp_path / 'state.json'))
+
+
+def test_failed_download_is_retried_and_not_marked_seen(tmp_path):
+    tracked = _result(2, '삼성전자')
+    scraper = FakeScraper([[tracked, _result(1, '기타회사')]], fail_downloads={tracked['rcp_no']})
+
+    result = _watcher(scraper, tmp_path).sync()
+    assert result['failed'] == 1
+
+    state = json.loads((tmp_path / 'state.json').read_text(encoding='utf-8'))
+    assert tracked['rcp_no'] not in state['seen']
+    assert _result(1, '기타회사')['rcp_no'] in state['seen']
+    assert tracked['rcp_no'] in state['pending']
+
+    # 새 프로세스에서 목록에 다시 나오지 않아도 재시도하고, 성공하면 확인 처리
+    scraper = FakeScraper([[_result(3, '기타회사'), _result(1, '기타회사')]])
+    watcher = _watcher(scraper, tmp_path)
+    result = watcher.sync()
+    assert scraper.downloads == [tracked['rcp_no']]
+    assert result['success'] == 1
+    assert tracked['rcp_no'] in watcher.seen
+    assert not watcher.pending
+
+
+def test_paging_error_does_not_persist_partial_poll(tmp_path):
+    newest = _result(3, '삼성전자')
+    older = _result(1, '삼성전자')
+    pages = [[newest, _result(2, '기타회사')], [older]]
+
+    watcher = _watcher(FakeScraper(pages, fail_pages={2}), tmp_path)
+    result = watcher.sync()
+    assert result['success'] == 1
+    assert not watcher.last_poll_complete
+    assert not (tmp_path / 'state.json').exists()
+
+    # 같은 프로세스의 다음 감시: 이미 받은 보고서는 다시 받지 않고, 놓친 이전 공시를 받음
+    watcher.scraper = FakeScraper(pages)
+    watcher.sync()
+    assert watcher.scraper.downloads == [older['rcp_no']]
+    assert {newest['rcp_no'], older['rcp_no'], _result(2, '기타회사')['rcp_no']} <= watcher.seen
+    assert not watcher.downloaded
+
+
+def test_poll_stops_at_seen_rcp_no(tmp_path):
+    seen = _result(1, '삼성전자')
+    (tmp_path / 'state.json').write_text(json.dumps({'seen': [seen['rcp_no']]}), encoding='utf-8')
+    scraper = FakeScraper([[_result(2, '삼성전자'), seen], [_result(0, '삼성전자')]])
+
+    hits = _watcher(scraper, tmp_path).poll()
+    assert [hit['rcp_no'] for hit in hits] == [_result(2, '삼성전자')['rcp_no']]
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'dart_pages')
+NO_RESULT = '<html><body><table class="tbList"><tbody><tr><td colspan="6">조회 결과가 없습니다.</td></tr></tbody></table></body></html>'
+
+
+def _search_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response.encoding = 'utf-8'
+    return response
+
+
+@pytest.mark.parametrize('last_page, complete', [
+    (NO_RESULT.encode('utf-8'), True),
+    (b'<html><body><div class="newLayout">...</div></body></html>', False),
+])
+def test_unparsed_page_does_not_end_the_poll(make_scraper, monkeypatch, tmp_path, last_page, complete):
+    with open(os.path.join(FIXTURES, 'search', 'page000.html'), 'rb') as f:
+        pages = [f.read(), last_page]
+    scraper = make_scraper()
+    monkeypatch.setattr(scraper, '_request', lambda method, url, **kwargs: _search_response(pages.pop(0)))
+
+    watcher = _watcher(scraper, tmp_path)
+    watcher.poll()
+    assert watcher.last_poll_complete is complete
+    assert (tmp_path / 'state.json').exists() is complete